@@ -24,6 +24,15 @@ a = Analysis(
         'PIL.ImageDraw',
         'PIL.ImageFont',
         'plyer.platforms.win.notification',
+        # LazyImport で文字列から読み込むため、静的解析では検出されないモジュール
+        'google.oauth2.credentials',
+        'google.auth.transport.requests',
+        'google_auth_oauthlib.flow',
+        'src.image_generator',
+        'src.multi_display',
+        'src.renderers.calendar_renderer',
+        'src.renderers.card_renderer',
+        'src.renderers.effects',
     ],
     hookspath=[],
     hooksconfig={},
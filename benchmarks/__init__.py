@@ -0,0 +1,6 @@
+"""
+性能ベンチマーク
+
+テストとは別に手動・CIで実行する計測用スクリプト群。
+    python -m benchmarks.render_benchmark --help
+"""
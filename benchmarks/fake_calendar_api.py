@@ -0,0 +1,368 @@
+"""
+Google Calendar API のローカル代替サーバー（ベンチマーク・テスト用）
+
+googleapiclient から api_endpoint を差し替えて接続し、ネットワークなしで次のAPIに応答する。
+- calendarList.list
+- events.list（timeMin/timeMax の絞り込み・orderBy=startTime・ページネーション・syncToken による差分）
+  合成データは展開済みの単発イベントのみのため、singleEvents は受け付けるだけで結果は変わらない
+- バッチリクエスト（multipart/mixed）
+
+応答の遅延とページサイズは設定でき、リクエスト数・送信バイト数を記録する。
+
+使い方:
+    backend = FakeCalendarBackend.synthetic(calendar_ids=['primary'], events_per_calendar=200)
+    with FakeCalendarServer(backend, latency_ms=20, page_size=50) as server:
+        service = server.build_service()
+        service.events().list(calendarId='primary').execute()
+"""
+import json
+import re
+import socket
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from src.models.event import CalendarEvent
+from benchmarks.synthetic_events import generate_week_events
+
+# events.list の maxResults の既定値と上限（実APIと同じ）
+DEFAULT_PAGE_SIZE = 250
+MAX_PAGE_SIZE = 2500
+
+_EVENTS_PATH = re.compile(r'^/calendar/v3/calendars/([^/]+)/events$')
+_CALENDAR_LIST_PATH = '/calendar/v3/users/me/calendarList'
+_BATCH_PATH = '/batch/calendar/v3'
+
+
+def to_api_item(event: CalendarEvent) -> Dict:
+    """CalendarEvent を events.list の応答と同じ形のdictに変換"""
+    if event.is_all_day:
+        start = {'date': event.start_datetime.date().isoformat()}
+        end = {'date': event.end_datetime.date().isoformat()}
+    else:
+        start = {'dateTime': event.start_datetime.astimezone().isoformat()}
+        end = {'dateTime': event.end_datetime.astimezone().isoformat()}
+    return {
+        'kind': 'calendar#event',
+        'id': event.id,
+        'status': 'confirmed',
+        'summary': event.summary,
+        'location': event.location,
+        'colorId': event.color_id,
+        'start': start,
+        'end': end,
+    }
+
+
+def _item_start(item: Dict) -> str:
+    start = item.get('start', {})
+    return start.get('dateTime') or start.get('date', '')
+
+
+class _CalendarData:
+    """1カレンダー分のイベントと変更履歴"""
+
+    def __init__(self, summary: str, items: List[Dict]):
+        self.summary = summary
+        self.items: Dict[str, Dict] = {item['id']: item for item in items}
+        self.version = 1
+        # (変更後のバージョン, イベントID)。syncToken の差分に使う
+        self.changes: List[Tuple[int, str]] = []
+
+
+class FakeCalendarBackend:
+    """
+    代替サーバーが返すカレンダーデータ
+
+    Args:
+        calendars: {カレンダーID: イベントdictのリスト}
+    """
+
+    def __init__(self, calendars: Dict[str, List[Dict]]):
+        self._lock = threading.Lock()
+        self._calendars = {
+            calendar_id: _CalendarData(calendar_id, items) for calendar_id, items in calendars.items()
+        }
+
+    @classmethod
+    def synthetic(cls, calendar_ids: List[str], events_per_calendar: int, seed: int = 0) -> 'FakeCalendarBackend':
+        """合成カレンダー（synthetic_events）で作成"""
+        return cls({
+            calendar_id: [
+                to_api_item(event)
+                for event in generate_week_events(events_per_calendar, seed=seed + index)
+            ]
+            for index, calendar_id in enumerate(calendar_ids)
+        })
+
+    @property
+    def calendar_ids(self) -> List[str]:
+        return list(self._calendars)
+
+    def upsert_event(self, calendar_id: str, item: Dict) -> None:
+        """イベントを追加・更新（次の syncToken の差分に含まれる）"""
+        with self._lock:
+            calendar = self._calendars[calendar_id]
+            calendar.version += 1
+            calendar.items[item['id']] = item
+            calendar.changes.append((calendar.version, item['id']))
+
+    def delete_event(self, calendar_id: str, event_id: str) -> None:
+        """イベントを削除（差分には status=cancelled として含まれる）"""
+        with self._lock:
+            calendar = self._calendars[calendar_id]
+            item = calendar.items.get(event_id)
+            if item is None:
+                return
+            calendar.version += 1
+            calendar.items[event_id] = {'kind': 'calendar#event', 'id': event_id, 'status': 'cancelled'}
+            calendar.changes.append((calendar.version, event_id))
+
+    def calendar_list(self) -> Dict:
+        with self._lock:
+            return {
+                'kind': 'calendar#calendarList',
+                'items': [
+                    {'kind': 'calendar#calendarListEntry', 'id': calendar_id, 'summary': data.summary,
+                     'accessRole': 'owner'}
+                    for calendar_id, data in self._calendars.items()
+                ],
+            }
+
+    def list_events(self, calendar_id: str, params: Dict[str, str], page_size: int) -> Tuple[int, Dict]:
+        """
+        events.list の応答
+
+        Returns:
+            Tuple[int, Dict]: (HTTPステータス, 応答)
+        """
+        with self._lock:
+            calendar = self._calendars.get(calendar_id)
+            if calendar is None:
+                return 404, _error(404, 'Not Found')
+
+            sync_token = params.get('syncToken')
+            if sync_token:
+                since = _parse_sync_token(sync_token)
+                if since is None or since > calendar.version:
+                    return 410, _error(410, 'Sync token is no longer valid, a full sync is required.')
+                changed_ids = list(dict.fromkeys(eid for version, eid in calendar.changes if version > since))
+                items = [calendar.items[eid] for eid in changed_ids]
+            else:
+                items = [item for item in calendar.items.values() if item.get('status') != 'cancelled']
+                time_min, time_max = params.get('timeMin'), params.get('timeMax')
+                if time_min or time_max:
+                    items = [item for item in items if _overlaps(item, time_min, time_max)]
+                if params.get('orderBy') == 'startTime':
+                    items.sort(key=_item_start)
+            version = calendar.version
+
+        size = min(int(params.get('maxResults') or page_size), MAX_PAGE_SIZE)
+        offset = int(params.get('pageToken') or 0)
+        page = items[offset:offset + size]
+        body = {'kind': 'calendar#events', 'summary': calendar_id, 'items': page}
+        if offset + size < len(items):
+            body['nextPageToken'] = str(offset + size)
+        else:
+            body['nextSyncToken'] = f"v{version}"
+        return 200, body
+
+
+def _parse_sync_token(token: str) -> Optional[int]:
+    if token.startswith('v') and token[1:].isdigit():
+        return int(token[1:])
+    return None
+
+
+def _parse_time(value: str) -> datetime:
+    """RFC3339 または日付のみの文字列を aware な datetime に変換"""
+    if len(value) == 10:
+        return datetime.fromisoformat(value).astimezone()
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _overlaps(item: Dict, time_min: Optional[str], time_max: Optional[str]) -> bool:
+    """イベントが期間 [timeMin, timeMax) にかかるか"""
+    start = _parse_time(_item_start(item))
+    end_value = item.get('end', {})
+    end = _parse_time(end_value.get('dateTime') or end_value.get('date') or _item_start(item))
+    if time_max and start >= _parse_time(time_max):
+        return False
+    if time_min and end <= _parse_time(time_min):
+        return False
+    return True
+
+
+def _error(code: int, message: str) -> Dict:
+    return {'error': {'code': code, 'message': message, 'errors': [{'message': message}]}}
+
+
+class FakeCalendarServer:
+    """
+    代替サーバー（127.0.0.1 の空きポートで待ち受け）
+
+    Args:
+        backend: 返すカレンダーデータ
+        latency_ms: 1リクエストごとの応答遅延（ミリ秒、バッチは1回分）
+        page_size: maxResults 未指定時の1ページの件数
+    """
+
+    def __init__(self, backend: FakeCalendarBackend, latency_ms: float = 0, page_size: int = DEFAULT_PAGE_SIZE):
+        self.backend = backend
+        self.latency_ms = latency_ms
+        self.page_size = page_size
+        self.requests: Counter = Counter()  # {'events.list': 回数, ...}（バッチ内の個々のリクエストを含む）
+        self.http_requests = 0  # HTTPリクエスト数（バッチは1回）
+        self.bytes_sent = 0
+        self._stats_lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    # === 起動・停止 ===
+
+    def start(self) -> 'FakeCalendarServer':
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='fake-calendar-api', daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'FakeCalendarServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self.requests.clear()
+            self.http_requests = 0
+            self.bytes_sent = 0
+
+    # === クライアント ===
+
+    def build_service(self):
+        """このサーバーに接続する Calendar API サービス（認証なし・同梱のディスカバリー文書を使用）"""
+        import httplib2
+        from googleapiclient.discovery import build
+        return build(
+            'calendar', 'v3',
+            http=httplib2.Http(),
+            client_options={'api_endpoint': f"{self.base_url}/calendar/v3/"},
+            static_discovery=True,
+            cache_discovery=False,
+        )
+
+    def new_batch(self, callback=None):
+        """このサーバーに送るバッチリクエスト"""
+        from googleapiclient.http import BatchHttpRequest
+        return BatchHttpRequest(callback=callback, batch_uri=f"{self.base_url}{_BATCH_PATH}")
+
+    # === 応答 ===
+
+    def _dispatch(self, method: str, target: str) -> Tuple[int, Dict]:
+        """1リクエスト分の応答（バッチ内の個々のリクエストにも使う）"""
+        parts = urlsplit(target)
+        path = parts.path
+        params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        if method == 'GET' and path == _CALENDAR_LIST_PATH:
+            self._count('calendarList.list')
+            return 200, self.backend.calendar_list()
+        match = _EVENTS_PATH.match(path)
+        if method == 'GET' and match:
+            self._count('events.list')
+            return self.backend.list_events(unquote(match.group(1)), params, self.page_size)
+        return 404, _error(404, f'Unknown endpoint: {method} {path}')
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.requests[name] += 1
+
+    def _batch_response(self, content_type: str, body: bytes) -> Tuple[bytes, str]:
+        """multipart/mixed のバッチを個々に処理して multipart/mixed で返す"""
+        message = BytesParser(policy=HTTP).parsebytes(
+            b'Content-Type: ' + content_type.encode('ascii') + b'\r\n\r\n' + body
+        )
+        boundary = 'batch_fake_calendar_api'
+        chunks = []
+        for part in message.iter_parts():
+            content_id = part.get('Content-ID', '')
+            inner = part.get_payload(decode=True) or b''
+            request_line = inner.split(b'\r\n', 1)[0].split(b'\n', 1)[0].decode('utf-8')
+            method, target = request_line.split(' ')[:2]
+            status, payload = self._dispatch(method, target)
+            response_id = content_id.replace('<', '<response-', 1) if content_id else ''
+            chunks.append(
+                f"--{boundary}\r\n"
+                f"Content-Type: application/http\r\n"
+                f"Content-ID: {response_id}\r\n\r\n"
+                f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                f"Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{json.dumps(payload, ensure_ascii=False)}\r\n"
+            )
+        chunks.append(f"--{boundary}--\r\n")
+        return ''.join(chunks).encode('utf-8'), f"multipart/mixed; boundary={boundary}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                # ヘッダーと本文の書き込みが分かれるため、Nagle と遅延ACKで応答が約40ms遅れないようにする
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def _send(self, status: int, body: bytes, content_type: str) -> None:
+                # 応答を受け取った直後にクライアントが統計を参照しても反映済みになるよう、先に記録
+                with server._stats_lock:
+                    server.http_requests += 1
+                    server.bytes_sent += len(body)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _delay(self) -> None:
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+
+            def do_GET(self):
+                self._delay()
+                status, payload = server._dispatch('GET', self.path)
+                self._send(status, json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+                           'application/json; charset=UTF-8')
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length)
+                self._delay()
+                if urlsplit(self.path).path != _BATCH_PATH:
+                    payload = json.dumps(_error(404, 'Unknown endpoint')).encode('utf-8')
+                    self._send(404, payload, 'application/json; charset=UTF-8')
+                    return
+                response, content_type = server._batch_response(self.headers.get('Content-Type', ''), body)
+                self._send(200, response, content_type)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
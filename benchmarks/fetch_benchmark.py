@@ -0,0 +1,255 @@
+"""
+予定取得のベンチマーク
+
+ローカルの代替サーバー（fake_calendar_api）に接続した CalendarClient で
+get_all_events(days=7) を実行し、アカウント数 × カレンダー数 × イベント数ごとに次の値を記録する。
+- get_all_events の所要時間（キャッシュなしの中央値・最小・初回）
+- 1回の取得あたりのリクエスト数・受信バイト数
+- 取得したイベントの解析（iter_parsed_events）だけの所要時間
+ネットワーク・認証情報は使わない（accounts.json も読み込まない）。
+
+--recurring-store を指定すると繰り返しイベントのローカル展開（syncToken による差分同期）で計測する。
+初回が全件同期、2回目以降が差分同期になる。
+
+使い方:
+    python -m benchmarks.fetch_benchmark --latency-ms 30 --output fetch.json
+    python -m benchmarks.fetch_benchmark --baseline fetch.json --threshold 0.2
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src import calendar_client as calendar_client_module
+from src.calendar_client import CalendarClient
+from src.event_parser import iter_parsed_events
+from src.events_cache import EventsCache
+from src.recurring_events import RecurringEventStore
+from benchmarks.fake_calendar_api import FakeCalendarBackend, FakeCalendarServer
+from benchmarks.render_benchmark import compare_results
+
+ACCOUNT_COUNTS = (1, 3)
+CALENDAR_COUNTS = (1, 4)
+EVENT_COUNTS = (50, 500)  # カレンダーあたりの1週間のイベント数
+
+
+def case_id(accounts: int, calendars: int, events: int) -> str:
+    """ケースの識別子（結果JSONのキー）"""
+    return f"accounts={accounts}/calendars={calendars}/events={events}"
+
+
+@contextmanager
+def offline_client_settings(calendar_ids: List[str]):
+    """
+    CalendarClient を代替サーバー向けに設定
+
+    取得するカレンダーを calendar_ids にし、accounts.json（レガシーアカウントの色設定）は
+    存在しないパスに向けて実環境の設定を読み込まない。
+    """
+    saved = (calendar_client_module.CALENDAR_IDS, calendar_client_module.ACCOUNTS_CONFIG_PATH)
+    with tempfile.TemporaryDirectory(prefix='calesk-fetch-bench-') as tmp:
+        calendar_client_module.CALENDAR_IDS = calendar_ids
+        calendar_client_module.ACCOUNTS_CONFIG_PATH = Path(tmp) / 'accounts.json'
+        try:
+            yield
+        finally:
+            calendar_client_module.CALENDAR_IDS, calendar_client_module.ACCOUNTS_CONFIG_PATH = saved
+
+
+class FakeServerCalendarClient(CalendarClient):
+    """
+    代替サーバーに接続するアカウントを読み込む CalendarClient
+
+    load_accounts() は accounts.json・トークンの代わりに代替サーバーのアカウントを登録する
+    （WallpaperService は取得のたびに load_accounts() を呼ぶため、上書きしておく）。
+
+    Args:
+        server: 代替サーバー
+        accounts: アカウント数（すべて同じサーバー・カレンダーを参照する）
+        recurring_store: 繰り返しイベントのローカル展開を使うか
+    """
+
+    def __init__(self, server: FakeCalendarServer, accounts: int, recurring_store: bool = False):
+        self._fake_server = server
+        self._fake_account_count = accounts
+        self._fake_services: Dict[str, object] = {}
+        super().__init__()
+        self._recurring_store = RecurringEventStore() if recurring_store else None
+
+    def load_accounts(self):
+        self._expired_accounts = {}
+        self.accounts = {}
+        for index in range(self._fake_account_count):
+            account_id = f"account-{index}"
+            service = self._fake_services.get(account_id)
+            if service is None:
+                service = self._fake_services[account_id] = self._fake_server.build_service()
+            self.accounts[account_id] = {
+                'service': service,
+                'email': f"user{index}@example.com",
+                'color': '#4285f4',
+                'display_name': f"Account {index}",
+            }
+
+
+def create_client(server: FakeCalendarServer, accounts: int, recurring_store: bool = False) -> CalendarClient:
+    """代替サーバーに接続するアカウントを登録した CalendarClient"""
+    return FakeServerCalendarClient(server, accounts, recurring_store)
+
+
+def _measure_parse(server: FakeCalendarServer, calendar_ids: List[str], accounts: int) -> float:
+    """取得済みのイベントの解析だけにかかる時間（ミリ秒、全アカウント分）"""
+    today = datetime.now().astimezone().replace(hour=0, minute=0, second=0, microsecond=0)
+    params = {'timeMin': today.isoformat(), 'timeMax': (today + timedelta(days=7)).isoformat(),
+              'orderBy': 'startTime', 'maxResults': '2500'}
+    pages = {calendar_id: server.backend.list_events(calendar_id, params, server.page_size)[1]['items']
+             for calendar_id in calendar_ids}
+    start = time.perf_counter()
+    for index in range(accounts):
+        for calendar_id, items in pages.items():
+            for _ in iter_parsed_events(items, calendar_id, account_id=f"account-{index}"):
+                pass
+    return (time.perf_counter() - start) * 1000
+
+
+def run_case(
+    accounts: int,
+    calendars: int,
+    events: int,
+    repeat: int,
+    latency_ms: float,
+    page_size: int,
+    recurring_store: bool = False
+) -> dict:
+    """
+    1ケースを計測
+
+    毎回新しい EventsCache で取得し（キャッシュヒットさせない）、初回を cold_ms として別に記録する。
+
+    Returns:
+        dict: ケースの結果
+    """
+    calendar_ids = ['primary'] + [f"calendar-{index}@group.calendar.google.com" for index in range(1, calendars)]
+    backend = FakeCalendarBackend.synthetic(calendar_ids, events)
+
+    with FakeCalendarServer(backend, latency_ms=latency_ms, page_size=page_size) as server, \
+            offline_client_settings(calendar_ids):
+        client = create_client(server, accounts, recurring_store)
+
+        def fetch_once():
+            client.events_cache = EventsCache()
+            server.reset_stats()
+            start = time.perf_counter()
+            fetched = client.get_all_events(days=7)
+            elapsed = (time.perf_counter() - start) * 1000
+            return elapsed, len(fetched), sum(server.requests.values()), server.bytes_sent
+
+        cold = fetch_once()
+        runs = [fetch_once() for _ in range(repeat)]
+        parse_ms = _measure_parse(server, calendar_ids, accounts)
+
+    return {
+        'median_ms': round(statistics.median(run[0] for run in runs), 3),
+        'min_ms': round(min(run[0] for run in runs), 3),
+        'cold_ms': round(cold[0], 3),
+        'events': runs[-1][1],
+        'requests': runs[-1][2],
+        'cold_requests': cold[2],
+        'bytes': runs[-1][3],
+        'parse_ms': round(parse_ms, 3),
+    }
+
+
+def run_benchmark(
+    account_counts: Iterable[int] = ACCOUNT_COUNTS,
+    calendar_counts: Iterable[int] = CALENDAR_COUNTS,
+    event_counts: Iterable[int] = EVENT_COUNTS,
+    repeat: int = 5,
+    latency_ms: float = 20,
+    page_size: int = 250,
+    recurring_store: bool = False
+) -> dict:
+    """
+    全ケースを計測
+
+    Returns:
+        dict: {'meta': 実行環境・条件, 'cases': {ケースID: 結果}}
+    """
+    cases = {}
+    for accounts in account_counts:
+        for calendars in calendar_counts:
+            for events in event_counts:
+                key = case_id(accounts, calendars, events)
+                cases[key] = run_case(accounts, calendars, events, repeat, latency_ms, page_size, recurring_store)
+                print(f"{key:<40} {cases[key]['median_ms']:>9.1f} ms  {cases[key]['requests']:>4} req", flush=True)
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'latency_ms': latency_ms,
+            'page_size': page_size,
+            'recurring_store': recurring_store,
+        },
+        'cases': cases,
+    }
+
+
+def _parse_ints(value: Optional[str], default: Iterable[int]) -> List[int]:
+    return [int(item) for item in value.split(',')] if value else list(default)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='予定取得のベンチマーク（ローカルの代替サーバーを使用）')
+    parser.add_argument('--accounts', help='アカウント数（カンマ区切り）')
+    parser.add_argument('--calendars', help='アカウントあたりのカレンダー数（カンマ区切り）')
+    parser.add_argument('--events', help='カレンダーあたりの1週間のイベント数（カンマ区切り）')
+    parser.add_argument('--latency-ms', type=float, default=20, help='1リクエストごとの応答遅延（ミリ秒）')
+    parser.add_argument('--page-size', type=int, default=250, help='1ページのイベント数')
+    parser.add_argument('--repeat', type=int, default=5, help='ケースごとの計測回数（初回を除く）')
+    parser.add_argument('--recurring-store', action='store_true', help='繰り返しイベントのローカル展開で計測')
+    parser.add_argument('--output', type=Path, help='結果を保存するJSONファイル')
+    parser.add_argument('--baseline', type=Path, help='比較するベースラインのJSONファイル')
+    parser.add_argument('--threshold', type=float, default=0.2, help='回帰とする悪化の割合（既定: 0.2 = 20%%）')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+
+    results = run_benchmark(
+        _parse_ints(args.accounts, ACCOUNT_COUNTS),
+        _parse_ints(args.calendars, CALENDAR_COUNTS),
+        _parse_ints(args.events, EVENT_COUNTS),
+        repeat=args.repeat,
+        latency_ms=args.latency_ms,
+        page_size=args.page_size,
+        recurring_store=args.recurring_store,
+    )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"結果を保存しました: {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions = compare_results(results, baseline, args.threshold)
+        for item in regressions:
+            print(f"回帰: {item['case']} {item['metric']} {item['baseline']} → {item['current']}（×{item['ratio']}）")
+        if regressions:
+            return 1
+        print(f"ベースラインからの回帰はありません（閾値 {args.threshold:.0%}）")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""
+メモリのソークテスト
+
+代替サーバー（fake_calendar_api）に接続した WallpaperService で更新を N 回続けて実行し、
+Pythonレベルの割り当て（tracemalloc）とRSSを記録する。
+ウォームアップ後からの増加・ピークが予算（MemoryBudget）を超えたら失敗とし、
+増加の大きい割り当て箇所（top allocators）を報告する。
+
+壁紙は実際には設定しない（WallpaperSetter の代わりに設定したパスを記録するだけ）。
+出力画像・キャッシュは一時ディレクトリに書き込み、accounts.json は読み込まない。
+
+使い方:
+    python -m benchmarks.memory_soak --cycles 300 --report soak.json
+"""
+import argparse
+import gc
+import json
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src import image_generator as image_generator_module
+from src.image_generator import ImageGenerator
+from src.metrics import peak_rss_bytes
+from src.output_store import OutputStore
+from src.viewmodels import wallpaper_service as wallpaper_service_module
+from src.viewmodels.wallpaper_service import WallpaperService
+from src.wallpaper_cache import WallpaperCache
+from benchmarks.fake_calendar_api import FakeCalendarBackend, FakeCalendarServer, to_api_item
+from benchmarks.fetch_benchmark import create_client, offline_client_settings
+from benchmarks.synthetic_events import generate_week_events
+
+MiB = 1024 * 1024
+
+
+@dataclass
+class MemoryBudget:
+    """
+    メモリの予算（バイト）
+
+    Args:
+        max_py_growth: ウォームアップ後からの tracemalloc の保持量の増加
+        max_py_peak: tracemalloc のピーク
+        max_rss_growth: ウォームアップ後からのRSSの増加
+        max_rss_peak: プロセスのピークRSS（Noneの場合は確認しない）
+    """
+    max_py_growth: int = 2 * MiB
+    max_py_peak: int = 64 * MiB
+    max_rss_growth: int = 64 * MiB
+    max_rss_peak: Optional[int] = None
+
+
+@dataclass
+class SoakResult:
+    """ソークテストの結果"""
+    cycles: int
+    elapsed_seconds: float
+    samples: List[Dict] = field(default_factory=list)  # [{'cycle', 'py_current', 'py_peak', 'rss'}]
+    py_growth: int = 0
+    py_peak: int = 0
+    rss_growth: Optional[int] = None
+    rss_peak: Optional[int] = None
+    top_allocators: List[Dict] = field(default_factory=list)  # [{'location', 'size_diff', 'count_diff'}]
+    violations: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    現在のRSS（バイト）
+
+    Linux のみ /proc/self/statm から取得し、それ以外はNone（ピークRSSのみ確認できる）。
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    import resource
+    return pages * resource.getpagesize()
+
+
+class RecordingSetter:
+    """壁紙を設定せず、設定したパスを記録するだけの WallpaperSetter の代わり"""
+
+    def __init__(self):
+        self.applied: List[Path] = []
+
+    def set_wallpaper(self, image_path: Path) -> bool:
+        self.applied = [Path(image_path)]
+        return True
+
+    def set_wallpapers(self, image_paths: List[Path]) -> bool:
+        self.applied = [Path(path) for path in image_paths]
+        return True
+
+    def applied_paths(self) -> List[Path]:
+        return list(self.applied)
+
+
+@contextmanager
+def soak_environment(server: FakeCalendarServer, calendar_ids: List[str], resolution: Tuple[int, int]):
+    """
+    代替サーバー・一時ディレクトリを使う WallpaperService を作成
+
+    出力先は一時ディレクトリにし、マルチディスプレイ描画は行わない（子プロセスのメモリは計測できないため）。
+
+    Yields:
+        WallpaperService: 計測対象のサービス
+    """
+    with ExitStack() as stack:
+        tmp = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix='calesk-soak-')))
+        stack.enter_context(offline_client_settings(calendar_ids))
+        saved = (image_generator_module.OUTPUT_DIR, wallpaper_service_module.MULTI_DISPLAY_RENDER)
+        image_generator_module.OUTPUT_DIR = tmp / 'output'
+        wallpaper_service_module.MULTI_DISPLAY_RENDER = False
+        try:
+            service = WallpaperService()
+            service.calendar_client = create_client(server, accounts=1)
+            service.image_generator = ImageGenerator(resolution=resolution)
+            service.wallpaper_setter = RecordingSetter()
+            service.wallpaper_cache = WallpaperCache(cache_dir=tmp / 'cache')
+            service.output_store = OutputStore(output_dir=tmp / 'output', wallpaper_cache=service.wallpaper_cache)
+            yield service
+        finally:
+            image_generator_module.OUTPUT_DIR, wallpaper_service_module.MULTI_DISPLAY_RENDER = saved
+
+
+def _update_cycle(service: WallpaperService, backend: FakeCalendarBackend, cycle: int,
+                  theme: str, time_only_every: int) -> None:
+    """
+    更新1回分
+
+    予定を1件更新してイベントキャッシュを無効化し、取得から描画・設定までを実行する。
+    time_only_every 回ごとに時刻のみの更新も実行する。
+    """
+    event = generate_week_events(1, seed=cycle)[0]
+    item = to_api_item(event)
+    item['id'] = f"soak-{cycle % 10}"  # 同じIDを使い回し、イベント数が増え続けないようにする
+    backend.upsert_event('primary', item)
+    service.calendar_client.invalidate_events_cache()
+    if not service.generate_and_set_wallpaper(theme):
+        raise RuntimeError(f"{cycle}回目の更新に失敗しました")
+    if time_only_every and cycle % time_only_every == 0:
+        service.refresh_time_only(theme)
+
+
+def _sample(cycle: int) -> Dict:
+    py_current, py_peak = tracemalloc.get_traced_memory()
+    return {'cycle': cycle, 'py_current': py_current, 'py_peak': py_peak, 'rss': current_rss_bytes()}
+
+
+def run_soak(
+    cycles: int = 200,
+    warmup: int = 5,
+    events: int = 100,
+    resolution: Tuple[int, int] = (1920, 1080),
+    theme: str = 'simple',
+    budget: Optional[MemoryBudget] = None,
+    sample_every: int = 10,
+    time_only_every: int = 5,
+    top: int = 15
+) -> SoakResult:
+    """
+    更新を続けて実行し、メモリの増加・ピークを予算と比較
+
+    Args:
+        cycles: 計測する更新回数（ウォームアップを除く）
+        warmup: 計測前に実行する更新回数（フォント・背景などの初回作成を除外）
+        events: 1週間のイベント数
+        resolution: 描画解像度
+        theme: テーマ名
+        budget: メモリの予算（省略時は MemoryBudget の既定値）
+        sample_every: 記録する間隔（更新回数）
+        time_only_every: 時刻のみの更新を挟む間隔（0で行わない）
+        top: 報告する割り当て箇所の数
+
+    Returns:
+        SoakResult: 結果（violations が空なら予算内）
+    """
+    budget = budget or MemoryBudget()
+    backend = FakeCalendarBackend.synthetic(['primary'], events)
+
+    with FakeCalendarServer(backend) as server, soak_environment(server, ['primary'], resolution) as service:
+        for cycle in range(warmup):
+            _update_cycle(service, backend, cycle, theme, time_only_every)
+
+        gc.collect()
+        tracemalloc.start(10)
+        try:
+            baseline = tracemalloc.take_snapshot()
+            baseline_py = tracemalloc.get_traced_memory()[0]
+            baseline_rss = current_rss_bytes()
+            result = SoakResult(cycles=cycles, elapsed_seconds=0.0, samples=[_sample(0)])
+            started = time.perf_counter()
+
+            for cycle in range(1, cycles + 1):
+                _update_cycle(service, backend, warmup + cycle, theme, time_only_every)
+                if cycle % sample_every == 0 or cycle == cycles:
+                    result.samples.append(_sample(cycle))
+
+            result.elapsed_seconds = round(time.perf_counter() - started, 3)
+            gc.collect()
+            final = tracemalloc.take_snapshot()
+            final_py, result.py_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    result.py_growth = final_py - baseline_py
+    final_rss = current_rss_bytes()
+    if baseline_rss is not None and final_rss is not None:
+        result.rss_growth = final_rss - baseline_rss
+    result.rss_peak = peak_rss_bytes()
+
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    stats = final.filter_traces(ignore).compare_to(baseline.filter_traces(ignore), 'lineno')
+    result.top_allocators = [
+        {'location': str(stat.traceback[0]), 'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+        for stat in stats[:top]
+    ]
+
+    result.violations = check_budget(result, budget)
+    return result
+
+
+def check_budget(result: SoakResult, budget: MemoryBudget) -> List[str]:
+    """
+    予算を超えた項目
+
+    Returns:
+        List[str]: 超過内容の説明（予算内なら空）
+    """
+    violations = []
+    if result.py_growth > budget.max_py_growth:
+        violations.append(f"Pythonの保持量が {result.py_growth / MiB:.1f}MiB 増加（予算 {budget.max_py_growth / MiB:.1f}MiB）")
+    if result.py_peak > budget.max_py_peak:
+        violations.append(f"Pythonの割り当てのピーク {result.py_peak / MiB:.1f}MiB（予算 {budget.max_py_peak / MiB:.1f}MiB）")
+    if result.rss_growth is not None and result.rss_growth > budget.max_rss_growth:
+        violations.append(f"RSSが {result.rss_growth / MiB:.1f}MiB 増加（予算 {budget.max_rss_growth / MiB:.1f}MiB）")
+    if budget.max_rss_peak is not None and result.rss_peak is not None and result.rss_peak > budget.max_rss_peak:
+        violations.append(f"ピークRSS {result.rss_peak / MiB:.1f}MiB（予算 {budget.max_rss_peak / MiB:.1f}MiB）")
+    return violations
+
+
+def format_report(result: SoakResult) -> str:
+    """結果を読みやすい文字列にする"""
+    lines = [
+        f"更新 {result.cycles}回 / {result.elapsed_seconds:.1f}秒",
+        f"Python: 増加 {result.py_growth / MiB:+.2f}MiB / ピーク {result.py_peak / MiB:.1f}MiB",
+    ]
+    if result.rss_growth is not None:
+        lines.append(f"RSS: 増加 {result.rss_growth / MiB:+.1f}MiB")
+    if result.rss_peak is not None:
+        lines.append(f"ピークRSS: {result.rss_peak / MiB:.1f}MiB")
+    lines.append("増加の大きい割り当て箇所:")
+    for item in result.top_allocators:
+        lines.append(f"  {item['size_diff'] / 1024:+9.1f}KiB {item['count_diff']:+6d}  {item['location']}")
+    lines += [f"予算超過: {violation}" for violation in result.violations] or ["予算内です"]
+    return '\n'.join(lines)
+
+
+def _parse_resolution(value: str) -> Tuple[int, int]:
+    width, height = value.lower().split('x')
+    return int(width), int(height)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    defaults = MemoryBudget()
+    parser = argparse.ArgumentParser(description='メモリのソークテスト（更新を続けて実行）')
+    parser.add_argument('--cycles', type=int, default=200, help='計測する更新回数')
+    parser.add_argument('--warmup', type=int, default=5, help='計測前の更新回数')
+    parser.add_argument('--events', type=int, default=100, help='1週間のイベント数')
+    parser.add_argument('--resolution', type=_parse_resolution, default=(1920, 1080), help='描画解像度（例: 1920x1080）')
+    parser.add_argument('--theme', default='simple', help='テーマ名')
+    parser.add_argument('--max-py-growth-mib', type=float, default=defaults.max_py_growth / MiB)
+    parser.add_argument('--max-py-peak-mib', type=float, default=defaults.max_py_peak / MiB)
+    parser.add_argument('--max-rss-growth-mib', type=float, default=defaults.max_rss_growth / MiB)
+    parser.add_argument('--max-rss-peak-mib', type=float, help='ピークRSSの予算（省略時は確認しない）')
+    parser.add_argument('--report', type=Path, help='結果を保存するJSONファイル')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+
+    budget = MemoryBudget(
+        max_py_growth=int(args.max_py_growth_mib * MiB),
+        max_py_peak=int(args.max_py_peak_mib * MiB),
+        max_rss_growth=int(args.max_rss_growth_mib * MiB),
+        max_rss_peak=int(args.max_rss_peak_mib * MiB) if args.max_rss_peak_mib else None,
+    )
+    result = run_soak(args.cycles, args.warmup, args.events, args.resolution, args.theme, budget)
+    print(format_report(result))
+
+    if args.report:
+        args.report.parent.mkdir(parents=True, exist_ok=True)
+        args.report.write_text(json.dumps(asdict(result), ensure_ascii=False, indent=2), encoding='utf-8')
+
+    return 0 if result.passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+壁紙描画のベンチマーク
+
+合成カレンダー（synthetic_events）の各シナリオを、全テーマ × 解像度（1080p / 1440p / 4K）×
+背景（グラデーション / 画像 / 画像+ガラス）で描画し、次の値を記録する。
+- 描画1回の所要時間（中央値・最小・初回）
+- 段階ごとの所要時間（背景・予定カード・週間カレンダー・エンコード、エフェクト）
+- Pythonレベルの割り当てのピーク（tracemalloc、NumPy配列を含む。Pillowの画像バッファは含まない）
+- プロセスのピークRSS（ケースを解像度の小さい順に実行するため、増加分はそのケースまでの最大値）
+
+結果はJSONで保存し、ベースラインと比較して閾値を超えて遅くなったケースがあれば終了コード1を返す。
+
+使い方:
+    python -m benchmarks.render_benchmark --quick --output results.json
+    python -m benchmarks.render_benchmark --baseline baseline.json --threshold 0.15
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import ChainMap
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import PIL
+
+from src import themes
+from src.config import BASE_DIR
+from src.image_generator import ImageGenerator
+from src.metrics import metrics, peak_rss_bytes
+from src.pipeline_progress import PipelineProgress
+from src.themes import DEFAULT_THEME
+from benchmarks.synthetic_events import SCENARIOS, generate_week_events, split_today
+
+RESOLUTIONS: Dict[str, tuple] = {
+    '1080p': (1920, 1080),
+    '1440p': (2560, 1440),
+    '4k': (3840, 2160),
+}
+
+BACKGROUNDS = ('gradient', 'image', 'glass')
+
+# 画像背景に使う同梱の背景画像
+BACKGROUND_IMAGE = BASE_DIR / 'backgrounds' / 'aurora.png'
+
+# グラデーションを持たないテーマで使う色
+_DEFAULT_GRADIENT = {'type': 'linear', 'colors': [(40, 60, 120), (200, 120, 160)], 'direction': 'vertical'}
+
+# この差（ミリ秒）未満の悪化は計測誤差として回帰にしない
+MIN_REGRESSION_DELTA_MS = 5.0
+
+
+def case_id(theme: str, resolution: str, background: str, scenario: str) -> str:
+    """ケースの識別子（結果JSONのキー）"""
+    return f"{theme}/{resolution}/{background}/{scenario}"
+
+
+def prepare_generator(theme: str, resolution: tuple, background: str) -> ImageGenerator:
+    """
+    テーマ・解像度・背景を設定した ImageGenerator を作成
+
+    Args:
+        theme: テーマ名
+        resolution: (幅, 高さ)
+        background: 'gradient' / 'image' / 'glass'
+    """
+    gen = ImageGenerator(resolution=resolution)
+    gen.set_theme(theme)
+    base = themes.get_theme(theme)
+    if background == 'gradient':
+        gradient = dict(base.get('background_gradient') or _DEFAULT_GRADIENT)
+        gradient.setdefault('colors', _DEFAULT_GRADIENT['colors'])
+        gradient['enabled'] = True
+        overrides = {'background_gradient': gradient, 'glass_effect': False}
+    else:
+        gen.set_background_image(BACKGROUND_IMAGE)
+        overrides = {
+            'background_gradient': {'enabled': False},
+            'glass_effect': background == 'glass',
+        }
+    gen.theme = ChainMap(overrides, base, DEFAULT_THEME)
+    return gen
+
+
+def _render_once(gen: ImageGenerator, today_events, week_events, output_path: Path) -> Dict[str, float]:
+    """1回描画し、合計と段階ごとの所要時間（ミリ秒）を返す"""
+    metrics.reset()
+    start = time.perf_counter()
+    result = gen.generate_wallpaper(today_events, week_events, output_path=output_path, progress=PipelineProgress())
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if result is None:
+        raise RuntimeError("壁紙の描画に失敗しました")
+    timings = {name: span['sum_ms'] for name, span in metrics.snapshot()['spans'].items()}
+    timings['total'] = elapsed_ms
+    return timings
+
+
+def run_case(
+    theme: str,
+    resolution: str,
+    background: str,
+    scenario: str,
+    repeat: int,
+    output_dir: Path,
+    measure_memory: bool = True
+) -> dict:
+    """
+    1ケースを計測
+
+    初回の描画（背景の読み込み・フォントの作成を含む）を cold_ms として別に記録し、
+    続く repeat 回の中央値・最小値を求める。
+
+    Returns:
+        dict: ケースの結果
+    """
+    gen = prepare_generator(theme, RESOLUTIONS[resolution], background)
+    week_events = generate_week_events(SCENARIOS[scenario])
+    today_events = split_today(week_events)
+    output_path = output_dir / 'benchmark.png'
+
+    # 段階ごとの所要時間は pipeline.*（背景〜エンコード）と render.effects.* のスパンから取得する
+    was_enabled = metrics.enabled
+    metrics.enabled = True
+    try:
+        cold = _render_once(gen, today_events, week_events, output_path)
+        runs = [_render_once(gen, today_events, week_events, output_path) for _ in range(repeat)]
+    finally:
+        metrics.enabled = was_enabled
+        metrics.reset()
+
+    stage_names = sorted({name for run in runs for name in run if name != 'total'})
+    result = {
+        'median_ms': round(statistics.median(run['total'] for run in runs), 3),
+        'min_ms': round(min(run['total'] for run in runs), 3),
+        'cold_ms': round(cold['total'], 3),
+        'stages_ms': {
+            name: round(statistics.median(run.get(name, 0.0) for run in runs), 3)
+            for name in stage_names
+        },
+        'events': len(week_events),
+    }
+
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            _render_once(gen, today_events, week_events, output_path)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result['py_alloc_peak_bytes'] = peak
+        result['py_alloc_retained_bytes'] = current
+
+    result['rss_peak_bytes'] = peak_rss_bytes()
+    gen.release_resources()
+    return result
+
+
+def run_benchmark(
+    theme_names: Iterable[str],
+    resolutions: Iterable[str],
+    backgrounds: Iterable[str],
+    scenarios: Iterable[str],
+    repeat: int = 3,
+    measure_memory: bool = True
+) -> dict:
+    """
+    全ケースを計測
+
+    Returns:
+        dict: {'meta': 実行環境, 'cases': {ケースID: 結果}}
+    """
+    cases = {}
+    with tempfile.TemporaryDirectory(prefix='calesk-bench-') as tmp:
+        # ピークRSSを解釈しやすいよう解像度の小さい順に実行
+        for resolution in sorted(resolutions, key=lambda r: RESOLUTIONS[r][0] * RESOLUTIONS[r][1]):
+            for theme in theme_names:
+                for background in backgrounds:
+                    for scenario in scenarios:
+                        key = case_id(theme, resolution, background, scenario)
+                        cases[key] = run_case(
+                            theme, resolution, background, scenario, repeat, Path(tmp), measure_memory
+                        )
+                        print(f"{key:<40} {cases[key]['median_ms']:>9.1f} ms", flush=True)
+
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pillow': PIL.__version__,
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'cases': cases,
+    }
+
+
+def compare_results(
+    current: dict,
+    baseline: dict,
+    threshold: float,
+    min_delta_ms: float = MIN_REGRESSION_DELTA_MS
+) -> List[dict]:
+    """
+    ベースラインと比較して回帰したケースを返す
+
+    中央値が baseline × (1 + threshold) を超え、かつ差が min_delta_ms 以上のケースを回帰とする。
+    Pythonレベルの割り当てのピークも同じ閾値で比較する。両方にあるケースのみ比較する。
+
+    Args:
+        current: 今回の結果
+        baseline: ベースラインの結果
+        threshold: 許容する悪化の割合（0.2 = 20%）
+        min_delta_ms: 回帰とする最小の差（ミリ秒）
+
+    Returns:
+        List[dict]: [{'case', 'metric', 'baseline', 'current', 'ratio'}, ...]
+    """
+    regressions = []
+    for key, result in current.get('cases', {}).items():
+        base = baseline.get('cases', {}).get(key)
+        if base is None:
+            continue
+        old, new = base.get('median_ms'), result.get('median_ms')
+        if old and new and new > old * (1 + threshold) and new - old >= min_delta_ms:
+            regressions.append({'case': key, 'metric': 'median_ms', 'baseline': old, 'current': new,
+                                'ratio': round(new / old, 3)})
+        old, new = base.get('py_alloc_peak_bytes'), result.get('py_alloc_peak_bytes')
+        if old and new and new > old * (1 + threshold):
+            regressions.append({'case': key, 'metric': 'py_alloc_peak_bytes', 'baseline': old, 'current': new,
+                                'ratio': round(new / old, 3)})
+    return regressions
+
+
+def _parse_list(value: Optional[str], choices: Iterable[str]) -> List[str]:
+    """カンマ区切りの指定を検証してリストにする（省略時はすべて）"""
+    choices = list(choices)
+    if not value:
+        return choices
+    items = [item.strip() for item in value.split(',') if item.strip()]
+    unknown = [item for item in items if item not in choices]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"不明な指定: {', '.join(unknown)}（選択肢: {', '.join(choices)}）")
+    return items
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='壁紙描画のベンチマーク')
+    parser.add_argument('--themes', help='テーマ（カンマ区切り、省略時はすべて）')
+    parser.add_argument('--resolutions', help=f"解像度（{', '.join(RESOLUTIONS)}）")
+    parser.add_argument('--backgrounds', help=f"背景（{', '.join(BACKGROUNDS)}）")
+    parser.add_argument('--scenarios', help=f"イベント数のシナリオ（{', '.join(SCENARIOS)}）")
+    parser.add_argument('--repeat', type=int, default=3, help='ケースごとの計測回数（初回を除く）')
+    parser.add_argument('--quick', action='store_true', help='1080p・typical/extreme のみ（短時間の確認用）')
+    parser.add_argument('--no-memory', action='store_true', help='tracemalloc による割り当ての計測を省略')
+    parser.add_argument('--output', type=Path, help='結果を保存するJSONファイル')
+    parser.add_argument('--baseline', type=Path, help='比較するベースラインのJSONファイル')
+    parser.add_argument('--threshold', type=float, default=0.2, help='回帰とする悪化の割合（既定: 0.2 = 20%%）')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+
+    try:
+        theme_names = _parse_list(args.themes, themes.list_themes())
+        resolutions = _parse_list(args.resolutions or ('1080p' if args.quick else None), RESOLUTIONS)
+        backgrounds = _parse_list(args.backgrounds, BACKGROUNDS)
+        scenarios = _parse_list(args.scenarios or ('typical,extreme' if args.quick else None), SCENARIOS)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    results = run_benchmark(theme_names, resolutions, backgrounds, scenarios, args.repeat, not args.no_memory)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"結果を保存しました: {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions = compare_results(results, baseline, args.threshold)
+        for item in regressions:
+            print(f"回帰: {item['case']} {item['metric']} {item['baseline']} → {item['current']}（×{item['ratio']}）")
+        if regressions:
+            return 1
+        print(f"ベースラインからの回帰はありません（閾値 {args.threshold:.0%}）")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+起動時間のベンチマーク
+
+GUI（run_gui.py が読み込む src.ui.main_window）と CLI（main.py）の import にかかる時間を
+`python -X importtime` で別プロセスごとに計測し、次の値を記録する。
+- import 全体の所要時間（中央値・最小）
+- 累積時間の大きいモジュール（上位のみ）
+- 起動時に読み込まないはずの重いモジュール（NumPy・PIL・Google API クライアント）のうち読み込まれたもの
+
+重いモジュールが読み込まれた場合、またはベースラインと比較して閾値を超えて遅くなった場合は
+終了コード1を返す。
+
+使い方:
+    python -m benchmarks.startup_benchmark --output startup.json
+    python -m benchmarks.startup_benchmark --baseline startup.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.config import BASE_DIR
+from benchmarks.render_benchmark import compare_results
+
+# 計測対象: 名前 → 実行する import 文
+TARGETS: Dict[str, str] = {
+    'gui': 'import src.ui.main_window',
+    'cli': 'import main',
+}
+
+# 起動時には読み込まず、最初の取得・描画（またはウォームアップ）まで遅らせるモジュール
+DEFERRED_MODULES = (
+    'numpy',
+    'PIL.Image',
+    'googleapiclient.discovery',
+    'google.auth.transport.requests',
+    'google_auth_oauthlib.flow',
+    'src.image_generator',
+    'http.server',
+)
+
+# 結果に残す累積時間の大きいモジュールの数
+TOP_MODULES = 15
+
+
+def parse_importtime(stderr: str) -> Dict[str, dict]:
+    """
+    `-X importtime` の出力をモジュールごとの時間にする
+
+    Returns:
+        Dict[str, dict]: {モジュール名: {'self_us', 'cumulative_us', 'depth'}}
+        （同じモジュールが複数回現れた場合は最初の読み込み）
+    """
+    modules: Dict[str, dict] = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # 見出し行
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        modules.setdefault(stripped, {
+            'self_us': int(fields[0]),
+            'cumulative_us': int(fields[1]),
+            'depth': (len(name) - len(stripped)) // 2,
+        })
+    return modules
+
+
+def measure_once(statement: str, cwd: Path = BASE_DIR) -> Dict[str, dict]:
+    """別プロセスで statement を実行し、import の時間を返す"""
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    env.pop('PYTHONPROFILEIMPORTTIME', None)
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=str(cwd), env=env, capture_output=True, text=True, check=False,
+    )
+    if completed.returncode != 0:
+        tail = '\n'.join(line for line in completed.stderr.splitlines() if not line.startswith('import time:'))
+        raise RuntimeError(f"import に失敗しました（{statement}）: {tail[-500:]}")
+    return parse_importtime(completed.stderr)
+
+
+def total_import_ms(modules: Dict[str, dict]) -> float:
+    """import 全体の所要時間（最上位のモジュールの累積時間の合計、ミリ秒）"""
+    return sum(info['cumulative_us'] for info in modules.values() if info['depth'] == 0) / 1000
+
+
+def _without(modules: Dict[str, dict], names: Iterable[str]) -> Dict[str, dict]:
+    names = set(names)
+    return {name: info for name, info in modules.items() if name not in names}
+
+
+def run_case(statement: str, repeat: int) -> dict:
+    """
+    1ケースを計測
+
+    初回はファイルシステムのキャッシュ・.pyc の作成を含むため計測から除く。
+    インタープリタ自体の起動で読み込むモジュール（site など）は時間に含めない。
+
+    Returns:
+        dict: ケースの結果
+    """
+    interpreter_modules = measure_once('pass')
+    measure_once(statement)
+    runs = [_without(measure_once(statement), interpreter_modules) for _ in range(repeat)]
+    totals = [total_import_ms(run) for run in runs]
+    last = runs[-1]
+    top = sorted(last.items(), key=lambda item: item[1]['cumulative_us'], reverse=True)[:TOP_MODULES]
+    return {
+        'median_ms': round(statistics.median(totals), 3),
+        'min_ms': round(min(totals), 3),
+        'modules': len(last),
+        'top_cumulative_ms': {name: round(info['cumulative_us'] / 1000, 3) for name, info in top},
+        'eager_heavy_modules': [name for name in DEFERRED_MODULES if name in last],
+    }
+
+
+def run_benchmark(targets: Iterable[str], repeat: int = 5) -> dict:
+    """
+    全ケースを計測
+
+    Returns:
+        dict: {'meta': 実行環境, 'cases': {ケース名: 結果}}
+    """
+    cases = {}
+    for name in targets:
+        cases[name] = run_case(TARGETS[name], repeat)
+        print(f"{name:<6} {cases[name]['median_ms']:>9.1f} ms  {cases[name]['modules']:>5} modules", flush=True)
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+        },
+        'cases': cases,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='起動時間（import）のベンチマーク')
+    parser.add_argument('--targets', help=f"計測対象（カンマ区切り: {', '.join(TARGETS)}）")
+    parser.add_argument('--repeat', type=int, default=5, help='ケースごとの計測回数（初回を除く）')
+    parser.add_argument('--output', type=Path, help='結果を保存するJSONファイル')
+    parser.add_argument('--baseline', type=Path, help='比較するベースラインのJSONファイル')
+    parser.add_argument('--threshold', type=float, default=0.2, help='回帰とする悪化の割合（既定: 0.2 = 20%%）')
+    args = parser.parse_args(argv)
+
+    targets = [item.strip() for item in args.targets.split(',')] if args.targets else list(TARGETS)
+    unknown = [item for item in targets if item not in TARGETS]
+    if unknown:
+        parser.error(f"不明な指定: {', '.join(unknown)}（選択肢: {', '.join(TARGETS)}）")
+
+    results = run_benchmark(targets, args.repeat)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"結果を保存しました: {args.output}")
+
+    failed = False
+    for name, result in results['cases'].items():
+        if result['eager_heavy_modules']:
+            print(f"起動時に読み込まれた重いモジュール（{name}）: {', '.join(result['eager_heavy_modules'])}")
+            failed = True
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        regressions = compare_results(results, baseline, args.threshold)
+        for item in regressions:
+            print(f"回帰: {item['case']} {item['metric']} {item['baseline']} → {item['current']}（×{item['ratio']}）")
+        if regressions:
+            failed = True
+        else:
+            print(f"ベースラインからの回帰はありません（閾値 {args.threshold:.0%}）")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
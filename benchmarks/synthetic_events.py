@@ -0,0 +1,100 @@
+"""
+ベンチマーク用の合成カレンダー
+
+乱数シードから再現可能な1週間分のイベントを生成する。
+通常の予定に加えて、重なり合う予定・複数日にまたがる予定・終日予定・
+週間カレンダーの表示時間帯（8:00〜22:00）外の予定を一定の割合で含める。
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from src.models.event import CalendarEvent
+
+# シナリオ名: 1週間のイベント数
+SCENARIOS: Dict[str, int] = {
+    'empty': 0,
+    'light': 15,
+    'typical': 60,
+    'busy': 150,
+    'extreme': 500,
+}
+
+_ACCOUNT_COLORS = ['#4285f4', '#34a853', '#fbbc05', '#ea4335']
+_TITLES = ['定例会議', '1on1', '設計レビュー', '顧客打ち合わせ', 'ランチ', '移動',
+           'Weekly Sync with the Platform Team', '締め切り', '勉強会', '歯医者']
+
+
+def generate_week_events(
+    count: int,
+    seed: int = 0,
+    start: Optional[date] = None
+) -> List[CalendarEvent]:
+    """
+    1週間分の合成イベントを生成
+
+    内訳（おおよそ）: 重なり合う予定 30% / 複数日 5% / 終日 5% / 表示時間帯外 10% / 残りは通常の予定
+
+    Args:
+        count: イベント数
+        seed: 乱数シード（同じ値なら同じイベント）
+        start: 週の初日（省略時は今日）
+
+    Returns:
+        List[CalendarEvent]: 開始日時順のイベント
+    """
+    rng = random.Random(seed)
+    start = start or datetime.now().date()
+    events: List[CalendarEvent] = []
+
+    for i in range(count):
+        day = start + timedelta(days=rng.randrange(7))
+        kind = rng.random()
+        is_all_day = False
+
+        if kind < 0.05:
+            # 終日
+            begin = datetime.combine(day, time())
+            end = begin + timedelta(days=1)
+            is_all_day = True
+        elif kind < 0.10:
+            # 複数日にまたがる予定
+            begin = datetime.combine(day, time(rng.randrange(8, 20)))
+            end = begin + timedelta(days=rng.randint(1, 3), hours=rng.randint(0, 4))
+        elif kind < 0.20:
+            # 表示時間帯外（早朝・深夜）
+            hour = rng.choice([0, 5, 6, 7, 22, 23])
+            begin = datetime.combine(day, time(hour, rng.choice([0, 30])))
+            end = begin + timedelta(minutes=rng.choice([30, 60, 90]))
+        elif kind < 0.50 and events:
+            # 直前の予定に重なる予定
+            base = events[-1]
+            begin = base.start_datetime + timedelta(minutes=rng.choice([0, 15, 30]))
+            end = begin + timedelta(minutes=rng.choice([30, 45, 60, 120]))
+        else:
+            begin = datetime.combine(day, time(rng.randrange(8, 21), rng.choice([0, 15, 30, 45])))
+            end = begin + timedelta(minutes=rng.choice([15, 30, 60, 90, 120]))
+
+        account = rng.randrange(len(_ACCOUNT_COLORS))
+        events.append(CalendarEvent(
+            id=f"synthetic-{seed}-{i}",
+            summary=f"{rng.choice(_TITLES)} #{i}",
+            start_datetime=begin,
+            end_datetime=end,
+            is_all_day=is_all_day,
+            calendar_id=f"calendar-{account}",
+            location=rng.choice(['', '', '会議室A', 'Zoom']),
+            color_id=str(rng.randint(1, 11)),
+            account_id=f"account-{account}",
+            account_color=_ACCOUNT_COLORS[account],
+            account_display_name=f"Account {account}",
+        ))
+
+    events.sort(key=lambda e: e.start_datetime)
+    return events
+
+
+def split_today(week_events: List[CalendarEvent], today: Optional[date] = None) -> List[CalendarEvent]:
+    """週間イベントのうち今日にかかるもの（WallpaperService と同じ条件）"""
+    today = today or datetime.now().date()
+    return [e for e in week_events if e.start_datetime.date() <= today <= e.end_datetime.date()]
@@ -2,6 +2,8 @@
 Calesk - メインプログラム
 Google Calendarの予定をデスクトップ壁紙として表示
 """
+import atexit
+import multiprocessing
 import sys
 import logging
 import argparse
@@ -11,11 +13,18 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.calendar_client import CalendarClient
-from src.image_generator import ImageGenerator
 from src.wallpaper_setter import WallpaperSetter
 from src.notifier import Notifier
 from src.scheduler import Scheduler
-from src.config import LOG_FILE, LOG_LEVEL
+from src.config import LOG_FILE, LOG_LEVEL, INSTANT_ON_STARTUP, THEME
+from src.events_cache import events_fingerprint
+from src.wallpaper_cache import WallpaperCache
+from src.output_store import OutputStore
+from src.metrics import metrics, configure_from_settings
+from src.lazy_import import LazyImport
+
+# 描画系（PIL・NumPy）は壁紙を生成するコマンドでのみ読み込む（--auth-only 等の起動を速くする）
+ImageGenerator = LazyImport('src.image_generator', 'ImageGenerator')
 
 
 def setup_logging(log_level: str = None) -> None:
@@ -55,29 +64,51 @@ def update_wallpaper() -> bool:
             return False
 
         # イベント取得
-        today_events = calendar_client.get_today_events()
-        week_events = calendar_client.get_week_events()
+        with metrics.span('calendar.fetch'):
+            today_events = calendar_client.get_today_events()
+            week_events = calendar_client.get_week_events()
 
         logging.info(f"今日の予定: {len(today_events)}件")
         logging.info(f"今週の予定: {len(week_events)}件")
 
-        # 画像生成
+        # 画像生成（前回の壁紙と同じ描画結果になるなら描画しない）
         generator = ImageGenerator()
-        image_path = generator.generate_wallpaper(today_events, week_events)
-
-        if not image_path:
-            logging.error("壁紙画像の生成に失敗しました")
-            return False
+        wallpaper_cache = WallpaperCache()
+        setter = WallpaperSetter()
+        image_path = _reuse_last_frame(wallpaper_cache, generator, today_events, week_events)
+        if image_path is None:
+            # 表示中の壁紙ファイルは上書きせず、A/Bのもう一方のスロットに書き込む
+            protected_paths = setter.applied_paths()
+            render_state = generator.render_state(today_events, week_events)
+            image_path = generator.generate_wallpaper(
+                today_events, week_events, protected_paths=protected_paths
+            )
+
+            if not image_path:
+                logging.error("壁紙画像の生成に失敗しました")
+                return False
+
+            # 次回の起動で復元できるよう、描画に使った予定も保存
+            wallpaper_cache.save_cache(wallpaper_path=image_path, theme=generator.theme_name)
+            wallpaper_cache.save_frame(image_path, week_events, render_state)
+
+            # 古い出力ファイルを削除（今回の出力・適用中・キャッシュ壁紙は保持）
+            try:
+                OutputStore(wallpaper_cache=wallpaper_cache).evict(
+                    current=[image_path], protected=protected_paths
+                )
+            except Exception as e:
+                logging.warning(f"出力ファイルの整理に失敗しました: {e}")
 
         # 壁紙設定
-        setter = WallpaperSetter()
-        if not setter.set_wallpaper(image_path):
+        with metrics.span('wallpaper.apply'):
+            applied = setter.set_wallpaper(image_path)
+        if not applied:
             logging.error("壁紙の設定に失敗しました")
             return False
 
-        # 更新通知
-        notifier = Notifier()
-        notifier.send_update_notification()
+        # 更新通知（送信キュー経由のため壁紙更新をブロックしない）
+        get_notifier().send_update_notification()
 
         logging.info("壁紙更新が完了しました")
         return True
@@ -85,6 +116,73 @@ def update_wallpaper() -> bool:
     except Exception as e:
         logging.error(f"壁紙更新でエラーが発生: {e}", exc_info=True)
         return False
+    finally:
+        # 更新1回分の計測をJSONLに出力（計測が無効なら何もしない）
+        metrics.flush()
+
+
+def _reuse_last_frame(wallpaper_cache: WallpaperCache, generator, today_events, week_events):
+    """
+    前回の壁紙と予定・描画状態が同じなら、その壁紙のパスを返す（描画を省く）
+
+    Returns:
+        Optional[Path]: 再利用できる壁紙のパス。描画し直す必要があればNone。
+    """
+    frame = wallpaper_cache.load_frame()
+    if frame is None or not frame.is_from_today():
+        return None
+    if events_fingerprint(week_events) != events_fingerprint(frame.week_events):
+        return None
+    if generator.render_state(today_events, week_events) != frame.render_state:
+        return None
+    logging.info("前回の壁紙と同じ内容のため、描画を省略しました")
+    return frame.wallpaper_path
+
+
+def restore_last_frame() -> bool:
+    """
+    前回の壁紙と予定を復元（デーモン起動直後、認証・予定の取得の前に呼ぶ）
+
+    今日・設定中のテーマで描画した壁紙なら適用したままにし（適用済みなら WallpaperSetter は何もしない）、
+    復元した今日の予定で通知を確認する。最新の予定での更新はこの後のスケジューラーの初回実行で行う。
+
+    Returns:
+        bool: 復元できた場合True
+    """
+    try:
+        frame = WallpaperCache().load_frame()
+        if frame is None or not frame.is_from_today() or frame.theme != THEME:
+            logging.info("復元できる今日の壁紙がありません")
+            return False
+
+        with metrics.span('wallpaper.apply'):
+            WallpaperSetter().set_wallpaper(frame.wallpaper_path)
+        get_notifier().check_upcoming_events(frame.today_events())
+        logging.info(f"前回の壁紙と予定を復元しました: {frame.wallpaper_path}（予定{len(frame.week_events)}件）")
+        return True
+
+    except Exception as e:
+        logging.warning(f"前回の壁紙の復元に失敗しました: {e}")
+        return False
+
+
+# 通知済みの記録・通知時刻のヒープ・送信キューを共有するため、プロセス内で1つだけ作成
+_notifier = None
+
+
+def get_notifier() -> Notifier:
+    """
+    プロセス共通のNotifierを取得
+
+    Returns:
+        Notifier: 通知送信インスタンス
+    """
+    global _notifier
+    if _notifier is None:
+        _notifier = Notifier.with_dispatcher()
+        # 終了時に送信待ちの通知を送ってからワーカーを止める
+        atexit.register(_notifier.dispatcher.stop)
+    return _notifier
 
 
 def check_notifications() -> None:
@@ -103,8 +201,7 @@ def check_notifications() -> None:
         today_events = calendar_client.get_today_events()
 
         # 通知チェック
-        notifier = Notifier()
-        notifier.check_upcoming_events(today_events)
+        get_notifier().check_upcoming_events(today_events)
 
     except Exception as e:
         logging.error(f"通知チェックでエラーが発生: {e}")
@@ -152,10 +249,16 @@ def run_daemon() -> None:
     """
     logging.info("デーモンモード: スケジューラーを起動します...")
 
+    # 前回の壁紙と予定を先に復元（更新はスケジューラーの初回実行で行い、変化があれば置き換える）
+    if INSTANT_ON_STARTUP:
+        restore_last_frame()
+
     # スケジューラーを初期化
     scheduler = Scheduler()
     scheduler.set_update_callback(update_wallpaper)
     scheduler.set_notification_callback(check_notifications)
+    notifier = get_notifier()
+    scheduler.set_notification_deadline(notifier.next_deadline, notifier.dispatch_due)
     scheduler.schedule_tasks()
 
     # スケジューラーを開始（ブロッキング）
@@ -193,12 +296,25 @@ def main() -> int:
         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
         help='ログレベルを指定'
     )
+    parser.add_argument(
+        '--metrics',
+        action='store_true',
+        help='段階ごとの所要時間などを計測してJSONLに出力'
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        help='計測値をPrometheus形式で公開するローカルポート（--metrics と併用）'
+    )
 
     args = parser.parse_args()
 
     # ログ設定
     setup_logging(args.log_level)
 
+    # 計測（--metrics 指定時または METRICS_ENABLED が True の場合）
+    configure_from_settings(enabled=args.metrics or None, http_port=args.metrics_port)
+
     try:
         # 認証のみ
         if args.auth:
@@ -228,4 +344,6 @@ def main() -> int:
 
 
 if __name__ == '__main__':
+    # PyInstaller 版でマルチディスプレイ描画の子プロセス（spawn）がデーモンを再起動しないようにする
+    multiprocessing.freeze_support()
     sys.exit(main())
@@ -2,15 +2,19 @@
 """
 GUIアプリケーション起動スクリプト
 """
+import multiprocessing
 import sys
 from pathlib import Path
 
 # プロジェクトルートをパスに追加
 sys.path.insert(0, str(Path(__file__).parent))
 
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QIcon
 from src.ui.main_window import MainWindow
+from src.display_info import get_topology_cache
+from src.metrics import configure_from_settings
 
 
 def _find_icon() -> str | None:
@@ -30,6 +34,12 @@ def main():
     app = QApplication(sys.argv)
     app.setApplicationName("Calesk")
 
+    # 計測（METRICS_ENABLED が False なら何もしない）
+    configure_from_settings()
+
+    # 画面の追加・削除・解像度変更時のみ解像度を再取得する
+    get_topology_cache().watch_qt_screens(app)
+
     icon_path = _find_icon()
     if icon_path:
         app.setWindowIcon(QIcon(icon_path))
@@ -37,8 +47,13 @@ def main():
     window = MainWindow()
     window.show()
 
+    # ウィンドウの表示後に Google API クライアント・描画系の読み込みをバックグラウンドで済ませる
+    QTimer.singleShot(0, window.viewmodel.warm_up)
+
     sys.exit(app.exec())
 
 
 if __name__ == '__main__':
+    # PyInstaller 版でマルチディスプレイ描画の子プロセス（spawn）がアプリを再起動しないようにする
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,158 @@
+"""
+壁紙出力ファイルのアトミック書き込み
+
+- 一時ファイルに書き込み → fsync → os.replace で差し替えるため、
+  読み手が書きかけのPNG（や起動時に読み込むスナップショット）を見ることはない
+- 壁紙はA/B 2つのスロットに交互に書き込む。パス単位で画像をキャッシュする
+  デスクトップ環境でも、設定のたびに新しいパスを渡すため確実に再読み込みされ、
+  表示中のファイルが上書きされることもない
+"""
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Optional, Tuple
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+SLOT_NAMES = ('a', 'b')
+
+
+def slot_paths(base_path: Path) -> Tuple[Path, Path]:
+    """
+    ベースパスに対応するA/Bスロットのパス
+
+    Args:
+        base_path: 例) output/wallpaper_simple_20260205.png
+
+    Returns:
+        Tuple[Path, Path]: (…_a.png, …_b.png)
+    """
+    return tuple(
+        base_path.with_name(f"{base_path.stem}_{slot}{base_path.suffix}")
+        for slot in SLOT_NAMES
+    )
+
+
+def next_slot_path(base_path: Path, avoid: Iterable[Optional[Path]] = ()) -> Path:
+    """
+    次に書き込むスロットを選択
+
+    avoid に含まれるスロット（表示中の壁紙）は選ばない。
+    どちらも選べる場合は、未作成または更新が古い方を選ぶ（交互に使用）。
+
+    Args:
+        base_path: スロットのベースパス
+        avoid: 書き込みを避けるパス（現在適用中の壁紙など）
+
+    Returns:
+        Path: 書き込み先スロットのパス
+    """
+    avoid_set = {Path(p).resolve() for p in avoid if p}
+    candidates = [p for p in slot_paths(base_path) if p.resolve() not in avoid_set]
+    if not candidates:
+        candidates = list(slot_paths(base_path))
+
+    def age_key(path: Path) -> int:
+        try:
+            return path.stat().st_mtime_ns
+        except OSError:
+            return -1
+
+    return min(candidates, key=age_key)
+
+
+def latest_slot_path(base_path: Path) -> Optional[Path]:
+    """
+    最後に書き込まれたスロットのパス
+
+    スロット導入前の形式（ベースパスそのもの）のファイルも候補に含める。
+
+    Args:
+        base_path: スロットのベースパス
+
+    Returns:
+        Optional[Path]: 最新のファイル。存在しない場合はNone。
+    """
+    latest = None
+    latest_mtime = -1
+    for path in (*slot_paths(base_path), base_path):
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            continue
+        if mtime > latest_mtime:
+            latest, latest_mtime = path, mtime
+    return latest
+
+
+def _fsync_directory(directory: Path) -> None:
+    """ディレクトリエントリ（rename結果）をディスクに反映（POSIXのみ）"""
+    if os.name != 'posix':
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_save_image(image: Image.Image, path: Path, **save_kwargs) -> Path:
+    """
+    画像を一時ファイルに保存してからアトミックに差し替える
+
+    Args:
+        image: 保存する画像
+        path: 保存先
+        **save_kwargs: Image.save に渡す追加引数
+
+    Returns:
+        Path: 保存先パス
+    """
+    image_format = save_kwargs.pop('format', None) or Image.registered_extensions().get(path.suffix.lower())
+    _atomic_write(path, lambda f: image.save(f, format=image_format, **save_kwargs))
+    logger.debug(f"画像をアトミックに保存しました: {path}")
+    return path
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = 'utf-8') -> Path:
+    """
+    テキストを一時ファイルに書き込んでからアトミックに差し替える
+
+    Args:
+        path: 保存先
+        text: 書き込む内容
+        encoding: 文字コード
+
+    Returns:
+        Path: 保存先パス
+    """
+    _atomic_write(path, lambda f: f.write(text.encode(encoding)))
+    return path
+
+
+def _atomic_write(path: Path, write: Callable[[BinaryIO], object]) -> None:
+    """一時ファイルに write で書き込み、fsync してから path に差し替える（失敗時は一時ファイルを削除）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.stem}.", suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+    _fsync_directory(path.parent)
@@ -2,25 +2,49 @@
 Google Calendar API連携モジュール
 OAuth2認証とカレンダーイベントの取得を担当
 """
+import json
 import os
-from dataclasses import replace
+import threading
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 import logging
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
-from .config import SCOPES, CREDENTIALS_PATH, TOKEN_PATH, CALENDAR_IDS, ACCOUNTS_CONFIG_PATH, CONFIG_DIR
+from .config import (
+    SCOPES, CREDENTIALS_PATH, TOKEN_PATH, CALENDAR_IDS, ACCOUNTS_CONFIG_PATH, CONFIG_DIR,
+    RECURRING_LOCAL_EXPANSION,
+)
+from .cancellation import CancellationToken, check_cancelled
 from .models.event import CalendarEvent
+from .pipeline_progress import PipelineProgress
+from .event_parser import parse_event, iter_parsed_events
+from .events_cache import EventsCache
+from .lazy_import import LazyImport, resolve
+from .metrics import metrics
+from .recurring_events import get_recurring_event_store
 from .security_utils import ensure_private_dir, secure_file_permissions
 
 logger = logging.getLogger(__name__)
 
+# google-auth / googleapiclient の読み込みは起動時間の大半を占めるため、最初の認証・取得まで遅らせる
+Request = LazyImport('google.auth.transport.requests', 'Request')
+Credentials = LazyImport('google.oauth2.credentials', 'Credentials')
+InstalledAppFlow = LazyImport('google_auth_oauthlib.flow', 'InstalledAppFlow')
+build = LazyImport('googleapiclient.discovery', 'build')
+
+
+def warm_up() -> None:
+    """
+    Google API クライアントのモジュールを先に読み込む
+
+    起動直後にバックグラウンドで呼び、最初の取得がモジュール読み込みを待たないようにする。
+    アカウントごとのサービスは取得に使う CalendarClient ごとに構築されるため、ここでは構築しない。
+    """
+    for lazy in (Credentials, Request, build):
+        resolve(lazy)
+
 
 def _mask_email(email: str) -> str:
     """メールアドレスをログ用にマスキング（例: t***@gmail.com）"""
@@ -55,17 +79,53 @@ def _secure_token_file(token_path: Path) -> None:
         secure_file_permissions(token_path)
 
 
+class _DeferredService:
+    """
+    最初に使われた時点で build() するCalendar APIサービス
+
+    discovery ドキュメントの解析はアカウントごとに数十ミリ秒かかるため、
+    load_accounts() ではサービスを構築せず、最初のAPI呼び出しまで遅らせる。
+    構築はスレッドセーフ（ワーカーから同時に使われても1回だけ構築する）。
+    """
+
+    def __init__(self, credentials):
+        self._credentials = credentials
+        self._service = None
+        self._lock = threading.Lock()
+
+    def resolve(self):
+        """サービスを構築して返す（2回目以降は構築済みのサービス）"""
+        service = self._service
+        if service is None:
+            with self._lock:
+                service = self._service
+                if service is None:
+                    service = self._service = build('calendar', 'v3', credentials=self._credentials)
+        return service
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+
 class CalendarClient:
     """Google Calendar APIクライアント"""
 
-    def __init__(self):
+    def __init__(self, events_cache: Optional[EventsCache] = None):
+        """
+        Args:
+            events_cache: 共有するイベントキャッシュ（省略時はインスタンス専用のキャッシュを作成）
+        """
         self.service = None
         self.creds = None
         self.accounts = {}  # {account_id: {'service': service, 'email': str, 'color': str, 'display_name': str}}
         self._expired_accounts = {}  # {account_id: {'email': str, ...}} トークン期限切れアカウント
         self._local_tz = datetime.now(timezone.utc).astimezone().tzinfo
-        self._events_cache: dict = {}  # {days: (monotonic_time, events)}
-        self._events_cache_ttl: int = 180  # キャッシュ有効期限（秒）
+        # 取得結果のキャッシュ（stale-while-revalidate、ワーカー間で共有可能）
+        self.events_cache = events_cache if events_cache is not None else EventsCache()
+        # 繰り返しマスターのキャッシュ（ローカル展開が有効な場合のみ、プロセス内で共有）
+        self._recurring_store = get_recurring_event_store() if RECURRING_LOCAL_EXPANSION else None
         # レガシー単一アカウントの色設定（accounts.jsonのlegacy_colorキーで永続化）
         self._legacy_color: str = "#4285f4"
         self._load_legacy_color()
@@ -183,12 +243,20 @@ class CalendarClient:
 
         logger.info("ログアウトしました")
 
-    def get_events(self, days: int = 7) -> List[CalendarEvent]:
+    def get_events(
+        self,
+        days: int = 7,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> List[CalendarEvent]:
         """
         指定された日数分のイベントを取得
 
         Args:
             days: 今日から何日後までのイベントを取得するか（デフォルト: 7日）
+            cancel_token: キャンセルトークン（ページ取得ごとに確認）
+
+        Raises:
+            OperationCancelled: キャンセルされた場合
 
         Returns:
             List[CalendarEvent]: イベント情報のリスト
@@ -203,8 +271,7 @@ class CalendarClient:
             today_start = datetime.combine(
                 datetime.now().date(), datetime.min.time(), tzinfo=local_tz
             )
-            time_min = today_start.isoformat()
-            time_max = (today_start + timedelta(days=days)).isoformat()
+            window_end = today_start + timedelta(days=days)
 
             all_events = []
 
@@ -212,19 +279,16 @@ class CalendarClient:
             for calendar_id in CALENDAR_IDS:
                 logger.info(f"カレンダー '{calendar_id}' からイベントを取得中...")
 
-                events = self._list_events_paginated(
-                    service=self.service,
-                    calendar_id=calendar_id,
-                    time_min=time_min,
-                    time_max=time_max
-                )
-
-                for event in events:
-                    event_info = self._parse_event(event, calendar_id)
-                    if event_info:
-                        all_events.append(event_info)
+                fetched = len(all_events)
+                for items in self._iter_window_pages(
+                    self.service, 'default', calendar_id, today_start, window_end,
+                    cancel_token=cancel_token
+                ):
+                    all_events.extend(
+                        iter_parsed_events(items, calendar_id, account_color=self._legacy_color)
+                    )
 
-                logger.info(f"  → {len(events)}件のイベントを取得")
+                logger.info(f"  → {len(all_events) - fetched}件のイベントを取得")
 
             # 開始時刻でソート
             all_events.sort(key=lambda x: x.start_datetime)
@@ -272,54 +336,34 @@ class CalendarClient:
             logger.error(f"レガシーアカウント色保存エラー: {e}")
             return False
 
-    def _parse_event(self, event: Dict, calendar_id: str) -> Optional[CalendarEvent]:
+    def _parse_event(
+        self,
+        event: Dict,
+        calendar_id: str,
+        account_id: str = 'default',
+        account_color: Optional[str] = None,
+        account_display_name: str = ''
+    ) -> Optional[CalendarEvent]:
         """
         イベント情報を解析して必要な情報を抽出
 
         Args:
             event: Google Calendar APIから取得したイベント
             calendar_id: カレンダーID
+            account_id: アカウントID（デフォルト: "default"）
+            account_color: アカウント色（Noneの場合はレガシーアカウント色）
+            account_display_name: アカウント表示名
 
         Returns:
             CalendarEvent: 整形されたイベント情報
         """
-        try:
-            # 開始時刻の取得
-            start = event['start'].get('dateTime', event['start'].get('date'))
-            end = event['end'].get('dateTime', event['end'].get('date'))
-
-            # 終日イベントの判定
-            is_all_day = 'date' in event['start']
-
-            # datetime オブジェクトに変換
-            if is_all_day:
-                start_dt = datetime.fromisoformat(start)
-                end_dt = datetime.fromisoformat(end)
-            else:
-                # タイムゾーン情報を含む場合は現地時間に変換
-                start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
-                # 現地時間に変換してタイムゾーン情報を削除
-                start_dt = start_dt.astimezone().replace(tzinfo=None)
-                end_dt = end_dt.astimezone().replace(tzinfo=None)
-
-            # CalendarEventオブジェクトを構築
-            return CalendarEvent(
-                id=event['id'],
-                summary=event.get('summary', '（タイトルなし）'),
-                start_datetime=start_dt,
-                end_datetime=end_dt,
-                is_all_day=is_all_day,
-                location=event.get('location', ''),
-                description=event.get('description', ''),
-                calendar_id=calendar_id,
-                color_id=event.get('colorId', '1'),  # デフォルトカラー
-                account_color=self._legacy_color,
-            )
-
-        except Exception as e:
-            logger.warning(f"イベント解析エラー ({event.get('summary', 'Unknown')}): {e}")
-            return None
+        return parse_event(
+            event,
+            calendar_id,
+            account_id=account_id,
+            account_color=account_color or self._legacy_color,
+            account_display_name=account_display_name,
+        )
 
     def get_today_events(self) -> List[CalendarEvent]:
         """
@@ -342,44 +386,34 @@ class CalendarClient:
             day_start = datetime.combine(today, datetime.min.time(), tzinfo=local_tz)
             day_end = datetime.combine(today + timedelta(days=1), datetime.min.time(), tzinfo=local_tz)
 
-            # ISO 8601形式に変換（タイムゾーンオフセット付き）
-            time_min = day_start.isoformat()
-            time_max = day_end.isoformat()
-
-            all_events = []
+            # 今日のイベントのみ残す（APIが範囲外を返す可能性への防御）
+            # 重なり判定: イベントが当日の時間帯と重なるかどうか
+            # - 前日開始・当日継続イベントも含める
+            # ページ単位で 解析 → フィルタ を行い、範囲外イベントは保持しない
+            day_start_naive = day_start.replace(tzinfo=None)
+            day_end_naive = day_end.replace(tzinfo=None)
+            today_events = []
 
             for calendar_id in CALENDAR_IDS:
                 logger.info(f"カレンダー '{calendar_id}' から今日のイベントを取得中...")
 
-                events = self._list_events_paginated(
-                    service=self.service,
-                    calendar_id=calendar_id,
-                    time_min=time_min,
-                    time_max=time_max
-                )
-                logger.debug(f"取得したイベント数: {len(events)}")
-
-                for event in events:
-                    event_info = self._parse_event(event, calendar_id)
-                    if event_info:
-                        all_events.append(event_info)
+                fetched = 0
+                for items in self._iter_window_pages(
+                    self.service, 'default', calendar_id, day_start, day_end
+                ):
+                    fetched += len(items)
+                    for event_info in iter_parsed_events(items, calendar_id, account_color=self._legacy_color):
+                        if not (event_info.start_datetime < day_end_naive
+                                and event_info.end_datetime > day_start_naive):
+                            continue
+                        today_events.append(event_info)
                         if event_info.is_all_day:
                             logger.debug(f"終日イベント: {event_info.summary}, 開始: {event_info.start_datetime}")
 
-                logger.info(f"  → {len(events)}件のイベントを取得")
+                logger.info(f"  → {fetched}件のイベントを取得")
 
             # 開始時刻でソート
-            all_events.sort(key=lambda x: x.start_datetime)
-
-            # 今日のイベントのみフィルタリング（APIが範囲外を返す可能性への防御）
-            # 重なり判定: イベントが当日の時間帯と重なるかどうか
-            # - 前日開始・当日継続イベントも含める
-            day_start_naive = day_start.replace(tzinfo=None)
-            day_end_naive = day_end.replace(tzinfo=None)
-            today_events = [
-                event for event in all_events
-                if event.start_datetime < day_end_naive and event.end_datetime > day_start_naive
-            ]
+            today_events.sort(key=lambda x: x.start_datetime)
 
             logger.info(f"今日のイベント: {len(today_events)}件")
             return today_events
@@ -391,28 +425,36 @@ class CalendarClient:
             logger.error(f"今日のイベント取得エラー: {e}")
             return []
 
-    def get_week_events(self) -> List[CalendarEvent]:
+    def get_week_events(self, cancel_token: Optional[CancellationToken] = None) -> List[CalendarEvent]:
         """
         今週（7日間）のイベントを取得
 
+        Args:
+            cancel_token: キャンセルトークン
+
         Returns:
             List[CalendarEvent]: 今週のイベント情報のリスト
         """
-        return self.get_events(days=7)
+        return self.get_events(days=7, cancel_token=cancel_token)
 
-    def _list_events_paginated(
+    def _iter_event_pages(
         self,
         service,
         calendar_id: str,
         time_min: str,
-        time_max: str
-    ) -> List[Dict]:
+        time_max: str,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Iterator[List[Dict]]:
         """
-        events().list(...).execute() をページネーション込みで実行する共通処理。
+        events().list(...).execute() をページ単位で逐次返すジェネレータ。
+
+        次のページは呼び出し側が前のページを消費してから取得するため、
+        生のレスポンスdictは1ページ分しか保持しない。
+        cancel_token がキャンセルされていれば、次のページを取得する前に打ち切る。
         """
-        events: List[Dict] = []
         page_token = None
         while True:
+            check_cancelled(cancel_token, f"カレンダー {calendar_id} のイベント取得")
             events_result = service.events().list(
                 calendarId=calendar_id,
                 timeMin=time_min,
@@ -421,12 +463,63 @@ class CalendarClient:
                 orderBy='startTime',
                 pageToken=page_token
             ).execute()
-            events.extend(events_result.get('items', []))
+            metrics.incr('calendar_api_calls')
+            if metrics.enabled:
+                # 受信サイズはクライアントから取れないため、応答をJSONに戻した長さで近似
+                metrics.incr('calendar_bytes_fetched', len(json.dumps(events_result, ensure_ascii=False).encode('utf-8')))
             page_token = events_result.get('nextPageToken')
+            items = events_result.get('items', [])
+            del events_result
+            yield items
             if not page_token:
                 break
+
+    def _list_events_paginated(
+        self,
+        service,
+        calendar_id: str,
+        time_min: str,
+        time_max: str
+    ) -> List[Dict]:
+        """
+        events().list(...).execute() をページネーション込みで実行する共通処理。
+        """
+        events: List[Dict] = []
+        for items in self._iter_event_pages(service, calendar_id, time_min, time_max):
+            events.extend(items)
         return events
 
+    def _iter_window_pages(
+        self,
+        service,
+        account_id: str,
+        calendar_id: str,
+        window_start: datetime,
+        window_end: datetime,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Iterator[List[Dict]]:
+        """
+        期間内のイベントをページ単位で返す
+
+        繰り返しイベントのローカル展開が有効な場合はキャッシュしたマスターから展開し、
+        展開できないカレンダーはAPIのサーバー展開（singleEvents=True）を使用する。
+        """
+        check_cancelled(cancel_token, f"カレンダー {calendar_id} のイベント取得")
+        store = getattr(self, '_recurring_store', None)
+        if store is not None:
+            items = store.window_items(service, account_id, calendar_id, window_start, window_end)
+            if items is not None:
+                yield items
+                return
+
+        yield from self._iter_event_pages(
+            service=service,
+            calendar_id=calendar_id,
+            time_min=window_start.isoformat(),
+            time_max=window_end.isoformat(),
+            cancel_token=cancel_token
+        )
+
     def _load_accounts_config(self) -> Dict:
         """
         accounts.json からアカウント設定を読み込む
@@ -640,6 +733,9 @@ class CalendarClient:
             config['accounts'] = [acc for acc in accounts if acc.get('id') != account_id]
             self._save_accounts_config(config)
             self.load_accounts()
+            store = getattr(self, '_recurring_store', None)
+            if store is not None:
+                store.drop_account(account_id)
 
             logger.info(f"アカウントを削除しました: {account_id}")
             return True
@@ -731,7 +827,7 @@ class CalendarClient:
 
     def load_accounts(self):
         """
-        accounts.jsonから有効なアカウントを読み込み、サービスインスタンスを初期化
+        accounts.jsonから有効なアカウントを読み込み、サービスを登録（構築は最初のAPI呼び出し時）
         """
         config = self._load_accounts_config()
         self.accounts = {}
@@ -787,8 +883,8 @@ class CalendarClient:
                         }
                         continue
 
-                # サービスを構築
-                service = build('calendar', 'v3', credentials=creds)
+                # サービスは最初のAPI呼び出しで構築する
+                service = _DeferredService(creds)
 
                 # アカウント情報を保存
                 self.accounts[account_id] = {
@@ -814,75 +910,118 @@ class CalendarClient:
         return list(self._expired_accounts.keys())
 
     def invalidate_events_cache(self) -> None:
-        """イベントキャッシュを強制クリア（手動更新・アカウント変更時に呼び出す）"""
-        self._events_cache.clear()
-        logger.debug("イベントキャッシュをクリアしました")
-
-    def get_all_events(self, days: int = 1) -> List[CalendarEvent]:
+        """イベントキャッシュを無効化（次回の取得でAPIから再取得）"""
+        cache = getattr(self, 'events_cache', None)
+        if cache is not None:
+            cache.invalidate()
+
+    def _events_cache_key(self, days: int) -> tuple:
+        """キャッシュキー（アカウント構成・日数・取得基準日）"""
+        accounts = tuple(sorted(
+            (account_id, info.get('color', ''), info.get('display_name', ''))
+            for account_id, info in list(self.accounts.items())
+        ))
+        return (accounts, days, datetime.now().date())
+
+    def get_all_events(
+        self,
+        days: int = 1,
+        cancel_token: Optional[CancellationToken] = None,
+        progress: Optional[PipelineProgress] = None
+    ) -> List[CalendarEvent]:
         """
         すべての有効なアカウントからイベントを取得して統合
 
-        TTLキャッシュ（デフォルト180秒）を使用し、同一引数での重複API呼び出しを抑制。
+        EventsCache を使用し、同一アカウント構成・同一引数での重複API呼び出しを抑制。
+        TTL切れ直後はキャッシュを即座に返し、バックグラウンドで再取得する。
 
         Args:
             days: 取得する日数（デフォルト: 1 = 今日のみ）
+            cancel_token: キャンセルトークン（ページ取得ごとに確認）
+            progress: 進捗の記録（アカウントごとに予定取得の途中経過を通知）
 
         Returns:
             List[CalendarEvent]: 統合されたイベント情報のリスト（時系列ソート済み）
+
+        Raises:
+            OperationCancelled: キャンセルされた場合
         """
-        import time
-        now = time.monotonic()
-        _cache = getattr(self, '_events_cache', None)
-        _ttl = getattr(self, '_events_cache_ttl', 180)
-        if _cache is not None and days in _cache:
-            cached_time, cached_events = _cache[days]
-            if now - cached_time < _ttl:
-                logger.debug(f"イベントキャッシュヒット: {len(cached_events)}件（残り{_ttl - (now - cached_time):.0f}秒）")
-                return cached_events
+        cache = getattr(self, 'events_cache', None)
+        with metrics.span('calendar.get_all_events'):
+            if cache is None:
+                return self._fetch_all_events(days, cancel_token, progress)
+            return cache.get(
+                self._events_cache_key(days),
+                lambda: self._fetch_all_events(days, cancel_token, progress),
+                cancel_token=cancel_token
+            )
 
-        all_events = []
+    def _fetch_all_events(
+        self,
+        days: int,
+        cancel_token: Optional[CancellationToken] = None,
+        progress: Optional[PipelineProgress] = None
+    ) -> List[CalendarEvent]:
+        """すべてのアカウントからイベントを取得してソート（キャッシュなし）"""
+        all_events = list(self.iter_all_events(days, cancel_token=cancel_token, progress=progress))
 
-        for account_id, account_data in self.accounts.items():
-            service = account_data['service']
-            color = account_data['color']
-            display_name = account_data['display_name']
+        # 時系列でソート
+        all_events.sort(key=lambda e: e.start_datetime)
 
+        logger.info(f"統合イベント取得: {len(all_events)}件（{len(self.accounts)}アカウント）")
+        return all_events
+
+    def iter_all_events(
+        self,
+        days: int = 1,
+        cancel_token: Optional[CancellationToken] = None,
+        progress: Optional[PipelineProgress] = None
+    ) -> Iterator[CalendarEvent]:
+        """
+        すべての有効なアカウントのイベントを取得順に逐次返す
+
+        ページ取得 → 解析 → 返却 をページ単位で行うため、
+        呼び出し側は残りのページ・カレンダーの取得完了を待たずに処理を開始できる。
+        キャッシュは使用せず、順序は取得順（ソートなし）。
+
+        Args:
+            days: 取得する日数（デフォルト: 1 = 今日のみ）
+            cancel_token: キャンセルトークン（ページ取得ごとに確認）
+            progress: 進捗の記録（アカウントの取得完了ごとに途中経過を通知）
+
+        Yields:
+            CalendarEvent: アカウント情報付きのイベント
+
+        Raises:
+            OperationCancelled: キャンセルされた場合
+        """
+        accounts = list(self.accounts.items())
+        for index, (account_id, account_data) in enumerate(accounts, start=1):
             try:
-                # このアカウントからイベントを取得
-                events = self._get_events_from_service(
-                    service,
+                yield from self._iter_events_from_service(
+                    account_data['service'],
                     account_id,
-                    color,
-                    display_name,
-                    days
+                    account_data['color'],
+                    account_data['display_name'],
+                    days,
+                    cancel_token=cancel_token
                 )
-                all_events.extend(events)
-
             except Exception as e:
                 logger.error(f"アカウント {account_id} からのイベント取得エラー: {e}")
-                continue
-
-        # 時系列でソート
-        all_events.sort(key=lambda e: e.start_datetime)
-
-        # キャッシュに保存
-        if not hasattr(self, '_events_cache'):
-            self._events_cache = {}
-        self._events_cache[days] = (now, all_events)
-
-        logger.info(f"統合イベント取得: {len(all_events)}件（{len(self.accounts)}アカウント）")
-        return all_events
+            if progress is not None:
+                progress.advance('fetch', index / len(accounts))
 
-    def _get_events_from_service(
+    def _iter_events_from_service(
         self,
         service,
         account_id: str,
         account_color: str,
         account_display_name: str,
-        days: int = 1
-    ) -> List[CalendarEvent]:
+        days: int = 1,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Iterator[CalendarEvent]:
         """
-        1つのサービスインスタンスからイベントを取得
+        1つのサービスインスタンスからイベントをページ単位で取得して逐次返す
 
         Args:
             service: Google Calendar APIサービスインスタンス
@@ -890,12 +1029,11 @@ class CalendarClient:
             account_color: アカウント色
             account_display_name: アカウント表示名
             days: 取得する日数
+            cancel_token: キャンセルトークン（ページ取得ごとに確認）
 
-        Returns:
-            List[CalendarEvent]: イベント情報のリスト
+        Yields:
+            CalendarEvent: アカウント情報付きのイベント
         """
-        all_events = []
-
         # 日時範囲を設定（ローカルタイムゾーン基準）
         today = datetime.now().date()
         local_tz = self._local_tz
@@ -904,26 +1042,18 @@ class CalendarClient:
 
         for calendar_id in CALENDAR_IDS:
             try:
-                items = self._list_events_paginated(
-                    service=service,
-                    calendar_id=calendar_id,
-                    time_min=day_start.isoformat(),
-                    time_max=day_end.isoformat()
-                )
-
-                for item in items:
-                    # イベントをパース
-                    event = self._parse_event(item, calendar_id)
-
-                    if event:
-                        # アカウント情報を付与（dataclassは不変なので新しいインスタンスを作成）
-                        event = replace(
-                            event,
-                            account_id=account_id,
-                            account_color=account_color,
-                            account_display_name=account_display_name
-                        )
-                        all_events.append(event)
+                for items in self._iter_window_pages(
+                    service, account_id, calendar_id, day_start, day_end,
+                    cancel_token=cancel_token
+                ):
+                    # アカウント情報を解析時に渡し、イベントを1回の生成で完成させる
+                    yield from iter_parsed_events(
+                        items,
+                        calendar_id,
+                        account_id=account_id,
+                        account_color=account_color,
+                        account_display_name=account_display_name
+                    )
 
             except HttpError as error:
                 logger.error(f"カレンダー {calendar_id} のAPIエラー: {error}")
@@ -932,4 +1062,27 @@ class CalendarClient:
                 logger.error(f"カレンダー {calendar_id} のイベント取得エラー: {e}")
                 continue
 
-        return all_events
+    def _get_events_from_service(
+        self,
+        service,
+        account_id: str,
+        account_color: str,
+        account_display_name: str,
+        days: int = 1
+    ) -> List[CalendarEvent]:
+        """
+        1つのサービスインスタンスからイベントを取得
+
+        Args:
+            service: Google Calendar APIサービスインスタンス
+            account_id: アカウントID
+            account_color: アカウント色
+            account_display_name: アカウント表示名
+            days: 取得する日数
+
+        Returns:
+            List[CalendarEvent]: イベント情報のリスト
+        """
+        return list(self._iter_events_from_service(
+            service, account_id, account_color, account_display_name, days
+        ))
@@ -0,0 +1,64 @@
+"""
+協調的キャンセル
+
+ワーカーの cancel() で CancellationToken をキャンセルし、予定の取得（ページ・カレンダーごと）や
+描画の各段階（背景・予定カード・週間カレンダー・エンコード）の区切りで確認して途中で打ち切る。
+プレビューのテーマを次々に切り替えた場合に、古いプレビューの取得・描画を最後まで実行しない。
+"""
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class OperationCancelled(BaseException):
+    """
+    処理がキャンセルされた
+
+    予定取得や描画の途中にある `except Exception` で握りつぶされないよう、
+    asyncio.CancelledError と同じく BaseException を継承する。
+    """
+
+
+class CancellationToken:
+    """
+    キャンセル要求を伝えるトークン（スレッドセーフ）
+
+    要求側が cancel() を呼び、処理側が区切りごとに raise_if_cancelled() で確認する。
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        """キャンセルを要求"""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """キャンセルが要求されているか"""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self, stage: str = "") -> None:
+        """
+        キャンセルが要求されていれば OperationCancelled を送出
+
+        Args:
+            stage: 処理の段階（ログ用）
+        """
+        if self._event.is_set():
+            logger.info(f"処理をキャンセルしました: {stage}" if stage else "処理をキャンセルしました")
+            raise OperationCancelled(stage)
+
+
+def check_cancelled(token: Optional[CancellationToken], stage: str = "") -> None:
+    """
+    トークンが指定されていればキャンセルを確認（None の場合は何もしない）
+
+    Args:
+        token: キャンセルトークン
+        stage: 処理の段階（ログ用）
+    """
+    if token is not None:
+        token.raise_if_cancelled(stage)
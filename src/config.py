@@ -31,6 +31,13 @@ WALLPAPER_TARGET_DESKTOP = 1
 # 解像度の自動検出（True推奨）
 AUTO_DETECT_RESOLUTION = True
 
+# ディスプレイごとの解像度で壁紙を生成（WALLPAPER_TARGET_DESKTOP = 0 のときのみ有効）
+# 同じ解像度のディスプレイは1枚を共有し、異なる解像度は別プロセスで並列に描画する
+MULTI_DISPLAY_RENDER = False
+
+# 並列描画のプロセス数上限（None = CPUコア数）
+MULTI_DISPLAY_MAX_WORKERS = None
+
 # === フォント設定 ===
 # システムにインストールされている日本語フォントのパスを指定
 # 見つからない場合はデフォルトフォントが使用されます
@@ -105,6 +112,19 @@ else:
 # 複数アカウント設定ファイルパス
 ACCOUNTS_CONFIG_PATH = CONFIG_DIR / 'accounts.json'
 
+# 適用済み壁紙の記録（内容が同じ壁紙の再設定をスキップするため、ディスプレイごとに保存）
+APPLIED_WALLPAPER_STATE_PATH = CONFIG_DIR / 'applied_wallpapers.json'
+
+# 通知済みイベントの記録（再起動後の再通知を防ぐため、イベントID + 開始時刻で保存）
+NOTIFIED_EVENTS_STATE_PATH = CONFIG_DIR / 'notified_events.json'
+
+# 繰り返しイベントのローカル展開
+# True: 繰り返しマスター（singleEvents=False）を一度取得してキャッシュし、
+#       RRULEをローカルで展開する（以降はsyncTokenで差分のみ取得）
+# False: 毎回APIに展開済みインスタンス（singleEvents=True）を要求する
+RECURRING_LOCAL_EXPANSION = False
+RECURRING_FULL_SYNC_HOURS = 24  # 繰り返しマスターを全件同期し直す間隔（時間）
+
 # カレンダーID（複数指定可能）
 # 'primary'は主カレンダー、その他のカレンダーIDも追加可能
 CALENDAR_IDS = [
@@ -116,12 +136,29 @@ CALENDAR_IDS = [
 OUTPUT_DIR = BASE_DIR / 'output'
 WALLPAPER_FILENAME_TEMPLATE = 'wallpaper_{theme}_{date}.png'
 
+# プレビュー画像の最大サイズ（プレビュー表示の最大サイズと同じ）
+# 描画後にこのサイズへ縮小してから保存する（フル解像度のPNGエンコードを省く）
+PREVIEW_RENDER_SIZE = (640, 360)
+
+# テーマの先読みプレビュー（プレビュー表示後、他のテーマを低優先度で描画しておく）
+PREVIEW_PRERENDER_ENABLED = True
+PREVIEW_PRERENDER_DELAY_MS = 1000  # プレビュー表示から先読み開始までの待ち時間（ミリ秒）
+PREVIEW_FRAME_CACHE_SIZE = 8  # 保持する先読みプレビューの件数
+PREVIEW_FRAME_MAX_AGE_SECONDS = 300  # 先読みプレビューを使用できる時間（秒、時刻表示が古くならないよう）
+
+# 出力ファイルの保持ポリシー（現在の壁紙・キャッシュ壁紙は常に保持）
+OUTPUT_KEEP_PREVIOUS = 4  # 現在の壁紙以外に必ず残す直近のファイル数
+OUTPUT_MAX_AGE_DAYS = 7  # これより古いファイルは削除（直近N件を除く）
+OUTPUT_MAX_BYTES = 200 * 1024 * 1024  # 出力ディレクトリの合計サイズ上限（200MB）
+
 # === スケジュール設定 ===
 # 壁紙更新時刻（24時間形式）
 UPDATE_TIME = '06:00'
 
 # 通知設定
 NOTIFICATION_ADVANCE_MINUTES = 30  # 予定開始何分前に通知するか
+NOTIFICATION_COALESCE_SECONDS = 2.0  # この時間内に届いた同じ開始時刻の通知は1つにまとめる
+NOTIFICATION_QUEUE_SIZE = 32  # 送信待ち通知の上限（超えたら古いものから破棄）
 
 # === レイアウト設定 ===
 # 余白とレイアウト
@@ -241,6 +278,23 @@ SLEEP_WAKE_THRESHOLD_SECONDS = 120  # スリープ復帰と判定する閾値（
 # === 現在時刻インジケーター更新設定 ===
 TIME_INDICATOR_REFRESH_MINUTES = 5  # 週間カレンダーの「現在時刻ライン」を更新する間隔（分）
 
+# === 起動時の復元設定 ===
+# 起動直後に前回の壁紙と予定を復元して表示し（同じ日なら適用したまま）、
+# バックグラウンドの更新で描画結果が変わる場合のみ置き換える
+INSTANT_ON_STARTUP = True
+
+# === 更新リクエストのまとめ設定 ===
+# 同等以上の更新を開始してからこの秒数以内の自動リクエスト（タイマー・スリープ復帰）は実行しない
+UPDATE_COALESCE_SECONDS = 30
+
+# === 計測設定 ===
+# 有効にすると壁紙生成の段階ごとの所要時間・API呼び出し回数などを記録する（無効時はほぼコストなし）
+METRICS_ENABLED = False  # main.py の --metrics でも有効にできる
+METRICS_EXPORT_PATH = CONFIG_DIR / 'metrics.jsonl'  # 更新ごとに1行追記
+METRICS_EXPORT_MAX_BYTES = 1024 * 1024  # ローテーションするファイルサイズ（バイト）
+METRICS_EXPORT_BACKUP_COUNT = 3  # 残す世代数
+METRICS_HTTP_PORT = 0  # Prometheus形式で公開するローカルポート（0 = 公開しない）
+
 # === ログ設定 ===
 LOG_LEVEL = 'INFO'
 if getattr(sys, 'frozen', False):
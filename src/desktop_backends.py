@@ -0,0 +1,378 @@
+"""
+Linuxデスクトップ環境の壁紙設定バックエンド
+
+デスクトップ環境の判定と、使えるバックエンドの選択はプロセス内で1回だけ行い、
+成功したバックエンドを以降の適用で使い続ける（失敗した場合のみ選び直す）。
+
+バックエンド（優先順はデスクトップ環境に応じて変更）:
+- gnome-gio:       Gio.Settings（PyGObject）で GSettings に直接書き込む（常駐接続）
+- gnome-gsettings: gsettings コマンド（サブプロセス）
+- kde-dbus:        QtDBus のセッションバス接続で plasmashell の evaluateScript を呼ぶ（常駐接続）
+- kde-qdbus:       qdbus コマンド（サブプロセス）
+
+適用にかかった時間はバックエンドごとに集計する。
+"""
+import logging
+import os
+from abc import ABC, abstractmethod
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PLASMA_SERVICE = 'org.kde.plasmashell'
+PLASMA_PATH = '/PlasmaShell'
+PLASMA_INTERFACE = 'org.kde.PlasmaShell'
+GNOME_BACKGROUND_SCHEMA = 'org.gnome.desktop.background'
+
+# D-Bus呼び出しのタイムアウト（ミリ秒）
+DBUS_TIMEOUT_MS = 5000
+
+
+def escape_script_string(value: str) -> str:
+    """JavaScript/QMLの文字列リテラル用にエスケープ（インジェクション防止）"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def kde_wallpaper_script(image_path: Path) -> str:
+    """全デスクトップに同じ画像を設定するPlasmaスクリプト"""
+    safe_kde_path = escape_script_string(str(image_path))
+    return f'''
+                        var allDesktops = desktops();
+                        for (i=0;i<allDesktops.length;i++) {{
+                            d = allDesktops[i];
+                            d.wallpaperPlugin = "org.kde.image";
+                            d.currentConfigGroup = Array("Wallpaper", "org.kde.image", "General");
+                            d.writeConfig("Image", "file://{safe_kde_path}");
+                        }}
+                        '''
+
+
+def kde_per_screen_script(image_paths: List[Path]) -> str:
+    """スクリーン番号ごとに画像を設定するPlasmaスクリプト"""
+    images = ", ".join(f'"file://{escape_script_string(str(p))}"' for p in image_paths)
+    return f'''
+                    var images = [{images}];
+                    var allDesktops = desktops();
+                    for (i=0;i<allDesktops.length;i++) {{
+                        d = allDesktops[i];
+                        var image = images[Math.min(Math.max(d.screen, 0), images.length - 1)];
+                        d.wallpaperPlugin = "org.kde.image";
+                        d.currentConfigGroup = Array("Wallpaper", "org.kde.image", "General");
+                        d.writeConfig("Image", image);
+                    }}
+                    '''
+
+
+def detect_desktop_environment() -> str:
+    """
+    デスクトップ環境を判定
+
+    Returns:
+        str: 'kde' / 'gnome' / 'unknown'
+    """
+    desktop = ' '.join(
+        os.environ.get(name, '') for name in ('XDG_CURRENT_DESKTOP', 'DESKTOP_SESSION')
+    ).lower()
+    if 'kde' in desktop or 'plasma' in desktop:
+        return 'kde'
+    if any(name in desktop for name in ('gnome', 'unity', 'ubuntu', 'budgie', 'pantheon', 'cinnamon')):
+        return 'gnome'
+    return 'unknown'
+
+
+class WallpaperBackend(ABC):
+    """壁紙設定バックエンドの基底クラス"""
+
+    name = ''
+    desktop = ''
+    # 常駐接続を持つバックエンド（利用可否を事前に確認できる）
+    persistent = False
+
+    def is_available(self) -> bool:
+        """利用可能か（サブプロセス系は実行してみるまで分からないためTrue）"""
+        return True
+
+    @abstractmethod
+    def apply(self, image_path: Path) -> bool:
+        """壁紙を設定（失敗時は例外またはFalse）"""
+
+
+class KdeScriptBackend(WallpaperBackend):
+    """Plasmaスクリプトを実行できるバックエンド"""
+
+    desktop = 'kde'
+
+    @abstractmethod
+    def evaluate_script(self, script: str) -> bool:
+        """Plasmaスクリプトを実行（失敗時は例外またはFalse）"""
+
+    def apply(self, image_path: Path) -> bool:
+        return self.evaluate_script(kde_wallpaper_script(image_path))
+
+
+class GioSettingsBackend(WallpaperBackend):
+    """Gio.Settings で GSettings に直接書き込む（gsettings プロセスを起動しない）"""
+
+    name = 'gnome-gio'
+    desktop = 'gnome'
+    persistent = True
+
+    def __init__(self):
+        self._settings = None
+        self._checked = False
+
+    def is_available(self) -> bool:
+        if not self._checked:
+            self._checked = True
+            try:
+                import gi
+                gi.require_version('Gio', '2.0')
+                from gi.repository import Gio
+                source = Gio.SettingsSchemaSource.get_default()
+                if source is not None and source.lookup(GNOME_BACKGROUND_SCHEMA, True) is not None:
+                    self._settings = Gio.Settings.new(GNOME_BACKGROUND_SCHEMA)
+            except Exception as e:
+                logger.debug(f"Gio.Settings を利用できません: {e}")
+        return self._settings is not None
+
+    def apply(self, image_path: Path) -> bool:
+        from gi.repository import Gio
+        if not self._settings.set_string('picture-uri', f'file://{image_path}'):
+            return False
+        Gio.Settings.sync()
+        return True
+
+
+class GsettingsCommandBackend(WallpaperBackend):
+    """gsettings コマンドで設定"""
+
+    name = 'gnome-gsettings'
+    desktop = 'gnome'
+
+    def apply(self, image_path: Path) -> bool:
+        subprocess.run(
+            [
+                'gsettings', 'set',
+                GNOME_BACKGROUND_SCHEMA, 'picture-uri',
+                f'file://{image_path}'
+            ],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return True
+
+
+class QtDbusPlasmaBackend(KdeScriptBackend):
+    """
+    QtDBus の常駐接続で plasmashell を呼び出す
+
+    Args:
+        bus_address: 接続するバスのアドレス（省略時はセッションバス）
+    """
+
+    name = 'kde-dbus'
+    persistent = True
+
+    def __init__(self, bus_address: Optional[str] = None):
+        self._bus_address = bus_address
+        self._connection = None
+
+    def _get_connection(self):
+        if self._connection is None:
+            from PyQt6.QtCore import QCoreApplication
+            from PyQt6.QtDBus import QDBusConnection
+            # QtDBus はアプリケーションオブジェクトが必要（CLI実行時は使わない）
+            if QCoreApplication.instance() is None:
+                return None
+            if self._bus_address:
+                self._connection = QDBusConnection.connectToBus(self._bus_address, f'calesk-wallpaper:{self._bus_address}')
+            else:
+                self._connection = QDBusConnection.sessionBus()
+        return self._connection
+
+    def is_available(self) -> bool:
+        try:
+            connection = self._get_connection()
+            if connection is None or not connection.isConnected():
+                return False
+            registered = connection.interface().isServiceRegistered(PLASMA_SERVICE)
+            return bool(registered.value())
+        except Exception as e:
+            logger.debug(f"QtDBus を利用できません: {e}")
+            return False
+
+    def evaluate_script(self, script: str) -> bool:
+        from PyQt6.QtDBus import QDBusMessage
+        connection = self._get_connection()
+        if connection is None:
+            return False
+        message = QDBusMessage.createMethodCall(PLASMA_SERVICE, PLASMA_PATH, PLASMA_INTERFACE, 'evaluateScript')
+        message.setArguments([script])
+        reply = connection.call(message, timeout=DBUS_TIMEOUT_MS)
+        if reply.type() == QDBusMessage.MessageType.ErrorMessage:
+            logger.warning(f"plasmashell の呼び出しに失敗: {reply.errorMessage()}")
+            return False
+        return True
+
+
+class QdbusCommandBackend(KdeScriptBackend):
+    """qdbus コマンドで plasmashell を呼び出す"""
+
+    name = 'kde-qdbus'
+
+    def evaluate_script(self, script: str) -> bool:
+        subprocess.run(
+            [
+                'qdbus', PLASMA_SERVICE, PLASMA_PATH,
+                f'{PLASMA_INTERFACE}.evaluateScript',
+                script
+            ],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return True
+
+
+def default_backends() -> List[WallpaperBackend]:
+    """標準のバックエンド一覧（GNOME優先の順）"""
+    return [
+        GioSettingsBackend(),
+        GsettingsCommandBackend(),
+        QtDbusPlasmaBackend(),
+        QdbusCommandBackend(),
+    ]
+
+
+class LinuxWallpaperBackends:
+    """
+    Linuxの壁紙設定バックエンドの選択と実行
+
+    Args:
+        backends: 候補のバックエンド（省略時は default_backends()）
+        desktop: デスクトップ環境（省略時は環境変数から判定）
+    """
+
+    def __init__(self, backends: Optional[List[WallpaperBackend]] = None, desktop: Optional[str] = None):
+        self.desktop = desktop or detect_desktop_environment()
+        candidates = backends if backends is not None else default_backends()
+        # 判定したデスクトップ環境のバックエンドを優先（同じ環境内では常駐接続を優先）
+        self.backends = sorted(candidates, key=lambda b: b.desktop != self.desktop)
+        self._active: Optional[WallpaperBackend] = None
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = {}
+        logger.info(f"デスクトップ環境: {self.desktop}（候補: {', '.join(b.name for b in self.backends)}）")
+
+    @property
+    def active_backend(self) -> Optional[str]:
+        """現在使用中のバックエンド名"""
+        return self._active.name if self._active else None
+
+    def _run(self, backend: WallpaperBackend, action) -> bool:
+        """バックエンドを実行して所要時間を集計"""
+        stats = self.stats.setdefault(
+            backend.name, {'calls': 0, 'failures': 0, 'total_seconds': 0.0, 'last_seconds': 0.0}
+        )
+        started = time.perf_counter()
+        try:
+            ok = bool(action())
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"壁紙設定失敗 ({backend.name}): {e.stderr}")
+            ok = False
+        except Exception as e:
+            logger.warning(f"壁紙設定失敗 ({backend.name}): {e}")
+            ok = False
+        elapsed = time.perf_counter() - started
+        stats['calls'] += 1
+        stats['total_seconds'] += elapsed
+        stats['last_seconds'] = elapsed
+        if not ok:
+            stats['failures'] += 1
+        else:
+            logger.debug(f"壁紙設定 ({backend.name}): {elapsed * 1000:.1f}ms")
+        return ok
+
+    def _select_and_run(self, backends: List[WallpaperBackend], make_action) -> bool:
+        """使用中のバックエンドを優先して実行し、失敗時は他の候補を順に試す"""
+        with self._lock:
+            active = self._active if self._active in backends else None
+            if active is not None:
+                if self._run(active, make_action(active)):
+                    return True
+                logger.warning(f"バックエンド {active.name} が失敗したため選び直します")
+                self._active = None
+
+            for backend in backends:
+                if backend is active:
+                    continue
+                if backend.persistent and not backend.is_available():
+                    continue
+                if self._run(backend, make_action(backend)):
+                    if self._active is not backend:
+                        logger.info(f"壁紙設定バックエンド: {backend.name}")
+                    self._active = backend
+                    return True
+            return False
+
+    def apply(self, image_path: Path) -> bool:
+        """
+        壁紙を設定
+
+        Args:
+            image_path: 壁紙画像のパス（検証済み絶対パス）
+
+        Returns:
+            bool: いずれかのバックエンドで成功した場合True
+        """
+        return self._select_and_run(self.backends, lambda backend: lambda: backend.apply(image_path))
+
+    def evaluate_kde_script(self, script: str) -> bool:
+        """
+        Plasmaスクリプトを実行（KDEバックエンドのみ）
+
+        Args:
+            script: evaluateScript に渡すスクリプト
+
+        Returns:
+            bool: 成功した場合True
+        """
+        kde_backends = [b for b in self.backends if isinstance(b, KdeScriptBackend)]
+        return self._select_and_run(kde_backends, lambda backend: lambda: backend.evaluate_script(script))
+
+    def latency_summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        バックエンドごとの適用時間の集計
+
+        Returns:
+            Dict: {バックエンド名: {'calls', 'failures', 'total_seconds', 'last_seconds', 'average_seconds'}}
+        """
+        summary = {}
+        for name, stats in self.stats.items():
+            summary[name] = dict(stats)
+            summary[name]['average_seconds'] = stats['total_seconds'] / stats['calls'] if stats['calls'] else 0.0
+        return summary
+
+
+_shared_backends: Optional[LinuxWallpaperBackends] = None
+_shared_lock = threading.Lock()
+
+
+def get_linux_backends() -> LinuxWallpaperBackends:
+    """プロセス内で共有するバックエンド選択を取得（初回のみデスクトップ環境を判定）"""
+    global _shared_backends
+    with _shared_lock:
+        if _shared_backends is None:
+            _shared_backends = LinuxWallpaperBackends()
+        return _shared_backends
+
+
+def reset_linux_backends() -> None:
+    """共有のバックエンド選択を破棄（次回取得時に判定し直す）"""
+    global _shared_backends
+    with _shared_lock:
+        _shared_backends = None
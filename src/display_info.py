@@ -1,14 +1,177 @@
 """
 ディスプレイ情報取得モジュール
 各ディスプレイの解像度やメタデータを取得
+
+解像度の取得（xrandr / system_profiler の起動）はコストが高いため、
+プロセス内で結果をキャッシュし、ディスプレイ構成が変わった場合のみ再取得する。
+構成変化の検出:
+- GUI: QGuiApplication の画面追加・削除・ジオメトリ変更シグナル（watch_qt_screens）
+- Linux: /sys/class/drm のコネクタ状態の指紋
+- 上記が使えない場合: 一定時間（DISPLAY_CACHE_MAX_AGE 秒）で再取得
 """
 import platform
 import subprocess
 import logging
-from typing import List, Tuple, Optional
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
+# 構成変化を検出できない環境でのキャッシュ有効期間（秒）
+DISPLAY_CACHE_MAX_AGE = 600
+
+_DRM_CLASS_DIR = Path('/sys/class/drm')
+
+
+def _drm_fingerprint() -> Optional[tuple]:
+    """
+    /sys/class/drm のコネクタ状態から構成の指紋を作成（Linuxのみ）
+
+    Returns:
+        Optional[tuple]: ((コネクタ名, status, enabled), ...)。取得できない場合はNone。
+    """
+    try:
+        if not _DRM_CLASS_DIR.is_dir():
+            return None
+        connectors = []
+        for connector in sorted(_DRM_CLASS_DIR.glob('card*-*')):
+            status_path = connector / 'status'
+            if not status_path.exists():
+                continue
+            enabled_path = connector / 'enabled'
+            connectors.append((
+                connector.name,
+                status_path.read_text().strip(),
+                enabled_path.read_text().strip() if enabled_path.exists() else '',
+            ))
+        return tuple(connectors) if connectors else None
+    except OSError:
+        return None
+
+
+class DisplayTopologyCache:
+    """
+    ディスプレイ解像度のキャッシュ（構成変化の検出付き）
+
+    Args:
+        fingerprint_func: 構成の指紋を返す関数（Noneを返す場合は時間ベースで再取得）
+        max_age: 指紋で構成変化を検出できない場合のキャッシュ有効期間（秒）
+    """
+
+    def __init__(
+        self,
+        fingerprint_func: Optional[Callable[[], Optional[tuple]]] = None,
+        max_age: float = DISPLAY_CACHE_MAX_AGE
+    ):
+        self._fingerprint_func = fingerprint_func or _drm_fingerprint
+        self.max_age = max_age
+        self._resolutions: Optional[List[Tuple[int, int]]] = None
+        self._fingerprint: Optional[tuple] = None
+        self._probed_at = 0.0
+        # Qtシグナルで構成変化を受け取る場合の世代番号（Noneは未監視）
+        self._qt_generation: Optional[int] = None
+        self._listeners: List[Callable[[List[Tuple[int, int]]], None]] = []
+        self._lock = threading.Lock()
+
+    def _current_fingerprint(self) -> Optional[tuple]:
+        if self._qt_generation is not None:
+            return ('qt', self._qt_generation)
+        return self._fingerprint_func()
+
+    def get(self, probe: Callable[[], List[Tuple[int, int]]]) -> List[Tuple[int, int]]:
+        """
+        解像度を取得（構成が変わっていなければキャッシュを返す）
+
+        Args:
+            probe: 実際に解像度を取得する関数
+
+        Returns:
+            List[Tuple[int, int]]: 解像度のリスト
+        """
+        fingerprint = self._current_fingerprint()
+        with self._lock:
+            if self._resolutions is not None and fingerprint == self._fingerprint:
+                # Qt監視中は変化時にシグナルが届くため、期限切れを考慮しない
+                watched = fingerprint is not None and fingerprint[0] == 'qt'
+                if watched or time.monotonic() - self._probed_at < self.max_age:
+                    return list(self._resolutions)
+            previous = self._resolutions
+
+        resolutions = probe()
+
+        with self._lock:
+            self._resolutions = list(resolutions)
+            self._fingerprint = fingerprint
+            self._probed_at = time.monotonic()
+            listeners = list(self._listeners) if previous is not None and previous != resolutions else []
+
+        if listeners:
+            logger.info(f"ディスプレイ構成の変更を検出: {previous} → {resolutions}")
+        for listener in listeners:
+            try:
+                listener(list(resolutions))
+            except Exception as e:
+                logger.warning(f"ディスプレイ構成変更の通知エラー: {e}")
+        return list(resolutions)
+
+    def invalidate(self) -> None:
+        """キャッシュを無効化（次回取得時に再取得）"""
+        with self._lock:
+            if self._qt_generation is not None:
+                self._qt_generation += 1
+            self._probed_at = 0.0
+            self._fingerprint = None
+
+    def add_change_listener(self, callback: Callable[[List[Tuple[int, int]]], None]) -> None:
+        """
+        構成変化（再取得した解像度が前回と異なる）の通知先を登録
+
+        Args:
+            callback: 新しい解像度リストを受け取る関数
+        """
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_change_listener(self, callback: Callable[[List[Tuple[int, int]]], None]) -> None:
+        """構成変化の通知先を解除"""
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def watch_qt_screens(self, app) -> None:
+        """
+        QGuiApplication の画面シグナルで構成変化を検出する
+
+        Args:
+            app: QGuiApplication（QApplication）インスタンス
+        """
+        def on_screen_added(screen):
+            screen.geometryChanged.connect(lambda _rect: self.invalidate())
+            self.invalidate()
+
+        for screen in app.screens():
+            screen.geometryChanged.connect(lambda _rect: self.invalidate())
+        app.screenAdded.connect(on_screen_added)
+        app.screenRemoved.connect(lambda _screen: self.invalidate())
+        app.primaryScreenChanged.connect(lambda _screen: self.invalidate())
+
+        with self._lock:
+            if self._qt_generation is None:
+                self._qt_generation = 0
+                self._fingerprint = None
+        logger.debug("Qtの画面シグナルでディスプレイ構成の監視を開始しました")
+
+
+# プロセス内で共有するキャッシュ
+_topology_cache = DisplayTopologyCache()
+
+
+def get_topology_cache() -> DisplayTopologyCache:
+    """プロセス内で共有するディスプレイ構成キャッシュを取得"""
+    return _topology_cache
+
 
 class DisplayInfo:
     """ディスプレイ情報取得クラス"""
@@ -20,9 +183,15 @@ class DisplayInfo:
         """
         すべてのディスプレイの解像度を取得
 
+        ディスプレイ構成が前回から変わっていなければキャッシュを返す。
+
         Returns:
             List[Tuple[int, int]]: [(width1, height1), (width2, height2), ...]
         """
+        return _topology_cache.get(self._probe_resolutions)
+
+    def _probe_resolutions(self) -> List[Tuple[int, int]]:
+        """OSごとの方法で解像度を取得（キャッシュなし）"""
         try:
             if self.system == 'Darwin':  # macOS
                 return self._get_resolutions_mac()
@@ -0,0 +1,180 @@
+"""
+Google Calendar APIイベントの解析モジュール
+
+APIレスポンスのdictからCalendarEventを1回の生成で組み立てる。
+アカウント情報は呼び出し側から先に受け取り、後から dataclasses.replace で
+付け直す必要がないようにする。
+
+日時文字列は Google Calendar API が返す
+"YYYY-MM-DDTHH:MM:SS[.fff](Z|±HH:MM)" 形式を高速パスで処理する。
+- オフセット文字列 → timedelta はキャッシュ（同じオフセットの再解析をしない）
+- UTC → ローカル時刻のオフセットは15分単位の時刻バケットでキャッシュ
+  （DST切替は常に15分境界で発生するため、バケット内でオフセットは一定）
+"""
+import logging
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, Optional
+
+from .models.event import CalendarEvent
+
+logger = logging.getLogger(__name__)
+
+# オフセット部分（"Z" / "+09:00" / "-0530"）の検証用（キャッシュミス時のみ使用）
+_OFFSET_RE = re.compile(r'^(?:Z|([+-])(\d{2}):?(\d{2}))$')
+
+# オフセット文字列 → UTCからの差分
+_OFFSET_CACHE: Dict[str, timedelta] = {'Z': timedelta(0)}
+
+# ローカルオフセットのキャッシュ粒度（秒）
+_LOCAL_OFFSET_BUCKET_SECONDS = 900
+
+_EPOCH = datetime(1970, 1, 1)
+
+DEFAULT_SUMMARY = '（タイトルなし）'
+
+
+def _parse_offset(token: str) -> Optional[timedelta]:
+    """オフセット文字列をtimedeltaに変換（キャッシュ付き）"""
+    offset = _OFFSET_CACHE.get(token)
+    if offset is not None:
+        return offset
+
+    match = _OFFSET_RE.match(token)
+    if not match:
+        return None
+    sign, hours, minutes = match.groups()
+    offset = timedelta(hours=int(hours), minutes=int(minutes))
+    if sign == '-':
+        offset = -offset
+    _OFFSET_CACHE[token] = offset
+    return offset
+
+
+@lru_cache(maxsize=4096)
+def _local_offset_for_bucket(bucket: int) -> timedelta:
+    """指定バケット（UTCエポック秒 // 900）におけるローカルタイムゾーンのオフセット"""
+    moment = datetime.fromtimestamp(bucket * _LOCAL_OFFSET_BUCKET_SECONDS, timezone.utc)
+    return moment.astimezone().utcoffset()
+
+
+def clear_timezone_cache() -> None:
+    """ローカルタイムゾーンのキャッシュをクリア（システムのタイムゾーン変更時に使用）"""
+    _local_offset_for_bucket.cache_clear()
+
+
+def parse_api_datetime(value: str) -> datetime:
+    """
+    APIの日時文字列をローカル時刻（タイムゾーン情報なし）に変換
+
+    Args:
+        value: ISO 8601形式の日時文字列
+
+    Returns:
+        datetime: ローカル時刻のナイーブdatetime
+
+    Raises:
+        ValueError: 解析できない形式の場合
+    """
+    # 高速パス: "YYYY-MM-DDTHH:MM:SS" + 任意の小数秒 + オフセット
+    offset_start = 19
+    if len(value) > 19 and value[19] == '.':
+        offset_start = 20
+        while offset_start < len(value) and value[offset_start].isdigit():
+            offset_start += 1
+
+    offset = _parse_offset(value[offset_start:]) if len(value) > offset_start else None
+    if offset is None:
+        # 想定外の形式は標準パーサーにフォールバック
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            return parsed
+        return parsed.astimezone().replace(tzinfo=None)
+
+    utc_naive = datetime.fromisoformat(value[:offset_start]) - offset
+    bucket = int((utc_naive - _EPOCH).total_seconds()) // _LOCAL_OFFSET_BUCKET_SECONDS
+    return utc_naive + _local_offset_for_bucket(bucket)
+
+
+def parse_event(
+    item: Dict,
+    calendar_id: str,
+    account_id: str = 'default',
+    account_color: str = '#4285f4',
+    account_display_name: str = ''
+) -> Optional[CalendarEvent]:
+    """
+    APIイベントをアカウント情報付きのCalendarEventに変換
+
+    Args:
+        item: Google Calendar APIから取得したイベント
+        calendar_id: カレンダーID
+        account_id: アカウントID
+        account_color: アカウント色
+        account_display_name: アカウント表示名
+
+    Returns:
+        Optional[CalendarEvent]: 変換したイベント。解析できない場合はNone。
+    """
+    try:
+        start = item['start']
+        end = item['end']
+
+        # 終日イベントの判定
+        is_all_day = 'date' in start
+
+        if is_all_day:
+            start_dt = datetime.fromisoformat(start['date'])
+            end_dt = datetime.fromisoformat(end.get('date') or end['dateTime'])
+        else:
+            start_dt = parse_api_datetime(start['dateTime'])
+            end_dt = parse_api_datetime(end.get('dateTime') or end['date'])
+
+        return CalendarEvent(
+            id=item['id'],
+            summary=item.get('summary', DEFAULT_SUMMARY),
+            start_datetime=start_dt,
+            end_datetime=end_dt,
+            is_all_day=is_all_day,
+            calendar_id=sys.intern(calendar_id),
+            location=item.get('location', ''),
+            description=item.get('description', ''),
+            color_id=sys.intern(item.get('colorId', '1')),
+            account_id=account_id,
+            account_color=account_color,
+            account_display_name=account_display_name,
+        )
+
+    except Exception as e:
+        logger.warning(f"イベント解析エラー ({item.get('summary', 'Unknown')}): {e}")
+        return None
+
+
+def iter_parsed_events(
+    items: Iterable[Dict],
+    calendar_id: str,
+    account_id: str = 'default',
+    account_color: str = '#4285f4',
+    account_display_name: str = ''
+) -> Iterator[CalendarEvent]:
+    """
+    APIイベントを順に解析し、完成したCalendarEventを逐次返す
+
+    解析できないイベントはスキップする。
+
+    Args:
+        items: Google Calendar APIのイベント（ページイテレータ可）
+        calendar_id: カレンダーID
+        account_id: アカウントID
+        account_color: アカウント色
+        account_display_name: アカウント表示名
+
+    Yields:
+        CalendarEvent: アカウント情報付きのイベント
+    """
+    for item in items:
+        event = parse_event(item, calendar_id, account_id, account_color, account_display_name)
+        if event is not None:
+            yield event
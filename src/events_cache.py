@@ -0,0 +1,259 @@
+"""
+イベント取得結果のキャッシュ
+
+stale-while-revalidate 方式:
+- TTL内: キャッシュをそのまま返す
+- TTL切れ（猶予期間内）: キャッシュを即座に返し、バックグラウンドで再取得する
+- 猶予期間も過ぎた / 未取得: 呼び出し元で取得する（同じキーの取得は1回に集約）
+
+TTLはカレンダーの変動頻度（直近の同期で内容が変わった割合）と
+次の予定開始までの時間に応じて伸縮する。
+プレビュー・更新ワーカー間で共有し、同じ期間を二重に取得しないようにする。
+"""
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+from .cancellation import CancellationToken, OperationCancelled, check_cancelled
+from .metrics import metrics
+from .models.event import CalendarEvent
+
+logger = logging.getLogger(__name__)
+
+# 変動頻度の判定に使う直近の同期回数
+_HISTORY_SIZE = 8
+
+# 他の呼び出しの取得結果を待つ間、キャンセルを確認する間隔（秒）
+_CANCEL_POLL_SECONDS = 0.1
+
+
+def events_fingerprint(events: List[CalendarEvent]) -> int:
+    """表示内容に影響するフィールドからイベントリストの指紋を計算"""
+    return hash(tuple(
+        (e.id, e.summary, e.start_datetime, e.end_datetime, e.location, e.color_id,
+         e.account_id, e.account_color, e.account_display_name)
+        for e in events
+    ))
+
+
+@dataclass
+class _Entry:
+    """キャッシュエントリ"""
+    events: List[CalendarEvent]
+    fetched_at: float
+    fingerprint: int
+    changes: Deque[bool] = field(default_factory=lambda: deque(maxlen=_HISTORY_SIZE))
+
+
+class _Flight:
+    """実行中の取得（同じキーの呼び出しはこの結果を待つ）"""
+
+    __slots__ = ('done', 'result', 'error', 'generation')
+
+    def __init__(self, generation: int = 0):
+        self.done = threading.Event()
+        self.generation = generation
+        self.result: Optional[List[CalendarEvent]] = None
+        self.error: Optional[BaseException] = None
+
+
+class EventsCache:
+    """
+    stale-while-revalidate 方式のイベントキャッシュ
+
+    Args:
+        base_ttl: 基準TTL（秒）。変動頻度が不明な間はこの値を使用
+        min_ttl: TTLの下限（秒）
+        max_ttl: TTLの上限（秒）
+        stale_grace: TTL切れ後、キャッシュを返しつつ再取得する猶予期間（秒）
+    """
+
+    def __init__(
+        self,
+        base_ttl: float = 180,
+        min_ttl: float = 60,
+        max_ttl: float = 900,
+        stale_grace: float = 1800
+    ):
+        self.base_ttl = base_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.stale_grace = stale_grace
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._flights: Dict[Hashable, _Flight] = {}
+        # invalidate() のたびに進める世代（それ以前に始まった取得の結果は保存しない）
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def ttl_for(self, key: Hashable) -> float:
+        """キーの現在のTTL（秒）を取得"""
+        with self._lock:
+            entry = self._entries.get(key)
+        return self._ttl(entry) if entry else self.base_ttl
+
+    def _ttl(self, entry: _Entry) -> float:
+        """
+        エントリのTTLを計算
+
+        - 直近の同期で毎回内容が変わるカレンダーは base の0.5倍、
+          全く変わらないカレンダーは4倍まで伸ばす
+        - 次の予定開始が近い場合は、開始までの半分の時間に短縮する
+        """
+        if entry.changes:
+            volatility = sum(entry.changes) / len(entry.changes)
+            ttl = self.base_ttl * (4.0 - 3.5 * volatility)
+        else:
+            ttl = self.base_ttl
+
+        now = datetime.now()
+        next_start = min(
+            (e.start_datetime for e in entry.events
+             if not e.is_all_day and e.start_datetime.replace(tzinfo=None) > now),
+            default=None
+        )
+        if next_start is not None:
+            seconds_until = (next_start.replace(tzinfo=None) - now).total_seconds()
+            ttl = min(ttl, seconds_until / 2)
+
+        return max(self.min_ttl, min(self.max_ttl, ttl))
+
+    def get(
+        self,
+        key: Hashable,
+        fetch: Callable[[], List[CalendarEvent]],
+        cancel_token: Optional[CancellationToken] = None
+    ) -> List[CalendarEvent]:
+        """
+        キャッシュから取得（必要に応じて取得・再検証）
+
+        Args:
+            key: キャッシュキー
+            fetch: イベントを取得する関数
+            cancel_token: キャンセルトークン（他の呼び出しの取得結果を待つ間も確認する）
+
+        Returns:
+            List[CalendarEvent]: イベントリスト
+
+        Raises:
+            OperationCancelled: キャンセルされた場合
+        """
+        while True:
+            events, flight, owner = self._lookup(key, fetch)
+            if events is not None:
+                return events
+
+            if owner:
+                self._run_fetch(key, fetch, flight)
+            else:
+                logger.debug("同じ期間のイベント取得が実行中のため、結果を待ちます")
+                while not flight.done.wait(_CANCEL_POLL_SECONDS if cancel_token else None):
+                    check_cancelled(cancel_token, "イベント取得の待機")
+
+            if isinstance(flight.error, OperationCancelled) and not owner:
+                # 取得していた呼び出しがキャンセルされた場合は、自分で取得し直す
+                check_cancelled(cancel_token, "イベント取得の待機")
+                continue
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+    def _lookup(
+        self,
+        key: Hashable,
+        fetch: Callable[[], List[CalendarEvent]]
+    ) -> Tuple[Optional[List[CalendarEvent]], Optional[_Flight], bool]:
+        """
+        キャッシュを確認し、返せるキャッシュがなければ取得を登録
+
+        Returns:
+            (キャッシュ済みのイベント, 待つ取得, 自分で取得するか)
+            キャッシュを返せる場合は (イベント, None, False)
+        """
+        now = time.monotonic()
+        owner = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.fetched_at
+                ttl = self._ttl(entry)
+                if age < ttl:
+                    logger.debug(f"イベントキャッシュヒット: {len(entry.events)}件（残り{ttl - age:.0f}秒）")
+                    metrics.incr('events_cache_hits')
+                    return entry.events, None, False
+                if age < ttl + self.stale_grace:
+                    if key not in self._flights:
+                        flight = self._flights[key] = _Flight(self._generation)
+                        threading.Thread(
+                            target=self._run_fetch,
+                            args=(key, fetch, flight),
+                            name="events-cache-revalidate",
+                            daemon=True
+                        ).start()
+                    logger.debug(f"期限切れキャッシュを返して再取得します: {len(entry.events)}件（経過{age:.0f}秒）")
+                    metrics.incr('events_cache_stale_hits')
+                    return entry.events, None, False
+
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight(self._generation)
+                owner = True
+        metrics.incr('events_cache_misses')
+        return None, flight, owner
+
+    def _run_fetch(self, key: Hashable, fetch: Callable[[], List[CalendarEvent]], flight: _Flight) -> None:
+        """取得を実行して結果を保存し、待機中の呼び出しに通知"""
+        try:
+            events = fetch()
+            self._store(key, events, flight.generation)
+            flight.result = events
+        except OperationCancelled as e:
+            logger.info("イベント取得がキャンセルされました（キャッシュは更新しません）")
+            flight.error = e
+        except BaseException as e:
+            logger.error(f"イベント取得エラー（キャッシュ更新）: {e}")
+            flight.error = e
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    def _store(self, key: Hashable, events: List[CalendarEvent], generation: Optional[int] = None) -> None:
+        """
+        取得結果を保存し、内容の変化を変動頻度の履歴に記録
+
+        generation を指定した場合、取得開始後に invalidate() されていれば（世代が古ければ）保存しない。
+        """
+        fingerprint = events_fingerprint(events)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                logger.debug("無効化前に開始したイベント取得の結果は保存しません")
+                return
+            previous = self._entries.get(key)
+            entry = _Entry(events=events, fetched_at=time.monotonic(), fingerprint=fingerprint)
+            if previous is not None:
+                entry.changes = previous.changes
+                entry.changes.append(previous.fingerprint != fingerprint)
+            self._entries[key] = entry
+
+    def peek(self, key: Hashable) -> Optional[List[CalendarEvent]]:
+        """鮮度に関係なくキャッシュ済みのイベントを取得（取得は行わない）"""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry.events if entry else None
+
+    def invalidate(self) -> None:
+        """
+        全エントリを削除
+
+        実行中の取得は継続するが、以降の呼び出しはその結果を待たずに取得し直す。
+        無効化前に開始した取得の結果はキャッシュに保存しない。
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._flights = {}
@@ -9,10 +9,11 @@
 """
 import gc
 import platform
-from collections import ChainMap
+import threading
+from collections import ChainMap, OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import Iterable, List, Dict, Tuple, Optional
 import logging
 
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
@@ -49,10 +50,20 @@ from .config import (
 from . import themes
 from .themes import DEFAULT_THEME
 from .display_info import DisplayInfo
+from .atomic_output import atomic_save_image, next_slot_path
+from .cancellation import CancellationToken, check_cancelled
+from .pipeline_progress import PipelineProgress, mark_stage
+from .models.event_table import EventTable
 from .renderers import EffectsRendererMixin, CardRendererMixin, CalendarRendererMixin
 
 logger = logging.getLogger(__name__)
 
+# プレビュー用に縮小した背景画像のキャッシュ（プロセス共通・LRU）
+# プレビューはワーカーごとに新しい ImageGenerator を使うため、インスタンスをまたいで共有する
+_PREVIEW_BACKGROUND_CACHE_SIZE = 4
+_preview_backgrounds: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+_preview_backgrounds_lock = threading.Lock()
+
 
 class ImageGenerator(EffectsRendererMixin, CardRendererMixin, CalendarRendererMixin):
     """壁紙画像生成クラス（新デザイン対応）"""
@@ -73,13 +84,20 @@ class ImageGenerator(EffectsRendererMixin, CardRendererMixin, CalendarRendererMi
     # クロップ位置の定義
     CROP_POSITIONS = ['center', 'top', 'bottom']
 
-    def __init__(self):
+    def __init__(self, resolution: Optional[Tuple[int, int]] = None):
+        """
+        Args:
+            resolution: 描画解像度 (width, height)。省略時は設定に従い自動検出
+        """
         self.system = platform.system()
         self._custom_background_path = None
         self._crop_position = 'center'
 
         # 解像度の自動検出
-        if AUTO_DETECT_RESOLUTION and WALLPAPER_TARGET_DESKTOP > 0:
+        if resolution is not None:
+            self.width, self.height = resolution
+            logger.info(f"指定解像度を使用: {self.width}x{self.height}")
+        elif AUTO_DETECT_RESOLUTION and WALLPAPER_TARGET_DESKTOP > 0:
             display_info = DisplayInfo()
             self.width, self.height = display_info.get_target_display_resolution(WALLPAPER_TARGET_DESKTOP)
             logger.info(f"解像度を自動検出しました: {self.width}x{self.height}")
@@ -98,6 +116,9 @@ class ImageGenerator(EffectsRendererMixin, CardRendererMixin, CalendarRendererMi
         # アイコン画像キャッシュ
         self._cached_icon = None
 
+        # 事前計算したイベント振り分け（マルチディスプレイ描画で共有）
+        self._event_index = None
+
         # レイアウト計算（動的）
         self.layout = self._calculate_layout()
 
@@ -241,14 +262,20 @@ class ImageGenerator(EffectsRendererMixin, CardRendererMixin, CalendarRendererMi
             self._cached_background_path = None
             logger.info(f"クロップ位置を '{position}' に設定しました")
 
-    def _resize_cover(self, img: Image.Image, crop_position: str = None) -> Image.Image:
+    def _resize_cover(
+        self,
+        img: Image.Image,
+        crop_position: str = None,
+        target_size: Optional[Tuple[int, int]] = None
+    ) -> Image.Image:
         """アスペクト比を維持したままスクリーンを覆うリサイズ+クロップ
 
         余白なし・はみ出し部分をクロップ（CSS background-size: cover相当）
+        target_size を省略した場合は描画解像度に合わせる。
         """
         position = crop_position or self._crop_position
         src_w, src_h = img.size
-        target_w, target_h = self.width, self.height
+        target_w, target_h = target_size or (self.width, self.height)
 
         # スケール計算: 大きい方の比率を採用（画面を完全に覆う）
         scale = max(target_w / src_w, target_h / src_h)
@@ -329,13 +356,174 @@ class ImageGenerator(EffectsRendererMixin, CardRendererMixin, CalendarRendererMi
         except Exception as e:
             logger.error(f"アイコン描画エラー: {e}", exc_info=True)
 
+    def build_event_index(self, week_events: List[CalendarEvent]) -> Dict:
+        """
+        解像度に依存しないイベントの振り分けを事前計算
+
+        同じイベントを複数の解像度で描画する場合に一度だけ計算し、
+        generate_wallpaper の event_index に渡して共有する。
+
+        Args:
+            week_events: 週間イベント
+
+        Returns:
+            Dict: {'date': 基準日, 'week_buckets': 開始日別イベント, 'card_days': 3日分のカード用イベント}
+        """
+        today = datetime.now().date()
+        return {
+            'date': today,
+            'week_buckets': EventTable.from_events(week_events).bucket_by_start_date(today, 7),
+            'card_days': self._get_events_for_days(week_events),
+        }
+
+    def _preview_background(self, bg_path, output_size: Tuple[int, int]) -> Image.Image:
+        """
+        プレビュー用の背景画像
+
+        プレビューサイズに縮小した背景をプロセス共通でキャッシュし、描画解像度に
+        拡大して返す。縮小して表示するプレビューでは元の背景と見分けがつかず、
+        テーマを切り替えるたびに元画像の読み込み・リサイズをしなくて済む。
+
+        Args:
+            bg_path: 背景画像のパス
+            output_size: プレビューの最大サイズ
+
+        Returns:
+            Image.Image: 描画解像度のRGBA背景画像
+        """
+        ratio = min(output_size[0] / self.width, output_size[1] / self.height, 1)
+        small_size = (max(1, round(self.width * ratio)), max(1, round(self.height * ratio)))
+        path = Path(bg_path)
+        key = (str(path), path.stat().st_mtime_ns, self.width, self.height, small_size, self._crop_position)
+
+        with _preview_backgrounds_lock:
+            small = _preview_backgrounds.get(key)
+            if small is not None:
+                _preview_backgrounds.move_to_end(key)
+
+        if small is None:
+            logger.info(f"プレビュー用の背景画像を作成しています: {bg_path}")
+            with Image.open(path) as raw:
+                raw.draft('RGB', small_size)  # JPEGは縮小デコードで高速化
+                cover = self._resize_cover(raw, target_size=small_size)
+            small = cover.convert('RGBA')
+            cover.close()
+            with _preview_backgrounds_lock:
+                _preview_backgrounds[key] = small
+                while len(_preview_backgrounds) > _PREVIEW_BACKGROUND_CACHE_SIZE:
+                    _preview_backgrounds.popitem(last=False)[1].close()
+
+        return small.resize((self.width, self.height), Image.Resampling.BILINEAR)
+
+    @staticmethod
+    def _downscale(image: Image.Image, max_size: Tuple[int, int]) -> Image.Image:
+        """
+        アスペクト比を保って max_size 内に縮小（元画像は解放）
+
+        Args:
+            image: 縮小する画像
+            max_size: (最大幅, 最大高さ)
+
+        Returns:
+            Image.Image: 縮小した画像（縮小不要なら元画像）
+        """
+        ratio = min(max_size[0] / image.width, max_size[1] / image.height)
+        if ratio >= 1:
+            return image
+        size = (max(1, round(image.width * ratio)), max(1, round(image.height * ratio)))
+        # reducing_gap: 先に整数倍で粗く縮小してから補間するため高速
+        small = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        image.close()
+        return small
+
+    def visible_time_state(
+        self,
+        today_events: List[CalendarEvent],
+        week_events: List[CalendarEvent],
+        now: Optional[datetime] = None
+    ) -> Tuple:
+        """
+        時刻によって変わる表示内容
+
+        日付・現在時刻ハイライトの時間枠・カードの進行中/終了状態と進行状況バーの幅・
+        Heroモードのカウントダウンをまとめた値。
+        前回の描画時と同じなら、同じイベントで描画し直しても壁紙は変わらない。
+
+        Args:
+            today_events: 今日のイベント
+            week_events: 週間イベント
+            now: 基準時刻（省略時は datetime.now()）
+
+        Returns:
+            Tuple: 比較用の値
+        """
+        now = now or datetime.now()
+        return (
+            now.date(),
+            self._current_hour_slot(now),
+            self.card_time_state(today_events, week_events, now),
+        )
+
+    def render_state(
+        self,
+        today_events: List[CalendarEvent],
+        week_events: List[CalendarEvent],
+        now: Optional[datetime] = None
+    ) -> str:
+        """
+        描画結果を決める設定と時刻依存の表示内容
+
+        テーマ・背景画像（パスと更新時刻）・クロップ位置・解像度と visible_time_state をまとめた値。
+        同じイベントでこの値が同じなら、描画し直しても同じ壁紙になる。
+        起動をまたいで前回の壁紙と比較するため、プロセスに依存しない文字列で返す。
+
+        Args:
+            today_events: 今日のイベント
+            week_events: 週間イベント
+            now: 基準時刻（省略時は datetime.now()）
+
+        Returns:
+            str: 比較用の値
+        """
+        background = self._custom_background_path
+        background_state = None
+        if background:
+            try:
+                background_state = (str(background), Path(background).stat().st_mtime_ns)
+            except OSError:
+                background_state = (str(background), None)
+        return repr((
+            self.theme_name,
+            background_state,
+            self._crop_position,
+            (self.width, self.height),
+            self.visible_time_state(today_events, week_events, now),
+        ))
+
     def generate_wallpaper(
         self,
         today_events: List[CalendarEvent],
         week_events: List[CalendarEvent],
-        output_path: Optional[Path] = None
+        output_path: Optional[Path] = None,
+        event_index: Optional[Dict] = None,
+        protected_paths: Iterable[Path] = (),
+        output_size: Optional[Tuple[int, int]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        progress: Optional[PipelineProgress] = None
     ) -> Optional[Path]:
-        """壁紙画像を生成"""
+        """
+        壁紙画像を生成
+
+        output_path を省略した場合は OUTPUT_DIR 配下のA/Bスロットに交互に書き込む。
+        protected_paths（表示中の壁紙）に一致するスロットは上書きしない。
+        output_size を指定した場合（プレビュー）は、描画後にそのサイズ内へ縮小し、
+        低圧縮で保存する。処理時間の大半はフル解像度のPNGエンコードのため、
+        レイアウトはフル解像度のまま描画する。
+        cancel_token を指定した場合は、背景・予定カード・週間カレンダーの描画後と
+        エンコード前にキャンセルを確認し、キャンセルされていれば OperationCancelled を送出する。
+        progress を指定した場合は、背景・予定カード・週間カレンダー・エンコードの完了を記録する。
+        """
+        self._event_index = event_index
         try:
             # グラデーション背景設定を確認
             gradient_config = self.theme.get('background_gradient', {})
@@ -348,19 +536,30 @@ class ImageGenerator(EffectsRendererMixin, CardRendererMixin, CalendarRendererMi
                 colors = gradient_config.get('colors', None)
                 direction = gradient_config.get('direction', 'vertical')
 
-                image = self._create_gradient_background(
-                    width=self.width,
-                    height=self.height,
-                    gradient_type=gradient_type,
-                    colors=colors,
-                    direction=direction
-                )
+                # 同じ設定のグラデーションは背景画像と同じキャッシュを再利用
+                cache_key = f"gradient:{gradient_type}:{colors}:{direction}:{self.width}x{self.height}"
+                if self._cached_background and self._cached_background_path == cache_key:
+                    image = self._cached_background.copy()
+                else:
+                    background = self._create_gradient_background(
+                        width=self.width,
+                        height=self.height,
+                        gradient_type=gradient_type,
+                        colors=colors,
+                        direction=direction
+                    )
+                    self._cached_background = background
+                    self._cached_background_path = cache_key
+                    image = background.copy()
             else:
                 # カスタム背景画像が設定されている場合はそちらを優先
                 bg_path = self._custom_background_path or BACKGROUND_IMAGE_PATH
                 if bg_path and Path(bg_path).exists():
+                    # プレビューは縮小済みの共有キャッシュから背景を作成
+                    if output_size is not None:
+                        image = self._preview_background(bg_path, output_size)
                     # 背景画像キャッシュ: 同じパスなら再読み込みしない
-                    if self._cached_background and self._cached_background_path == str(bg_path):
+                    elif self._cached_background and self._cached_background_path == str(bg_path):
                         logger.info("キャッシュ済み背景画像を使用します")
                         image = self._cached_background.copy()
                     else:
@@ -381,6 +580,8 @@ class ImageGenerator(EffectsRendererMixin, CardRendererMixin, CalendarRendererMi
                     logger.info("デフォルト背景を生成します")
                     image = Image.new('RGBA', (self.width, self.height), (255, 255, 255, 255))
 
+            check_cancelled(cancel_token, "背景の描画")
+            mark_stage(progress, 'background')
             draw = ImageDraw.Draw(image)
 
             # 動的レイアウト値を使用
@@ -389,10 +590,14 @@ class ImageGenerator(EffectsRendererMixin, CardRendererMixin, CalendarRendererMi
 
             # 予定カード描画（3列レイアウト: 今日・明日・明後日）
             self._draw_event_cards(draw, today_events, card_y_start, week_events=week_events, image=image)
+            check_cancelled(cancel_token, "予定カードの描画")
+            mark_stage(progress, 'cards')
             draw = ImageDraw.Draw(image)  # alpha_composite後にdrawを再取得
 
             # 週間カレンダー描画
             self._draw_week_calendar(draw, week_events, week_calendar_y_start, image=image)
+            check_cancelled(cancel_token, "週間カレンダーの描画")
+            mark_stage(progress, 'week_calendar')
 
             # RGBAからRGBに変換（PNG保存用）
             if image.mode == 'RGBA':
@@ -401,7 +606,12 @@ class ImageGenerator(EffectsRendererMixin, CardRendererMixin, CalendarRendererMi
                 image.close()  # RGBA画像を明示的に解放
                 image = rgb_image
 
-            # 画像を保存
+            save_kwargs = {}
+            if output_size is not None:
+                image = self._downscale(image, output_size)
+                save_kwargs['compress_level'] = 1
+
+            # 画像を保存（一時ファイル → fsync → リネームで差し替え）
             OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
             final_output_path = output_path
             if final_output_path is None:
@@ -409,9 +619,11 @@ class ImageGenerator(EffectsRendererMixin, CardRendererMixin, CalendarRendererMi
                     theme=self.theme_name,
                     date=datetime.now().strftime('%Y%m%d')
                 )
-                final_output_path = OUTPUT_DIR / filename
-            image.save(final_output_path)
+                final_output_path = next_slot_path(OUTPUT_DIR / filename, avoid=protected_paths)
+            check_cancelled(cancel_token, "画像のエンコード")
+            atomic_save_image(image, final_output_path, **save_kwargs)
             image.close()  # 保存後は不要なので即座に解放
+            mark_stage(progress, 'encode')
 
             logger.info(f"壁紙画像を生成しました: {final_output_path}")
             return final_output_path
@@ -419,3 +631,5 @@ class ImageGenerator(EffectsRendererMixin, CardRendererMixin, CalendarRendererMi
         except Exception as e:
             logger.error(f"画像生成エラー: {e}", exc_info=True)
             return None
+        finally:
+            self._event_index = None
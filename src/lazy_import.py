@@ -0,0 +1,71 @@
+"""
+遅延インポート
+
+起動時に読み込むと時間のかかるモジュール（Google API クライアント・NumPy・描画系）を、
+最初に使われた時点で読み込むためのプロキシ。
+モジュール属性として置くため、テストの patch('src.xxx.name') はこれまでどおり差し替えられる。
+
+使い方:
+    build = LazyImport('googleapiclient.discovery', 'build')
+    service = build('calendar', 'v3', credentials=creds)  # ここで初めて読み込む
+"""
+import importlib
+import threading
+from typing import Any, Optional
+
+
+class LazyImport:
+    """
+    モジュールまたはモジュール内の名前を最初の利用時に読み込むプロキシ
+
+    属性の参照・呼び出しは読み込んだ実体に委譲する。
+    読み込みはスレッドセーフ（ワーカーから同時に使われても1回だけ読み込む）。
+
+    Args:
+        module: モジュール名（例: 'googleapiclient.discovery'）
+        name: モジュール内の名前（省略時はモジュールそのもの）
+    """
+
+    def __init__(self, module: str, name: Optional[str] = None):
+        self._lazy_module = module
+        self._lazy_name = name
+        self._lazy_target = None
+        self._lazy_lock = threading.Lock()
+
+    def resolve(self) -> Any:
+        """実体を読み込んで返す（2回目以降は読み込み済みの実体）"""
+        target = self._lazy_target
+        if target is None:
+            with self._lazy_lock:
+                target = self._lazy_target
+                if target is None:
+                    target = importlib.import_module(self._lazy_module)
+                    if self._lazy_name is not None:
+                        target = getattr(target, self._lazy_name)
+                    self._lazy_target = target
+        return target
+
+    @property
+    def is_loaded(self) -> bool:
+        """読み込み済みか"""
+        return self._lazy_target is not None
+
+    def __getattr__(self, name: str) -> Any:
+        # _lazy_* は __init__ で設定済み。未設定（コピー・pickle途中など）で再帰しないようにする
+        if name.startswith('_lazy_'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        target = f"{self._lazy_module}.{self._lazy_name}" if self._lazy_name else self._lazy_module
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<LazyImport {target} ({state})>"
+
+
+def resolve(obj: Any) -> Any:
+    """LazyImport なら実体を、それ以外はそのまま返す（isinstance 等に渡す前に使う）"""
+    return obj.resolve() if isinstance(obj, LazyImport) else obj
+
@@ -0,0 +1,355 @@
+"""
+計測（スパン・カウンター）とメトリクスの出力
+
+壁紙生成パイプラインの所要時間と回数を記録する軽量な計測レイヤー。
+- span(): with文で囲んだ処理の所要時間を記録
+- timed(): 関数の所要時間を記録するデコレーター（描画エフェクトなど）
+- incr() / set_max(): カウンター（API呼び出し回数・キャッシュヒットなど）と最大値（ピークRSS）
+
+無効時（既定）は各呼び出しが enabled の確認だけで戻るため、ほぼコストがかからない。
+有効時は flush() ごとに1行のJSONをローテーション付きのファイルに追記し、
+start_http_server() で Prometheus 形式のテキスト（/metrics）をローカルに公開する。
+"""
+import functools
+import json
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Prometheus のメトリクス名の接頭辞
+_PREFIX = 'calesk'
+
+# flush() までに保持する個々のスパンの上限（プレビューだけが続く場合に増え続けないよう）
+_MAX_RECENT_SPANS = 1000
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    プロセスのピークRSS（バイト）
+
+    Returns:
+        Optional[int]: 取得できない環境（Windows）ではNone
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux はKB、macOS はバイト単位
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MetricsRegistry:
+    """
+    スパン・カウンター・最大値の記録
+
+    スパンは名前ごとに回数・合計・最大を累積し（Prometheus用）、
+    flush() までの個々の記録も保持する（JSONL用）。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._spans: Dict[str, List[float]] = {}  # 名前: [回数, 合計秒, 最大秒]
+        self._recent: Deque[dict] = deque(maxlen=_MAX_RECENT_SPANS)
+        self._export_logger: Optional[logging.Logger] = None
+        self._server = None  # ThreadingHTTPServer（start_http_server で作成）
+
+    # === 記録 ===
+
+    def observe(self, name: str, seconds: float) -> None:
+        """所要時間を記録"""
+        if not self.enabled:
+            return
+        with self._lock:
+            summary = self._spans.get(name)
+            if summary is None:
+                summary = self._spans[name] = [0, 0.0, 0.0]
+            summary[0] += 1
+            summary[1] += seconds
+            summary[2] = max(summary[2], seconds)
+            self._recent.append({'name': name, 'ms': round(seconds * 1000, 3)})
+
+    @contextmanager
+    def _span(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def span(self, name: str):
+        """
+        with文で囲んだ処理の所要時間を記録
+
+        Args:
+            name: スパン名（例: "calendar.get_all_events"）
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name)
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """カウンターを加算"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_max(self, name: str, value: float) -> None:
+        """最大値を更新（ピークRSSなど）"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[name] = max(self._gauges.get(name, value), value)
+
+    def record_peak_rss(self) -> None:
+        """プロセスのピークRSSを記録"""
+        if not self.enabled:
+            return
+        peak = peak_rss_bytes()
+        if peak is not None:
+            self.set_max('process_peak_rss_bytes', peak)
+
+    # === 参照・出力 ===
+
+    def snapshot(self) -> dict:
+        """累積値のコピー（counters / gauges / spans）"""
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+                'spans': {
+                    name: {'count': count, 'sum_ms': round(total * 1000, 3), 'max_ms': round(peak * 1000, 3)}
+                    for name, (count, total, peak) in self._spans.items()
+                },
+            }
+
+    def flush(self, source: str = 'update') -> Optional[dict]:
+        """
+        前回の flush() 以降のスパンと現在の累積値をJSONLに1行追記
+
+        Args:
+            source: 記録の種類（'update' = 壁紙更新、'preview' = プレビュー・先読み）
+
+        Returns:
+            Optional[dict]: 書き出した記録（無効時・記録なしの場合はNone）
+        """
+        if not self.enabled:
+            return None
+        self.record_peak_rss()
+        with self._lock:
+            recent = list(self._recent)
+            self._recent.clear()
+        if not recent:
+            return None
+        snapshot = self.snapshot()
+        record = {
+            'ts': datetime.now().isoformat(timespec='seconds'),
+            'source': source,
+            'spans': recent,
+            'counters': snapshot['counters'],
+            'gauges': snapshot['gauges'],
+        }
+        if self._export_logger is not None:
+            self._export_logger.info(json.dumps(record, ensure_ascii=False))
+        return record
+
+    def render_prometheus(self) -> str:
+        """Prometheus のテキスト形式で累積値を出力"""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot['counters'].items()):
+            metric = f"{_PREFIX}_{_metric_name(name)}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value:g}"]
+        for name, value in sorted(snapshot['gauges'].items()):
+            metric = f"{_PREFIX}_{_metric_name(name)}"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value:g}"]
+        if snapshot['spans']:
+            metric = f"{_PREFIX}_span_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for name, summary in sorted(snapshot['spans'].items()):
+                label = f'{{span="{name}"}}'
+                lines.append(f"{metric}_count{label} {summary['count']}")
+                lines.append(f"{metric}_sum{label} {summary['sum_ms'] / 1000:g}")
+            metric = f"{_PREFIX}_span_max_seconds"
+            lines.append(f"# TYPE {metric} gauge")
+            for name, summary in sorted(snapshot['spans'].items()):
+                lines.append(f'{metric}{{span="{name}"}} {summary["max_ms"] / 1000:g}')
+        return '\n'.join(lines) + '\n'
+
+    # === 設定 ===
+
+    def configure(
+        self,
+        enabled: bool,
+        export_path: Optional[Path] = None,
+        max_bytes: int = 1024 * 1024,
+        backup_count: int = 3
+    ) -> None:
+        """
+        計測の有効・無効と出力先を設定
+
+        Args:
+            enabled: 計測を有効にするか
+            export_path: JSONLの出力先（Noneの場合はファイルに出力しない）
+            max_bytes: ローテーションするファイルサイズ（バイト）
+            backup_count: 残す世代数
+        """
+        self.enabled = enabled
+        if self._export_logger is not None:
+            for handler in list(self._export_logger.handlers):
+                self._export_logger.removeHandler(handler)
+                handler.close()
+            self._export_logger = None
+        if enabled and export_path is not None:
+            export_path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(
+                export_path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            export_logger = logging.getLogger(f"{__name__}.export")
+            export_logger.setLevel(logging.INFO)
+            export_logger.propagate = False
+            export_logger.addHandler(handler)
+            self._export_logger = export_logger
+        logger.info(f"計測を{'有効' if enabled else '無効'}にしました")
+
+    def reset(self) -> None:
+        """記録をすべて破棄"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._spans.clear()
+            self._recent.clear()
+
+    def start_http_server(self, port: int, host: str = '127.0.0.1') -> int:
+        """
+        Prometheus 形式のメトリクスを http://host:port/metrics で公開（デーモンスレッド）
+
+        Args:
+            port: 待ち受けポート（0 の場合は空いているポート）
+            host: 待ち受けアドレス（既定はローカルのみ）
+
+        Returns:
+            int: 待ち受けているポート
+        """
+        if self._server is not None:
+            return self._server.server_address[1]
+        # http.server は公開する場合のみ読み込む（起動時間の短縮）
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"メトリクス要求: {format % args}")
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(
+            target=self._server.serve_forever, name='calesk-metrics-http', daemon=True
+        ).start()
+        port = self._server.server_address[1]
+        logger.info(f"メトリクスを公開しました: http://{host}:{port}/metrics")
+        return port
+
+    def stop_http_server(self) -> None:
+        """メトリクスの公開を停止"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class _NullSpan:
+    """無効時の span()（何もしない）"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _metric_name(name: str) -> str:
+    """Prometheus のメトリクス名に使えない文字を置換"""
+    return ''.join(c if c.isalnum() or c == '_' else '_' for c in name)
+
+
+# プロセス共通のレジストリ
+metrics = MetricsRegistry()
+
+
+def timed(name: str):
+    """
+    関数の所要時間をスパンとして記録するデコレーター（無効時は enabled の確認のみ）
+
+    Args:
+        name: スパン名
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def configure_from_settings(enabled: Optional[bool] = None, http_port: Optional[int] = None) -> None:
+    """
+    config の設定で計測を構成
+
+    Args:
+        enabled: 計測を有効にするか（省略時は METRICS_ENABLED）
+        http_port: メトリクスを公開するポート（省略時は METRICS_HTTP_PORT、0以下は公開しない）
+    """
+    from . import config
+    if not (config.METRICS_ENABLED if enabled is None else enabled):
+        return
+    metrics.configure(
+        True,
+        export_path=config.METRICS_EXPORT_PATH,
+        max_bytes=config.METRICS_EXPORT_MAX_BYTES,
+        backup_count=config.METRICS_EXPORT_BACKUP_COUNT
+    )
+    port = config.METRICS_HTTP_PORT if http_port is None else http_port
+    if port and port > 0:
+        try:
+            metrics.start_http_server(port)
+        except OSError as e:
+            logger.warning(f"メトリクスの公開を開始できませんでした（ポート {port}）: {e}")
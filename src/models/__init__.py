@@ -3,4 +3,12 @@
 """
 from .event import CalendarEvent
 
-__all__ = ['CalendarEvent']
+__all__ = ['CalendarEvent', 'EventTable']
+
+
+def __getattr__(name):
+    # EventTable は NumPy を読み込むため、使われるまで読み込まない（起動時間の短縮）
+    if name == 'EventTable':
+        from .event_table import EventTable
+        return EventTable
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,11 +8,14 @@ from datetime import datetime
 from typing import Dict
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CalendarEvent:
     """
     カレンダーイベントの統一モデル
 
+    __slots__ 化によりインスタンスごとの __dict__ を持たない。
+    共有カレンダー等で数千件を保持する場合のメモリ・生成コストを削減する。
+
     Args:
         id: イベントID
         summary: イベントタイトル
@@ -0,0 +1,181 @@
+"""
+カラム指向イベントテーブル
+
+大量のCalendarEventを NumPy datetime64 配列として保持し、
+日別バケット分けや重複検出をベクトル演算で行う。
+"""
+import sys
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from .event import CalendarEvent
+
+
+def _to_naive(dt: datetime) -> datetime:
+    """タイムゾーン情報を取り除く（datetime64はナイーブ時刻のみ扱う）"""
+    if dt.tzinfo is not None:
+        return dt.replace(tzinfo=None)
+    return dt
+
+
+class EventTable:
+    """
+    CalendarEventのカラム指向ビュー
+
+    開始・終了時刻を datetime64[s] 配列、文字列カラムを intern 済み文字列で保持する。
+    元のイベントオブジェクトは events に同じ順序で保持され、
+    インデックス配列から元のイベントへ戻せる。
+
+    Args:
+        events: 元になるイベントリスト
+    """
+
+    __slots__ = (
+        'events', 'starts', 'ends', 'is_all_day',
+        'calendar_ids', 'account_ids', 'account_colors',
+    )
+
+    def __init__(self, events: Iterable[CalendarEvent]):
+        self.events: List[CalendarEvent] = list(events)
+        self.starts = np.array(
+            [_to_naive(e.start_datetime) for e in self.events], dtype='datetime64[s]'
+        )
+        self.ends = np.array(
+            [_to_naive(e.end_datetime) for e in self.events], dtype='datetime64[s]'
+        )
+        self.is_all_day = np.array([e.is_all_day for e in self.events], dtype=bool)
+
+        intern = sys.intern
+        self.calendar_ids = [intern(e.calendar_id) for e in self.events]
+        self.account_ids = [intern(e.account_id) for e in self.events]
+        self.account_colors = [intern(e.account_color) for e in self.events]
+
+    @classmethod
+    def from_events(cls, events: Iterable[CalendarEvent]) -> 'EventTable':
+        """
+        イベントリストからテーブルを構築
+
+        Args:
+            events: イベントリスト
+
+        Returns:
+            EventTable: 構築されたテーブル
+        """
+        return cls(events)
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __iter__(self) -> Iterator[CalendarEvent]:
+        return iter(self.events)
+
+    @property
+    def start_dates(self) -> np.ndarray:
+        """開始日（datetime64[D]）の配列"""
+        return self.starts.astype('datetime64[D]')
+
+    def take(self, indices: np.ndarray) -> List[CalendarEvent]:
+        """
+        インデックス配列に対応するイベントを取り出す
+
+        Args:
+            indices: イベントのインデックス配列
+
+        Returns:
+            List[CalendarEvent]: 対応するイベントのリスト
+        """
+        events = self.events
+        return [events[i] for i in indices.tolist()]
+
+    def indices_starting_on(self, target_date: date) -> np.ndarray:
+        """
+        指定日に開始するイベントのインデックスを取得
+
+        Args:
+            target_date: 対象日
+
+        Returns:
+            np.ndarray: インデックス配列（元の順序を維持）
+        """
+        return np.flatnonzero(self.start_dates == np.datetime64(target_date, 'D'))
+
+    def bucket_by_start_date(self, start_date: date, days: int) -> Dict[int, List[CalendarEvent]]:
+        """
+        開始日ごとにイベントを振り分ける
+
+        Args:
+            start_date: 起点日（オフセット0）
+            days: 日数
+
+        Returns:
+            Dict[int, List[CalendarEvent]]: {日オフセット: イベントリスト}（イベントのない日は含まない）
+        """
+        if not self.events or days <= 0:
+            return {}
+
+        offsets = (self.start_dates - np.datetime64(start_date, 'D')).astype(np.int64)
+        in_range = np.flatnonzero((offsets >= 0) & (offsets < days))
+        if in_range.size == 0:
+            return {}
+
+        # 安定ソートで同日内の元の順序を維持
+        order = in_range[np.argsort(offsets[in_range], kind='stable')]
+        sorted_offsets = offsets[order]
+        boundaries = np.flatnonzero(np.diff(sorted_offsets)) + 1
+
+        buckets: Dict[int, List[CalendarEvent]] = {}
+        for chunk in np.split(order, boundaries):
+            buckets[int(offsets[chunk[0]])] = self.take(chunk)
+        return buckets
+
+    def overlaps(self, start: datetime, end: datetime) -> np.ndarray:
+        """
+        指定区間と重なるイベントのブールマスクを取得
+
+        Args:
+            start: 区間開始
+            end: 区間終了
+
+        Returns:
+            np.ndarray: 重なる場合Trueのマスク
+        """
+        start64 = np.datetime64(_to_naive(start), 's')
+        end64 = np.datetime64(_to_naive(end), 's')
+        return (self.starts < end64) & (self.ends > start64)
+
+    def overlap_group_ids(self) -> np.ndarray:
+        """
+        重複関係の連結グループIDを計算
+
+        イベントは開始時刻順に並んでいる前提。
+        直前までの最大終了時刻より後に始まるイベントで新しいグループが始まる。
+
+        Returns:
+            np.ndarray: 各イベントのグループID（0始まり）
+        """
+        count = len(self.events)
+        if count == 0:
+            return np.empty(0, dtype=np.int64)
+
+        running_end = np.maximum.accumulate(self.ends)
+        new_group = np.empty(count, dtype=bool)
+        new_group[0] = True
+        new_group[1:] = self.starts[1:] >= running_end[:-1]
+        return np.cumsum(new_group) - 1
+
+    def next_start_after(self, moment: datetime) -> Optional[datetime]:
+        """
+        指定時刻より後に開始する最も早いイベントの開始時刻
+
+        Args:
+            moment: 基準時刻
+
+        Returns:
+            Optional[datetime]: 開始時刻。該当なしの場合はNone。
+        """
+        future = self.starts[self.starts > np.datetime64(_to_naive(moment), 's')]
+        if future.size == 0:
+            return None
+        return future.min().astype(datetime)
@@ -0,0 +1,243 @@
+"""
+マルチディスプレイ壁紙描画モジュール
+
+接続中の各ディスプレイの解像度ごとに壁紙を生成する。
+- イベントの振り分け（解像度に依存しない処理）は1回だけ計算して共有
+- 同じ解像度のディスプレイは1枚の画像を共有
+- 異なる解像度の描画はプロセスプールで並列実行（プールは初回に作成して使い回し、終了時に停止）
+"""
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .atomic_output import next_slot_path
+from .cancellation import CancellationToken, check_cancelled
+from .config import OUTPUT_DIR, WALLPAPER_FILENAME_TEMPLATE, MULTI_DISPLAY_MAX_WORKERS
+from .models.event import CalendarEvent
+
+logger = logging.getLogger(__name__)
+
+# 並列描画の完了を待つ間、キャンセルを確認する間隔（秒）
+_CANCEL_POLL_SECONDS = 0.1
+
+# 並列描画用のプロセスプール（初回の並列描画で作成し、以降は使い回す）
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    """1解像度分の描画ジョブ（子プロセスに渡すためpickle可能な値のみ保持）"""
+    resolution: Tuple[int, int]
+    theme_name: str
+    background_path: Optional[str]
+    crop_position: str
+    today_events: List[CalendarEvent]
+    week_events: List[CalendarEvent]
+    event_index: Dict
+    output_path: Path
+
+
+def render_job(job: RenderJob, cancel_token: Optional[CancellationToken] = None) -> Optional[Path]:
+    """
+    描画ジョブを実行（プロセスプールのワーカーから呼ばれる）
+
+    Args:
+        job: 描画ジョブ
+        cancel_token: キャンセルトークン（同じプロセスで描画する場合のみ）
+
+    Returns:
+        Optional[Path]: 生成した画像のパス。失敗時はNone。
+    """
+    from .image_generator import ImageGenerator
+
+    generator = ImageGenerator(resolution=job.resolution)
+    generator.set_theme(job.theme_name)
+    if job.background_path:
+        generator.set_background_image(job.background_path)
+    generator.set_crop_position(job.crop_position)
+    try:
+        return generator.generate_wallpaper(
+            job.today_events,
+            job.week_events,
+            output_path=job.output_path,
+            event_index=job.event_index,
+            cancel_token=cancel_token
+        )
+    finally:
+        generator.release_resources()
+
+
+def display_output_path(theme_name: str, resolution: Tuple[int, int], output_dir: Optional[Path] = None) -> Path:
+    """
+    解像度別の出力ファイルのベースパスを作成（実際の書き込み先はA/Bスロット）
+
+    Args:
+        theme_name: テーマ名
+        resolution: (width, height)
+        output_dir: 出力ディレクトリ（省略時はOUTPUT_DIR）
+
+    Returns:
+        Path: 例) output/wallpaper_modern_20260205_2560x1440.png
+    """
+    filename = WALLPAPER_FILENAME_TEMPLATE.format(
+        theme=theme_name,
+        date=datetime.now().strftime('%Y%m%d')
+    )
+    stem, suffix = os.path.splitext(filename)
+    return (output_dir or OUTPUT_DIR) / f"{stem}_{resolution[0]}x{resolution[1]}{suffix}"
+
+
+def render_for_displays(
+    generator,
+    today_events: List[CalendarEvent],
+    week_events: List[CalendarEvent],
+    resolutions: List[Tuple[int, int]],
+    output_dir: Optional[Path] = None,
+    max_workers: Optional[int] = MULTI_DISPLAY_MAX_WORKERS,
+    protected_paths: Iterable[Path] = (),
+    cancel_token: Optional[CancellationToken] = None
+) -> List[Optional[Path]]:
+    """
+    ディスプレイごとの解像度で壁紙を生成
+
+    Args:
+        generator: テーマ・背景設定の参照元となるImageGenerator
+        today_events: 今日のイベント
+        week_events: 週間イベント
+        resolutions: ディスプレイ順の解像度リスト
+        output_dir: 出力ディレクトリ（省略時はOUTPUT_DIR）
+        max_workers: 並列描画のプロセス数上限（None = CPUコア数）
+        protected_paths: 上書きしないパス（表示中の壁紙）
+        cancel_token: キャンセルトークン
+
+    Returns:
+        List[Optional[Path]]: ディスプレイ順の画像パス（同じ解像度は同じパス、失敗はNone）
+
+    Raises:
+        OperationCancelled: キャンセルされた場合
+    """
+    unique_resolutions = list(dict.fromkeys(resolutions))
+    if not unique_resolutions:
+        return []
+
+    protected_paths = list(protected_paths)
+    event_index = generator.build_event_index(week_events)
+    background = generator.custom_background_path
+    jobs = [
+        RenderJob(
+            resolution=resolution,
+            theme_name=generator.theme_name,
+            background_path=str(background) if background else None,
+            crop_position=generator.crop_position,
+            today_events=today_events,
+            week_events=week_events,
+            event_index=event_index,
+            output_path=next_slot_path(
+                display_output_path(generator.theme_name, resolution, output_dir),
+                avoid=protected_paths
+            ),
+        )
+        for resolution in unique_resolutions
+    ]
+    (output_dir or OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
+
+    logger.info(
+        f"マルチディスプレイ描画: {len(resolutions)}台 / {len(unique_resolutions)}解像度 "
+        f"({', '.join(f'{w}x{h}' for w, h in unique_resolutions)})"
+    )
+
+    results = _run_jobs(jobs, max_workers, cancel_token)
+    by_resolution = dict(zip(unique_resolutions, results))
+    return [by_resolution[resolution] for resolution in resolutions]
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    並列描画用のプロセスプールを取得（なければ作成）
+
+    既存のプールのプロセス数が足りない場合のみ作り直す。
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers < workers:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            # Qtのスレッドから呼ばれるため fork ではなく spawn で起動する
+            # （PyInstaller 版では各エントリポイントの multiprocessing.freeze_support() が必要）
+            context = multiprocessing.get_context('spawn')
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _pool_workers = workers
+            logger.debug(f"並列描画用のプロセスプールを作成しました（{workers}プロセス）")
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """使えなくなったプールを破棄（次回の並列描画で作り直す）"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+            _pool_workers = 0
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pool() -> None:
+    """並列描画用のプロセスプールを停止（アプリ終了時に呼ばれる）"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        pool, _pool, _pool_workers = _pool, None, 0
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_pool)
+
+
+def _run_jobs(
+    jobs: List[RenderJob],
+    max_workers: Optional[int],
+    cancel_token: Optional[CancellationToken] = None
+) -> List[Optional[Path]]:
+    """描画ジョブを実行（2件以上はプロセスプール、失敗時は順次実行にフォールバック）"""
+    if len(jobs) == 1:
+        return [render_job(jobs[0], cancel_token)]
+
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    if workers > 1:
+        pool = None
+        try:
+            pool = _get_pool(workers)
+            futures = [pool.submit(render_job, job) for job in jobs]
+            if cancel_token is not None:
+                # 子プロセスにはトークンを渡せないため、待機中に確認して未開始のジョブを取り消す
+                pending = set(futures)
+                while pending:
+                    if cancel_token.cancelled:
+                        for future in pending:
+                            future.cancel()
+                        check_cancelled(cancel_token, "マルチディスプレイ描画")
+                    _, pending = wait(pending, timeout=_CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            return [future.result() for future in futures]
+        except BrokenProcessPool as e:
+            logger.warning(f"並列描画のプロセスが異常終了したため順次描画します: {e}")
+            if pool is not None:
+                _discard_pool(pool)
+        except Exception as e:
+            logger.warning(f"並列描画に失敗したため順次描画します: {e}")
+
+    results = []
+    for job in jobs:
+        check_cancelled(cancel_token, "マルチディスプレイ描画")
+        results.append(render_job(job, cancel_token))
+    return results
@@ -0,0 +1,182 @@
+"""
+通知の非同期送信キュー
+
+plyer の notify はバックエンドによっては timeout の間や D-Bus の応答待ちで
+ブロックするため、専用のワーカースレッドで送信する。
+- 短時間に届いた通知はまとめて処理し、同じグループ（同じ開始時刻の予定など）は
+  1つの通知にまとめる
+- キューが上限に達したら古い通知から破棄する（送信元には失敗として通知）
+- 投入から送信完了までの遅延を記録する
+"""
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional
+
+from .config import NOTIFICATION_COALESCE_SECONDS, NOTIFICATION_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class NotificationRequest:
+    """送信待ちの通知"""
+    title: str
+    message: str
+    group: Optional[str] = None
+    timeout: int = 10
+    on_done: Optional[Callable[[bool], None]] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class NotificationDispatcher:
+    """
+    通知の非同期送信キュー
+
+    Args:
+        send: 通知を送信する関数 (title, message, timeout) -> bool
+        coalesce_seconds: 最初の通知からまとめて送信するまでの待ち時間（秒）
+        max_queue: キューの上限件数
+    """
+
+    def __init__(
+        self,
+        send: Callable[..., bool],
+        coalesce_seconds: float = NOTIFICATION_COALESCE_SECONDS,
+        max_queue: int = NOTIFICATION_QUEUE_SIZE
+    ):
+        self._send = send
+        self.coalesce_seconds = coalesce_seconds
+        self.max_queue = max_queue
+        self._queue: Deque[NotificationRequest] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._busy = False
+        self._stopping = False
+        self.metrics: Dict[str, float] = {
+            'delivered': 0,
+            'failed': 0,
+            'dropped': 0,
+            'coalesced': 0,
+            'last_latency': 0.0,
+            'max_latency': 0.0,
+        }
+
+    def submit(self, request: NotificationRequest) -> None:
+        """
+        通知をキューに追加（ブロックしない）
+
+        Args:
+            request: 送信する通知
+        """
+        dropped = None
+        with self._cond:
+            if self._stopping:
+                dropped = request
+            else:
+                if len(self._queue) >= self.max_queue:
+                    dropped = self._queue.popleft()
+                self._queue.append(request)
+                self._ensure_worker()
+                self._cond.notify_all()
+        if dropped is not None:
+            self.metrics['dropped'] += 1
+            logger.warning(f"通知キューが上限に達したため破棄しました: {dropped.title}")
+            self._finish([dropped], False)
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name='calesk-notification-dispatcher', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                # 最初の通知から coalesce_seconds の間に届いたものをまとめる
+                deadline = self._queue[0].enqueued_at + self.coalesce_seconds
+                while not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = list(self._queue)
+                self._queue.clear()
+                self._busy = True
+            try:
+                self._deliver(batch)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _deliver(self, batch: List[NotificationRequest]) -> None:
+        """グループごとに1つの通知にまとめて送信"""
+        groups: Dict[object, List[NotificationRequest]] = {}
+        for request in batch:
+            key = request.group if request.group is not None else id(request)
+            groups.setdefault(key, []).append(request)
+
+        for requests in groups.values():
+            first = requests[0]
+            if len(requests) == 1:
+                title, message = first.title, first.message
+            else:
+                title = f"{first.title}（{len(requests)}件）"
+                message = '\n'.join(request.message for request in requests)
+                self.metrics['coalesced'] += len(requests) - 1
+            try:
+                success = bool(self._send(title, message, timeout=first.timeout))
+            except Exception as e:
+                logger.error(f"通知送信エラー: {e}")
+                success = False
+
+            latency = time.monotonic() - first.enqueued_at
+            self.metrics['last_latency'] = latency
+            self.metrics['max_latency'] = max(self.metrics['max_latency'], latency)
+            self.metrics['delivered' if success else 'failed'] += 1
+            self._finish(requests, success)
+
+    @staticmethod
+    def _finish(requests: List[NotificationRequest], success: bool) -> None:
+        for request in requests:
+            if request.on_done is None:
+                continue
+            try:
+                request.on_done(success)
+            except Exception as e:
+                logger.error(f"通知完了コールバックでエラーが発生: {e}")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        キューが空になり送信が終わるまで待つ
+
+        Args:
+            timeout: 最大待ち時間（秒）。Noneの場合は無制限。
+
+        Returns:
+            bool: 送信が完了していればTrue
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        残っている通知を送信してからワーカーを停止
+
+        Args:
+            timeout: ワーカー終了の最大待ち時間（秒）
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
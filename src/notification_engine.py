@@ -0,0 +1,221 @@
+"""
+通知スケジューリングエンジン
+
+予定ごとの通知時刻（開始時刻 - 通知タイミング）を最小ヒープで管理し、
+通知時刻を迎えたものだけを取り出す。
+- 通知済みの記録は「イベントID + 開始時刻」をキーにしてJSONに保存する
+  （再起動しても再通知しない / 時刻が変更された予定は改めて通知する）
+- 記録には有効期限を持たせ、開始後しばらく経った予定の記録は自動的に削除する
+- next_deadline() で次の通知時刻が分かるため、デーモンはその時刻まで正確にスリープできる
+"""
+import heapq
+import json
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models.event import CalendarEvent
+from .security_utils import ensure_private_dir, secure_file_permissions
+
+logger = logging.getLogger(__name__)
+
+# 通知済み記録の保持期間（予定開始からの経過時間）
+DEDUPE_RETENTION = timedelta(days=2)
+
+
+def _naive_start(event: CalendarEvent) -> datetime:
+    """開始時刻（タイムゾーン情報を除いたローカル時刻）"""
+    start_time = event.start_datetime
+    if start_time.tzinfo:
+        start_time = start_time.replace(tzinfo=None)
+    return start_time
+
+
+def dedupe_key(event: CalendarEvent) -> str:
+    """
+    通知済み判定のキー
+
+    Args:
+        event: イベント
+
+    Returns:
+        str: "イベントID@開始時刻"（時刻が変わった予定は別キーになる）
+    """
+    return f"{event.id}@{_naive_start(event).isoformat(timespec='minutes')}"
+
+
+class NotifiedStore:
+    """
+    通知済みキーの永続化（有効期限付き）
+
+    {キー: 有効期限(ISO形式)} をJSONで保存する。
+
+    Args:
+        state_path: 保存先のJSONファイル（Noneの場合はメモリ上のみ）
+    """
+
+    def __init__(self, state_path: Optional[Path] = None):
+        self.state_path = state_path
+        self._entries: Dict[str, str] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if self.state_path is None:
+            return
+        try:
+            if self.state_path.exists():
+                data = json.loads(self.state_path.read_text())
+                if isinstance(data, dict):
+                    self._entries = {str(k): str(v) for k, v in data.items()}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"通知済みイベントの記録を読み込めませんでした: {e}")
+        if self.prune():
+            self._save()
+
+    def _save(self) -> None:
+        if self.state_path is None:
+            return
+        try:
+            ensure_private_dir(self.state_path.parent)
+            self.state_path.write_text(json.dumps(self._entries, ensure_ascii=False))
+            secure_file_permissions(self.state_path)
+        except OSError as e:
+            logger.warning(f"通知済みイベントの記録を保存できませんでした: {e}")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: str, expires_at: datetime) -> None:
+        """通知済みとして記録"""
+        self._entries[key] = expires_at.isoformat()
+        self._save()
+
+    def prune(self, now: Optional[datetime] = None) -> int:
+        """
+        有効期限切れの記録を削除
+
+        Returns:
+            int: 削除した件数
+        """
+        now = now or datetime.now()
+        expired = []
+        for key, expires_at in self._entries.items():
+            try:
+                if datetime.fromisoformat(expires_at) <= now:
+                    expired.append(key)
+            except ValueError:
+                expired.append(key)
+        for key in expired:
+            del self._entries[key]
+        return len(expired)
+
+    def clear(self) -> None:
+        """すべての記録を削除"""
+        self._entries = {}
+        self._save()
+
+
+class NotificationEngine:
+    """
+    通知時刻の最小ヒープ
+
+    schedule() で最新のイベント一覧を登録し、pop_due() で通知時刻を迎えた
+    イベントだけを取り出す。ヒープには (通知時刻, 開始時刻, 連番, キー) を積み、
+    登録し直しで不要になった要素は取り出し時に読み捨てる（遅延削除）。
+
+    Args:
+        lead_minutes: 予定開始何分前に通知するか
+        store: 通知済みキーの記録
+    """
+
+    def __init__(self, lead_minutes: int, store: Optional[NotifiedStore] = None):
+        self.lead_minutes = lead_minutes
+        self.store = store if store is not None else NotifiedStore()
+        self._heap: List[Tuple[datetime, datetime, int, str]] = []
+        self._pending: Dict[str, CalendarEvent] = {}
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def schedule(self, events: Iterable[CalendarEvent], now: Optional[datetime] = None) -> None:
+        """
+        通知対象のイベントを登録し直す
+
+        終日イベント・開始済みのイベント・通知済みのイベントは登録しない。
+        前回の登録内容は破棄する（削除・時刻変更された予定を通知しないため）。
+
+        Args:
+            events: イベントリスト
+            now: 現在時刻（省略時は datetime.now()）
+        """
+        now = now or datetime.now()
+        lead = timedelta(minutes=self.lead_minutes)
+        self._pending = {}
+        entries = []
+        for event in events:
+            if event.is_all_day:
+                continue
+            start_time = _naive_start(event)
+            if start_time <= now:
+                continue
+            key = dedupe_key(event)
+            if key in self.store or key in self._pending:
+                continue
+            self._pending[key] = event
+            self._counter += 1
+            entries.append((start_time - lead, start_time, self._counter, key))
+        heapq.heapify(entries)
+        self._heap = entries
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[Tuple[CalendarEvent, datetime]]:
+        """
+        通知時刻を迎えたイベントを取り出す
+
+        開始時刻を過ぎてしまったイベントは通知せずに捨てる。
+
+        Args:
+            now: 現在時刻（省略時は datetime.now()）
+
+        Returns:
+            List[Tuple[CalendarEvent, datetime]]: (イベント, 開始時刻) の通知時刻順リスト
+        """
+        now = now or datetime.now()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, start_time, _, key = heapq.heappop(self._heap)
+            event = self._pending.pop(key, None)
+            if event is None or key in self.store:
+                continue
+            if start_time <= now:
+                continue
+            due.append((event, start_time))
+        return due
+
+    def mark_notified(self, event: CalendarEvent) -> None:
+        """通知済みとして記録（開始から DEDUPE_RETENTION 経過後に期限切れ）"""
+        self.store.add(dedupe_key(event), _naive_start(event) + DEDUPE_RETENTION)
+
+    def next_deadline(self) -> Optional[datetime]:
+        """
+        次の通知時刻
+
+        Returns:
+            Optional[datetime]: 未通知のイベントのうち最も早い通知時刻。なければNone。
+        """
+        while self._heap:
+            key = self._heap[0][3]
+            if key in self._pending and key not in self.store:
+                return self._heap[0][0]
+            heapq.heappop(self._heap)
+        return None
+
+    def clear(self) -> None:
+        """登録内容と通知済みの記録をすべて破棄"""
+        self._heap = []
+        self._pending = {}
+        self.store.clear()
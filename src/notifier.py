@@ -3,13 +3,18 @@
 予定開始前にデスクトップ通知を送信
 """
 import logging
-from datetime import datetime, timedelta
-from typing import List, Set
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Set
 
 from plyer import notification
 
+from . import config
 from .config import NOTIFICATION_ADVANCE_MINUTES
 from .models.event import CalendarEvent
+from .notification_dispatcher import NotificationDispatcher, NotificationRequest
+from .notification_engine import NotificationEngine, NotifiedStore, dedupe_key
 
 logger = logging.getLogger(__name__)
 
@@ -17,9 +22,50 @@ logger = logging.getLogger(__name__)
 class Notifier:
     """通知送信クラス"""
 
-    def __init__(self):
-        self.advance_minutes = NOTIFICATION_ADVANCE_MINUTES
-        self.notified_event_ids: Set[str] = set()
+    def __init__(
+        self,
+        state_path: Optional[Path] = None,
+        dispatcher: Optional[NotificationDispatcher] = None
+    ):
+        """
+        初期化
+
+        Args:
+            state_path: 通知済みイベントの記録先（省略時は NOTIFIED_EVENTS_STATE_PATH）
+            dispatcher: 非同期送信キュー（Noneの場合は呼び出し元のスレッドで送信）
+        """
+        self.engine = NotificationEngine(
+            NOTIFICATION_ADVANCE_MINUTES,
+            NotifiedStore(state_path or config.NOTIFIED_EVENTS_STATE_PATH)
+        )
+        self.dispatcher = dispatcher
+        # 送信キューに入っていて結果待ちのイベント（二重投入防止）
+        self._in_flight: Set[str] = set()
+        self._lock = threading.RLock()
+
+    @classmethod
+    def with_dispatcher(cls, state_path: Optional[Path] = None) -> 'Notifier':
+        """
+        非同期送信キュー付きのNotifierを作成
+
+        Args:
+            state_path: 通知済みイベントの記録先
+
+        Returns:
+            Notifier: 通知を専用スレッドで送信するインスタンス
+        """
+        notifier = cls(state_path)
+        notifier.dispatcher = NotificationDispatcher(notifier.send_notification)
+        return notifier
+
+    @property
+    def advance_minutes(self) -> int:
+        """予定開始何分前に通知するか"""
+        return self.engine.lead_minutes
+
+    @advance_minutes.setter
+    def advance_minutes(self, minutes: int) -> None:
+        self.engine.lead_minutes = minutes
 
     def send_notification(
         self,
@@ -58,31 +104,45 @@ class Notifier:
         """
         今後の予定をチェックして通知が必要なイベントを通知
 
+        イベントを通知エンジンに登録し直し、通知時刻を迎えたものだけを通知する。
+        通知済みの判定は「イベントID + 開始時刻」で行い、再起動後も保持される。
+
         Args:
             events: イベントリスト
         """
         now = datetime.now()
-        notification_time = now + timedelta(minutes=self.advance_minutes)
+        with self._lock:
+            self.engine.schedule(events, now)
+        self._dispatch(now)
 
-        for event in events:
-            # 終日イベントはスキップ
-            if event.is_all_day:
-                continue
+    def dispatch_due(self) -> None:
+        """
+        登録済みのイベントのうち通知時刻を迎えたものを通知
 
-            start_time = event.start_datetime
+        イベントを取得し直さずに通知できるため、next_deadline() の時刻に呼び出す。
+        """
+        self._dispatch(datetime.now())
 
-            # タイムゾーンをローカルに変換（必要に応じて）
-            if start_time.tzinfo:
-                start_time = start_time.replace(tzinfo=None)
+    def next_deadline(self) -> Optional[datetime]:
+        """
+        次の通知時刻
 
-            # 通知タイミングをチェック
+        Returns:
+            Optional[datetime]: 未通知のイベントのうち最も早い通知時刻。なければNone。
+        """
+        with self._lock:
+            return self.engine.next_deadline()
+
+    def _dispatch(self, now: datetime) -> None:
+        """通知時刻を迎えたイベントを通知（失敗したものは次回のチェックで再試行）"""
+        with self._lock:
+            due = [
+                (event, start_time) for event, start_time in self.engine.pop_due(now)
+                if dedupe_key(event) not in self._in_flight
+            ]
+        for event, start_time in due:
             time_until_event = (start_time - now).total_seconds() / 60
-
-            if 0 < time_until_event <= self.advance_minutes:
-                # 通知済みのイベントはスキップ
-                if event.id in self.notified_event_ids:
-                    continue
-                self._send_event_notification(event, int(time_until_event))
+            self._send_event_notification(event, int(time_until_event))
 
     def _send_event_notification(self, event: CalendarEvent, minutes_until: int) -> None:
         """
@@ -102,22 +162,49 @@ class Notifier:
         else:
             message = f"{start_time} - {summary}"
 
-        success = self.send_notification(title, message)
-        if success:
-            self.notified_event_ids.add(event.id)
+        if self.dispatcher is None:
+            self._on_event_notified(event, self.send_notification(title, message))
+            return
+
+        # 同じ開始時刻の予定は送信キューで1つの通知にまとめられる
+        key = dedupe_key(event)
+        with self._lock:
+            self._in_flight.add(key)
+        self.dispatcher.submit(NotificationRequest(
+            title=title,
+            message=message,
+            group=f"event@{event.start_datetime.isoformat(timespec='minutes')}",
+            on_done=lambda success: self._on_event_notified(event, success),
+        ))
+
+    def _on_event_notified(self, event: CalendarEvent, success: bool) -> None:
+        """送信結果を反映（成功したイベントのみ通知済みとして記録）"""
+        with self._lock:
+            self._in_flight.discard(dedupe_key(event))
+            if success:
+                self.engine.mark_notified(event)
 
     def clear_notified_ids(self) -> None:
         """
         通知済みイベントIDをクリア
 
-        日付変更時やリセットが必要な場合に使用する。
+        保存済みの通知済み記録も削除する。リセットが必要な場合に使用する。
         """
-        self.notified_event_ids = set()
+        with self._lock:
+            self.engine.clear()
 
     def send_update_notification(self) -> None:
         """
         壁紙更新完了の通知を送信
         """
+        if self.dispatcher is not None:
+            self.dispatcher.submit(NotificationRequest(
+                title='壁紙を更新しました',
+                message='今日の予定が表示されています',
+                group='wallpaper-update',
+                timeout=5
+            ))
+            return
         self.send_notification(
             title='壁紙を更新しました',
             message='今日の予定が表示されています',
@@ -0,0 +1,136 @@
+"""
+出力ディレクトリの管理
+
+OUTPUT_DIR に溜まる壁紙ファイルを保持ポリシーに従って削除する。
+- 現在の壁紙（今回生成・適用中）とキャッシュ壁紙（WallpaperCache）は削除しない
+- 上記以外で最近使われた OUTPUT_KEEP_PREVIOUS 件は期限切れでも残す
+- それ以外は OUTPUT_MAX_AGE_DAYS を過ぎたものから削除
+- 合計サイズが OUTPUT_MAX_BYTES を超える場合は、使われていない順（LRU）に削除
+"""
+import logging
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from .config import OUTPUT_DIR, OUTPUT_KEEP_PREVIOUS, OUTPUT_MAX_AGE_DAYS, OUTPUT_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# 書き込み途中で残った一時ファイル（atomic_output）を削除するまでの時間（秒）
+_STALE_TEMP_SECONDS = 3600
+
+
+class OutputStore:
+    """
+    出力ディレクトリの保持ポリシー管理
+
+    Args:
+        output_dir: 出力ディレクトリ
+        keep_previous: 現在の壁紙以外に必ず残す直近のファイル数
+        max_age_days: 保持期間（日）
+        max_bytes: 合計サイズの上限（バイト）
+        wallpaper_cache: キャッシュ壁紙を保護するための WallpaperCache
+    """
+
+    PATTERN = 'wallpaper_*'
+
+    def __init__(
+        self,
+        output_dir: Path = OUTPUT_DIR,
+        keep_previous: int = OUTPUT_KEEP_PREVIOUS,
+        max_age_days: float = OUTPUT_MAX_AGE_DAYS,
+        max_bytes: int = OUTPUT_MAX_BYTES,
+        wallpaper_cache=None
+    ):
+        self.output_dir = output_dir
+        self.keep_previous = keep_previous
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self.wallpaper_cache = wallpaper_cache
+
+    def _scan(self) -> List[Tuple[Path, int, float]]:
+        """出力ファイルの一覧 [(パス, サイズ, 最終使用時刻)]（最近使われた順）"""
+        entries = []
+        for path in self.output_dir.glob(self.PATTERN):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if not path.is_file():
+                continue
+            # atime はマウント設定で更新されないことがあるため mtime と大きい方を使う
+            entries.append((path, stat.st_size, max(stat.st_atime, stat.st_mtime)))
+        entries.sort(key=lambda entry: entry[2], reverse=True)
+        return entries
+
+    def _remove_stale_temp_files(self, now: float) -> None:
+        """書き込み途中で中断された一時ファイルを削除"""
+        for path in self.output_dir.glob('.wallpaper_*.tmp'):
+            try:
+                if now - path.stat().st_mtime > _STALE_TEMP_SECONDS:
+                    path.unlink()
+            except OSError:
+                continue
+
+    def evict(self, current: Iterable[Optional[Path]] = (), protected: Iterable[Optional[Path]] = ()) -> List[Path]:
+        """
+        保持ポリシーに従って古い出力ファイルを削除
+
+        Args:
+            current: 今回生成した壁紙（常に保持）
+            protected: 適用中の壁紙など、削除してはいけないファイル
+
+        Returns:
+            List[Path]: 削除したファイル
+        """
+        if not self.output_dir.exists():
+            return []
+
+        keep = {Path(p).resolve() for p in (*current, *protected) if p}
+        if self.wallpaper_cache is not None:
+            keep.update(p.resolve() for p in self.wallpaper_cache.protected_paths())
+
+        now = time.time()
+        self._remove_stale_temp_files(now)
+
+        entries = self._scan()
+        total_bytes = sum(size for _, size, _ in entries)
+        candidates = [entry for entry in entries if entry[0].resolve() not in keep]
+
+        evicted: List[Path] = []
+
+        def remove(entry) -> None:
+            nonlocal total_bytes
+            path, size, _ = entry
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"出力ファイルを削除できませんでした ({path.name}): {e}")
+                return
+            total_bytes -= size
+            evicted.append(path)
+
+        # 直近N件以外の期限切れファイル
+        max_age_seconds = self.max_age_days * 86400
+        remaining = candidates[:self.keep_previous]
+        for entry in candidates[self.keep_previous:]:
+            if now - entry[2] > max_age_seconds:
+                remove(entry)
+            else:
+                remaining.append(entry)
+
+        # サイズ上限を超えていれば使われていない順に削除（直近N件も対象、保護ファイルは除く）
+        remaining.sort(key=lambda entry: entry[2])
+        for entry in remaining:
+            if total_bytes <= self.max_bytes:
+                break
+            remove(entry)
+
+        if evicted:
+            logger.info(
+                f"古い出力ファイルを{len(evicted)}件削除しました"
+                f"（残り{total_bytes / (1024 * 1024):.1f}MB）"
+            )
+        return evicted
@@ -0,0 +1,121 @@
+"""
+壁紙生成パイプラインの進捗と段階ごとの所要時間
+
+予定取得 → レイアウト → 背景 → 予定カード → 週間カレンダー → エンコード → 壁紙設定
+の各段階の完了時に mark() を呼び、前回の mark() からの経過時間をその段階の所要時間として記録する。
+進捗率は段階ごとに決めた完了時の値を使う（実行しない段階は飛ばす）。
+計測が有効な場合は、段階の所要時間を pipeline.<段階名> のスパンとしても記録する。
+"""
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 段階名: (表示名, 完了時の進捗率)。実行順に並べる
+PIPELINE_STAGES: Dict[str, tuple] = {
+    'fetch': ('予定の取得', 35),
+    'layout': ('レイアウト', 40),
+    'background': ('背景', 50),
+    'cards': ('予定カード', 60),
+    'week_calendar': ('週間カレンダー', 70),
+    'encode': ('エンコード', 90),
+    'apply': ('壁紙の設定', 100),
+}
+
+# 進捗の通知先 (段階名, 進捗率, 所要時間)。所要時間は段階の途中経過の通知ではNone
+ProgressCallback = Callable[[str, int, Optional[float]], None]
+
+
+def stage_label(stage: str) -> str:
+    """段階の表示名"""
+    return PIPELINE_STAGES.get(stage, (stage, 0))[0]
+
+
+class PipelineProgress:
+    """
+    パイプラインの進捗・所要時間の記録
+
+    Args:
+        callback: 進捗の通知先（省略時は記録のみ）
+    """
+
+    def __init__(self, callback: Optional[ProgressCallback] = None):
+        self._callback = callback
+        self._started = time.perf_counter()
+        self._last = self._started
+        self._percent = 0
+        self.timings: Dict[str, float] = {}
+
+    def _start_percent(self, stage: str) -> int:
+        """段階の開始時の進捗率（直前の段階の完了時の値）"""
+        previous = 0
+        for name, (_, percent) in PIPELINE_STAGES.items():
+            if name == stage:
+                return previous
+            previous = percent
+        return self._percent
+
+    def _notify(self, stage: str, elapsed: Optional[float]) -> None:
+        if self._callback is None:
+            return
+        try:
+            self._callback(stage, self._percent, elapsed)
+        except Exception as e:
+            logger.warning(f"進捗の通知に失敗しました: {e}")
+
+    def advance(self, stage: str, fraction: float) -> None:
+        """
+        段階の途中経過を通知（例: アカウントごとの予定取得）
+
+        Args:
+            stage: 段階名
+            fraction: 段階内の進み具合（0.0〜1.0）
+        """
+        start = self._start_percent(stage)
+        end = PIPELINE_STAGES.get(stage, (stage, start))[1]
+        percent = start + int((end - start) * max(0.0, min(1.0, fraction)))
+        if percent > self._percent:
+            self._percent = percent
+            self._notify(stage, None)
+
+    def mark(self, stage: str) -> float:
+        """
+        段階の完了を記録（計測が有効なら pipeline.<段階名> のスパンも記録）
+
+        Args:
+            stage: 段階名
+
+        Returns:
+            float: 段階の所要時間（前回の mark() からの経過秒数）
+        """
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._last = now
+        self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+        metrics.observe(f"pipeline.{stage}", elapsed)
+        self._percent = max(self._percent, PIPELINE_STAGES.get(stage, (stage, self._percent))[1])
+        self._notify(stage, elapsed)
+        return elapsed
+
+    @property
+    def total(self) -> float:
+        """開始から最後の mark() までの秒数"""
+        return self._last - self._started
+
+    def log_summary(self, title: str = "壁紙生成") -> None:
+        """段階ごとの所要時間をログに出力"""
+        if not self.timings:
+            return
+        details = ' / '.join(
+            f"{stage_label(stage)} {seconds:.2f}秒" for stage, seconds in self.timings.items()
+        )
+        logger.info(f"{title}の所要時間: {details}（合計 {self.total:.2f}秒）")
+
+
+def mark_stage(progress: Optional[PipelineProgress], stage: str) -> None:
+    """進捗が指定されていれば段階の完了を記録（None の場合は何もしない）"""
+    if progress is not None:
+        progress.mark(stage)
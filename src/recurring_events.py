@@ -0,0 +1,685 @@
+"""
+繰り返しイベントのローカル展開モジュール
+
+singleEvents=False で取得した繰り返しイベントのマスター（RRULE付き）を
+カレンダー単位でキャッシュし、任意の期間のインスタンスをローカルで展開する。
+変更は syncToken による差分同期で取り込み、例外インスタンス
+（個別に変更・キャンセルされた回）はマスター展開結果に上書きマージする。
+
+展開結果は singleEvents=True のAPIレスポンスと同じ形のdict
+（id = "{マスターID}_{開始UTC}"）として返すため、既存の解析処理をそのまま使える。
+
+対応するRRULE: FREQ=DAILY/WEEKLY/MONTHLY/YEARLY、INTERVAL、COUNT、UNTIL、
+BYDAY、BYMONTHDAY、BYMONTH、WKST、および EXDATE。
+それ以外（BYSETPOS、RDATE等）を含むカレンダーは UnsupportedRecurrenceError とし、
+呼び出し側でサーバー展開（singleEvents=True）にフォールバックする。
+"""
+import calendar
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # pragma: no cover - Python 3.9未満
+    ZoneInfo = None
+
+from googleapiclient.errors import HttpError
+
+logger = logging.getLogger(__name__)
+
+_WEEKDAYS = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+_FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+
+# 展開ループの安全上限（期間数）
+_MAX_PERIODS = 100_000
+
+# 差分同期が使えない場合などに完全同期をやり直す間隔（秒）
+DEFAULT_FULL_SYNC_INTERVAL_SECONDS = 24 * 60 * 60
+
+
+class UnsupportedRecurrenceError(ValueError):
+    """ローカル展開に対応していない繰り返しルール"""
+
+
+# === 日時ヘルパー ===
+
+def _resolve_timezone(name: Optional[str], fallback: tzinfo) -> tzinfo:
+    """IANAタイムゾーン名からtzinfoを取得（取得できない場合はfallback）"""
+    if name and ZoneInfo is not None:
+        try:
+            return ZoneInfo(name)
+        except Exception:
+            logger.debug(f"タイムゾーンを解決できません: {name}")
+    return fallback
+
+
+def _parse_aware(value: str) -> datetime:
+    """オフセット付きISO 8601文字列をaware datetimeに変換"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _parse_ical_datetime(value: str, tz: tzinfo) -> datetime:
+    """
+    iCalendar形式の日時（20260210T100000Z / 20260210T100000 / 20260210）をaware datetimeに変換
+
+    タイムゾーン指定のない値は tz のローカル時刻として扱う。
+    """
+    if len(value) == 8:
+        return datetime.strptime(value, '%Y%m%d').replace(tzinfo=tz)
+    if value.endswith('Z'):
+        return datetime.strptime(value[:-1], '%Y%m%dT%H%M%S').replace(tzinfo=timezone.utc)
+    return datetime.strptime(value, '%Y%m%dT%H%M%S').replace(tzinfo=tz)
+
+
+def _instance_key_for_datetime(start: datetime) -> str:
+    """時刻指定インスタンスの識別キー（開始時刻のUTC表記）"""
+    return start.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _instance_key_for_date(start: date) -> str:
+    """終日インスタンスの識別キー"""
+    return start.strftime('%Y%m%d')
+
+
+def _instance_key(original_start: Dict) -> str:
+    """originalStartTime（{'dateTime': ...} または {'date': ...}）から識別キーを取得"""
+    if 'dateTime' in original_start:
+        return _instance_key_for_datetime(_parse_aware(original_start['dateTime']))
+    return _instance_key_for_date(date.fromisoformat(original_start['date']))
+
+
+def _item_bounds(item: Dict, date_tz: tzinfo) -> Optional[Tuple[datetime, datetime]]:
+    """イベントdictの開始・終了をaware datetimeで取得（終日は date_tz の0:00）"""
+    start = item.get('start') or {}
+    end = item.get('end') or {}
+    try:
+        if 'dateTime' in start:
+            start_dt = _parse_aware(start['dateTime'])
+        else:
+            start_dt = datetime.combine(date.fromisoformat(start['date']), datetime.min.time(), tzinfo=date_tz)
+        if 'dateTime' in end:
+            end_dt = _parse_aware(end['dateTime'])
+        else:
+            end_dt = datetime.combine(date.fromisoformat(end['date']), datetime.min.time(), tzinfo=date_tz)
+    except (KeyError, ValueError):
+        return None
+    return start_dt, end_dt
+
+
+def _overlaps(item: Dict, window_start: datetime, window_end: datetime) -> bool:
+    """イベントdictが期間と重なるか"""
+    bounds = _item_bounds(item, window_start.tzinfo)
+    if bounds is None:
+        return False
+    return bounds[0] < window_end and bounds[1] > window_start
+
+
+def _add_months(year: int, month: int, months: int) -> Tuple[int, int]:
+    """年月に月数を加算"""
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def _month_days_matching(
+    year: int,
+    month: int,
+    by_day: Tuple[Tuple[Optional[int], int], ...],
+    by_month_day: Tuple[int, ...]
+) -> Set[int]:
+    """月内で BYDAY / BYMONTHDAY に一致する日の集合"""
+    days_in_month = calendar.monthrange(year, month)[1]
+    first_weekday = date(year, month, 1).weekday()
+
+    day_set: Optional[Set[int]] = None
+    if by_month_day:
+        day_set = set()
+        for value in by_month_day:
+            day = value if value > 0 else days_in_month + value + 1
+            if 1 <= day <= days_in_month:
+                day_set.add(day)
+
+    if by_day:
+        weekday_days: Set[int] = set()
+        for ordinal, weekday in by_day:
+            first = 1 + (weekday - first_weekday) % 7
+            candidates = list(range(first, days_in_month + 1, 7))
+            if ordinal is None:
+                weekday_days.update(candidates)
+            elif 0 < ordinal <= len(candidates):
+                weekday_days.add(candidates[ordinal - 1])
+            elif ordinal < 0 and -ordinal <= len(candidates):
+                weekday_days.add(candidates[ordinal])
+        day_set = weekday_days if day_set is None else day_set & weekday_days
+
+    return day_set or set()
+
+
+# === RRULE ===
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """
+    RRULEの解析結果
+
+    Args:
+        freq: 頻度（DAILY/WEEKLY/MONTHLY/YEARLY）
+        interval: 間隔
+        count: 回数上限（オプション）
+        until: 終了日時（aware datetime、オプション）
+        by_day: (序数, 曜日) のタプル（序数なしはNone）
+        by_month_day: 月内の日
+        by_month: 月
+        wkst: 週の開始曜日（0=月曜）
+    """
+    freq: str
+    interval: int = 1
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    by_day: Tuple[Tuple[Optional[int], int], ...] = ()
+    by_month_day: Tuple[int, ...] = ()
+    by_month: Tuple[int, ...] = ()
+    wkst: int = 0
+
+    @classmethod
+    def parse(cls, line: str, tz: tzinfo) -> 'RecurrenceRule':
+        """
+        "RRULE:FREQ=WEEKLY;BYDAY=MO,WE" 形式の文字列を解析
+
+        Args:
+            line: RRULE行
+            tz: UNTILにタイムゾーン指定がない場合に使うタイムゾーン
+
+        Raises:
+            UnsupportedRecurrenceError: 対応していない要素を含む場合
+        """
+        body = line.split(':', 1)[1] if line.upper().startswith('RRULE') else line
+        params = {}
+        for part in body.split(';'):
+            if not part:
+                continue
+            key, _, value = part.partition('=')
+            params[key.upper()] = value
+
+        freq = params.pop('FREQ', '')
+        if freq not in _FREQUENCIES:
+            raise UnsupportedRecurrenceError(f"未対応のFREQ: {freq}")
+
+        try:
+            interval = int(params.pop('INTERVAL', '1'))
+            count = int(params['COUNT']) if 'COUNT' in params else None
+            params.pop('COUNT', None)
+            until = None
+            if 'UNTIL' in params:
+                until_value = params.pop('UNTIL')
+                until = _parse_ical_datetime(until_value, tz)
+                if len(until_value) == 8:
+                    # 日付のみのUNTILはその日の終わりまでを含む
+                    until += timedelta(days=1) - timedelta(seconds=1)
+
+            by_day = []
+            for token in filter(None, params.pop('BYDAY', '').split(',')):
+                weekday = _WEEKDAYS[token[-2:]]
+                ordinal = int(token[:-2]) if token[:-2] else None
+                by_day.append((ordinal, weekday))
+
+            by_month_day = tuple(int(v) for v in filter(None, params.pop('BYMONTHDAY', '').split(',')))
+            by_month = tuple(int(v) for v in filter(None, params.pop('BYMONTH', '').split(',')))
+            wkst = _WEEKDAYS[params.pop('WKST', 'MO')]
+        except (KeyError, ValueError) as e:
+            raise UnsupportedRecurrenceError(f"RRULEを解析できません: {line} ({e})")
+
+        if params:
+            raise UnsupportedRecurrenceError(f"未対応のRRULE要素: {', '.join(sorted(params))}")
+        if interval < 1:
+            raise UnsupportedRecurrenceError(f"不正なINTERVAL: {interval}")
+        if freq == 'WEEKLY' and any(ordinal is not None for ordinal, _ in by_day):
+            raise UnsupportedRecurrenceError("WEEKLYでの序数付きBYDAYには未対応です")
+        if freq == 'YEARLY' and by_day and not by_month:
+            raise UnsupportedRecurrenceError("BYMONTHなしのYEARLY BYDAYには未対応です")
+        if freq == 'DAILY' and any(ordinal is not None for ordinal, _ in by_day):
+            raise UnsupportedRecurrenceError("DAILYでの序数付きBYDAYには未対応です")
+
+        return cls(
+            freq=freq,
+            interval=interval,
+            count=count,
+            until=until,
+            by_day=tuple(by_day),
+            by_month_day=by_month_day,
+            by_month=by_month,
+            wkst=wkst,
+        )
+
+    def _period_dates(self, dtstart: date, period: int) -> List[date]:
+        """period番目の期間に含まれる候補日（昇順）"""
+        if self.freq == 'DAILY':
+            day = dtstart + timedelta(days=period * self.interval)
+            if self.by_day and day.weekday() not in {wd for _, wd in self.by_day}:
+                return []
+            if self.by_month and day.month not in self.by_month:
+                return []
+            if self.by_month_day and day.day not in _month_days_matching(day.year, day.month, (), self.by_month_day):
+                return []
+            return [day]
+
+        if self.freq == 'WEEKLY':
+            week_start = dtstart - timedelta(days=(dtstart.weekday() - self.wkst) % 7)
+            week_start += timedelta(weeks=period * self.interval)
+            weekdays = {wd for _, wd in self.by_day} or {dtstart.weekday()}
+            days = sorted(week_start + timedelta(days=(wd - self.wkst) % 7) for wd in weekdays)
+            if self.by_month:
+                days = [d for d in days if d.month in self.by_month]
+            return days
+
+        if self.freq == 'MONTHLY':
+            year, month = _add_months(dtstart.year, dtstart.month, period * self.interval)
+            if self.by_month and month not in self.by_month:
+                return []
+            if self.by_day or self.by_month_day:
+                day_numbers = _month_days_matching(year, month, self.by_day, self.by_month_day)
+            else:
+                day_numbers = _month_days_matching(year, month, (), (dtstart.day,))
+            return [date(year, month, d) for d in sorted(day_numbers)]
+
+        # YEARLY
+        year = dtstart.year + period * self.interval
+        days = []
+        for month in (self.by_month or (dtstart.month,)):
+            if self.by_day or self.by_month_day:
+                day_numbers = _month_days_matching(year, month, self.by_day, self.by_month_day)
+            else:
+                day_numbers = _month_days_matching(year, month, (), (dtstart.day,))
+            days.extend(date(year, month, d) for d in day_numbers)
+        return sorted(days)
+
+    def _first_period(self, dtstart: date, window_start: date) -> int:
+        """COUNTがない場合に、期間の先頭までスキップできる期間番号"""
+        if self.count is not None or window_start <= dtstart:
+            return 0
+        if self.freq == 'DAILY':
+            return max(0, (window_start - dtstart).days // self.interval - 1)
+        if self.freq == 'WEEKLY':
+            return max(0, (window_start - dtstart).days // (7 * self.interval) - 1)
+        if self.freq == 'MONTHLY':
+            months = (window_start.year - dtstart.year) * 12 + window_start.month - dtstart.month
+            return max(0, months // self.interval - 1)
+        return max(0, (window_start.year - dtstart.year) // self.interval - 1)
+
+    def iter_starts(
+        self,
+        dtstart: datetime,
+        tz: tzinfo,
+        window_end: datetime,
+        window_start: Optional[datetime] = None
+    ) -> Iterator[datetime]:
+        """
+        開始時刻（aware）を昇順に返す
+
+        Args:
+            dtstart: 初回の開始時刻（tz のローカル時刻、ナイーブ）
+            tz: シリーズのタイムゾーン
+            window_end: これ以降に始まる回は返さない（aware）
+            window_start: 展開開始の目安（COUNTなしの場合にスキップに使用、aware）
+        """
+        time_of_day = dtstart.time()
+        start_date = dtstart.date()
+        first_period = 0
+        if window_start is not None:
+            first_period = self._first_period(start_date, window_start.astimezone(tz).date())
+
+        emitted = 0
+        empty_periods = 0
+        for period in range(first_period, first_period + _MAX_PERIODS):
+            days = self._period_dates(start_date, period)
+            if not days:
+                # 条件に一致する日が長期間現れない不正なルールは打ち切る
+                empty_periods += 1
+                if empty_periods > 1000:
+                    return
+                continue
+            empty_periods = 0
+            for day in days:
+                if day < start_date:
+                    continue
+                local = datetime.combine(day, time_of_day)
+                if local < dtstart:
+                    continue
+                start = local.replace(tzinfo=tz)
+                if self.until is not None and start > self.until:
+                    return
+                if start >= window_end:
+                    return
+                emitted += 1
+                if self.count is not None and emitted > self.count:
+                    return
+                yield start
+
+
+# === マスター展開 ===
+
+def _exdate_keys(recurrence: List[str], tz: tzinfo, all_day: bool) -> Set[str]:
+    """EXDATE行から除外するインスタンスキーを収集"""
+    keys: Set[str] = set()
+    for line in recurrence:
+        if not line.upper().startswith('EXDATE'):
+            continue
+        header, _, values = line.partition(':')
+        value_tz = tz
+        for param in header.split(';')[1:]:
+            name, _, param_value = param.partition('=')
+            if name.upper() == 'TZID':
+                value_tz = _resolve_timezone(param_value, tz)
+        for value in filter(None, values.split(',')):
+            moment = _parse_ical_datetime(value, value_tz)
+            if all_day:
+                keys.add(_instance_key_for_date(moment.date()))
+            else:
+                keys.add(_instance_key_for_datetime(moment))
+    return keys
+
+
+def expand_master(
+    master: Dict,
+    window_start: datetime,
+    window_end: datetime,
+    skip_keys: Optional[Set[str]] = None
+) -> List[Dict]:
+    """
+    繰り返しマスターを期間内のインスタンスdictに展開
+
+    Args:
+        master: singleEvents=False で取得したマスターイベント
+        window_start: 期間開始（aware）
+        window_end: 期間終了（aware）
+        skip_keys: 展開しないインスタンスキー（例外インスタンスで上書きされる回）
+
+    Returns:
+        List[Dict]: singleEvents=True 形式のインスタンスdict
+
+    Raises:
+        UnsupportedRecurrenceError: ローカル展開できないルールの場合
+    """
+    recurrence = master.get('recurrence') or []
+    rrules = [line for line in recurrence if line.upper().startswith('RRULE')]
+    unsupported = [
+        line.split(':', 1)[0] for line in recurrence
+        if not line.upper().startswith(('RRULE', 'EXDATE'))
+    ]
+    if unsupported or len(rrules) != 1:
+        raise UnsupportedRecurrenceError(
+            f"未対応の繰り返し定義です（{master.get('id', '?')}）: {unsupported or len(rrules)}"
+        )
+
+    start_info = master['start']
+    end_info = master['end']
+    all_day = 'date' in start_info
+    window_tz = window_start.tzinfo
+
+    if all_day:
+        tz = window_tz
+        dtstart = datetime.combine(date.fromisoformat(start_info['date']), datetime.min.time())
+        dtend = datetime.combine(date.fromisoformat(end_info['date']), datetime.min.time())
+    else:
+        aware_start = _parse_aware(start_info['dateTime'])
+        tz = _resolve_timezone(start_info.get('timeZone'), aware_start.tzinfo)
+        dtstart = aware_start.astimezone(tz).replace(tzinfo=None)
+        dtend = _parse_aware(end_info['dateTime']).astimezone(tz).replace(tzinfo=None)
+    # 壁時計上の長さを維持する（DSTを跨いでも同じ時刻に終わる）
+    duration = dtend - dtstart
+
+    rule = RecurrenceRule.parse(rrules[0], tz)
+    skip = set(skip_keys or ()) | _exdate_keys(recurrence, tz, all_day)
+
+    base = {k: v for k, v in master.items() if k not in ('id', 'start', 'end', 'recurrence')}
+    instances = []
+    # 期間開始より前に始まり期間内に続く回も含めるため、長さ分だけ早くから展開する
+    search_start = window_start - duration if duration > timedelta(0) else window_start
+    for start in rule.iter_starts(dtstart, tz, window_end, window_start=search_start):
+        end = (start.replace(tzinfo=None) + duration).replace(tzinfo=tz)
+        if end <= window_start:
+            continue
+
+        if all_day:
+            key = _instance_key_for_date(start.date())
+            original = {'date': start.date().isoformat()}
+            start_field = {'date': start.date().isoformat()}
+            end_field = {'date': end.date().isoformat()}
+        else:
+            key = _instance_key_for_datetime(start)
+            original = {'dateTime': start.isoformat()}
+            start_field = {'dateTime': start.isoformat()}
+            end_field = {'dateTime': end.isoformat()}
+        if key in skip:
+            continue
+
+        instance = dict(base)
+        instance['id'] = f"{master['id']}_{key}"
+        instance['recurringEventId'] = master['id']
+        instance['originalStartTime'] = original
+        instance['start'] = start_field
+        instance['end'] = end_field
+        instances.append(instance)
+
+    return instances
+
+
+# === キャッシュ ===
+
+class _CalendarSeries:
+    """1カレンダー分のマスター・単発イベント・例外インスタンス"""
+
+    __slots__ = (
+        'masters', 'singles', 'exceptions', 'sync_token',
+        'time_min', 'synced_at', 'unsupported',
+    )
+
+    def __init__(self, time_min: datetime):
+        self.masters: Dict[str, Dict] = {}
+        self.singles: Dict[str, Dict] = {}
+        self.exceptions: Dict[Tuple[str, str], Dict] = {}
+        self.sync_token: Optional[str] = None
+        self.time_min = time_min
+        self.synced_at = time.monotonic()
+        self.unsupported = False
+
+    def apply(self, item: Dict) -> None:
+        """APIから取得した1件（全件同期・差分同期共通）を反映"""
+        event_id = item.get('id')
+        if not event_id:
+            return
+
+        master_id = item.get('recurringEventId')
+        if master_id:
+            original = item.get('originalStartTime')
+            if original:
+                # キャンセルされた回もマーカーとして保持（展開結果から除外するため）
+                self.exceptions[(master_id, _instance_key(original))] = item
+            return
+
+        if item.get('status') == 'cancelled':
+            self.masters.pop(event_id, None)
+            self.singles.pop(event_id, None)
+            for key in [k for k in self.exceptions if k[0] == event_id]:
+                del self.exceptions[key]
+            return
+
+        if item.get('recurrence'):
+            self.masters[event_id] = item
+            self.singles.pop(event_id, None)
+        else:
+            self.singles[event_id] = item
+            self.masters.pop(event_id, None)
+
+    def window_items(self, window_start: datetime, window_end: datetime) -> List[Dict]:
+        """期間内のイベントをsingleEvents=True形式で取得"""
+        overridden: Dict[str, Set[str]] = {}
+        items = []
+        for (master_id, key), item in self.exceptions.items():
+            overridden.setdefault(master_id, set()).add(key)
+            if item.get('status') != 'cancelled' and _overlaps(item, window_start, window_end):
+                items.append(item)
+
+        for item in self.singles.values():
+            if _overlaps(item, window_start, window_end):
+                items.append(item)
+
+        for master_id, master in self.masters.items():
+            items.extend(expand_master(master, window_start, window_end, overridden.get(master_id)))
+
+        return items
+
+
+def _is_gone(error: Exception) -> bool:
+    """syncTokenが失効した（HTTP 410）か"""
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    return status == 410 or str(status) == '410'
+
+
+class RecurringEventStore:
+    """
+    繰り返しマスターのキャッシュとローカル展開
+
+    (アカウントID, カレンダーID) ごとにマスター・単発イベント・例外を保持する。
+    プロセス内で共有し、プレビュー・更新ワーカー間で同期結果を再利用する。
+
+    Args:
+        full_sync_interval_seconds: 完全同期をやり直す間隔（秒）
+    """
+
+    def __init__(self, full_sync_interval_seconds: int = DEFAULT_FULL_SYNC_INTERVAL_SECONDS):
+        self._full_sync_interval = full_sync_interval_seconds
+        self._series: Dict[Tuple[str, str], _CalendarSeries] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _list_all(self, service, **params) -> Tuple[List[Dict], Optional[str]]:
+        """events().list をページネーション込みで実行し、(items, nextSyncToken) を返す"""
+        items: List[Dict] = []
+        page_token = None
+        while True:
+            result = service.events().list(singleEvents=False, pageToken=page_token, **params).execute()
+            items.extend(result.get('items', []))
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                return items, result.get('nextSyncToken')
+
+    def _full_sync(self, service, calendar_id: str, time_min: datetime) -> _CalendarSeries:
+        """timeMin以降のマスター・単発イベント・例外を全件取得"""
+        series = _CalendarSeries(time_min)
+        items, sync_token = self._list_all(service, calendarId=calendar_id, timeMin=time_min.isoformat())
+        for item in items:
+            series.apply(item)
+        series.sync_token = sync_token
+        logger.info(
+            f"繰り返しイベントを全件同期: {calendar_id} "
+            f"（マスター{len(series.masters)}件、単発{len(series.singles)}件、例外{len(series.exceptions)}件）"
+        )
+        return series
+
+    def _incremental_sync(self, service, calendar_id: str, series: _CalendarSeries) -> bool:
+        """syncTokenで差分を取り込む。トークン失効時はFalse"""
+        try:
+            items, sync_token = self._list_all(
+                service, calendarId=calendar_id, syncToken=series.sync_token
+            )
+        except HttpError as e:
+            if _is_gone(e):
+                logger.info(f"syncTokenが失効しました。全件同期します: {calendar_id}")
+                return False
+            raise
+        for item in items:
+            series.apply(item)
+        series.sync_token = sync_token or series.sync_token
+        if items:
+            logger.debug(f"繰り返しイベントの差分を反映: {calendar_id} {len(items)}件")
+        return True
+
+    def _key_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        """カレンダー単位のロックを取得（同じカレンダーの同期を直列化）"""
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    def window_items(
+        self,
+        service,
+        account_id: str,
+        calendar_id: str,
+        window_start: datetime,
+        window_end: datetime
+    ) -> Optional[List[Dict]]:
+        """
+        期間内のイベントを singleEvents=True 形式で取得
+
+        必要に応じて全件同期・差分同期を行い、繰り返しマスターをローカル展開する。
+
+        Args:
+            service: Google Calendar APIサービスインスタンス
+            account_id: アカウントID
+            calendar_id: カレンダーID
+            window_start: 期間開始（aware）
+            window_end: 期間終了（aware）
+
+        Returns:
+            Optional[List[Dict]]: イベントdictのリスト。
+            ローカル展開できないカレンダーの場合はNone（サーバー展開を使用すること）。
+        """
+        key = (account_id, calendar_id)
+        with self._key_lock(key):
+            series = self._series.get(key)
+            expired = series is None or time.monotonic() - series.synced_at >= self._full_sync_interval
+
+            if series is not None and series.unsupported and not expired:
+                return None
+
+            if (
+                expired
+                or window_start < series.time_min
+                or not series.sync_token
+                or not self._incremental_sync(service, calendar_id, series)
+            ):
+                series = self._full_sync(service, calendar_id, window_start)
+                with self._lock:
+                    self._series[key] = series
+
+            try:
+                return series.window_items(window_start, window_end)
+            except UnsupportedRecurrenceError as e:
+                logger.info(f"ローカル展開できない繰り返しイベントがあります。サーバー展開を使用します: {e}")
+                series.unsupported = True
+                return None
+
+    def drop_account(self, account_id: str) -> None:
+        """アカウントのキャッシュを削除（アカウント削除時）"""
+        with self._lock:
+            for key in [k for k in self._series if k[0] == account_id]:
+                del self._series[key]
+                self._locks.pop(key, None)
+
+    def clear(self) -> None:
+        """全キャッシュを削除"""
+        with self._lock:
+            self._series.clear()
+            self._locks.clear()
+
+
+_shared_store: Optional[RecurringEventStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_recurring_event_store() -> RecurringEventStore:
+    """プロセス内で共有する RecurringEventStore を取得"""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            from .config import RECURRING_FULL_SYNC_HOURS
+            _shared_store = RecurringEventStore(
+                full_sync_interval_seconds=RECURRING_FULL_SYNC_HOURS * 60 * 60
+            )
+        return _shared_store
@@ -9,6 +9,7 @@ from typing import List, Dict, Tuple
 from PIL import Image, ImageDraw
 
 from ..models.event import CalendarEvent
+from ..models.event_table import EventTable
 from ..config import (
     DAY_COLUMN_WIDTH,
     WEEK_CALENDAR_START_HOUR, WEEK_CALENDAR_END_HOUR,
@@ -498,14 +499,16 @@ class CalendarRendererMixin:
         if image is not None:
             draw = ImageDraw.Draw(image)
 
-        # イベントブロックを描画
-        for day_offset in range(7):
-            event_date = today + timedelta(days=day_offset)
-            day_events = [e for e in all_events if e.start_datetime.date() == event_date]
-
-            if day_events:
-                column_x = start_x + day_offset * DAY_COLUMN_WIDTH
-                self._draw_day_events(draw, day_events, column_x, grid_y_start)
+        # イベントブロックを描画（開始日ごとの振り分けはEventTableで一括計算）
+        # マルチディスプレイ描画では事前計算済みの振り分けを共有する
+        event_index = getattr(self, '_event_index', None)
+        if event_index is not None and event_index.get('date') == today:
+            events_by_day = event_index['week_buckets']
+        else:
+            events_by_day = EventTable.from_events(all_events).bucket_by_start_date(today, 7)
+        for day_offset, day_events in sorted(events_by_day.items()):
+            column_x = start_x + day_offset * DAY_COLUMN_WIDTH
+            self._draw_day_events(draw, day_events, column_x, grid_y_start)
 
         # 深夜イベントストリップ（グリッド下端）
         if has_after:
@@ -3,7 +3,7 @@
 Zenモード、Heroモード、コンパクトカード、シングルカード、空カード
 """
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 from PIL import Image, ImageDraw
 
@@ -65,6 +65,112 @@ class CardRendererMixin:
         else:
             return 'compact'
 
+    def _card_days(
+        self,
+        today_events: List[CalendarEvent],
+        week_events: Optional[List[CalendarEvent]],
+        now: datetime
+    ) -> Dict[str, List[CalendarEvent]]:
+        """カード表示用に今日・明日・明後日へ振り分けたイベント"""
+        event_index = getattr(self, '_event_index', None)
+        if week_events and event_index is not None and event_index.get('date') == now.date():
+            return event_index['card_days']
+        if week_events:
+            return self._get_events_for_days(week_events)
+        return {
+            'today': sorted(today_events, key=lambda e: e.start_datetime),
+            'tomorrow': [],
+            'day_after': []
+        }
+
+    def _card_layout_mode(self, days: Dict[str, List[CalendarEvent]]) -> str:
+        """振り分け結果からカードのレイアウトモードを決定"""
+        today_count = len(days['today'])
+        has_future_events = len(days['tomorrow']) > 0 or len(days['day_after']) > 0
+
+        # 明日・明後日に予定がある場合は常に3列レイアウト
+        if has_future_events:
+            return 'card' if today_count <= 3 else 'compact'
+        return self._select_layout_mode(today_count)
+
+    @staticmethod
+    def _event_time_state(event: CalendarEvent, now: datetime) -> Tuple[bool, bool]:
+        """
+        時刻で変わるイベントの表示状態
+
+        Returns:
+            Tuple[bool, bool]: (進行中, 終了済み)。終日イベントは常に (False, False)。
+        """
+        if event.is_all_day:
+            return False, False
+        is_in_progress = event.start_datetime <= now <= event.end_datetime
+        is_finished = event.end_datetime < now
+        return is_in_progress, is_finished
+
+    @staticmethod
+    def _hero_status_text(event: CalendarEvent, now: datetime) -> str:
+        """Heroモードのカウントダウン / ステータス文言"""
+        if not event.is_all_day and event.start_datetime <= now <= event.end_datetime:
+            remaining = event.end_datetime - now
+            mins = int(remaining.total_seconds() // 60)
+            return f'進行中 - 残り{mins}分'
+        if event.is_all_day:
+            return '終日イベント'
+        until = event.start_datetime - now
+        total_mins = int(until.total_seconds() // 60)
+        if total_mins < 0:
+            return '終了済み'
+        if total_mins < 60:
+            return f'あと{total_mins}分で開始'
+        hours = total_mins // 60
+        mins = total_mins % 60
+        return f'あと{hours}時間{mins}分で開始'
+
+    def _hero_card_width(self) -> int:
+        """ヒーローカードの幅（画面幅の60%）"""
+        return int(self.width * 0.6)
+
+    def card_time_state(
+        self,
+        today_events: List[CalendarEvent],
+        week_events: Optional[List[CalendarEvent]],
+        now: datetime
+    ) -> Tuple:
+        """
+        予定カード領域のうち時刻によって変わる表示内容
+
+        同じ値なら（同じイベントに対して）カード領域の描画結果は変わらない。
+
+        Args:
+            today_events: 今日のイベント
+            week_events: 週間イベント
+            now: 基準時刻
+
+        Returns:
+            Tuple: (レイアウトモード, 時刻依存の表示状態)
+        """
+        days = self._card_days(today_events, week_events, now)
+        mode = self._card_layout_mode(days)
+        if mode == 'zen':
+            return mode, ()
+        if mode == 'hero':
+            event = days['today'][0]
+            return mode, (
+                self._event_time_state(event, now),
+                self._hero_status_text(event, now),
+                self._progress_bar_width(event, self._hero_card_width() - 24, now),
+            )
+        # 進行中のカードは進行状況バーの幅も含める（描画時と同じバーの幅で計算）
+        return mode, tuple(
+            (
+                event.id,
+                self._event_time_state(event, now),
+                self._progress_bar_width(event, CARD_WIDTH - CARD_PADDING * 2, now),
+            )
+            for key in ('today', 'tomorrow', 'day_after')
+            for event in days[key][:MAX_CARDS_PER_COLUMN]
+        )
+
     def _draw_zen_mode(
         self,
         draw: ImageDraw.ImageDraw,
@@ -131,22 +237,14 @@ class CardRendererMixin:
         glass_effect = self.theme.get('glass_effect', False)
 
         # ヒーローカードのサイズ（画面幅の60%、高さ160px）
-        hero_width = int(self.width * 0.6)
+        hero_width = self._hero_card_width()
         hero_height = 160
         hero_x = (self.width - hero_width) // 2
         hero_y = y_start + 10
 
         # 進行中判定
         now = datetime.now()
-        is_in_progress = (
-            not event.is_all_day
-            and event.start_datetime <= now <= event.end_datetime
-        )
-
-        is_finished = (
-            not event.is_all_day
-            and event.end_datetime < now
-        )
+        is_in_progress, is_finished = self._event_time_state(event, now)
 
         if is_in_progress:
             card_bg = self.theme.get('active_card_bg', (255, 245, 245))
@@ -205,23 +303,7 @@ class CardRendererMixin:
         )
 
         # カウントダウン / ステータス
-        if is_in_progress:
-            remaining = event.end_datetime - now
-            mins = int(remaining.total_seconds() // 60)
-            status_text = f'進行中 - 残り{mins}分'
-        elif event.is_all_day:
-            status_text = '終日イベント'
-        else:
-            until = event.start_datetime - now
-            total_mins = int(until.total_seconds() // 60)
-            if total_mins < 0:
-                status_text = '終了済み'
-            elif total_mins < 60:
-                status_text = f'あと{total_mins}分で開始'
-            else:
-                hours = total_mins // 60
-                mins = total_mins % 60
-                status_text = f'あと{hours}時間{mins}分で開始'
+        status_text = self._hero_status_text(event, now)
 
         accent = self.theme.get('accent_color', (100, 100, 100))
         draw.text(
@@ -253,23 +335,8 @@ class CardRendererMixin:
         now = datetime.now()
 
         # 先に3日分に振り分け（レイアウト判定に必要）
-        if week_events:
-            days = self._get_events_for_days(week_events)
-        else:
-            days = {
-                'today': sorted(today_events, key=lambda e: e.start_datetime),
-                'tomorrow': [],
-                'day_after': []
-            }
-
-        today_count = len(days['today'])
-        has_future_events = len(days['tomorrow']) > 0 or len(days['day_after']) > 0
-
-        # 明日・明後日に予定がある場合は常に3列レイアウト
-        if has_future_events:
-            mode = 'card' if today_count <= 3 else 'compact'
-        else:
-            mode = self._select_layout_mode(today_count)
+        days = self._card_days(today_events, week_events, now)
+        mode = self._card_layout_mode(days)
 
         if mode == 'zen':
             self._draw_zen_mode(draw, y_start, image)
@@ -336,11 +403,7 @@ class CardRendererMixin:
 
             # 最大件数分のカードを描画
             for i, event in enumerate(events[:MAX_CARDS_PER_COLUMN]):
-                is_finished = False
-                is_in_progress = False
-                if not event.is_all_day:
-                    is_finished = event.end_datetime < now
-                    is_in_progress = (event.start_datetime <= now <= event.end_datetime)
+                is_in_progress, is_finished = self._event_time_state(event, now)
 
                 self._draw_compact_event_card(
                     draw, event,
@@ -9,6 +9,7 @@ import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
 from ..models.event import CalendarEvent
+from ..metrics import timed
 from ..config import (
     CARD_HEIGHT, CARD_PADDING,
     WEEK_CALENDAR_START_HOUR, WEEK_CALENDAR_END_HOUR,
@@ -51,6 +52,7 @@ class EffectsRendererMixin:
             width=width
         )
 
+    @timed('render.effects.draw_card_shadow')
     def _draw_card_shadow(
         self,
         draw: ImageDraw.ImageDraw,
@@ -138,6 +140,7 @@ class EffectsRendererMixin:
                 width=card_border_width
             )
 
+    @timed('render.effects.draw_glass_card')
     def _draw_glass_card(
         self,
         draw: ImageDraw.ImageDraw,
@@ -268,6 +271,32 @@ class EffectsRendererMixin:
             # パースエラーの場合はデフォルト色を返す
             return default_color
 
+    @staticmethod
+    def _progress_bar_width(event: CalendarEvent, width: int, now: datetime) -> int:
+        """
+        進行状況バーの塗りつぶし幅（ピクセル）
+
+        Returns:
+            int: 進行中でなければ0
+        """
+        if event.is_all_day or not (event.start_datetime <= now <= event.end_datetime):
+            return 0
+        total_duration = (event.end_datetime - event.start_datetime).total_seconds()
+        elapsed = (now - event.start_datetime).total_seconds()
+        progress_ratio = min(elapsed / total_duration, 1.0) if total_duration > 0 else 0
+        return int(width * progress_ratio)
+
+    def _current_hour_slot(self, now: datetime) -> Optional[int]:
+        """
+        週間カレンダーでハイライトする時間枠
+
+        Returns:
+            Optional[int]: 現在の時（表示範囲外ならNone）
+        """
+        if not (WEEK_CALENDAR_START_HOUR <= now.hour <= WEEK_CALENDAR_END_HOUR):
+            return None
+        return now.hour
+
     def _draw_event_progress_bar(
         self,
         draw: ImageDraw.ImageDraw,
@@ -300,11 +329,6 @@ class EffectsRendererMixin:
         if not (event.start_datetime <= now <= event.end_datetime):
             return  # 進行中でない場合は描画しない
 
-        # 進行率計算
-        total_duration = (event.end_datetime - event.start_datetime).total_seconds()
-        elapsed = (now - event.start_datetime).total_seconds()
-        progress_ratio = min(elapsed / total_duration, 1.0) if total_duration > 0 else 0
-
         # バーの設定
         bar_height = 4
         bar_y = y + card_height - CARD_PADDING - bar_height - 5
@@ -319,7 +343,7 @@ class EffectsRendererMixin:
         accent = self.theme.get('accent_color', None)
         start_color = accent if accent else (0, 122, 255)
         end_color = (0, 200, 100)
-        progress_width = int(width * progress_ratio)
+        progress_width = self._progress_bar_width(event, width, now)
         if progress_width <= 0:
             return
 
@@ -410,7 +434,7 @@ class EffectsRendererMixin:
         now = datetime.now()
 
         # 週間カレンダーの表示時間範囲内かチェック
-        if not (WEEK_CALENDAR_START_HOUR <= now.hour <= WEEK_CALENDAR_END_HOUR):
+        if self._current_hour_slot(now) is None:
             return  # 表示範囲外の場合は描画しない
 
         # 蛍光色で現在の1時間枠を塗りつぶし（今日の列のみ）
@@ -428,6 +452,7 @@ class EffectsRendererMixin:
             overlay.close()
             draw = ImageDraw.Draw(image)
 
+    @timed('render.effects.create_gradient_background')
     def _create_gradient_background(
         self,
         width: int,
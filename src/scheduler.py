@@ -4,13 +4,17 @@
 """
 import time
 import logging
-from typing import Callable
+from datetime import datetime
+from typing import Callable, Optional
 import schedule
 
 from .config import UPDATE_TIME
 
 logger = logging.getLogger(__name__)
 
+# スケジュールループの最大スリープ時間（秒）
+MAX_SLEEP_SECONDS = 60
+
 
 class Scheduler:
     """スケジューラークラス"""
@@ -19,6 +23,8 @@ class Scheduler:
         self.is_running = False
         self.update_callback = None
         self.notification_callback = None
+        self.deadline_source: Optional[Callable[[], Optional[datetime]]] = None
+        self.deadline_callback: Optional[Callable] = None
 
     def set_update_callback(self, callback: Callable) -> None:
         """
@@ -40,6 +46,24 @@ class Scheduler:
         self.notification_callback = callback
         logger.info("通知チェックコールバックを設定しました")
 
+    def set_notification_deadline(
+        self,
+        deadline_source: Callable[[], Optional[datetime]],
+        callback: Callable
+    ) -> None:
+        """
+        次の通知時刻の取得元と、その時刻に呼び出すコールバックを設定
+
+        スケジュールループは次の通知時刻までだけスリープし、時刻を迎えたら
+        コールバックを呼び出す（5分ごとのチェックを待たずに通知できる）。
+
+        Args:
+            deadline_source: 次の通知時刻を返す関数（なければNone）
+            callback: 通知時刻に呼び出される関数
+        """
+        self.deadline_source = deadline_source
+        self.deadline_callback = callback
+
     def schedule_tasks(self) -> None:
         """
         タスクをスケジュール
@@ -77,6 +101,39 @@ class Scheduler:
         except Exception as e:
             logger.error(f"通知チェックでエラーが発生: {e}")
 
+    def _run_deadline(self) -> None:
+        """
+        通知時刻を迎えていればコールバックを実行（内部用）
+        """
+        if not (self.deadline_source and self.deadline_callback):
+            return
+        try:
+            deadline = self.deadline_source()
+            if deadline is not None and deadline <= datetime.now():
+                self.deadline_callback()
+        except Exception as e:
+            logger.error(f"通知の送信でエラーが発生: {e}")
+
+    def _sleep_seconds(self) -> float:
+        """
+        次にループを回すまでのスリープ時間（秒）
+
+        Returns:
+            float: 次の通知時刻・次のスケジュール実行のうち早い方まで（最大 MAX_SLEEP_SECONDS）
+        """
+        seconds = float(MAX_SLEEP_SECONDS)
+        idle = schedule.idle_seconds()
+        if idle is not None:
+            seconds = min(seconds, idle)
+        if self.deadline_source:
+            try:
+                deadline = self.deadline_source()
+            except Exception:
+                deadline = None
+            if deadline is not None:
+                seconds = min(seconds, (deadline - datetime.now()).total_seconds())
+        return max(seconds, 1.0)
+
     def run_once(self) -> None:
         """
         スケジュールされたタスクを即座に1回実行
@@ -106,7 +163,9 @@ class Scheduler:
         try:
             while self.is_running:
                 schedule.run_pending()
-                time.sleep(60)  # 1分ごとにチェック
+                self._run_deadline()
+                # 次の通知時刻・スケジュール実行まで（最大1分）スリープ
+                time.sleep(self._sleep_seconds())
 
         except KeyboardInterrupt:
             logger.info("スケジューラーを停止します (Ctrl+C)")
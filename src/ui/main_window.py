@@ -18,7 +18,9 @@ import sys
 from src.ui.widgets.preview_widget import PreviewWidget
 from src.ui.settings_dialog import SettingsDialog
 from src.viewmodels.main_viewmodel import MainViewModel
+from src.viewmodels.update_queue import UpdateReason
 from src.viewmodels.settings_service import SettingsService
+from src.pipeline_progress import stage_label
 
 logger = logging.getLogger(__name__)
 
@@ -85,9 +87,16 @@ class MainWindow(QMainWindow):
         # 背景画像設定を復元
         self._restore_background_setting()
 
+        # 前回の壁紙をプレビューに表示（取得・描画を待たずに表示する）
+        restored = self._show_cached_preview()
+
         # 設定に基づいて自動更新を開始
         self._restore_auto_update_setting()
 
+        # 今日の壁紙を復元できた場合は、バックグラウンドで更新して変化があれば置き換える
+        if restored and self.viewmodel.is_auto_updating:
+            self.viewmodel.refresh_in_background()
+
         logger.info("MainWindowを初期化しました")
 
     def _setup_control_area(self, parent_layout):
@@ -225,9 +234,11 @@ class MainWindow(QMainWindow):
         self.viewmodel.update_started.connect(self._on_update_started)
         self.viewmodel.update_completed.connect(self._on_update_completed)
         self.viewmodel.progress_updated.connect(self._on_progress_updated)
+        self.viewmodel.stage_completed.connect(self._on_stage_completed)
         self.viewmodel.error_occurred.connect(self._on_error_occurred)
         self.viewmodel.theme_changed.connect(self._on_viewmodel_theme_changed)
         self.viewmodel.preview_ready.connect(self._on_preview_ready)
+        self.viewmodel.preview_frame_ready.connect(self._on_preview_frame_ready)
         self.viewmodel.auto_update_status_changed.connect(self._on_auto_update_status_changed)
 
         # テーマ一覧をComboBoxに設定
@@ -278,6 +289,17 @@ class MainWindow(QMainWindow):
         else:
             self.statusBar().showMessage("プレビュー生成に失敗しました")
 
+    @pyqtSlot(object)
+    def _on_preview_frame_ready(self, image):
+        """
+        先読み済みのプレビューを表示
+
+        Args:
+            image: プレビュー画像（QImage）
+        """
+        self.preview_widget.set_qimage(image)
+        self.statusBar().showMessage("プレビュー表示中 - 「壁紙に適用」で反映されます")
+
     @pyqtSlot()
     def _on_settings_clicked(self):
         """「設定」ボタンがクリックされたときの処理"""
@@ -437,6 +459,27 @@ class MainWindow(QMainWindow):
                 self.theme_combo.blockSignals(False)
             self.viewmodel.set_theme(saved_theme)
 
+    def _show_cached_preview(self) -> bool:
+        """
+        起動時に前回の壁紙（キャッシュ）をプレビューに表示
+
+        今日の壁紙なら描画に使った予定も復元する（時刻更新・次の更新で再利用）。
+
+        Returns:
+            bool: 今日の壁紙と予定を復元できた場合True
+        """
+        restored = self.viewmodel.restore_last_frame()
+        if isinstance(restored, Path):
+            cached = restored
+        else:
+            restored = None
+            cached = self.viewmodel.get_cached_wallpaper()
+        if isinstance(cached, Path) and cached.exists():
+            self.preview_widget.set_image(cached)
+            self.statusBar().showMessage("前回の壁紙を表示中")
+            logger.info(f"前回の壁紙をプレビューに表示しました: {cached}")
+        return restored is not None
+
     def _restore_auto_update_setting(self):
         """起動時に保存済み設定に基づいて自動更新を開始"""
         if self.settings_service.get("auto_update_enabled", True):
@@ -464,6 +507,17 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(value)
         logger.debug(f"進捗: {value}%")
 
+    @pyqtSlot(str, float)
+    def _on_stage_completed(self, stage: str, seconds: float):
+        """
+        更新の段階が完了したときの処理
+
+        Args:
+            stage (str): 段階名
+            seconds (float): 所要時間（秒）
+        """
+        self.statusBar().showMessage(f"壁紙を更新中...（{stage_label(stage)} {seconds:.1f}秒）")
+
     @pyqtSlot(bool)
     def _on_update_completed(self, success: bool):
         """
@@ -494,16 +548,17 @@ class MainWindow(QMainWindow):
         """
         try:
             from datetime import datetime
+            from src.atomic_output import latest_slot_path
             from src.config import OUTPUT_DIR, WALLPAPER_FILENAME_TEMPLATE
 
-            # 現在のテーマ名と日付からファイル名を生成
+            # 現在のテーマ名と日付からファイル名を生成（実ファイルはA/Bスロットの新しい方）
             theme_name = self.viewmodel.current_theme
             date_str = datetime.now().strftime('%Y%m%d')
             filename = WALLPAPER_FILENAME_TEMPLATE.format(
                 theme=theme_name,
                 date=date_str
             )
-            image_path = OUTPUT_DIR / filename
+            image_path = latest_slot_path(OUTPUT_DIR / filename) or OUTPUT_DIR / filename
 
             # 画像が存在する場合のみプレビューに設定
             if image_path.exists():
@@ -557,7 +612,7 @@ class MainWindow(QMainWindow):
 
         # 「今すぐ更新」アクション
         update_action = tray_menu.addAction("今すぐ更新")
-        update_action.triggered.connect(self.viewmodel.update_wallpaper)
+        update_action.triggered.connect(lambda: self.viewmodel.update_wallpaper(UpdateReason.FULL))
 
         # 「設定」アクション
         settings_action = tray_menu.addAction("設定")
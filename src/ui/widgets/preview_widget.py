@@ -8,7 +8,7 @@ QPixmapを使用して画像を表示します。
 from enum import Enum, auto
 from pathlib import Path
 from PyQt6.QtWidgets import QLabel
-from PyQt6.QtGui import QPixmap
+from PyQt6.QtGui import QImage, QPixmap
 from PyQt6.QtCore import Qt
 import logging
 
@@ -201,6 +201,35 @@ class PreviewWidget(QLabel):
             logger.error(f"画像設定エラー: {e}")
             self._set_state(PreviewState.ERROR)
 
+    def set_qimage(self, image: QImage):
+        """
+        メモリ上の画像（先読み済みのプレビュー）を設定して表示
+
+        ファイルを読み込まないため、テーマ切り替え時に即座に表示できます。
+        状態遷移: INITIAL/LOADED → LOADED（成功）またはERROR→INITIAL（空の画像）
+
+        Args:
+            image (QImage): プレビュー画像
+        """
+        if image is None or image.isNull():
+            logger.error("プレビュー画像が空です")
+            self._set_state(PreviewState.ERROR)
+            return
+
+        pixmap = QPixmap.fromImage(image)
+        if pixmap.width() > self._max_preview_width or pixmap.height() > self._max_preview_height:
+            pixmap = pixmap.scaled(
+                self._max_preview_width,
+                self._max_preview_height,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+        self._preview_pixmap = pixmap
+        self._image_path = None
+        self._display_scaled_image()
+        self.setText("")
+        self._set_state(PreviewState.LOADED)
+
     def _display_scaled_image(self):
         """
         プレビュー画像をウィジェットサイズに合わせてスケーリングして表示
@@ -6,6 +6,8 @@ MVVMパターンにおけるViewModel層。
 """
 
 from PyQt6.QtCore import pyqtSignal, QThreadPool, QTimer
+from PyQt6.QtGui import QImage
+from functools import partial
 from pathlib import Path
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
@@ -13,7 +15,9 @@ import logging
 
 from src.viewmodels.base_viewmodel import ViewModelBase
 from src.viewmodels.wallpaper_service import WallpaperService
-from src.viewmodels.wallpaper_worker import WallpaperWorker, PreviewWorker
+from src.viewmodels.wallpaper_worker import WallpaperWorker, PreviewWorker, SpeculativePreviewWorker, WarmUpWorker
+from src.viewmodels.update_queue import UpdateReason, UpdateRequestQueue
+from src.viewmodels.preview_cache import PreviewFrameCache
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +36,11 @@ class MainViewModel(ViewModelBase):
     update_started = pyqtSignal()  # 更新開始
     update_completed = pyqtSignal(bool)  # 更新完了（成功/失敗）
     progress_updated = pyqtSignal(int)  # 進捗更新（0-100）
+    stage_completed = pyqtSignal(str, float)  # 更新の段階が完了（段階名, 所要時間（秒））
     error_occurred = pyqtSignal(str)  # エラーが発生したとき
     auto_update_status_changed = pyqtSignal(bool)  # 自動更新状態変更
     preview_ready = pyqtSignal(object)  # プレビュー画像生成完了（Pathを通知）
+    preview_frame_ready = pyqtSignal(object)  # 先読み済みのプレビューを表示（QImageを通知）
     background_image_changed = pyqtSignal(object)  # 背景画像変更（Pathまたは None）
 
     def __init__(self, wallpaper_service: Optional[WallpaperService] = None, parent=None):
@@ -55,6 +61,14 @@ class MainViewModel(ViewModelBase):
         self._is_updating = False
         self._current_worker = None
         self._preview_worker = None
+        # 更新中に届いたリクエストは1回分にまとめて完了後に実行する
+        self._update_queue = UpdateRequestQueue()
+        # 時刻のみの更新で再利用するサービス（前回の更新で描画したイベントと背景を保持）
+        self._tick_service = None
+        # 起動時に前回の壁紙を復元したサービス（最初の更新で描画結果を比較するため再利用）
+        self._restored_service = None
+        # 直近の更新での段階ごとの所要時間（秒）
+        self._last_stage_timings: Dict[str, float] = {}
         self._thread_pool = QThreadPool.globalInstance()
         self._background_image_path = None
 
@@ -65,6 +79,17 @@ class MainViewModel(ViewModelBase):
         self._preview_debounce_timer.timeout.connect(self._on_preview_debounce_timeout)
         self._pending_preview_theme = None
 
+        # テーマの先読みプレビュー（プレビュー表示後、他のテーマを低優先度で描画）
+        from src.config import PREVIEW_PRERENDER_DELAY_MS
+        self._preview_frames = PreviewFrameCache()
+        self._prerender_worker = None
+        self._last_preview_theme = None
+        self._rendered_events_fingerprint = None
+        self._prerender_timer = QTimer(self)
+        self._prerender_timer.setSingleShot(True)
+        self._prerender_timer.setInterval(PREVIEW_PRERENDER_DELAY_MS)
+        self._prerender_timer.timeout.connect(self._start_prerender)
+
         # 自動更新タイマー
         from src.config import AUTO_UPDATE_INTERVAL_MINUTES
         self._auto_update_timer = QTimer(self)
@@ -177,33 +202,76 @@ class MainViewModel(ViewModelBase):
             self.theme_changed.emit(theme_name)
             logger.info(f"テーマを変更しました: {theme_name}")
 
-    def update_wallpaper(self) -> bool:
+    def update_wallpaper(
+        self,
+        reason: UpdateReason = UpdateReason.REFRESH,
+        automatic: bool = False
+    ) -> bool:
         """
         壁紙を更新（非同期実行）
 
         WallpaperServiceが内部でCalendarClientを使用してイベントを取得します。
+        更新中に呼ばれた場合は、完了後に1回だけ実行するよう保留します
+        （複数のリクエストは最も強い理由にまとめる）。
+
+        Args:
+            reason: 更新の種類（FULL は予定を取得し直す）
+            automatic: タイマー等による自動リクエストか。直前に同等以上の
+                更新を開始していれば実行しない。
 
         Returns:
-            bool: ワーカーの起動に成功した場合True、失敗した場合False
+            bool: ワーカーの起動に成功した場合True、保留・省略・失敗した場合False
         """
-        # 同時更新の防止
-        if self._is_updating:
-            logger.warning("既に更新中です")
+        if not self._update_queue.submit(reason, busy=self._is_updating, manual=not automatic):
+            # 同時更新の防止（完了後に実行）
+            if self._is_updating:
+                logger.warning(f"既に更新中です（完了後に実行します: {reason.name}）")
             return False
 
+        return self._start_update(reason)
+
+    def _start_update(self, reason: UpdateReason) -> bool:
+        """
+        壁紙更新ワーカーを起動
+
+        Args:
+            reason: 更新の種類
+
+        Returns:
+            bool: ワーカーの起動に成功した場合True
+        """
         try:
             self._is_updating = True
-            worker_service = self._create_worker_service()
+            self._update_queue.mark_started(reason)
+
+            # 予定を取得し直す更新では、共有しているイベントキャッシュを破棄
+            if reason >= UpdateReason.FULL:
+                self._invalidate_events_cache()
+
+            # 時刻のみの更新は前回の更新で使ったサービスを再利用（予定を取得し直さない）
+            time_only = reason == UpdateReason.TIME_ONLY and self._tick_service is not None
+            if time_only:
+                worker_service = self._tick_service
+            elif self._restored_service is not None and self._restored_service is self._tick_service:
+                # 起動時に復元したサービスで更新し、描画結果が同じなら描画・適用を省く
+                worker_service = self._restored_service
+                self._restored_service = None
+            else:
+                worker_service = self._create_worker_service()
+                self._tick_service = worker_service
+                self._restored_service = None
 
             # WallpaperWorkerを作成
             self._current_worker = WallpaperWorker(
                 worker_service,
-                self._current_theme
+                self._current_theme,
+                time_only=time_only
             )
 
             # シグナルを接続
             self._current_worker.signals.started.connect(self._on_worker_started)
             self._current_worker.signals.progress.connect(self._on_worker_progress)
+            self._current_worker.signals.stage_completed.connect(self._on_worker_stage)
             self._current_worker.signals.finished.connect(self._on_worker_finished)
             self._current_worker.signals.error.connect(self._on_worker_error)
             self._current_worker.signals.result.connect(self._on_worker_result)
@@ -211,7 +279,7 @@ class MainViewModel(ViewModelBase):
             # QThreadPoolで実行
             self._thread_pool.start(self._current_worker)
 
-            logger.info("壁紙更新ワーカーを起動しました")
+            logger.info(f"壁紙更新ワーカーを起動しました（{reason.name}）")
             return True
 
         except Exception as e:
@@ -220,14 +288,32 @@ class MainViewModel(ViewModelBase):
             self._is_updating = False
             return False
 
+    def _invalidate_events_cache(self):
+        """メインサービスのイベントキャッシュを破棄（ワーカーとも共有）"""
+        self._invalidate_preview_frames()
+        if getattr(type(self._wallpaper_service), "invalidate_events_cache", None):
+            # CalendarClient を作成していなければ作成せずに破棄する
+            invalidate = self._wallpaper_service.invalidate_events_cache
+        else:
+            calendar_client = getattr(self._wallpaper_service, "calendar_client", None)
+            invalidate = getattr(calendar_client, "invalidate_events_cache", None)
+        if invalidate is None:
+            return
+        try:
+            invalidate()
+        except Exception as e:
+            logger.warning(f"イベントキャッシュの破棄に失敗しました: {e}")
+
     def cancel_update(self):
-        """壁紙更新をキャンセル"""
+        """壁紙更新をキャンセル（保留中の更新も破棄）"""
+        self._update_queue.clear()
         if self._current_worker:
             self._current_worker.cancel()
             logger.info("壁紙更新のキャンセルを要求しました")
 
     def _on_worker_started(self):
         """ワーカー開始時の処理"""
+        self._last_stage_timings = {}
         self.update_started.emit()
         logger.debug("ワーカーが開始されました")
 
@@ -236,12 +322,42 @@ class MainViewModel(ViewModelBase):
         self.progress_updated.emit(value)
         logger.debug(f"進捗: {value}%")
 
+    def _on_worker_stage(self, stage: str, seconds: float):
+        """更新の段階が完了したときの処理（所要時間を記録）"""
+        self._last_stage_timings[stage] = seconds
+        self.stage_completed.emit(stage, seconds)
+        logger.debug(f"段階完了: {stage} {seconds:.3f}秒")
+
+    @property
+    def last_stage_timings(self) -> Dict[str, float]:
+        """直近の更新での段階ごとの所要時間（秒）"""
+        return dict(self._last_stage_timings)
+
     def _on_worker_finished(self):
         """ワーカー終了時の処理"""
         self._is_updating = False
         self._current_worker = None
         logger.debug("ワーカーが終了しました")
 
+        # 更新中に届いたリクエストがあれば続けて1回だけ実行
+        pending = self._update_queue.take_pending()
+        if pending is not None:
+            logger.info(f"保留中の壁紙更新を実行します（{pending.name}）")
+            self._start_update(pending)
+
+    def _check_rendered_events(self):
+        """更新で描画した予定が前回と変わっていれば先読みプレビューを破棄"""
+        service = self._tick_service
+        if service is None or not getattr(type(service), "rendered_events_fingerprint", None):
+            return
+        fingerprint = service.rendered_events_fingerprint()
+        if fingerprint is None:
+            return
+        if self._rendered_events_fingerprint is not None and fingerprint != self._rendered_events_fingerprint:
+            logger.info("予定が変わったため先読みプレビューを破棄します")
+            self._invalidate_preview_frames()
+        self._rendered_events_fingerprint = fingerprint
+
     def _on_worker_error(self, error_message: str):
         """ワーカーエラー時の処理"""
         self.error_occurred.emit(error_message)
@@ -259,6 +375,63 @@ class MainViewModel(ViewModelBase):
         lower_msg = error_message.lower()
         return any(keyword in lower_msg for keyword in self._auth_error_keywords)
 
+    def get_cached_wallpaper(self) -> Optional[Path]:
+        """
+        前回の壁紙（キャッシュ）のパスを取得（起動直後のプレビュー表示用。取得・描画は行わない）
+
+        Returns:
+            Optional[Path]: キャッシュ壁紙のパス。存在しない場合はNone。
+        """
+        try:
+            return self._wallpaper_service.get_cached_wallpaper()
+        except Exception as e:
+            logger.warning(f"キャッシュ壁紙の取得に失敗しました: {e}")
+            return None
+
+    def restore_last_frame(self) -> Optional[Path]:
+        """
+        前回の壁紙と予定を復元（起動直後の表示用。取得・描画は行わない）
+
+        今日・現在のテーマで描画した壁紙がある場合のみ復元し、時刻更新と次の更新に使う。
+        復元後に refresh_in_background() を呼ぶと、描画結果が変わる場合のみ壁紙を置き換える。
+
+        Returns:
+            Optional[Path]: 復元した壁紙のパス。復元できない場合はNone。
+        """
+        from src.config import INSTANT_ON_STARTUP
+        if not INSTANT_ON_STARTUP:
+            return None
+        service = self._create_worker_service()
+        if not getattr(type(service), "restore_last_frame", None):
+            return None
+        try:
+            # 壁紙は表示中のままのため適用しない（置き換えはバックグラウンドの更新で行う）
+            path = service.restore_last_frame(self._current_theme, apply=False)
+        except Exception as e:
+            logger.warning(f"前回の壁紙の復元に失敗しました: {e}")
+            return None
+        if path is None:
+            return None
+        self._tick_service = service
+        self._restored_service = service
+        return path
+
+    def refresh_in_background(self):
+        """起動直後の更新を予約（イベントループに戻ってから実行し、ウィンドウの表示を待たせない）"""
+        QTimer.singleShot(0, partial(self.update_wallpaper, UpdateReason.REFRESH, True))
+
+    def warm_up(self):
+        """
+        重い初期化をバックグラウンドで先に済ませる（ウィンドウ表示後に呼ぶ）
+
+        プレビュー・更新ワーカーより低い優先度で実行する。
+        """
+        try:
+            self._thread_pool.start(WarmUpWorker(self._wallpaper_service), -1)
+            logger.info("ウォームアップを開始しました")
+        except Exception as e:
+            logger.warning(f"ウォームアップ起動エラー: {e}")
+
     def _fallback_to_cache(self):
         """キャッシュ壁紙にフォールバック"""
         cached = self._wallpaper_service.get_cached_wallpaper()
@@ -278,6 +451,7 @@ class MainViewModel(ViewModelBase):
 
         if success:
             self._retry_count = 0
+            self._check_rendered_events()
             logger.info("壁紙を更新しました")
         else:
             logger.warning("壁紙の更新に失敗しました")
@@ -303,7 +477,7 @@ class MainViewModel(ViewModelBase):
     def _on_retry_timeout(self):
         """リトライタイマー発火: 壁紙更新を再実行"""
         logger.info(f"リトライ実行: {self._retry_count}/{self._max_retries}")
-        self.update_wallpaper()
+        self.update_wallpaper(UpdateReason.REFRESH, automatic=True)
 
     def generate_preview(self) -> Optional[Path]:
         """
@@ -347,6 +521,20 @@ class MainViewModel(ViewModelBase):
         # 実行中のプレビューワーカーをキャンセル
         if self._preview_worker:
             self._preview_worker.cancel()
+            self._preview_worker = None
+
+        # 先読み済みならファイルを介さず即座に表示
+        frame = self._preview_frames.get(theme_name)
+        if frame is not None:
+            self._preview_debounce_timer.stop()
+            self._pending_preview_theme = None
+            self._last_preview_theme = theme_name
+            self.preview_frame_ready.emit(frame)
+            logger.info(f"先読み済みのプレビューを表示しました: {theme_name}")
+            return
+
+        # 先読みの描画と競合しないよう中断（プレビュー表示後に再開）
+        self._cancel_prerender()
 
         # デバウンス: テーマ名を保存してタイマーリスタート
         self._pending_preview_theme = theme_name
@@ -364,7 +552,9 @@ class MainViewModel(ViewModelBase):
                 preview_service,
                 theme_name
             )
-            self._preview_worker.signals.preview_ready.connect(self._on_preview_result)
+            self._preview_worker.signals.preview_ready.connect(
+                partial(self._on_preview_result, theme_name=theme_name, generation=self._preview_frames.generation)
+            )
             self._preview_worker.signals.error.connect(self._on_preview_error)
             self._thread_pool.start(self._preview_worker)
             logger.info(f"プレビューワーカーを起動: {theme_name}")
@@ -373,12 +563,85 @@ class MainViewModel(ViewModelBase):
             logger.error(f"プレビューワーカー起動エラー: {e}")
             self.error_occurred.emit(str(e))
 
-    def _on_preview_result(self, preview_path):
+    def _on_preview_result(self, preview_path, theme_name=None, generation=None):
         """プレビュー生成完了時の処理"""
         self._preview_worker = None
+        if theme_name and preview_path and Path(preview_path).exists():
+            self._preview_frames.put(theme_name, QImage(str(preview_path)), generation)
+            self._last_preview_theme = theme_name
+            self._schedule_prerender()
         self.preview_ready.emit(preview_path)
         logger.info(f"プレビュー画像を生成しました: {preview_path}")
 
+    # === 先読みプレビュー ===
+
+    def _prerender_supported(self) -> bool:
+        """先読みプレビューを使うか（設定で有効、かつサービスが先読みに対応している場合）"""
+        from src.config import PREVIEW_PRERENDER_ENABLED
+        return PREVIEW_PRERENDER_ENABLED and bool(
+            getattr(type(self._wallpaper_service), "generate_preview", None)
+        )
+
+    def _schedule_prerender(self):
+        """プレビュー表示後、少し待ってから他のテーマの先読みを開始"""
+        if self._prerender_supported():
+            self._prerender_timer.start()
+
+    def _prerender_order(self) -> List[str]:
+        """先読みするテーマ（直前にプレビューしたテーマに近い順、先読み済みは除く）"""
+        themes = self.get_available_themes()
+        if self._last_preview_theme in themes:
+            center = themes.index(self._last_preview_theme)
+        else:
+            center = 0
+        ordered = sorted(themes, key=lambda name: abs(themes.index(name) - center))
+        return [name for name in ordered if name not in self._preview_frames]
+
+    def _start_prerender(self):
+        """他のテーマのプレビューを低優先度で先読み"""
+        if self._prerender_worker or self._preview_worker or self._is_updating:
+            return
+        theme_names = self._prerender_order()
+        if not theme_names:
+            return
+
+        try:
+            worker = SpeculativePreviewWorker(
+                self._create_worker_service(),
+                theme_names,
+                self._preview_frames.generation
+            )
+            worker.signals.frame_ready.connect(self._on_prerender_frame)
+            worker.signals.finished.connect(partial(self._on_prerender_finished, worker))
+            self._prerender_worker = worker
+            # 優先度を下げ、プレビュー・壁紙更新のワーカーを先に実行させる
+            self._thread_pool.start(worker, -1)
+            logger.info(f"テーマの先読みを開始しました: {', '.join(theme_names)}")
+        except Exception as e:
+            self._prerender_worker = None
+            logger.warning(f"先読みワーカー起動エラー: {e}")
+
+    def _on_prerender_frame(self, theme_name: str, image, generation: int):
+        """先読みしたプレビューを保存（描画中に無効化された世代のものは破棄）"""
+        self._preview_frames.put(theme_name, image, generation)
+
+    def _on_prerender_finished(self, worker):
+        """先読みワーカー終了時の処理"""
+        if self._prerender_worker is worker:
+            self._prerender_worker = None
+
+    def _cancel_prerender(self):
+        """先読みを中断"""
+        self._prerender_timer.stop()
+        if self._prerender_worker:
+            self._prerender_worker.cancel()
+            self._prerender_worker = None
+
+    def _invalidate_preview_frames(self):
+        """先読みしたプレビューを破棄（予定・背景が変わったとき）"""
+        self._cancel_prerender()
+        self._preview_frames.invalidate()
+
     def _on_preview_error(self, error_message: str):
         """プレビュー生成エラー時の処理"""
         self._preview_worker = None
@@ -397,11 +660,14 @@ class MainViewModel(ViewModelBase):
         if not is_real_service:
             return self._wallpaper_service
 
-        service = WallpaperService()
+        # イベントキャッシュはメインサービスと共有し、プレビュー・更新で同じ期間を二重取得しない
+        # （CalendarClient・ImageGenerator は参照せず、未作成のままワーカー側で作成させる）
+        events_cache = self._wallpaper_service.events_cache
+        service = WallpaperService(events_cache=events_cache)
         try:
             if self._background_image_path:
                 service.set_background_image(self._background_image_path)
-            crop_position = getattr(self._wallpaper_service.image_generator, "crop_position", None)
+            crop_position = self._wallpaper_service.crop_position
             if crop_position:
                 service.set_crop_position(crop_position)
         except Exception as e:
@@ -460,6 +726,8 @@ class MainViewModel(ViewModelBase):
 
         self._background_image_path = path
         self._wallpaper_service.set_background_image(path)
+        self._tick_service = None
+        self._invalidate_preview_frames()
         self.background_image_changed.emit(path)
         logger.info(f"背景画像を設定しました: {path}")
 
@@ -480,6 +748,8 @@ class MainViewModel(ViewModelBase):
 
         self._background_image_path = path
         self._wallpaper_service.set_background_image(path)
+        self._tick_service = None
+        self._invalidate_preview_frames()
         self.background_image_changed.emit(path)
         logger.info(f"プリセット背景画像を設定しました: {filename}")
 
@@ -492,6 +762,8 @@ class MainViewModel(ViewModelBase):
     def set_crop_position(self, position: str):
         """背景画像のクロップ位置を設定"""
         self._wallpaper_service.set_crop_position(position)
+        self._tick_service = None
+        self._invalidate_preview_frames()
         logger.info(f"クロップ位置を '{position}' に設定しました")
 
     # === 自動更新機能 ===
@@ -571,12 +843,16 @@ class MainViewModel(ViewModelBase):
     def _on_auto_update_timeout(self):
         """自動更新タイマーのタイムアウト処理"""
         logger.info("自動更新タイマーが発火しました")
-        self.update_wallpaper()
+        self.update_wallpaper(UpdateReason.REFRESH, automatic=True)
 
     def _on_time_indicator_timeout(self):
-        """現在時刻インジケーター更新タイマーのタイムアウト処理（週間カレンダーの時刻ラインを更新）"""
+        """
+        現在時刻インジケーター更新タイマーのタイムアウト処理（週間カレンダーの時刻ラインを更新）
+
+        前回のイベントを再利用し、表示が変わる場合のみ描画・適用する。
+        """
         logger.debug("現在時刻リフレッシュタイマーが発火しました")
-        self.update_wallpaper()
+        self.update_wallpaper(UpdateReason.TIME_ONLY, automatic=True)
 
     def _on_sleep_check(self):
         """
@@ -597,7 +873,7 @@ class MainViewModel(ViewModelBase):
             logger.info(f"スリープ復帰を検知しました（経過時間: {elapsed_seconds:.1f}秒）")
             if self.is_auto_updating:
                 logger.info("スリープ復帰により即座に壁紙更新を実行します")
-                self.update_wallpaper()
+                self.update_wallpaper(UpdateReason.FULL, automatic=True)
                 triggered = True
                 # スリープ復帰時はmidnight timerも再スケジュール
                 self._schedule_midnight_timer()
@@ -611,7 +887,7 @@ class MainViewModel(ViewModelBase):
                 self._schedule_midnight_timer()
                 if not triggered:
                     logger.info("日付変更により壁紙更新を実行します")
-                    self.update_wallpaper()
+                    self.update_wallpaper(UpdateReason.FULL, automatic=True)
 
         # 最後のチェック時刻を更新
         self._last_check_time = current_time
@@ -637,7 +913,7 @@ class MainViewModel(ViewModelBase):
         self._schedule_midnight_timer()
 
         if self.is_auto_updating:
-            self.update_wallpaper()
+            self.update_wallpaper(UpdateReason.FULL, automatic=True)
 
     def cleanup(self):
         """リソースの解放（タイマー停止等）"""
@@ -657,4 +933,5 @@ class MainViewModel(ViewModelBase):
             self._current_worker.cancel()
         if self._preview_worker:
             self._preview_worker.cancel()
+        self._cancel_prerender()
         logger.info("MainViewModelのリソースを解放しました")
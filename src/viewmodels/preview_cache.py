@@ -0,0 +1,101 @@
+"""
+先読みプレビューのキャッシュ
+
+テーマごとのプレビュー画像（QImage）を件数上限付きのLRUで保持する。
+- 予定・背景が変わったら invalidate() で世代を進めて破棄する
+- 古い世代で描画されたフレームは put() で受け付けない（描画中に無効化された場合）
+- 現在時刻の表示が古くならないよう、一定時間を過ぎたフレームは使わない
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from PyQt6.QtGui import QImage
+
+from src.config import PREVIEW_FRAME_CACHE_SIZE, PREVIEW_FRAME_MAX_AGE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class PreviewFrameCache:
+    """
+    テーマ別プレビュー画像のLRUキャッシュ
+
+    Args:
+        max_entries: 保持するフレーム数の上限
+        max_age_seconds: フレームを使用できる時間（秒）
+    """
+
+    def __init__(
+        self,
+        max_entries: int = PREVIEW_FRAME_CACHE_SIZE,
+        max_age_seconds: float = PREVIEW_FRAME_MAX_AGE_SECONDS
+    ):
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self._frames: "OrderedDict[str, Tuple[QImage, float]]" = OrderedDict()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """現在の世代（描画開始時に控えておき put() に渡す）"""
+        return self._generation
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __contains__(self, theme_name: str) -> bool:
+        return self.get(theme_name, touch=False) is not None
+
+    def get(self, theme_name: str, now: Optional[float] = None, touch: bool = True) -> Optional[QImage]:
+        """
+        テーマのフレームを取得
+
+        Args:
+            theme_name: テーマ名
+            now: 現在時刻（time.monotonic()、省略時は現在）
+            touch: 最近使ったものとして記録するか
+
+        Returns:
+            Optional[QImage]: 使用できるフレーム。なければNone。
+        """
+        entry = self._frames.get(theme_name)
+        if entry is None:
+            return None
+        image, rendered_at = entry
+        now = time.monotonic() if now is None else now
+        if now - rendered_at > self.max_age_seconds:
+            del self._frames[theme_name]
+            return None
+        if touch:
+            self._frames.move_to_end(theme_name)
+        return image
+
+    def put(self, theme_name: str, image: QImage, generation: int, now: Optional[float] = None) -> bool:
+        """
+        フレームを保存
+
+        Args:
+            theme_name: テーマ名
+            image: プレビュー画像
+            generation: 描画開始時の世代
+            now: 描画時刻（time.monotonic()、省略時は現在）
+
+        Returns:
+            bool: 保存した場合True（世代が古い・画像が空の場合はFalse）
+        """
+        if generation != self._generation or image is None or image.isNull():
+            return False
+        self._frames[theme_name] = (image, time.monotonic() if now is None else now)
+        self._frames.move_to_end(theme_name)
+        while len(self._frames) > self.max_entries:
+            self._frames.popitem(last=False)
+        return True
+
+    def invalidate(self) -> None:
+        """すべてのフレームを破棄し、描画中のフレームも受け付けないようにする"""
+        self._generation += 1
+        if self._frames:
+            logger.debug(f"先読みプレビューを破棄しました: {len(self._frames)}件")
+        self._frames.clear()
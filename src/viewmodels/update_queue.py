@@ -0,0 +1,128 @@
+"""
+壁紙更新リクエストキュー
+
+自動更新・現在時刻ライン・日付変更・スリープ復帰・リトライ・ユーザー操作など、
+複数のきっかけから届く更新リクエストをまとめる。
+- 更新中に届いたリクエストは、完了後に1回だけ実行する（理由は最も強いものを保持）
+- 直前に同等以上の更新を開始していれば、自動のリクエストは実行しない
+  （スリープ復帰直後に各タイマーが一斉に発火しても更新は1回で済む）
+"""
+import logging
+import time
+from enum import IntEnum
+from typing import Dict, Optional
+
+from src.config import UPDATE_COALESCE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateReason(IntEnum):
+    """
+    更新の種類（値が大きいほど強い＝処理が重い）
+
+    強い更新は弱い更新の内容をすべて含むため、まとめる際は強い方を残す。
+    """
+    TIME_ONLY = 1  # 現在時刻ラインの更新のみ（予定はキャッシュを利用）
+    REFRESH = 2  # 通常更新（有効期限内ならキャッシュした予定を利用）
+    FULL = 3  # 予定を取得し直す（日付変更・スリープ復帰・手動更新）
+
+
+class UpdateRequestQueue:
+    """
+    更新リクエストのまとめ役
+
+    Args:
+        coalesce_seconds: 更新開始からこの秒数以内の自動リクエストは、
+            同等以上の更新が開始済みなら実行しない
+    """
+
+    def __init__(self, coalesce_seconds: float = UPDATE_COALESCE_SECONDS):
+        self.coalesce_seconds = coalesce_seconds
+        self._pending: Optional[UpdateReason] = None
+        self._pending_manual = False
+        self._last_reason: Optional[UpdateReason] = None
+        self._last_started: Optional[float] = None
+        self.stats: Dict[str, int] = {
+            'requested': 0,
+            'started': 0,
+            'merged': 0,
+            'absorbed': 0,
+        }
+
+    @property
+    def pending(self) -> Optional[UpdateReason]:
+        """完了後に実行する更新（なければNone）"""
+        return self._pending
+
+    def _is_satisfied(self, reason: UpdateReason, now: float) -> bool:
+        """直前に開始した更新で、このリクエストが満たされるか"""
+        return (
+            self._last_started is not None
+            and self._last_reason >= reason
+            and now - self._last_started <= self.coalesce_seconds
+        )
+
+    def submit(
+        self,
+        reason: UpdateReason,
+        busy: bool,
+        manual: bool = False,
+        now: Optional[float] = None
+    ) -> bool:
+        """
+        更新リクエストを受け付ける
+
+        Args:
+            reason: 更新の種類
+            busy: 更新を実行中か
+            manual: ユーザー操作によるリクエストか（直前の更新で省略しない）
+            now: 現在時刻（time.monotonic()、省略時は現在）
+
+        Returns:
+            bool: 今すぐ更新を開始すべきならTrue（実行中なら完了後に実行するよう保留）
+        """
+        now = time.monotonic() if now is None else now
+        self.stats['requested'] += 1
+
+        if not manual and self._is_satisfied(reason, now):
+            self.stats['absorbed'] += 1
+            logger.debug(f"直前の更新に含まれるため省略しました: {reason.name}")
+            return False
+
+        if busy:
+            if self._pending is not None:
+                self.stats['merged'] += 1
+            self._pending = max(reason, self._pending) if self._pending is not None else reason
+            self._pending_manual = self._pending_manual or manual
+            return False
+
+        return True
+
+    def mark_started(self, reason: UpdateReason, now: Optional[float] = None) -> None:
+        """更新を開始したことを記録"""
+        self._last_reason = reason
+        self._last_started = time.monotonic() if now is None else now
+        self.stats['started'] += 1
+
+    def take_pending(self, now: Optional[float] = None) -> Optional[UpdateReason]:
+        """
+        保留中の更新を取り出す（更新完了時に呼ぶ）
+
+        Returns:
+            Optional[UpdateReason]: 続けて実行する更新。不要ならNone。
+        """
+        reason, manual = self._pending, self._pending_manual
+        self.clear()
+        if reason is None:
+            return None
+        now = time.monotonic() if now is None else now
+        if not manual and self._is_satisfied(reason, now):
+            self.stats['absorbed'] += 1
+            return None
+        return reason
+
+    def clear(self) -> None:
+        """保留中の更新を破棄"""
+        self._pending = None
+        self._pending_manual = False
@@ -9,15 +9,27 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
 import logging
-
-from ..calendar_client import CalendarClient
-from ..image_generator import ImageGenerator
+import threading
+
+from ..calendar_client import CalendarClient, warm_up as warm_up_calendar_api
+from ..cancellation import CancellationToken, check_cancelled
+from ..pipeline_progress import PipelineProgress, mark_stage
+from ..metrics import metrics
+from ..config import MULTI_DISPLAY_RENDER, WALLPAPER_TARGET_DESKTOP, PREVIEW_RENDER_SIZE
+from ..display_info import DisplayInfo
+from ..events_cache import EventsCache, events_fingerprint
+from ..lazy_import import LazyImport, resolve
 from ..wallpaper_setter import WallpaperSetter
-from ..wallpaper_cache import WallpaperCache
+from ..wallpaper_cache import CachedFrame, WallpaperCache
+from ..output_store import OutputStore
 from .. import themes
 
 logger = logging.getLogger(__name__)
 
+# 描画系（PIL・NumPy）の読み込みは起動時に行わず、最初の描画またはウォームアップまで遅らせる
+ImageGenerator = LazyImport('src.image_generator', 'ImageGenerator')
+render_for_displays = LazyImport('src.multi_display', 'render_for_displays')
+
 
 class WallpaperService:
     """
@@ -25,20 +37,123 @@ class WallpaperService:
 
     ImageGeneratorとWallpaperSetterを使用して、
     壁紙の生成と設定を行います。
+    CalendarClient（アカウントの読み込み）と ImageGenerator（フォント・描画系の読み込み）は
+    最初に使われた時点で作成し、起動時のウィンドウ表示を待たせない（warm_up() でモジュールだけ先に読み込める）。
     """
 
-    def __init__(self):
-        """WallpaperServiceを初期化"""
-        self.calendar_client = CalendarClient()
-        self.image_generator = ImageGenerator()
+    def __init__(self, events_cache: Optional[EventsCache] = None):
+        """
+        WallpaperServiceを初期化
+
+        Args:
+            events_cache: 他のサービスと共有するイベントキャッシュ（省略時は専用キャッシュ）
+        """
+        self._events_cache = events_cache if events_cache is not None else EventsCache()
+        self._calendar_client = None
+        self._image_generator = None
+        self._init_lock = threading.RLock()
+        # ImageGenerator 作成前に受けた背景設定（作成時に反映する）
+        self._background_image: Optional[Path] = None
+        self._crop_position: Optional[str] = None
         self.wallpaper_setter = WallpaperSetter()
         self.wallpaper_cache = WallpaperCache()
+        self.output_store = OutputStore(wallpaper_cache=self.wallpaper_cache)
+        # 直近の生成結果（ディスプレイ順。マルチディスプレイ描画時のみ複数）
+        self._display_outputs: List[Path] = []
+        # 時刻更新用: 前回描画したイベント・テーマ・時刻依存の表示内容
+        self._event_snapshot: Optional[Dict] = None
+        self._time_state = None
+        # 起動時に復元した前回の壁紙（最初の更新で描画結果が同じなら描画・適用を省く）
+        self._restored_frame: Optional[CachedFrame] = None
         logger.info("WallpaperServiceを初期化しました")
 
-    def _collect_events(self) -> tuple[list, list]:
+    @property
+    def calendar_client(self):
+        """CalendarClient（最初に使われた時点で作成）"""
+        client = self._calendar_client
+        if client is None:
+            with self._init_lock:
+                client = self._calendar_client
+                if client is None:
+                    client = self._calendar_client = CalendarClient(events_cache=self._events_cache)
+        return client
+
+    @calendar_client.setter
+    def calendar_client(self, client) -> None:
+        self._calendar_client = client
+
+    @property
+    def image_generator(self):
+        """ImageGenerator（最初に使われた時点で作成し、それまでに受けた背景設定を反映）"""
+        generator = self._image_generator
+        if generator is None:
+            with self._init_lock:
+                generator = self._image_generator
+                if generator is None:
+                    generator = ImageGenerator()
+                    if self._background_image is not None:
+                        generator.set_background_image(self._background_image)
+                    if self._crop_position is not None:
+                        generator.set_crop_position(self._crop_position)
+                    self._image_generator = generator
+        return generator
+
+    @image_generator.setter
+    def image_generator(self, generator) -> None:
+        self._image_generator = generator
+
+    @property
+    def events_cache(self) -> Optional[EventsCache]:
+        """イベントキャッシュ（CalendarClient を作成せずに参照できる）"""
+        if self._calendar_client is not None:
+            return getattr(self._calendar_client, 'events_cache', None)
+        return self._events_cache
+
+    @property
+    def crop_position(self) -> Optional[str]:
+        """背景画像のクロップ位置（ImageGenerator を作成せずに参照できる）"""
+        if self._image_generator is not None:
+            return getattr(self._image_generator, 'crop_position', None)
+        return self._crop_position
+
+    def invalidate_events_cache(self) -> None:
+        """イベントキャッシュを破棄（CalendarClient が未作成なら作成せずにキャッシュだけ破棄）"""
+        if self._calendar_client is not None:
+            self._calendar_client.invalidate_events_cache()
+        else:
+            self._events_cache.invalidate()
+
+    def warm_up(self) -> None:
+        """
+        重いモジュールの読み込みを先に済ませる（起動直後にバックグラウンドで呼ぶ）
+
+        描画系（PIL・NumPy・レンダラー）と Google API クライアントを読み込む。
+        プレビュー・更新はワーカーごとのサービスで CalendarClient・ImageGenerator を作成するため、
+        インスタンスは作成しない。失敗しても最初の更新時に改めて読み込まれる。
+        """
+        with metrics.span('startup.warm_up'):
+            try:
+                for lazy in (ImageGenerator, render_for_displays):
+                    resolve(lazy)
+                warm_up_calendar_api()
+            except Exception as e:
+                logger.warning(f"ウォームアップに失敗しました（最初の更新時に再試行します）: {e}")
+                return
+        logger.info("ウォームアップが完了しました")
+
+    def _multi_display_enabled(self) -> bool:
+        """ディスプレイごとの解像度で生成するか（全デスクトップ適用時のみ）"""
+        return MULTI_DISPLAY_RENDER and WALLPAPER_TARGET_DESKTOP == 0
+
+    def _collect_events(
+        self,
+        cancel_token: Optional[CancellationToken] = None,
+        progress: Optional[PipelineProgress] = None
+    ) -> tuple[list, list]:
         """
         壁紙生成に必要な week/today イベントを取得する。
         マルチアカウントが有効なら統合取得、未設定時はレガシー経路へフォールバック。
+        cancel_token はページ取得ごとに確認される。progress には取得の完了を記録する。
         """
         today = datetime.now().date()
         week_events = []
@@ -47,58 +162,57 @@ class WallpaperService:
         self.calendar_client.load_accounts()
         accounts = getattr(self.calendar_client, "accounts", {})
         if isinstance(accounts, dict) and len(accounts) > 0:
-            week_events = self.calendar_client.get_all_events(days=7)
+            week_events = self.calendar_client.get_all_events(
+                days=7, cancel_token=cancel_token, progress=progress
+            )
         else:
             # 既存互換: 単一アカウント認証→週イベント
             if not self.calendar_client.authenticate():
                 raise Exception("Google Calendar API認証に失敗しました")
-            week_events = self.calendar_client.get_week_events()
+            week_events = self.calendar_client.get_week_events(cancel_token=cancel_token)
 
         today_events = [
             e for e in week_events
             if e.start_datetime.date() <= today <= e.end_datetime.date()
         ]
+        mark_stage(progress, 'fetch')
         return today_events, week_events
 
     def generate_wallpaper(
         self,
-        theme_name: str
+        theme_name: str,
+        cancel_token: Optional[CancellationToken] = None,
+        progress: Optional[PipelineProgress] = None
     ) -> Path:
         """
         壁紙画像を生成
 
         Args:
             theme_name: テーマ名（例: "simple", "modern"）
+            cancel_token: キャンセルトークン（予定取得・描画の各段階で確認）
+            progress: 進捗の記録（予定取得・描画の各段階の完了を記録）
 
         Returns:
             Path: 生成された壁紙画像のパス
 
         Raises:
             Exception: 認証失敗またはイベント取得失敗時
+            OperationCancelled: キャンセルされた場合
         """
         try:
             logger.info(f"壁紙生成を開始: theme={theme_name}")
 
             # イベント取得（マルチアカウント対応）
-            today_events, week_events = self._collect_events()
+            today_events, week_events = self._collect_events(cancel_token, progress)
             logger.info(f"今日の予定: {len(today_events)}件、今週の予定: {len(week_events)}件")
 
-            # テーマの設定
-            self.image_generator.set_theme(theme_name)
-
-            # 壁紙生成
-            image_path = self.image_generator.generate_wallpaper(today_events, week_events)
-
-            if not image_path:
-                raise Exception("壁紙画像の生成に失敗しました")
+            # 起動時に復元した壁紙と同じ描画結果になるなら、描画せずにそのまま使う
+            restored_path = self._reuse_restored_frame(theme_name, today_events, week_events)
+            if restored_path is not None:
+                return restored_path
 
-            logger.info(f"壁紙生成完了: {image_path}")
-
-            # キャッシュに保存
-            self.wallpaper_cache.save_cache(
-                wallpaper_path=image_path,
-                theme=theme_name
-            )
+            with metrics.span('wallpaper.render'):
+                image_path = self._render_wallpaper(theme_name, today_events, week_events, cancel_token, progress)
 
             # 生成完了後にメモリ解放（バックグラウンド待機時の消費削減）
             self.image_generator.release_resources()
@@ -109,23 +223,252 @@ class WallpaperService:
             logger.error(f"壁紙生成エラー: {e}")
             raise
 
-    def generate_preview(self, theme_name: str) -> Path:
+    def _render_wallpaper(
+        self,
+        theme_name: str,
+        today_events: list,
+        week_events: list,
+        cancel_token: Optional[CancellationToken] = None,
+        progress: Optional[PipelineProgress] = None
+    ) -> Path:
+        """
+        取得済みのイベントで壁紙を描画して保存
+
+        時刻更新で再利用できるよう、描画したイベントと時刻依存の表示内容を記録する。
+        キャンセルされた場合は記録・キャッシュ保存を行わない。
+
+        Returns:
+            Path: 生成された壁紙画像のパス（マルチディスプレイ時は1台目）
+
+        Raises:
+            Exception: 画像生成失敗時
+        """
+        # テーマの設定
+        self.image_generator.set_theme(theme_name)
+        time_state = self.image_generator.visible_time_state(today_events, week_events)
+        render_state = self.image_generator.render_state(today_events, week_events)
+        mark_stage(progress, 'layout')
+
+        # 壁紙生成
+        # 表示中の壁紙ファイルは上書きせず、A/Bのもう一方のスロットに書き込む
+        self._display_outputs = []
+        protected_paths = self.wallpaper_setter.applied_paths()
+        if self._multi_display_enabled():
+            resolutions = DisplayInfo().get_display_resolutions()
+            outputs = render_for_displays(
+                self.image_generator, today_events, week_events, resolutions,
+                protected_paths=protected_paths,
+                cancel_token=cancel_token
+            )
+            # 子プロセスで描画するため、背景〜エンコードをまとめて記録
+            mark_stage(progress, 'encode')
+            if outputs and all(outputs):
+                self._display_outputs = outputs
+            image_path = self._display_outputs[0] if self._display_outputs else None
+        else:
+            image_path = self.image_generator.generate_wallpaper(
+                today_events, week_events, protected_paths=protected_paths,
+                cancel_token=cancel_token,
+                progress=progress
+            )
+
+        if not image_path:
+            raise Exception("壁紙画像の生成に失敗しました")
+
+        logger.info(f"壁紙生成完了: {image_path}")
+        self._event_snapshot = {
+            'theme': theme_name,
+            'date': datetime.now().date(),
+            'today_events': today_events,
+            'week_events': week_events,
+        }
+        self._time_state = time_state
+
+        # キャッシュに保存（次回の起動で復元できるよう、描画に使った予定も保存）
+        self.wallpaper_cache.save_cache(
+            wallpaper_path=image_path,
+            theme=theme_name
+        )
+        self.wallpaper_cache.save_frame(image_path, week_events, render_state)
+
+        # 古い出力ファイルを削除（今回の出力・適用中・キャッシュ壁紙は保持）
+        try:
+            self.output_store.evict(
+                current=[image_path, *self._display_outputs],
+                protected=protected_paths
+            )
+        except Exception as e:
+            logger.warning(f"出力ファイルの整理に失敗しました: {e}")
+
+        return image_path
+
+    def refresh_time_only(
+        self,
+        theme_name: str,
+        cancel_token: Optional[CancellationToken] = None,
+        progress: Optional[PipelineProgress] = None
+    ) -> bool:
+        """
+        現在時刻の表示だけを更新（時刻インジケーター用）
+
+        前回描画したイベントをそのまま使い、予定の取得（API・アカウント読み込み）を行わない。
+        時刻によって変わる表示内容（時間枠のハイライト・カードの状態・進行状況バーの幅）が
+        前回と同じなら描画も適用も行わない。背景は ImageGenerator のキャッシュを再利用する。
+        前回のイベントがない・日付やテーマが変わった場合は通常の更新を行う。
+
+        Args:
+            theme_name: テーマ名
+            cancel_token: キャンセルトークン
+            progress: 進捗の記録
+
+        Returns:
+            bool: 成功（変化なしでスキップした場合を含む）でTrue
+
+        Raises:
+            OperationCancelled: キャンセルされた場合
+        """
+        snapshot = self._event_snapshot
+        if (
+            snapshot is None
+            or snapshot['theme'] != theme_name
+            or snapshot['date'] != datetime.now().date()
+        ):
+            logger.info("時刻更新に使えるイベントがないため通常の更新を行います")
+            return self.generate_and_set_wallpaper(theme_name, cancel_token, progress)
+
+        try:
+            today_events = snapshot['today_events']
+            week_events = snapshot['week_events']
+            self.image_generator.set_theme(theme_name)
+            time_state = self.image_generator.visible_time_state(today_events, week_events)
+            if time_state == self._time_state:
+                logger.info("時刻表示に変化がないため、時刻更新をスキップしました")
+                return True
+
+            logger.info("時刻表示のみ更新します（予定は前回の取得結果を使用）")
+            with metrics.span('wallpaper.render'):
+                image_path = self._render_wallpaper(theme_name, today_events, week_events, cancel_token, progress)
+            check_cancelled(cancel_token, "壁紙の設定")
+            with metrics.span('wallpaper.apply'):
+                result = self._apply_outputs(image_path)
+            mark_stage(progress, 'apply')
+            return result
+
+        except Exception as e:
+            logger.error(f"時刻更新エラー: {e}")
+            return False
+        finally:
+            metrics.flush()
+
+    def restore_last_frame(self, theme_name: str, apply: bool = True) -> Optional[Path]:
+        """
+        前回の壁紙と予定を復元（起動直後に、予定の取得・描画を待たずに表示する）
+
+        今日・同じテーマで描画した壁紙の場合のみ復元する。復元した予定は時刻更新に使い、
+        次の generate_wallpaper() で取得した予定と描画状態が同じなら描画・適用を省く。
+        予定の取得・ImageGenerator の作成は行わない。
+
+        Args:
+            theme_name: テーマ名
+            apply: 壁紙を適用するか（適用済みの場合は WallpaperSetter が何もしない）。
+                マルチディスプレイ描画時は適用しない。
+
+        Returns:
+            Optional[Path]: 復元した壁紙のパス。復元できない場合はNone。
+        """
+        frame = self.wallpaper_cache.load_frame()
+        if frame is None:
+            return None
+        if not frame.is_from_today() or frame.theme != theme_name:
+            logger.info("前回の壁紙は今日・同じテーマのものではないため復元しません")
+            return None
+
+        today = datetime.now().date()
+        self._event_snapshot = {
+            'theme': theme_name,
+            'date': today,
+            'today_events': frame.today_events(today),
+            'week_events': frame.week_events,
+        }
+        self._time_state = None
+        self._restored_frame = frame
+        logger.info(f"前回の壁紙を復元しました: {frame.wallpaper_path}（予定{len(frame.week_events)}件）")
+
+        if apply and not self._multi_display_enabled():
+            with metrics.span('wallpaper.apply'):
+                self.set_wallpaper(frame.wallpaper_path)
+        return frame.wallpaper_path
+
+    def _reuse_restored_frame(self, theme_name: str, today_events: list, week_events: list) -> Optional[Path]:
+        """
+        復元した壁紙と同じ描画結果になるか確認し、同じならその壁紙のパスを返す
+
+        比較は復元後の最初の更新でのみ行う（予定の指紋と描画状態が一致する場合に再利用）。
+        """
+        frame, self._restored_frame = self._restored_frame, None
+        if frame is None or self._multi_display_enabled() or not frame.wallpaper_path.exists():
+            return None
+        if events_fingerprint(week_events) != events_fingerprint(frame.week_events):
+            logger.info("予定が変わったため、前回の壁紙を描画し直します")
+            return None
+
+        self.image_generator.set_theme(theme_name)
+        if self.image_generator.render_state(today_events, week_events) != frame.render_state:
+            logger.info("描画状態が変わったため、前回の壁紙を描画し直します")
+            return None
+
+        logger.info("前回の壁紙と同じ内容のため、描画を省略しました")
+        self._display_outputs = []
+        self._event_snapshot = {
+            'theme': theme_name,
+            'date': datetime.now().date(),
+            'today_events': today_events,
+            'week_events': week_events,
+        }
+        self._time_state = self.image_generator.visible_time_state(today_events, week_events)
+        return frame.wallpaper_path
+
+    def rendered_events_fingerprint(self) -> Optional[int]:
+        """
+        前回描画した予定の指紋（予定の変化の検出用）
+
+        Returns:
+            Optional[int]: 週間イベントの指紋。まだ描画していなければNone。
+        """
+        if self._event_snapshot is None:
+            return None
+        return events_fingerprint(self._event_snapshot['week_events'])
+
+    def generate_preview(
+        self,
+        theme_name: str,
+        cancel_token: Optional[CancellationToken] = None,
+        filename: str = "preview.png"
+    ) -> Path:
         """
         プレビュー専用画像を生成。
         出力先を固定し、プレビュー操作で output/ 配下のファイルを増やさない。
+        画像はプレビュー表示サイズ（PREVIEW_RENDER_SIZE）に縮小して保存し、
+        フル解像度の画像は適用時にのみ生成する。
+        別のテーマが選ばれて cancel_token がキャンセルされると、途中で打ち切る
+        （OperationCancelled を送出）。
+        filename は先読みプレビューなど、表示中のプレビューと別のファイルに書き込む場合に指定する。
+        計測はプレビュー1回分ごとに source='preview' として出力し、壁紙更新の記録に混ぜない。
         """
         try:
-            today_events, week_events = self._collect_events()
+            today_events, week_events = self._collect_events(cancel_token)
             self.image_generator.set_theme(theme_name)
 
             preview_dir = self.wallpaper_cache._cache_dir
             preview_dir.mkdir(parents=True, exist_ok=True)
-            preview_path = preview_dir / "preview.png"
+            preview_path = preview_dir / filename
 
             image_path = self.image_generator.generate_wallpaper(
                 today_events,
                 week_events,
-                output_path=preview_path
+                output_path=preview_path,
+                output_size=PREVIEW_RENDER_SIZE,
+                cancel_token=cancel_token
             )
             if not image_path:
                 raise Exception("プレビュー画像の生成に失敗しました")
@@ -133,6 +476,8 @@ class WallpaperService:
         except Exception as e:
             logger.error(f"プレビュー生成エラー: {e}")
             raise
+        finally:
+            metrics.flush('preview')
 
     def set_wallpaper(self, image_path: Path) -> bool:
         """
@@ -161,29 +506,46 @@ class WallpaperService:
 
     def generate_and_set_wallpaper(
         self,
-        theme_name: str
+        theme_name: str,
+        cancel_token: Optional[CancellationToken] = None,
+        progress: Optional[PipelineProgress] = None
     ) -> bool:
         """
         壁紙を生成して設定
 
         Args:
             theme_name: テーマ名
+            cancel_token: キャンセルトークン（キャンセル時は壁紙を設定しない）
+            progress: 進捗の記録（各段階の完了と所要時間を記録）
 
         Returns:
             bool: 生成と設定が成功でTrue、失敗でFalse
+
+        Raises:
+            OperationCancelled: キャンセルされた場合
         """
         try:
             # 壁紙生成
-            image_path = self.generate_wallpaper(theme_name)
-
-            # 壁紙設定
-            result = self.set_wallpaper(image_path)
+            image_path = self.generate_wallpaper(theme_name, cancel_token, progress)
+            check_cancelled(cancel_token, "壁紙の設定")
 
+            with metrics.span('wallpaper.apply'):
+                result = self._apply_outputs(image_path)
+            mark_stage(progress, 'apply')
             return result
 
         except Exception as e:
             logger.error(f"壁紙生成・設定エラー: {e}")
             return False
+        finally:
+            # 更新1回分の計測をJSONLに出力（計測が無効なら何もしない）
+            metrics.flush()
+
+    def _apply_outputs(self, image_path: Path) -> bool:
+        """生成した壁紙を設定（マルチディスプレイ描画時はディスプレイごとに設定）"""
+        if len(self._display_outputs) > 1:
+            return self.wallpaper_setter.set_wallpapers(self._display_outputs)
+        return self.set_wallpaper(image_path)
 
     def set_background_image(self, path: Path):
         """
@@ -192,17 +554,26 @@ class WallpaperService:
         Args:
             path: 背景画像のパス
         """
-        self.image_generator.set_background_image(path)
+        with self._init_lock:
+            self._background_image = path
+            if self._image_generator is not None:
+                self._image_generator.set_background_image(path)
         logger.info(f"背景画像を設定しました: {path}")
 
     def reset_background_image(self):
         """背景画像をデフォルトに戻す"""
-        self.image_generator.reset_background_image()
+        with self._init_lock:
+            self._background_image = None
+            if self._image_generator is not None:
+                self._image_generator.reset_background_image()
         logger.info("背景画像をデフォルトに戻しました")
 
     def set_crop_position(self, position: str):
         """背景画像のクロップ位置を設定"""
-        self.image_generator.set_crop_position(position)
+        with self._init_lock:
+            self._crop_position = position
+            if self._image_generator is not None:
+                self._image_generator.set_crop_position(position)
         logger.info(f"クロップ位置を '{position}' に設定しました")
 
     def get_cached_wallpaper(self) -> Optional[Path]:
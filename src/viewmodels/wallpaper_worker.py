@@ -6,9 +6,13 @@ UIスレッドをブロックせずに壁紙生成と設定を実行します。
 """
 
 from PyQt6.QtCore import QObject, QRunnable, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import QImage
 from typing import List, Dict, Optional
 import logging
 
+from ..cancellation import CancellationToken, OperationCancelled
+from ..pipeline_progress import PipelineProgress
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,6 +25,7 @@ class WorkerSignals(QObject):
     """
     started = pyqtSignal()
     progress = pyqtSignal(int)
+    stage_completed = pyqtSignal(str, float)  # 段階名, 所要時間（秒）
     finished = pyqtSignal()
     error = pyqtSignal(str)
     result = pyqtSignal(bool)
@@ -32,6 +37,12 @@ class PreviewSignals(QObject):
     error = pyqtSignal(str)
 
 
+class PrerenderSignals(QObject):
+    """SpeculativePreviewWorkerのシグナル"""
+    frame_ready = pyqtSignal(str, object, int)  # テーマ名, QImage, 描画開始時の世代
+    finished = pyqtSignal()
+
+
 class WallpaperWorker(QRunnable):
     """
     壁紙更新ワーカー
@@ -41,19 +52,24 @@ class WallpaperWorker(QRunnable):
     進捗やエラーをシグナルで通知します。
     """
 
-    def __init__(self, wallpaper_service, theme_name: str):
+    def __init__(self, wallpaper_service, theme_name: str, time_only: bool = False):
         """
         WallpaperWorkerを初期化
 
         Args:
             wallpaper_service: WallpaperServiceインスタンス
             theme_name (str): 使用するテーマ名
+            time_only (bool): 現在時刻の表示のみ更新する（前回のイベントを再利用）
         """
         super().__init__()
         self.signals = WorkerSignals()
         self._wallpaper_service = wallpaper_service
         self._theme_name = theme_name
+        self._time_only = time_only
         self._is_cancelled = False
+        self._cancel_token = CancellationToken()
+        # 直近の実行での段階ごとの所要時間（秒）
+        self.stage_timings: Dict[str, float] = {}
 
     @pyqtSlot()
     def run(self):
@@ -73,19 +89,22 @@ class WallpaperWorker(QRunnable):
                 self.signals.result.emit(False)
                 return
 
-            # 壁紙生成と設定を実行
-            self.signals.progress.emit(50)
+            # 各段階の完了時に進捗・所要時間を通知
+            progress = PipelineProgress(self._on_stage_progress)
+            extra = {'cancel_token': self._cancel_token, 'progress': progress}
 
-            # 実行前にもう一度キャンセルチェック
-            if self._is_cancelled:
-                logger.info("ワーカーがキャンセルされました（実行前）")
-                self.signals.result.emit(False)
-                return
-
-            # WallpaperServiceが内部でCalendarClientを使ってイベント取得
-            success = self._wallpaper_service.generate_and_set_wallpaper(
-                theme_name=self._theme_name
-            )
+            if self._time_only and getattr(type(self._wallpaper_service), "refresh_time_only", None):
+                # 前回のイベントを再利用して時刻表示のみ更新
+                success = self._wallpaper_service.refresh_time_only(
+                    theme_name=self._theme_name, **extra
+                )
+            else:
+                # WallpaperServiceが内部でCalendarClientを使ってイベント取得
+                success = self._wallpaper_service.generate_and_set_wallpaper(
+                    theme_name=self._theme_name, **extra
+                )
+            progress.log_summary("壁紙更新")
+            self.stage_timings = progress.timings
 
             # 実行後にキャンセルされていた場合は失敗扱い
             if self._is_cancelled:
@@ -98,6 +117,10 @@ class WallpaperWorker(QRunnable):
 
             logger.info(f"壁紙更新が完了しました: success={success}")
 
+        except OperationCancelled:
+            logger.info("ワーカーがキャンセルされました（処理中）")
+            self.signals.result.emit(False)
+
         except Exception as e:
             logger.error(f"壁紙更新中にエラーが発生しました: {e}")
             self.signals.error.emit(str(e))
@@ -106,13 +129,21 @@ class WallpaperWorker(QRunnable):
         finally:
             self.signals.finished.emit()
 
+    def _on_stage_progress(self, stage: str, percent: int, elapsed: Optional[float]):
+        """パイプラインの進捗をシグナルで通知"""
+        self.signals.progress.emit(percent)
+        if elapsed is not None:
+            self.signals.stage_completed.emit(stage, elapsed)
+
     def cancel(self):
         """
         ワーカーをキャンセル
 
-        実行中のワーカーにキャンセルフラグを設定します。
+        実行中のワーカーにキャンセルフラグを設定し、予定取得・描画の
+        次の区切りで処理を打ち切ります。
         """
         self._is_cancelled = True
+        self._cancel_token.cancel()
         logger.info("ワーカーのキャンセルが要求されました")
 
 
@@ -137,6 +168,7 @@ class PreviewWorker(QRunnable):
         self._wallpaper_service = wallpaper_service
         self._theme_name = theme_name
         self._is_cancelled = False
+        self._cancel_token = CancellationToken()
 
     @pyqtSlot()
     def run(self):
@@ -147,22 +179,107 @@ class PreviewWorker(QRunnable):
 
             if getattr(type(self._wallpaper_service), "generate_preview", None):
                 preview_path = self._wallpaper_service.generate_preview(
-                    theme_name=self._theme_name
+                    theme_name=self._theme_name, cancel_token=self._cancel_token
                 )
             else:
                 preview_path = self._wallpaper_service.generate_wallpaper(
-                    theme_name=self._theme_name
+                    theme_name=self._theme_name, cancel_token=self._cancel_token
                 )
 
             if not self._is_cancelled:
                 self.signals.preview_ready.emit(preview_path)
                 logger.info(f"プレビュー生成完了: {preview_path}")
 
+        except OperationCancelled:
+            logger.info(f"プレビュー生成を中断しました: {self._theme_name}")
+
         except Exception as e:
             if not self._is_cancelled:
                 logger.error(f"プレビュー生成エラー: {e}")
                 self.signals.error.emit(str(e))
 
     def cancel(self):
-        """ワーカーをキャンセル"""
+        """ワーカーをキャンセル（予定取得・描画の次の区切りで打ち切る）"""
         self._is_cancelled = True
+        self._cancel_token.cancel()
+
+
+class SpeculativePreviewWorker(QRunnable):
+    """
+    テーマの先読みプレビューワーカー
+
+    指定されたテーマのプレビュー画像を順に生成し、QImageとして通知します。
+    テーマごとの区切りと描画の各段階でキャンセルを確認します。
+    生成したファイルは読み込み後に削除します。
+    """
+
+    def __init__(self, wallpaper_service, theme_names: List[str], generation: int):
+        """
+        SpeculativePreviewWorkerを初期化
+
+        Args:
+            wallpaper_service: WallpaperServiceインスタンス（generate_preview を実装していること）
+            theme_names (List[str]): 先読みするテーマ名（優先順）
+            generation (int): 先読み開始時のキャッシュの世代
+        """
+        super().__init__()
+        self.signals = PrerenderSignals()
+        self._wallpaper_service = wallpaper_service
+        self._theme_names = list(theme_names)
+        self._generation = generation
+        self._cancel_token = CancellationToken()
+
+    @pyqtSlot()
+    def run(self):
+        """テーマごとにプレビュー画像を生成"""
+        try:
+            for theme_name in self._theme_names:
+                self._cancel_token.raise_if_cancelled("先読みプレビュー")
+                path = self._wallpaper_service.generate_preview(
+                    theme_name=theme_name,
+                    cancel_token=self._cancel_token,
+                    filename=f"preview_{theme_name}.png"
+                )
+                image = QImage(str(path))
+                path.unlink(missing_ok=True)
+                self.signals.frame_ready.emit(theme_name, image, self._generation)
+                logger.debug(f"先読みプレビューを生成しました: {theme_name}")
+
+        except OperationCancelled:
+            logger.debug("先読みプレビューを中断しました")
+
+        except Exception as e:
+            logger.warning(f"先読みプレビューの生成に失敗しました: {e}")
+
+        finally:
+            self.signals.finished.emit()
+
+    def cancel(self):
+        """ワーカーをキャンセル（描画中のテーマも次の区切りで打ち切る）"""
+        self._cancel_token.cancel()
+
+
+class WarmUpWorker(QRunnable):
+    """
+    起動直後のウォームアップワーカー
+
+    ウィンドウ表示後に低優先度で実行し、Google API クライアント・描画系の読み込みを先に済ませる。
+    """
+
+    def __init__(self, wallpaper_service):
+        """
+        WarmUpWorkerを初期化
+
+        Args:
+            wallpaper_service: WallpaperServiceインスタンス
+        """
+        super().__init__()
+        self._wallpaper_service = wallpaper_service
+
+    @pyqtSlot()
+    def run(self):
+        """ウォームアップを実行（失敗しても最初の更新時に改めて初期化される）"""
+        try:
+            self._wallpaper_service.warm_up()
+        except Exception as e:
+            logger.warning(f"ウォームアップに失敗しました: {e}")
@@ -1,17 +1,54 @@
 """
 壁紙キャッシュ管理
 壁紙生成成功時にメタデータを保存し、API接続不可時にキャッシュから復元
+起動直後の表示用に、描画に使った予定（フレームのスナップショット）も保存する
 """
 import json
 import logging
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import date, datetime
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+from .models.event import CalendarEvent
 from .security_utils import ensure_private_dir, secure_file_permissions
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class CachedFrame:
+    """前回描画した壁紙と、その描画に使った予定"""
+    wallpaper_path: Path
+    theme: str
+    generated_at: datetime
+    week_events: List[CalendarEvent] = field(default_factory=list)
+    # 描画結果を決める設定と時刻依存の表示内容（ImageGenerator.render_state）
+    render_state: Optional[str] = None
+
+    def is_from_today(self, today: Optional[date] = None) -> bool:
+        """今日描画した壁紙か"""
+        return self.generated_at.date() == (today or datetime.now().date())
+
+    def today_events(self, today: Optional[date] = None) -> List[CalendarEvent]:
+        """週間イベントのうち今日にかかるもの"""
+        today = today or datetime.now().date()
+        return [e for e in self.week_events if e.start_datetime.date() <= today <= e.end_datetime.date()]
+
+
+def _event_to_json(event: CalendarEvent) -> dict:
+    data = event.to_dict()
+    data['start_datetime'] = event.start_datetime.isoformat()
+    data['end_datetime'] = event.end_datetime.isoformat()
+    return data
+
+
+def _event_from_json(data: dict) -> CalendarEvent:
+    data = dict(data)
+    data['start_datetime'] = datetime.fromisoformat(data['start_datetime'])
+    data['end_datetime'] = datetime.fromisoformat(data['end_datetime'])
+    return CalendarEvent.from_dict(data)
+
+
 class WallpaperCache:
     """壁紙キャッシュ管理クラス"""
 
@@ -35,6 +72,11 @@ class WallpaperCache:
         """キャッシュメタデータのパス"""
         return self._cache_dir / 'cache_meta.json'
 
+    @property
+    def frame_path(self) -> Path:
+        """フレームのスナップショット（描画に使った予定）のパス"""
+        return self._cache_dir / 'frame_snapshot.json'
+
     def save_cache(self, wallpaper_path: Path, theme: str) -> None:
         """
         壁紙キャッシュのメタデータを保存
@@ -79,3 +121,68 @@ class WallpaperCache:
         except (json.JSONDecodeError, KeyError) as e:
             logger.warning(f"キャッシュメタデータの読み込みに失敗: {e}")
             return None
+
+    def save_frame(self, wallpaper_path: Path, week_events: List[CalendarEvent], render_state: str) -> None:
+        """
+        壁紙の描画に使った予定と描画状態を保存（save_cache の後に呼ぶ）
+
+        Args:
+            wallpaper_path: 壁紙画像のパス（キャッシュメタデータと一致する場合のみ復元に使う）
+            week_events: 描画に使った週間イベント
+            render_state: 描画結果を決める設定と時刻依存の表示内容
+        """
+        try:
+            snapshot = {
+                'wallpaper_path': str(wallpaper_path),
+                'render_state': render_state,
+                'week_events': [_event_to_json(e) for e in week_events],
+            }
+            # 起動時に読み込むため、書き込み途中で終了しても壊れないよう差し替えで保存
+            # （atomic_output は PIL を読み込むため、起動時ではなく保存時に読み込む）
+            from .atomic_output import atomic_write_text
+            atomic_write_text(self.frame_path, json.dumps(snapshot, ensure_ascii=False))
+            secure_file_permissions(self.frame_path)
+        except Exception as e:
+            logger.warning(f"フレームのスナップショット保存エラー: {e}")
+
+    def load_frame(self) -> Optional[CachedFrame]:
+        """
+        前回の壁紙と、その描画に使った予定を読み込み
+
+        Returns:
+            CachedFrame。キャッシュ・スナップショットがない、壁紙ファイルが存在しない、
+            またはスナップショットが別の壁紙のものである場合はNone。
+        """
+        wallpaper_path = self.load_cache()
+        if wallpaper_path is None or not self.frame_path.exists():
+            return None
+
+        try:
+            meta = json.loads(self.meta_path.read_text())
+            snapshot = json.loads(self.frame_path.read_text())
+            if snapshot['wallpaper_path'] != str(wallpaper_path):
+                logger.info("フレームのスナップショットが前回の壁紙と一致しません")
+                return None
+            return CachedFrame(
+                wallpaper_path=wallpaper_path,
+                theme=meta['theme'],
+                generated_at=datetime.fromisoformat(meta['generated_at']),
+                week_events=[_event_from_json(item) for item in snapshot['week_events']],
+                render_state=snapshot.get('render_state'),
+            )
+        except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"フレームのスナップショットの読み込みに失敗: {e}")
+            return None
+
+    def protected_paths(self) -> List[Path]:
+        """
+        削除してはいけない壁紙ファイル（キャッシュ復元に使うファイル）
+
+        Returns:
+            List[Path]: キャッシュメタデータが指す壁紙パス（存在確認はしない）
+        """
+        try:
+            meta = json.loads(self.meta_path.read_text())
+            return [Path(meta['last_wallpaper_path'])]
+        except (OSError, json.JSONDecodeError, KeyError, TypeError):
+            return []
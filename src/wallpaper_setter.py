@@ -4,12 +4,18 @@ OS別に壁紙を設定する機能を提供
 """
 import platform
 import ctypes
+import hashlib
+import json
 import re
 import subprocess
 import logging
+import time
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 from . import config
+from .desktop_backends import LinuxWallpaperBackends, get_linux_backends, kde_per_screen_script
+from .security_utils import ensure_private_dir, secure_file_permissions
 
 logger = logging.getLogger(__name__)
 
@@ -24,11 +30,138 @@ MAX_FILE_SIZE_BYTES = 50 * 1024 * 1024
 _DANGEROUS_PATH_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
 
 
+def file_digest(path: Path) -> Optional[str]:
+    """
+    ファイル内容のSHA-256を計算
+
+    Args:
+        path: 対象ファイル
+
+    Returns:
+        Optional[str]: 16進ダイジェスト。読み込めない場合はNone。
+    """
+    try:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+class AppliedWallpaperState:
+    """
+    ディスプレイごとの適用済み壁紙の記録（再起動後も保持）
+
+    {ターゲット: {'sha256', 'path', 'size', 'mtime_ns', 'applied_at'}} をJSONで保存する。
+
+    Args:
+        state_path: 保存先のJSONファイル
+    """
+
+    def __init__(self, state_path: Path):
+        self.state_path = state_path
+        self._entries: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            if self.state_path.exists():
+                data = json.loads(self.state_path.read_text())
+                if isinstance(data, dict):
+                    self._entries = data
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"適用済み壁紙の記録を読み込めませんでした: {e}")
+
+    def _save(self) -> None:
+        try:
+            ensure_private_dir(self.state_path.parent)
+            self.state_path.write_text(json.dumps(self._entries, ensure_ascii=False))
+            secure_file_permissions(self.state_path)
+        except OSError as e:
+            logger.warning(f"適用済み壁紙の記録を保存できませんでした: {e}")
+
+    def is_current(self, target: str, image_path: Path, digest: Optional[str]) -> bool:
+        """
+        指定ターゲットに同じ内容の壁紙が適用済みか判定
+
+        記録されたファイルが別パスの場合は、そのファイルが適用時から
+        変更されていない（サイズ・更新時刻が同じ）ことも確認する。
+
+        Args:
+            target: ターゲット（ディスプレイ）
+            image_path: これから適用する画像（絶対パス）
+            digest: 画像のSHA-256
+
+        Returns:
+            bool: 適用済みならTrue
+        """
+        entry = self._entries.get(target)
+        if digest is None or not entry or entry.get('sha256') != digest:
+            return False
+        if entry.get('path') == str(image_path):
+            return True
+        try:
+            stat = Path(entry['path']).stat()
+        except (OSError, KeyError):
+            return False
+        return stat.st_size == entry.get('size') and stat.st_mtime_ns == entry.get('mtime_ns')
+
+    def record(self, target: str, image_path: Path, digest: Optional[str]) -> None:
+        """適用した壁紙を記録"""
+        if digest is None:
+            return
+        try:
+            stat = image_path.stat()
+        except OSError:
+            return
+        self._entries[target] = {
+            'sha256': digest,
+            'path': str(image_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'applied_at': datetime.now().isoformat(),
+        }
+        self._save()
+
+    def paths(self, prefix: str = '') -> List[Path]:
+        """記録されている適用中の壁紙パス（ターゲットの接頭辞で絞り込み）"""
+        return [
+            Path(entry['path']) for target, entry in self._entries.items()
+            if target.startswith(prefix) and entry.get('path')
+        ]
+
+    def clear(self) -> None:
+        """記録を削除（次回は必ず適用する）"""
+        self._entries = {}
+        self._save()
+
+
 class WallpaperSetter:
     """壁紙設定クラス"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        state_path: Optional[Path] = None,
+        linux_backends: Optional[LinuxWallpaperBackends] = None
+    ):
+        """
+        Args:
+            state_path: 適用済み壁紙の記録先（省略時は APPLIED_WALLPAPER_STATE_PATH）
+            linux_backends: Linuxの壁紙設定バックエンド（省略時はプロセス内で共有）
+        """
         self.system = platform.system()
+        self._linux_backends = linux_backends
+        self._applied = AppliedWallpaperState(state_path or config.APPLIED_WALLPAPER_STATE_PATH)
+        # 適用・スキップの集計（スキップで節約したOS呼び出しと推定時間）
+        self.metrics = {
+            'applied': 0,
+            'skipped': 0,
+            'os_calls_saved': 0,
+            'seconds_saved': 0.0,
+            'last_apply_seconds': 0.0,
+        }
         logger.info(f"検出されたOS: {self.system}")
 
     def _validate_wallpaper_path(self, path: Path) -> bool:
@@ -50,46 +183,69 @@ class WallpaperSetter:
             return False
         return True
 
-    def set_wallpaper(self, image_path: Path) -> bool:
+    def _prepare_path(self, image_path: Path) -> Optional[Path]:
         """
-        壁紙を設定
+        壁紙画像パスを検証して絶対パスに変換
 
         Args:
             image_path: 壁紙画像のパス
 
         Returns:
-            bool: 設定成功でTrue、失敗でFalse
+            Optional[Path]: 検証済みの絶対パス。不正な場合はNone。
         """
         if not image_path.exists():
             logger.error(f"画像ファイルが見つかりません: {image_path}")
-            return False
+            return None
 
         # セキュリティ: 画像ファイル拡張子の検証
         file_extension = image_path.suffix
         if file_extension not in ALLOWED_IMAGE_EXTENSIONS:
             logger.error(f"サポートされていないファイル形式: {file_extension}")
-            return False
+            return None
 
         # セキュリティ: ファイルサイズの検証
         file_size = image_path.stat().st_size
         if file_size > MAX_FILE_SIZE_BYTES:
             logger.error(f"ファイルサイズが大きすぎます: {file_size / (1024*1024):.2f}MB (上限: {MAX_FILE_SIZE_BYTES / (1024*1024):.0f}MB)")
-            return False
+            return None
 
         # 絶対パスに変換
         abs_path = image_path.resolve()
 
         # セキュリティ: 制御文字によるインジェクション防止（一元検証）
         if not self._validate_wallpaper_path(abs_path):
+            return None
+
+        return abs_path
+
+    def set_wallpaper(self, image_path: Path) -> bool:
+        """
+        壁紙を設定
+
+        Args:
+            image_path: 壁紙画像のパス
+
+        Returns:
+            bool: 設定成功でTrue、失敗でFalse
+        """
+        abs_path = self._prepare_path(image_path)
+        if abs_path is None:
             return False
 
+        target = self._target_key(getattr(config, 'WALLPAPER_TARGET_DESKTOP', 0))
+        digest = file_digest(abs_path)
+        if self._applied.is_current(target, abs_path, digest):
+            self._record_skip(1)
+            return True
+
+        started = time.perf_counter()
         try:
             if self.system == 'Windows':
-                return self._set_wallpaper_windows(abs_path)
+                result = self._set_wallpaper_windows(abs_path)
             elif self.system == 'Darwin':  # Mac
-                return self._set_wallpaper_mac(abs_path)
+                result = self._set_wallpaper_mac(abs_path)
             elif self.system == 'Linux':
-                return self._set_wallpaper_linux(abs_path)
+                result = self._set_wallpaper_linux(abs_path)
             else:
                 logger.error(f"サポートされていないOS: {self.system}")
                 return False
@@ -98,6 +254,128 @@ class WallpaperSetter:
             logger.error(f"壁紙設定エラー: {e}")
             return False
 
+        if result:
+            self._record_apply(time.perf_counter() - started)
+            self._applied.record(target, abs_path, digest)
+        return result
+
+    def _target_key(self, desktop: int) -> str:
+        """適用済み記録のターゲットキー（0 = 全デスクトップ）"""
+        return f"{self.system}:desktop{desktop}"
+
+    def _record_apply(self, elapsed: float) -> None:
+        """適用時間を集計"""
+        self.metrics['applied'] += 1
+        self.metrics['last_apply_seconds'] = elapsed
+
+    def _record_skip(self, os_calls: int) -> None:
+        """スキップを集計（直近の適用時間を節約時間の推定に使用）"""
+        self.metrics['skipped'] += 1
+        self.metrics['os_calls_saved'] += os_calls
+        self.metrics['seconds_saved'] += self.metrics['last_apply_seconds'] * os_calls
+        logger.info(
+            f"壁紙の内容に変更がないため設定をスキップしました"
+            f"（累計スキップ{self.metrics['skipped']}回、OS呼び出し{self.metrics['os_calls_saved']}回・"
+            f"推定{self.metrics['seconds_saved']:.2f}秒を節約）"
+        )
+
+    def applied_paths(self) -> List[Path]:
+        """
+        現在適用中として記録されている壁紙パス
+
+        壁紙の出力時に、表示中のファイルを上書きしないために使用する。
+
+        Returns:
+            List[Path]: 適用中の壁紙パス
+        """
+        return self._applied.paths(prefix=f"{self.system}:")
+
+    def reset_applied_state(self) -> None:
+        """適用済みの記録を消去（次回の設定は内容に関係なく必ず適用）"""
+        self._applied.clear()
+
+    def set_wallpapers(self, image_paths: List[Path]) -> bool:
+        """
+        ディスプレイごとに壁紙を設定
+
+        - Mac: desktop 1, 2, ... にそれぞれ設定
+        - Linux/KDE: 各デスクトップの screen 番号に対応する画像を設定
+        - Windows / GNOME: ディスプレイ別の設定に未対応のため、desktop 1 の画像を全体に設定
+
+        Args:
+            image_paths: ディスプレイ順の壁紙画像パス
+
+        Returns:
+            bool: すべての設定に成功した場合True
+        """
+        if not image_paths:
+            return False
+
+        if len(set(image_paths)) == 1:
+            return self.set_wallpaper(image_paths[0])
+
+        abs_paths = []
+        for image_path in image_paths:
+            abs_path = self._prepare_path(image_path)
+            if abs_path is None:
+                return False
+            abs_paths.append(abs_path)
+
+        targets = [self._target_key(i) for i in range(1, len(abs_paths) + 1)]
+        digests = [file_digest(abs_path) for abs_path in abs_paths]
+        current = [
+            self._applied.is_current(target, abs_path, digest)
+            for target, abs_path, digest in zip(targets, abs_paths, digests)
+        ]
+
+        try:
+            if self.system == 'Darwin':
+                results = []
+                for i, abs_path in enumerate(abs_paths):
+                    if current[i]:
+                        self._record_skip(1)
+                        results.append(True)
+                        continue
+                    started = time.perf_counter()
+                    ok = self._set_wallpaper_mac(abs_path, desktop=i + 1)
+                    if ok:
+                        self._record_apply(time.perf_counter() - started)
+                        self._applied.record(targets[i], abs_path, digests[i])
+                    results.append(ok)
+                return all(results)
+            elif self.system == 'Linux':
+                if all(current):
+                    self._record_skip(1)
+                    return True
+                started = time.perf_counter()
+                if self._set_wallpaper_kde_per_screen(abs_paths):
+                    self._record_apply(time.perf_counter() - started)
+                    for target, abs_path, digest in zip(targets, abs_paths, digests):
+                        self._applied.record(target, abs_path, digest)
+                    return True
+            logger.warning("ディスプレイ別の壁紙設定に未対応のため、desktop 1 の画像を使用します")
+            return self.set_wallpaper(image_paths[0])
+
+        except Exception as e:
+            logger.error(f"ディスプレイ別壁紙設定エラー: {e}")
+            return False
+
+    def _set_wallpaper_kde_per_screen(self, image_paths: List[Path]) -> bool:
+        """
+        KDE Plasma でスクリーンごとに壁紙を設定
+
+        Args:
+            image_paths: スクリーン順の壁紙画像パス（検証済み絶対パス）
+
+        Returns:
+            bool: 設定成功でTrue、KDEが利用できない場合False
+        """
+        if self._get_linux_backends().evaluate_kde_script(kde_per_screen_script(image_paths)):
+            logger.info(f"壁紙を設定しました (Linux/KDE, {len(image_paths)}画面)")
+            return True
+        logger.warning("KDEのスクリーン別壁紙設定に失敗しました")
+        return False
+
     def _set_wallpaper_windows(self, image_path: Path) -> bool:
         """
         Windows用の壁紙設定
@@ -132,12 +410,13 @@ class WallpaperSetter:
             logger.error(f"Windows壁紙設定エラー: {e}")
             return False
 
-    def _set_wallpaper_mac(self, image_path: Path) -> bool:
+    def _set_wallpaper_mac(self, image_path: Path, desktop: Optional[int] = None) -> bool:
         """
         Mac用の壁紙設定
 
         Args:
             image_path: 壁紙画像のパス
+            desktop: 設定先のデスクトップ番号（省略時はWALLPAPER_TARGET_DESKTOP）
 
         Returns:
             bool: 設定成功でTrue、失敗でFalse
@@ -148,7 +427,7 @@ class WallpaperSetter:
 
             # osascriptでAppleScriptを実行
             # WALLPAPER_TARGET_DESKTOPに応じて適用範囲を変更
-            target_desktop = getattr(config, 'WALLPAPER_TARGET_DESKTOP', 0)
+            target_desktop = desktop if desktop is not None else getattr(config, 'WALLPAPER_TARGET_DESKTOP', 0)
 
             if target_desktop == 0:
                 # 全デスクトップに適用
@@ -188,7 +467,10 @@ class WallpaperSetter:
 
     def _set_wallpaper_linux(self, image_path: Path) -> bool:
         """
-        Linux用の壁紙設定（GNOME環境）
+        Linux用の壁紙設定（GNOME / KDE Plasma）
+
+        デスクトップ環境の判定と使用するバックエンドの選択はプロセス内で1回だけ行い、
+        以降は成功したバックエンド（可能なら常駐のD-Bus/GSettings接続）を使い続ける。
 
         Args:
             image_path: 壁紙画像のパス
@@ -196,56 +478,27 @@ class WallpaperSetter:
         Returns:
             bool: 設定成功でTrue、失敗でFalse
         """
-        try:
-            # GNOME環境の場合
-            result = subprocess.run(
-                [
-                    'gsettings', 'set',
-                    'org.gnome.desktop.background', 'picture-uri',
-                    f'file://{image_path}'
-                ],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-
-            logger.info(f"壁紙を設定しました (Linux/GNOME): {image_path}")
+        backends = self._get_linux_backends()
+        if backends.apply(image_path):
+            logger.info(f"壁紙を設定しました (Linux/{backends.active_backend}): {image_path}")
             return True
 
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"GNOME壁紙設定失敗: {e.stderr}")
-
-            # KDE Plasma環境を試す
-            try:
-                # セキュリティ: JavaScript/QMLコード内の危険な文字をエスケープ
-                safe_kde_path = str(image_path).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\r', '\\r')
-
-                result = subprocess.run(
-                    [
-                        'qdbus', 'org.kde.plasmashell', '/PlasmaShell',
-                        'org.kde.PlasmaShell.evaluateScript',
-                        f'''
-                        var allDesktops = desktops();
-                        for (i=0;i<allDesktops.length;i++) {{
-                            d = allDesktops[i];
-                            d.wallpaperPlugin = "org.kde.image";
-                            d.currentConfigGroup = Array("Wallpaper", "org.kde.image", "General");
-                            d.writeConfig("Image", "file://{safe_kde_path}");
-                        }}
-                        '''
-                    ],
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-
-                logger.info(f"壁紙を設定しました (Linux/KDE): {image_path}")
-                return True
+        logger.error("Linux壁紙設定に失敗しました（利用可能なバックエンドがありません）")
+        return False
 
-            except Exception as kde_error:
-                logger.error(f"KDE壁紙設定も失敗: {kde_error}")
-                return False
+    def _get_linux_backends(self) -> LinuxWallpaperBackends:
+        """Linuxの壁紙設定バックエンド（未指定時はプロセス内で共有）"""
+        if self._linux_backends is None:
+            self._linux_backends = get_linux_backends()
+        return self._linux_backends
 
-        except Exception as e:
-            logger.error(f"Linux壁紙設定エラー: {e}")
-            return False
+    def backend_latency(self) -> Dict[str, Dict[str, float]]:
+        """
+        壁紙設定バックエンドごとの適用時間（Linuxのみ）
+
+        Returns:
+            Dict: {バックエンド名: 集計値}。Linux以外、または未使用の場合は空。
+        """
+        if self._linux_backends is None:
+            return {}
+        return self._linux_backends.latency_summary()
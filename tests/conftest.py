@@ -30,3 +30,41 @@ def qapp_run(qapp, qtbot):
     UIテストで非同期処理を待つために使用します。
     """
     return qtbot
+
+
+@pytest.fixture(autouse=True)
+def isolated_applied_wallpaper_state(tmp_path, monkeypatch):
+    """適用済み壁紙の記録をテストごとに分離（実環境の記録でスキップされないように）"""
+    monkeypatch.setattr(
+        'src.config.APPLIED_WALLPAPER_STATE_PATH',
+        tmp_path / 'applied_wallpapers.json'
+    )
+
+
+@pytest.fixture(autouse=True)
+def isolated_notified_events_state(tmp_path, monkeypatch):
+    """通知済みイベントの記録をテストごとに分離"""
+    monkeypatch.setattr(
+        'src.config.NOTIFIED_EVENTS_STATE_PATH',
+        tmp_path / 'notified_events.json'
+    )
+
+
+@pytest.fixture(autouse=True)
+def fresh_linux_wallpaper_backends(monkeypatch):
+    """
+    Linux壁紙バックエンドの選択結果をテスト間で持ち越さない
+
+    常駐接続のバックエンド（Gio/QtDBus）は実際のデスクトップに書き込むため、
+    テストではサブプロセス系（subprocess.run をモック可能）のみを候補にする。
+    """
+    from src import desktop_backends
+    monkeypatch.delenv('XDG_CURRENT_DESKTOP', raising=False)
+    monkeypatch.delenv('DESKTOP_SESSION', raising=False)
+    monkeypatch.setattr(
+        desktop_backends, 'default_backends',
+        lambda: [desktop_backends.GsettingsCommandBackend(), desktop_backends.QdbusCommandBackend()]
+    )
+    desktop_backends.reset_linux_backends()
+    yield
+    desktop_backends.reset_linux_backends()
@@ -0,0 +1,117 @@
+"""
+atomic_output（A/Bスロットとアトミック書き込み）のテスト
+"""
+import os
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from src.atomic_output import atomic_save_image, next_slot_path, slot_paths
+
+
+class TestAtomicSave:
+    """一時ファイル経由の保存"""
+
+    def test_saves_complete_image(self, tmp_path):
+        path = tmp_path / "wallpaper.png"
+        atomic_save_image(Image.new('RGB', (16, 9), (10, 20, 30)), path)
+        with Image.open(path) as img:
+            assert img.size == (16, 9)
+            assert img.getpixel((0, 0)) == (10, 20, 30)
+
+    def test_no_temp_files_left(self, tmp_path):
+        atomic_save_image(Image.new('RGB', (4, 4)), tmp_path / "wallpaper.png")
+        assert [p.name for p in tmp_path.iterdir()] == ["wallpaper.png"]
+
+    def test_failure_keeps_previous_file(self, tmp_path):
+        """保存に失敗しても既存ファイルは壊れず、一時ファイルも残らない"""
+        path = tmp_path / "wallpaper.png"
+        atomic_save_image(Image.new('RGB', (4, 4), (1, 2, 3)), path)
+
+        with patch('src.atomic_output.os.replace', side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                atomic_save_image(Image.new('RGB', (4, 4), (9, 9, 9)), path)
+
+        with Image.open(path) as img:
+            assert img.getpixel((0, 0)) == (1, 2, 3)
+        assert [p.name for p in tmp_path.iterdir()] == ["wallpaper.png"]
+
+
+class TestSlots:
+    """A/Bスロットの選択"""
+
+    def test_slot_names(self, tmp_path):
+        a, b = slot_paths(tmp_path / "wallpaper_simple_20260205.png")
+        assert a.name == "wallpaper_simple_20260205_a.png"
+        assert b.name == "wallpaper_simple_20260205_b.png"
+
+    def test_alternates_between_slots(self, tmp_path):
+        base = tmp_path / "wallpaper.png"
+        first = next_slot_path(base)
+        first.write_bytes(b"1")
+        second = next_slot_path(base)
+        assert second != first
+        second.write_bytes(b"2")
+        os.utime(first, ns=(1, 1))
+        assert next_slot_path(base) == first
+
+    def test_avoids_protected_slot(self, tmp_path):
+        """表示中のスロットは古くても選ばない"""
+        base = tmp_path / "wallpaper.png"
+        a, b = slot_paths(base)
+        a.write_bytes(b"a")
+        b.write_bytes(b"b")
+        os.utime(a, ns=(1, 1))
+        assert next_slot_path(base, avoid=[a]) == b
+
+
+class TestGeneratorDoubleBuffer:
+    """ImageGenerator の出力先"""
+
+    def test_generator_never_overwrites_applied_wallpaper(self, tmp_path):
+        from src.image_generator import ImageGenerator
+
+        with patch('src.image_generator.OUTPUT_DIR', tmp_path):
+            gen = ImageGenerator(resolution=(320, 180))
+            first = gen.generate_wallpaper([], [])
+            second = gen.generate_wallpaper([], [], protected_paths=[first])
+            third = gen.generate_wallpaper([], [], protected_paths=[second])
+
+        assert first != second
+        assert third == first
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+class TestLatestSlot:
+    """最新スロットの取得"""
+
+    def test_returns_most_recent_slot(self, tmp_path):
+        from src.atomic_output import latest_slot_path
+
+        base = tmp_path / "wallpaper.png"
+        a, b = slot_paths(base)
+        assert latest_slot_path(base) is None
+        a.write_bytes(b"a")
+        b.write_bytes(b"b")
+        os.utime(a, ns=(1, 1))
+        assert latest_slot_path(base) == b
+
+    def test_includes_legacy_unslotted_file(self, tmp_path):
+        from src.atomic_output import latest_slot_path
+
+        base = tmp_path / "wallpaper.png"
+        base.write_bytes(b"legacy")
+        assert latest_slot_path(base) == base
+
+
+class TestAtomicWriteText:
+    """テキストのアトミック書き込み"""
+
+    def test_writes_text_without_temp_files(self, tmp_path):
+        from src.atomic_output import atomic_write_text
+
+        path = tmp_path / "snapshot.json"
+        atomic_write_text(path, '{"予定": 1}')
+        assert path.read_text(encoding='utf-8') == '{"予定": 1}'
+        assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,72 @@
+"""
+ベンチマーク（benchmarks パッケージ）のテスト
+"""
+from datetime import date, datetime, time
+
+from benchmarks.render_benchmark import compare_results, run_case
+from benchmarks.synthetic_events import SCENARIOS, generate_week_events, split_today
+
+
+class TestSyntheticEvents:
+    """合成カレンダーのテスト"""
+
+    def test_same_seed_produces_same_events(self):
+        """同じシードからは同じイベントを生成する"""
+        start = date(2026, 1, 5)
+        assert generate_week_events(50, seed=1, start=start) == generate_week_events(50, seed=1, start=start)
+
+    def test_extreme_scenario_contains_edge_cases(self):
+        """重なり・複数日・終日・表示時間帯外の予定を含む"""
+        events = generate_week_events(SCENARIOS['extreme'], start=date(2026, 1, 5))
+
+        assert len(events) == 500
+        assert any(e.is_all_day for e in events)
+        assert any(not e.is_all_day and e.end_datetime.date() > e.start_datetime.date() for e in events)
+        assert any(e.start_datetime.time() < time(8) or e.start_datetime.time() >= time(22) for e in events)
+        overlapping = sum(
+            1 for prev, cur in zip(events, events[1:]) if cur.start_datetime < prev.end_datetime
+        )
+        assert overlapping > 50
+
+    def test_split_today(self):
+        """今日にかかるイベントだけを返す"""
+        today = datetime.now().date()
+        events = generate_week_events(100)
+        assert all(e.start_datetime.date() <= today <= e.end_datetime.date() for e in split_today(events))
+
+
+class TestCompareResults:
+    """ベースラインとの比較のテスト"""
+
+    def _results(self, median_ms, alloc=1000):
+        return {'cases': {'simple/1080p/image/typical': {'median_ms': median_ms, 'py_alloc_peak_bytes': alloc}}}
+
+    def test_slower_than_threshold_is_regression(self):
+        """閾値を超えて遅くなったケースを回帰とする"""
+        regressions = compare_results(self._results(130.0), self._results(100.0), threshold=0.2)
+        assert [r['metric'] for r in regressions] == ['median_ms']
+
+    def test_within_threshold_or_small_delta_is_not_regression(self):
+        """閾値以内・誤差程度の差は回帰にしない"""
+        assert compare_results(self._results(115.0), self._results(100.0), threshold=0.2) == []
+        assert compare_results(self._results(4.0), self._results(1.0), threshold=0.2) == []
+
+    def test_allocation_growth_is_regression(self):
+        """割り当てのピークの増加も回帰とする"""
+        regressions = compare_results(self._results(100.0, 2000), self._results(100.0, 1000), threshold=0.2)
+        assert [r['metric'] for r in regressions] == ['py_alloc_peak_bytes']
+
+
+class TestRunCase:
+    """1ケースの計測のテスト"""
+
+    def test_run_case_reports_stage_timings_and_memory(self, tmp_path):
+        """所要時間・段階ごとの所要時間・割り当てのピークを記録する"""
+        from src.metrics import metrics
+
+        result = run_case('modern', '1080p', 'glass', 'light', repeat=1, output_dir=tmp_path)
+
+        assert result['median_ms'] > 0
+        assert {'pipeline.background', 'pipeline.cards', 'pipeline.week_calendar', 'pipeline.encode'} <= set(result['stages_ms'])
+        assert result['py_alloc_peak_bytes'] > 0
+        assert not metrics.enabled
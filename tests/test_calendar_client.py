@@ -1899,3 +1899,100 @@ class TestMultipleAccountsEvents:
         # 日付が今日と明日であることを確認
         assert time_min_dt.date() == today
         assert time_max_dt.date() == today + timedelta(days=1)
+
+
+class TestStreamingPipeline:
+    """ページ単位のストリーミング取得パイプラインのテスト"""
+
+    @staticmethod
+    def _item(event_id, hour):
+        return {
+            'id': event_id,
+            'summary': event_id,
+            'start': {'dateTime': f'2026-02-09T{hour:02d}:00:00Z'},
+            'end': {'dateTime': f'2026-02-09T{hour:02d}:30:00Z'},
+        }
+
+    def _make_paged_service(self, pages):
+        """executeが呼ばれるたびに次のページを返すサービスモック"""
+        service = MagicMock()
+        responses = []
+        for i, items in enumerate(pages):
+            response = {'items': items}
+            if i < len(pages) - 1:
+                response['nextPageToken'] = f'token{i + 1}'
+            responses.append(response)
+        service.events.return_value.list.return_value.execute.side_effect = responses
+        return service
+
+    def test_pages_are_fetched_lazily(self):
+        """前のページを消費するまで次のページを取得しない"""
+        client = CalendarClient()
+        service = self._make_paged_service([
+            [self._item('a', 9)],
+            [self._item('b', 10)],
+        ])
+        execute = service.events.return_value.list.return_value.execute
+
+        pages = client._iter_event_pages(service, 'primary', 'min', 'max')
+
+        first = next(pages)
+        assert [item['id'] for item in first] == ['a']
+        assert execute.call_count == 1
+
+        second = next(pages)
+        assert [item['id'] for item in second] == ['b']
+        assert execute.call_count == 2
+
+    def test_iter_all_events_streams_across_accounts(self):
+        """最初のアカウントのイベントは後続アカウントの取得前に返される"""
+        client = CalendarClient()
+        service1 = self._make_paged_service([[self._item('a', 9)], [self._item('b', 10)]])
+        service2 = self._make_paged_service([[self._item('c', 8)]])
+        client.accounts = {
+            'account_1': {'service': service1, 'email': '', 'color': '#4285f4', 'display_name': '仕事'},
+            'account_2': {'service': service2, 'email': '', 'color': '#ea4335', 'display_name': '個人'},
+        }
+
+        with patch('src.calendar_client.CALENDAR_IDS', ['primary']):
+            stream = client.iter_all_events(days=7)
+            first = next(stream)
+
+            assert first.id == 'a'
+            assert first.account_id == 'account_1'
+            service2.events.return_value.list.return_value.execute.assert_not_called()
+
+            rest = list(stream)
+
+        assert [e.id for e in rest] == ['b', 'c']
+        assert rest[-1].account_color == '#ea4335'
+
+    def test_get_all_events_sorts_streamed_events(self):
+        """get_all_eventsはストリームを時系列ソートしてキャッシュする"""
+        client = CalendarClient()
+        client.accounts = {
+            'account_1': {
+                'service': self._make_paged_service([[self._item('late', 15)], [self._item('early', 7)]]),
+                'email': '', 'color': '#4285f4', 'display_name': '仕事',
+            },
+        }
+
+        with patch('src.calendar_client.CALENDAR_IDS', ['primary']):
+            events = client.get_all_events(days=7)
+
+        assert [e.id for e in events] == ['early', 'late']
+
+    def test_calendar_error_keeps_other_calendars(self):
+        """1つのカレンダーでAPIエラーが起きても他のカレンダーは取得される"""
+        client = CalendarClient()
+        service = MagicMock()
+        service.events.return_value.list.return_value.execute.side_effect = [
+            Exception("boom"),
+            {'items': [self._item('ok', 9)]},
+        ]
+
+        with patch('src.calendar_client.CALENDAR_IDS', ['broken', 'primary']):
+            events = list(client._iter_events_from_service(service, 'account_1', '#4285f4', '仕事', 7))
+
+        assert [e.id for e in events] == ['ok']
+        assert events[0].calendar_id == 'primary'
@@ -0,0 +1,202 @@
+"""
+協調的キャンセル（CancellationToken）のテスト
+
+予定取得・描画・ワーカーの各段階でキャンセルが反映されることを確認します。
+"""
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from PyQt6.QtCore import QThreadPool
+
+from src.cancellation import CancellationToken, OperationCancelled, check_cancelled
+
+
+def _item(event_id, hour):
+    return {
+        'id': event_id,
+        'summary': event_id,
+        'start': {'dateTime': f'2026-02-09T{hour:02d}:00:00Z'},
+        'end': {'dateTime': f'2026-02-09T{hour:02d}:30:00Z'},
+    }
+
+
+class TestCancellationToken:
+    """CancellationToken の基本動作"""
+
+    def test_raise_if_cancelled(self):
+        """cancel() 後のみ OperationCancelled を送出する"""
+        token = CancellationToken()
+        token.raise_if_cancelled("描画")
+        assert token.cancelled is False
+
+        token.cancel()
+        assert token.cancelled is True
+        with pytest.raises(OperationCancelled):
+            token.raise_if_cancelled("描画")
+
+    def test_not_caught_by_generic_exception_handler(self):
+        """途中の except Exception で握りつぶされない"""
+        token = CancellationToken()
+        token.cancel()
+        with pytest.raises(OperationCancelled):
+            try:
+                check_cancelled(token)
+            except Exception:
+                pass
+
+    def test_check_cancelled_without_token(self):
+        """トークン未指定の場合は何もしない"""
+        check_cancelled(None, "描画")
+
+
+class TestFetchCancellation:
+    """予定取得のキャンセル"""
+
+    def test_pages_stop_after_cancel(self):
+        """キャンセル後は次のページを取得しない"""
+        from src.calendar_client import CalendarClient
+
+        client = CalendarClient()
+        service = MagicMock()
+        execute = service.events.return_value.list.return_value.execute
+        execute.side_effect = [
+            {'items': [_item('a', 9)], 'nextPageToken': 'token1'},
+            {'items': [_item('b', 10)]},
+        ]
+        token = CancellationToken()
+
+        pages = client._iter_event_pages(service, 'primary', 'min', 'max', cancel_token=token)
+        next(pages)
+        token.cancel()
+
+        with pytest.raises(OperationCancelled):
+            next(pages)
+        assert execute.call_count == 1
+
+    def test_cancelled_fetch_is_not_cached_and_waiter_refetches(self):
+        """取得中の呼び出しがキャンセルされても、待っていた呼び出しは自分で取得し直す"""
+        from datetime import datetime, timedelta
+        from src.events_cache import EventsCache
+        from src.models.event import CalendarEvent
+
+        start = datetime.now() + timedelta(days=3)
+        refetched = [CalendarEvent(
+            id="e1", summary="会議", start_datetime=start, end_datetime=start + timedelta(hours=1),
+            is_all_day=False, calendar_id="primary",
+        )]
+        cache = EventsCache()
+        owner_token = CancellationToken()
+        started = threading.Event()
+        release = threading.Event()
+
+        def cancelled_fetch():
+            started.set()
+            release.wait(5)
+            owner_token.raise_if_cancelled()
+            return []
+
+        errors = []
+
+        def owner():
+            try:
+                cache.get('week', cancelled_fetch, cancel_token=owner_token)
+            except OperationCancelled as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=owner)
+        thread.start()
+        assert started.wait(5)
+
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(cache.get('week', lambda: refetched)))
+        waiter.start()
+        owner_token.cancel()
+        release.set()
+        thread.join(5)
+        waiter.join(5)
+
+        assert len(errors) == 1
+        assert results == [refetched]
+        assert cache.peek('week') == refetched
+
+
+class TestRenderCancellation:
+    """描画のキャンセル"""
+
+    def test_cancelled_render_does_not_write_output(self, tmp_path):
+        """描画途中でキャンセルされると画像を保存しない"""
+        from src.image_generator import ImageGenerator
+
+        gen = ImageGenerator(resolution=(1920, 1080))
+        token = CancellationToken()
+        original = gen._draw_event_cards
+
+        def cancel_during_cards(*args, **kwargs):
+            original(*args, **kwargs)
+            token.cancel()
+
+        gen._draw_event_cards = cancel_during_cards
+        output = tmp_path / "preview.png"
+
+        with pytest.raises(OperationCancelled):
+            gen.generate_wallpaper([], [], output_path=output, cancel_token=token)
+        assert not output.exists()
+
+
+class _SlowPreviewService:
+    """generate_preview の途中でキャンセルを確認するサービス"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.reached_end = False
+
+    def generate_preview(self, theme_name, cancel_token=None):
+        self.started.set()
+        for _ in range(100):
+            cancel_token.raise_if_cancelled("描画")
+            threading.Event().wait(0.02)
+        self.reached_end = True
+        return None
+
+
+class TestWorkerCancellation:
+    """ワーカーのキャンセル"""
+
+    def test_preview_worker_cancel_aborts_render(self, qtbot, qapp):
+        """PreviewWorker.cancel() で実行中の生成が打ち切られ、結果は通知されない"""
+        from src.viewmodels.wallpaper_worker import PreviewWorker
+
+        service = _SlowPreviewService()
+        worker = PreviewWorker(service, "modern")
+        ready = []
+        worker.signals.preview_ready.connect(lambda path: ready.append(path))
+
+        pool = QThreadPool.globalInstance()
+        pool.start(worker)
+        assert service.started.wait(5)
+        worker.cancel()
+        pool.waitForDone(5000)
+        qtbot.wait(50)
+
+        assert service.reached_end is False
+        assert ready == []
+
+    def test_wallpaper_worker_reports_failure_when_cancelled(self, qtbot, qapp):
+        """WallpaperWorker は処理中にキャンセルされると result(False) を通知する"""
+        from src.viewmodels.wallpaper_worker import WallpaperWorker
+
+        class Service:
+            def generate_and_set_wallpaper(self, theme_name, cancel_token=None, progress=None):
+                cancel_token.cancel()
+                cancel_token.raise_if_cancelled("描画")
+                return True
+
+        worker = WallpaperWorker(Service(), "simple")
+        results = []
+        worker.signals.result.connect(lambda success: results.append(success))
+
+        worker.run()
+        qtbot.wait(50)
+
+        assert results == [False]
@@ -0,0 +1,185 @@
+"""
+desktop_backends（Linux壁紙設定バックエンド）のテスト
+"""
+import os
+import shutil
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from src.desktop_backends import (
+    LinuxWallpaperBackends, QtDbusPlasmaBackend, WallpaperBackend,
+    detect_desktop_environment, kde_wallpaper_script,
+)
+
+
+class FakeBackend(WallpaperBackend):
+    """結果を指定できるバックエンド"""
+
+    def __init__(self, name, desktop='gnome', results=None, persistent=False, available=True):
+        self.name = name
+        self.desktop = desktop
+        self.persistent = persistent
+        self._available = available
+        self._results = list(results or [True])
+        self.calls = []
+
+    def is_available(self):
+        return self._available
+
+    def apply(self, image_path):
+        self.calls.append(image_path)
+        result = self._results.pop(0) if len(self._results) > 1 else self._results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class TestDetectDesktop:
+
+    @pytest.mark.parametrize("value, expected", [
+        ("KDE", "kde"),
+        ("ubuntu:GNOME", "gnome"),
+        ("plasma", "kde"),
+        ("XFCE", "unknown"),
+    ])
+    def test_detect(self, monkeypatch, value, expected):
+        monkeypatch.setenv('XDG_CURRENT_DESKTOP', value)
+        assert detect_desktop_environment() == expected
+
+
+class TestBackendSelection:
+    """バックエンドの選択とキャッシュ"""
+
+    def test_working_backend_is_cached(self):
+        """一度成功したバックエンドを以降も使い、失敗した候補は再試行しない"""
+        failing = FakeBackend('gnome-gsettings', results=[subprocess.CalledProcessError(1, 'gsettings')])
+        working = FakeBackend('kde-qdbus', desktop='kde')
+        backends = LinuxWallpaperBackends([failing, working], desktop='unknown')
+
+        assert backends.apply(Path('/tmp/a.png')) is True
+        assert backends.apply(Path('/tmp/b.png')) is True
+
+        assert len(failing.calls) == 1
+        assert len(working.calls) == 2
+        assert backends.active_backend == 'kde-qdbus'
+
+    def test_detected_desktop_is_tried_first(self):
+        gnome = FakeBackend('gnome-gsettings')
+        kde = FakeBackend('kde-qdbus', desktop='kde')
+        backends = LinuxWallpaperBackends([gnome, kde], desktop='kde')
+        backends.apply(Path('/tmp/a.png'))
+        assert kde.calls and not gnome.calls
+
+    def test_unavailable_persistent_backend_is_skipped(self):
+        persistent = FakeBackend('kde-dbus', desktop='kde', persistent=True, available=False)
+        command = FakeBackend('kde-qdbus', desktop='kde')
+        backends = LinuxWallpaperBackends([persistent, command], desktop='kde')
+        assert backends.apply(Path('/tmp/a.png')) is True
+        assert not persistent.calls
+
+    def test_reselects_when_active_backend_fails(self):
+        first = FakeBackend('gnome-gio', results=[True, False])
+        second = FakeBackend('gnome-gsettings')
+        backends = LinuxWallpaperBackends([first, second], desktop='gnome')
+        backends.apply(Path('/tmp/a.png'))
+        assert backends.apply(Path('/tmp/b.png')) is True
+        assert backends.active_backend == 'gnome-gsettings'
+
+    def test_all_fail(self):
+        backends = LinuxWallpaperBackends([FakeBackend('x', results=[False])], desktop='gnome')
+        assert backends.apply(Path('/tmp/a.png')) is False
+        assert backends.active_backend is None
+
+    def test_latency_is_recorded_per_backend(self):
+        failing = FakeBackend('gnome-gsettings', results=[False])
+        working = FakeBackend('kde-qdbus', desktop='kde')
+        backends = LinuxWallpaperBackends([failing, working], desktop='gnome')
+        backends.apply(Path('/tmp/a.png'))
+        backends.apply(Path('/tmp/a.png'))
+
+        summary = backends.latency_summary()
+        assert summary['gnome-gsettings']['calls'] == 1
+        assert summary['gnome-gsettings']['failures'] == 1
+        assert summary['kde-qdbus']['calls'] == 2
+        assert summary['kde-qdbus']['average_seconds'] >= 0
+
+
+_STAND_IN_PLASMASHELL = textwrap.dedent('''
+    import sys
+    from PyQt6.QtCore import QCoreApplication, QObject, pyqtClassInfo, pyqtSlot
+    from PyQt6.QtDBus import QDBusConnection
+
+    app = QCoreApplication(sys.argv)
+    connection = QDBusConnection.connectToBus(sys.argv[1], 'stand-in')
+
+    @pyqtClassInfo("D-Bus Interface", "org.kde.PlasmaShell")
+    class PlasmaShell(QObject):
+        @pyqtSlot(str)
+        def evaluateScript(self, script):
+            with open(sys.argv[2], 'a') as f:
+                f.write(script)
+
+    shell = PlasmaShell()
+    connection.registerObject('/PlasmaShell', shell, QDBusConnection.RegisterOption.ExportAllSlots)
+    connection.registerService('org.kde.plasmashell')
+    print('ready', flush=True)
+    app.exec()
+''')
+
+
+@pytest.mark.skipif(shutil.which('dbus-daemon') is None, reason="dbus-daemon が必要")
+class TestQtDbusAgainstStandInBus:
+    """ローカルのセッションバスと代替 plasmashell に対する QtDBus バックエンドのテスト"""
+
+    def test_apply_calls_evaluate_script(self, qapp, tmp_path):
+        daemon = subprocess.Popen(
+            ['dbus-daemon', '--session', '--nofork', '--print-address'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        stand_in = None
+        try:
+            address = daemon.stdout.readline().strip()
+            log_path = tmp_path / 'scripts.txt'
+            stand_in = subprocess.Popen(
+                [sys.executable, '-c', _STAND_IN_PLASMASHELL, address, str(log_path)],
+                stdout=subprocess.PIPE, text=True,
+                env={**os.environ, 'QT_QPA_PLATFORM': 'offscreen'}
+            )
+            assert stand_in.stdout.readline().strip() == 'ready'
+
+            backend = QtDbusPlasmaBackend(bus_address=address)
+            assert backend.is_available()
+
+            backends = LinuxWallpaperBackends([backend], desktop='kde')
+            image = Path('/tmp/My "Vacation".png')
+            assert backends.apply(image) is True
+            assert backends.active_backend == 'kde-dbus'
+
+            for _ in range(50):
+                if log_path.exists() and log_path.read_text():
+                    break
+                time.sleep(0.05)
+            assert log_path.read_text() == kde_wallpaper_script(image)
+        finally:
+            if stand_in is not None:
+                stand_in.terminate()
+                stand_in.wait(timeout=5)
+            daemon.terminate()
+            daemon.wait(timeout=5)
+
+    def test_unavailable_without_plasmashell(self, qapp):
+        daemon = subprocess.Popen(
+            ['dbus-daemon', '--session', '--nofork', '--print-address'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        try:
+            address = daemon.stdout.readline().strip()
+            assert QtDbusPlasmaBackend(bus_address=address).is_available() is False
+        finally:
+            daemon.terminate()
+            daemon.wait(timeout=5)
@@ -0,0 +1,84 @@
+"""
+DisplayInfo / DisplayTopologyCache（ディスプレイ構成キャッシュ）のテスト
+"""
+from unittest.mock import MagicMock, patch
+
+from src.display_info import DisplayInfo, DisplayTopologyCache
+
+
+class TestDisplayTopologyCache:
+    """構成が変わった場合のみ再取得することを確認"""
+
+    def test_probe_runs_once_while_topology_unchanged(self):
+        """指紋が同じ間は再取得しない"""
+        cache = DisplayTopologyCache(fingerprint_func=lambda: (('card0-HDMI-A-1', 'connected', 'enabled'),))
+        probe = MagicMock(return_value=[(2560, 1440)])
+        assert cache.get(probe) == [(2560, 1440)]
+        assert cache.get(probe) == [(2560, 1440)]
+        assert probe.call_count == 1
+
+    def test_fingerprint_change_triggers_probe(self):
+        """コネクタ状態が変わると再取得する"""
+        state = {'fp': (('card0-DP-1', 'connected', 'enabled'),)}
+        cache = DisplayTopologyCache(fingerprint_func=lambda: state['fp'])
+        probe = MagicMock(side_effect=[[(1920, 1080)], [(1920, 1080), (3840, 2160)]])
+        cache.get(probe)
+        state['fp'] = (('card0-DP-1', 'connected', 'enabled'), ('card0-DP-2', 'connected', 'enabled'))
+        assert cache.get(probe) == [(1920, 1080), (3840, 2160)]
+        assert probe.call_count == 2
+
+    def test_without_fingerprint_uses_max_age(self):
+        """指紋が取れない環境では期限切れで再取得する"""
+        cache = DisplayTopologyCache(fingerprint_func=lambda: None, max_age=60)
+        probe = MagicMock(return_value=[(1920, 1080)])
+        cache.get(probe)
+        cache.get(probe)
+        assert probe.call_count == 1
+        cache._probed_at -= 120
+        cache.get(probe)
+        assert probe.call_count == 2
+
+    def test_invalidate_forces_probe(self):
+        """invalidate後は再取得する"""
+        cache = DisplayTopologyCache(fingerprint_func=lambda: ('fixed',))
+        probe = MagicMock(return_value=[(1920, 1080)])
+        cache.get(probe)
+        cache.invalidate()
+        cache.get(probe)
+        assert probe.call_count == 2
+
+    def test_change_listener_notified_only_on_change(self):
+        """再取得結果が変わった場合のみ通知する"""
+        cache = DisplayTopologyCache(fingerprint_func=lambda: None, max_age=0)
+        listener = MagicMock()
+        cache.add_change_listener(listener)
+        probe = MagicMock(side_effect=[[(1920, 1080)], [(1920, 1080)], [(2560, 1440)]])
+        cache.get(probe)
+        cache.get(probe)
+        listener.assert_not_called()
+        cache.get(probe)
+        listener.assert_called_once_with([(2560, 1440)])
+
+    def test_qt_screen_signals_invalidate(self, qapp):
+        """Qt監視中は画面シグナルでのみ再取得する"""
+        cache = DisplayTopologyCache(fingerprint_func=lambda: None, max_age=0)
+        cache.watch_qt_screens(qapp)
+        probe = MagicMock(return_value=[(1920, 1080)])
+        cache.get(probe)
+        cache.get(probe)
+        assert probe.call_count == 1
+        qapp.screenRemoved.emit(qapp.primaryScreen())
+        cache.get(probe)
+        assert probe.call_count == 2
+
+
+class TestDisplayInfoCaching:
+    """DisplayInfo がサブプロセスを毎回起動しないことを確認"""
+
+    def test_repeated_construction_reuses_cache(self):
+        cache = DisplayTopologyCache(fingerprint_func=lambda: ('fixed',))
+        with patch('src.display_info._topology_cache', cache), \
+                patch.object(DisplayInfo, '_probe_resolutions', return_value=[(3024, 1964)]) as probe:
+            assert DisplayInfo().get_target_display_resolution(1) == (3024, 1964)
+            assert DisplayInfo().get_target_display_resolution(1) == (3024, 1964)
+            assert probe.call_count == 1
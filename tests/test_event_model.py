@@ -310,3 +310,17 @@ class TestCalendarEvent:
         assert event.account_id == "default"
         assert event.account_color == "#4285f4"
         assert event.account_display_name == ""
+
+    def test_event_has_no_instance_dict(self):
+        """__slots__化によりインスタンスが__dict__を持たない"""
+        event = CalendarEvent(
+            id="event222",
+            summary="定例",
+            start_datetime=datetime(2026, 2, 5, 9, 0),
+            end_datetime=datetime(2026, 2, 5, 10, 0),
+            is_all_day=False,
+            calendar_id="primary"
+        )
+
+        assert not hasattr(event, '__dict__')
+        assert event.to_dict()['summary'] == "定例"
@@ -0,0 +1,119 @@
+"""
+event_parser（APIイベント解析）のテスト
+アカウント情報付きの1回生成と、高速ISO 8601解析の互換性を確認する
+"""
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from src.event_parser import parse_api_datetime, parse_event, iter_parsed_events
+from src.models.event import CalendarEvent
+
+
+def _legacy_parse(value: str) -> datetime:
+    """従来の解析処理（replace('Z') + astimezone()）"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).astimezone().replace(tzinfo=None)
+
+
+class TestParseApiDatetime:
+    """parse_api_datetime のテスト"""
+
+    @pytest.mark.parametrize("value", [
+        "2026-02-05T14:00:00+09:00",
+        "2026-02-05T05:00:00Z",
+        "2026-02-05T05:00:00.000Z",
+        "2026-07-01T23:30:00-05:00",
+        "2026-03-08T07:15:00+05:30",
+        "2026-10-25T01:30:00+00:00",
+    ])
+    def test_matches_legacy_conversion(self, value):
+        """従来のastimezone()による変換と同じローカル時刻を返す"""
+        assert parse_api_datetime(value) == _legacy_parse(value)
+
+    def test_result_is_naive(self):
+        """タイムゾーン情報を持たないdatetimeを返す"""
+        assert parse_api_datetime("2026-02-05T14:00:00+09:00").tzinfo is None
+
+    def test_value_without_offset_is_kept_as_is(self):
+        """オフセットなしの日時はそのまま返す"""
+        assert parse_api_datetime("2026-02-05T14:00:00") == datetime(2026, 2, 5, 14, 0)
+
+    def test_invalid_value_raises(self):
+        """解析できない文字列はValueError"""
+        with pytest.raises(ValueError):
+            parse_api_datetime("not-a-date")
+
+
+class TestParseEvent:
+    """parse_event のテスト"""
+
+    def test_account_context_is_applied_on_construction(self):
+        """アカウント情報が解析時に付与される"""
+        item = {
+            'id': 'event1',
+            'summary': '定例',
+            'start': {'dateTime': '2026-02-09T10:00:00+09:00'},
+            'end': {'dateTime': '2026-02-09T11:00:00+09:00'},
+        }
+
+        event = parse_event(
+            item, 'primary',
+            account_id='account_1',
+            account_color='#ea4335',
+            account_display_name='仕事用'
+        )
+
+        assert isinstance(event, CalendarEvent)
+        assert event.account_id == 'account_1'
+        assert event.account_color == '#ea4335'
+        assert event.account_display_name == '仕事用'
+
+    def test_all_day_event(self):
+        """終日イベントは日付のみから生成される"""
+        item = {
+            'id': 'holiday',
+            'summary': '休暇',
+            'start': {'date': '2026-02-07'},
+            'end': {'date': '2026-02-08'},
+        }
+
+        event = parse_event(item, 'personal')
+
+        assert event.is_all_day is True
+        assert event.start_datetime == datetime(2026, 2, 7)
+        assert event.end_datetime == datetime(2026, 2, 8)
+
+    def test_invalid_event_returns_none(self):
+        """必須キーが欠けたイベントはNone"""
+        assert parse_event({'id': 'broken', 'summary': '壊れた予定'}, 'primary') is None
+
+
+class TestIterParsedEvents:
+    """iter_parsed_events のテスト"""
+
+    def test_yields_events_and_skips_invalid(self):
+        """解析可能なイベントのみを順に返す"""
+        items = [
+            {'id': 'a', 'start': {'dateTime': '2026-02-09T10:00:00Z'}, 'end': {'dateTime': '2026-02-09T11:00:00Z'}},
+            {'id': 'broken'},
+            {'id': 'b', 'start': {'dateTime': '2026-02-09T12:00:00Z'}, 'end': {'dateTime': '2026-02-09T13:00:00Z'}},
+        ]
+
+        events = list(iter_parsed_events(iter(items), 'primary', account_id='account_2'))
+
+        assert [e.id for e in events] == ['a', 'b']
+        assert all(e.account_id == 'account_2' for e in events)
+        assert events[0].summary == '（タイトルなし）'
+
+    def test_each_event_constructed_once(self):
+        """dataclasses.replaceによる再生成を行わない"""
+        items = [
+            {'id': 'a', 'start': {'dateTime': '2026-02-09T10:00:00Z'}, 'end': {'dateTime': '2026-02-09T11:00:00Z'}},
+        ]
+
+        with patch('dataclasses.replace') as mock_replace:
+            events = list(iter_parsed_events(items, 'primary', account_id='account_1'))
+
+        assert len(events) == 1
+        mock_replace.assert_not_called()
@@ -0,0 +1,144 @@
+"""
+EventTable（カラム指向イベントテーブル）のテスト
+"""
+from datetime import date, datetime, timezone, timedelta
+
+import numpy as np
+
+from src.models.event import CalendarEvent
+from src.models.event_table import EventTable
+
+
+def _make_event(event_id, start, end, calendar_id="primary", **kwargs):
+    return CalendarEvent(
+        id=event_id,
+        summary=f"予定{event_id}",
+        start_datetime=start,
+        end_datetime=end,
+        is_all_day=kwargs.pop('is_all_day', False),
+        calendar_id=calendar_id,
+        **kwargs
+    )
+
+
+class TestEventTableConstruction:
+    """テーブル構築のテスト"""
+
+    def test_columns_match_events(self):
+        """開始・終了・終日フラグのカラムがイベント順に並ぶ"""
+        events = [
+            _make_event("a", datetime(2026, 2, 5, 9, 0), datetime(2026, 2, 5, 10, 0)),
+            _make_event("b", datetime(2026, 2, 6), datetime(2026, 2, 7), is_all_day=True),
+        ]
+        table = EventTable.from_events(events)
+
+        assert len(table) == 2
+        assert table.starts.dtype == np.dtype('datetime64[s]')
+        assert table.starts[0] == np.datetime64('2026-02-05T09:00')
+        assert table.ends[1] == np.datetime64('2026-02-07T00:00')
+        assert table.is_all_day.tolist() == [False, True]
+        assert list(table) == events
+
+    def test_empty_table(self):
+        """空リストでも構築できる"""
+        table = EventTable.from_events([])
+
+        assert len(table) == 0
+        assert table.bucket_by_start_date(date(2026, 2, 5), 7) == {}
+        assert table.overlap_group_ids().size == 0
+        assert table.next_start_after(datetime(2026, 2, 5)) is None
+
+    def test_string_columns_are_interned(self):
+        """calendar_id等の文字列カラムが同一オブジェクトに集約される"""
+        calendar_id = "".join(["team", "@group.calendar.google.com"])
+        other = "".join(["team", "@group.calendar.google.com"])
+        events = [
+            _make_event("a", datetime(2026, 2, 5, 9), datetime(2026, 2, 5, 10), calendar_id=calendar_id),
+            _make_event("b", datetime(2026, 2, 5, 11), datetime(2026, 2, 5, 12), calendar_id=other),
+        ]
+        table = EventTable.from_events(events)
+
+        assert table.calendar_ids[0] is table.calendar_ids[1]
+
+    def test_aware_datetimes_are_accepted(self):
+        """タイムゾーン付き日時はタイムゾーン情報を除いて格納される"""
+        tz = timezone(timedelta(hours=9))
+        events = [
+            _make_event("a", datetime(2026, 2, 5, 9, 0, tzinfo=tz), datetime(2026, 2, 5, 10, 0, tzinfo=tz)),
+        ]
+        table = EventTable.from_events(events)
+
+        assert table.starts[0] == np.datetime64('2026-02-05T09:00')
+
+
+class TestBucketByStartDate:
+    """日別振り分けのテスト"""
+
+    def test_buckets_by_day_offset(self):
+        """開始日ごとに振り分け、範囲外とイベントなしの日は含まない"""
+        events = [
+            _make_event("before", datetime(2026, 2, 4, 9), datetime(2026, 2, 4, 10)),
+            _make_event("d0", datetime(2026, 2, 5, 9), datetime(2026, 2, 5, 10)),
+            _make_event("d2", datetime(2026, 2, 7, 9), datetime(2026, 2, 7, 10)),
+            _make_event("d0b", datetime(2026, 2, 5, 13), datetime(2026, 2, 5, 14)),
+            _make_event("after", datetime(2026, 2, 12, 9), datetime(2026, 2, 12, 10)),
+        ]
+        buckets = EventTable.from_events(events).bucket_by_start_date(date(2026, 2, 5), 7)
+
+        assert sorted(buckets) == [0, 2]
+        assert [e.id for e in buckets[0]] == ["d0", "d0b"]
+        assert [e.id for e in buckets[2]] == ["d2"]
+
+    def test_matches_per_day_filter(self):
+        """従来の1日ずつのフィルタリングと同じ結果になる"""
+        base = datetime(2026, 2, 5)
+        events = [
+            _make_event(str(i), base + timedelta(hours=7 * i), base + timedelta(hours=7 * i + 1))
+            for i in range(30)
+        ]
+        buckets = EventTable.from_events(events).bucket_by_start_date(base.date(), 7)
+
+        for offset in range(7):
+            target = base.date() + timedelta(days=offset)
+            expected = [e for e in events if e.start_datetime.date() == target]
+            assert buckets.get(offset, []) == expected
+
+
+class TestOverlapDetection:
+    """重複検出のテスト"""
+
+    def test_overlaps_mask(self):
+        """指定区間と重なるイベントを検出する"""
+        events = [
+            _make_event("a", datetime(2026, 2, 5, 9), datetime(2026, 2, 5, 10)),
+            _make_event("b", datetime(2026, 2, 5, 10), datetime(2026, 2, 5, 11)),
+            _make_event("c", datetime(2026, 2, 5, 12), datetime(2026, 2, 5, 13)),
+        ]
+        table = EventTable.from_events(events)
+
+        mask = table.overlaps(datetime(2026, 2, 5, 9, 30), datetime(2026, 2, 5, 10, 30))
+
+        assert mask.tolist() == [True, True, False]
+
+    def test_overlap_group_ids(self):
+        """連鎖的に重なるイベントは同じグループになる"""
+        events = [
+            _make_event("a", datetime(2026, 2, 5, 9), datetime(2026, 2, 5, 11)),
+            _make_event("b", datetime(2026, 2, 5, 10), datetime(2026, 2, 5, 12)),
+            _make_event("c", datetime(2026, 2, 5, 11, 30), datetime(2026, 2, 5, 13)),
+            _make_event("d", datetime(2026, 2, 5, 13), datetime(2026, 2, 5, 14)),
+        ]
+        group_ids = EventTable.from_events(events).overlap_group_ids()
+
+        assert group_ids.tolist() == [0, 0, 0, 1]
+
+    def test_next_start_after(self):
+        """基準時刻より後の最も早い開始時刻を返す"""
+        events = [
+            _make_event("a", datetime(2026, 2, 5, 9), datetime(2026, 2, 5, 10)),
+            _make_event("b", datetime(2026, 2, 5, 14), datetime(2026, 2, 5, 15)),
+            _make_event("c", datetime(2026, 2, 5, 11), datetime(2026, 2, 5, 12)),
+        ]
+        table = EventTable.from_events(events)
+
+        assert table.next_start_after(datetime(2026, 2, 5, 9, 30)) == datetime(2026, 2, 5, 11)
@@ -0,0 +1,215 @@
+"""
+EventsCache（stale-while-revalidate イベントキャッシュ）のテスト
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+from src.events_cache import EventsCache
+from src.models.event import CalendarEvent
+
+
+def _event(event_id: str, start: datetime, summary: str = "会議") -> CalendarEvent:
+    return CalendarEvent(
+        id=event_id,
+        summary=summary,
+        start_datetime=start,
+        end_datetime=start + timedelta(hours=1),
+        is_all_day=False,
+        calendar_id="primary",
+    )
+
+
+def _far_future_events(summary: str = "会議"):
+    """TTLの短縮対象にならない（数日先の）イベント"""
+    return [_event("e1", datetime.now() + timedelta(days=3), summary)]
+
+
+def _age(cache: EventsCache, key, seconds: float) -> None:
+    """エントリの取得時刻を過去にずらす"""
+    cache._entries[key].fetched_at -= seconds
+
+
+class TestFreshAndStale:
+    """TTL内・TTL切れの挙動"""
+
+    def test_fresh_entry_is_returned_without_fetch(self):
+        """TTL内は再取得しない"""
+        cache = EventsCache()
+        fetch = MagicMock(return_value=_far_future_events())
+        first = cache.get("k", fetch)
+        second = cache.get("k", fetch)
+        assert first is second
+        assert fetch.call_count == 1
+
+    def test_stale_entry_is_returned_and_revalidated_in_background(self):
+        """TTL切れ（猶予期間内）はキャッシュを返し、バックグラウンドで再取得する"""
+        cache = EventsCache(base_ttl=60, min_ttl=60)
+        old = _far_future_events("旧")
+        new = _far_future_events("新")
+        cache.get("k", lambda: old)
+        _age(cache, "k", 120)
+
+        refreshed = threading.Event()
+
+        def fetch():
+            refreshed.set()
+            return new
+
+        assert cache.get("k", fetch) is old
+        assert refreshed.wait(timeout=2)
+        for _ in range(100):
+            if cache.peek("k") is new:
+                break
+            time.sleep(0.01)
+        assert cache.peek("k") is new
+
+    def test_expired_entry_is_fetched_synchronously(self):
+        """猶予期間も過ぎたエントリは呼び出し元で取得する"""
+        cache = EventsCache(base_ttl=60, min_ttl=60, stale_grace=60)
+        cache.get("k", lambda: _far_future_events("旧"))
+        _age(cache, "k", 600)
+        new = _far_future_events("新")
+        assert cache.get("k", lambda: new) is new
+
+    def test_invalidate_forces_fetch(self):
+        """invalidate後は再取得する"""
+        cache = EventsCache()
+        fetch = MagicMock(return_value=[])
+        cache.get("k", fetch)
+        cache.invalidate()
+        cache.get("k", fetch)
+        assert fetch.call_count == 2
+
+    def test_fetch_started_before_invalidate_is_not_joined_or_stored(self):
+        """invalidate前に始まった取得は待たずに取得し直し、その結果は保存しない"""
+        cache = EventsCache()
+        started = threading.Event()
+        release = threading.Event()
+        old = _far_future_events("旧")
+        new = _far_future_events("新")
+
+        def slow_fetch():
+            started.set()
+            release.wait(timeout=2)
+            return old
+
+        results = []
+        thread = threading.Thread(target=lambda: results.append(cache.get("k", slow_fetch)))
+        thread.start()
+        assert started.wait(timeout=2)
+
+        cache.invalidate()
+        assert cache.get("k", lambda: new) is new
+
+        release.set()
+        thread.join(timeout=2)
+        assert results == [old]
+        assert cache.peek("k") is new
+
+
+class TestSingleFlight:
+    """同時取得の集約"""
+
+    def test_concurrent_misses_share_one_fetch(self):
+        """同じキーの同時取得は1回のAPI呼び出しにまとめる"""
+        cache = EventsCache()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        events = _far_future_events()
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(timeout=2)
+            return events
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get("k", fetch))) for _ in range(4)]
+        threads[0].start()
+        assert started.wait(timeout=2)
+        for t in threads[1:]:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join(timeout=2)
+
+        assert len(calls) == 1
+        assert len(results) == 4
+        assert all(r is events for r in results)
+
+    def test_fetch_error_is_raised_and_not_cached(self):
+        """取得エラーは呼び出し元に伝え、キャッシュしない"""
+        cache = EventsCache()
+        fetch = MagicMock(side_effect=[RuntimeError("boom"), []])
+        with pytest.raises(RuntimeError):
+            cache.get("k", fetch)
+        assert cache.get("k", fetch) == []
+        assert fetch.call_count == 2
+
+
+class TestAdaptiveTtl:
+    """TTLの伸縮"""
+
+    def test_stable_calendar_gets_longer_ttl(self):
+        """内容が変わらない同期が続くとTTLが伸びる"""
+        cache = EventsCache(base_ttl=180, max_ttl=900)
+        events = _far_future_events()
+        for _ in range(4):
+            cache._store("k", list(events))
+        assert cache.ttl_for("k") == 720
+
+    def test_volatile_calendar_gets_shorter_ttl(self):
+        """毎回内容が変わるカレンダーはTTLが縮む"""
+        cache = EventsCache(base_ttl=180, min_ttl=60)
+        for i in range(4):
+            cache._store("k", _far_future_events(f"会議{i}"))
+        assert cache.ttl_for("k") == 90
+
+    def test_ttl_shrinks_near_next_event(self):
+        """次の予定開始が近い場合はTTLを短縮する"""
+        cache = EventsCache(base_ttl=180, min_ttl=60)
+        cache._store("k", [_event("soon", datetime.now() + timedelta(minutes=3))])
+        assert 60 <= cache.ttl_for("k") <= 90
+
+    def test_ttl_never_below_minimum(self):
+        """開始直前でも下限を下回らない"""
+        cache = EventsCache(base_ttl=180, min_ttl=60)
+        cache._store("k", [_event("soon", datetime.now() + timedelta(seconds=10))])
+        assert cache.ttl_for("k") == 60
+
+
+class TestCalendarClientIntegration:
+    """CalendarClient・WallpaperServiceとの連携"""
+
+    @patch('src.calendar_client.CalendarClient.load_accounts')
+    def test_clients_share_injected_cache(self, _mock_load):
+        """同じキャッシュを渡したクライアント間で取得結果を共有する"""
+        from src.calendar_client import CalendarClient
+
+        shared = EventsCache()
+        first = CalendarClient(events_cache=shared)
+        second = CalendarClient(events_cache=shared)
+        events = _far_future_events()
+
+        with patch.object(CalendarClient, 'iter_all_events', return_value=iter(events)) as mock_iter:
+            assert first.get_all_events(days=7) == events
+            assert second.get_all_events(days=7) == events
+            assert mock_iter.call_count == 1
+
+    @patch('src.calendar_client.CalendarClient.load_accounts')
+    def test_invalidate_events_cache(self, _mock_load):
+        """invalidate_events_cache で次回は再取得する"""
+        from src.calendar_client import CalendarClient
+
+        client = CalendarClient()
+        with patch.object(CalendarClient, 'iter_all_events', side_effect=lambda days, **kwargs: iter([])) as mock_iter:
+            client.get_all_events(days=7)
+            client.invalidate_events_cache()
+            client.get_all_events(days=7)
+            assert mock_iter.call_count == 2
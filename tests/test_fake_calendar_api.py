@@ -0,0 +1,97 @@
+"""
+Google Calendar API の代替サーバー（benchmarks.fake_calendar_api）と予定取得ベンチマークのテスト
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from benchmarks.fake_calendar_api import FakeCalendarBackend, FakeCalendarServer
+from benchmarks.fetch_benchmark import run_case
+
+
+@pytest.fixture
+def server():
+    backend = FakeCalendarBackend.synthetic(['primary', 'work'], events_per_calendar=120)
+    with FakeCalendarServer(backend, page_size=50) as srv:
+        yield srv
+
+
+class TestFakeCalendarServer:
+    """代替サーバーのテスト"""
+
+    def test_calendar_list(self, server):
+        """calendarList.list でカレンダー一覧を返す"""
+        items = server.build_service().calendarList().list().execute()['items']
+        assert [item['id'] for item in items] == ['primary', 'work']
+
+    def test_events_are_paginated(self, server):
+        """events.list はページサイズごとに nextPageToken を返し、最後のページで nextSyncToken を返す"""
+        service = server.build_service()
+        items, page_token, pages = [], None, 0
+        while True:
+            result = service.events().list(calendarId='primary', pageToken=page_token).execute()
+            items.extend(result['items'])
+            pages += 1
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                break
+
+        assert len(items) == 120
+        assert pages == 3
+        assert result['nextSyncToken']
+        assert server.requests['events.list'] == 3
+
+    def test_time_window_filter(self, server):
+        """timeMin/timeMax の期間にかかるイベントだけを返す"""
+        start = datetime.now().astimezone().replace(hour=0, minute=0, second=0, microsecond=0)
+        result = server.build_service().events().list(
+            calendarId='primary', timeMin=start.isoformat(), timeMax=(start + timedelta(days=1)).isoformat(),
+            orderBy='startTime', singleEvents=True, maxResults=2500
+        ).execute()
+
+        assert 0 < len(result['items']) < 120
+
+    def test_sync_token_returns_changes(self, server):
+        """syncToken 指定時は前回以降の変更だけを返し、無効なトークンは410"""
+        service = server.build_service()
+        token = service.events().list(calendarId='work', maxResults=2500).execute()['nextSyncToken']
+        server.backend.upsert_event('work', {
+            'id': 'added', 'summary': '追加', 'start': {'date': '2026-01-05'}, 'end': {'date': '2026-01-06'}
+        })
+
+        changes = service.events().list(calendarId='work', syncToken=token).execute()
+        assert [item['id'] for item in changes['items']] == ['added']
+
+        with pytest.raises(HttpError) as exc_info:
+            service.events().list(calendarId='work', syncToken='v999').execute()
+        assert exc_info.value.resp.status == 410
+
+    def test_batch_request(self, server):
+        """バッチリクエストを1回のHTTPリクエストで処理する"""
+        service = server.build_service()
+        results = {}
+        batch = server.new_batch(lambda request_id, response, exception: results.update(
+            {request_id: exception if exception else len(response['items'])}
+        ))
+        batch.add(service.events().list(calendarId='primary', maxResults=10), request_id='primary')
+        batch.add(service.events().list(calendarId='missing'), request_id='missing')
+        batch.execute(http=service._http)
+
+        assert results['primary'] == 10
+        assert isinstance(results['missing'], HttpError)
+        assert server.http_requests == 1
+        assert server.requests['events.list'] == 2
+
+
+class TestFetchBenchmark:
+    """予定取得ベンチマークのテスト"""
+
+    def test_run_case_fetches_through_calendar_client(self):
+        """CalendarClient.get_all_events で全アカウント・全カレンダーのイベントを取得して計測する"""
+        result = run_case(accounts=2, calendars=2, events=30, repeat=1, latency_ms=0, page_size=250)
+
+        assert result['events'] == 2 * 2 * 30
+        assert result['requests'] == 4
+        assert result['bytes'] > 0
+        assert result['parse_ms'] >= 0
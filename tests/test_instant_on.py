@@ -0,0 +1,140 @@
+"""
+起動時の復元（前回の壁紙と予定の再利用）のテスト
+"""
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.models.event import CalendarEvent
+
+
+def _events(summary: str = '定例会議'):
+    start = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+    return [CalendarEvent(
+        id='event-1', summary=summary, start_datetime=start,
+        end_datetime=start + timedelta(hours=1), is_all_day=False, calendar_id='primary'
+    )]
+
+
+@pytest.fixture
+def make_service(tmp_path):
+    """一時ディレクトリに出力・キャッシュする WallpaperService を作成"""
+    from src.image_generator import ImageGenerator
+    from src.output_store import OutputStore
+    from src.viewmodels.wallpaper_service import WallpaperService
+    from src.wallpaper_cache import WallpaperCache
+
+    def make(events):
+        service = WallpaperService()
+        service.calendar_client = MagicMock(accounts={'a': {}})
+        service.calendar_client.get_all_events.return_value = events
+        service.image_generator = ImageGenerator(resolution=(320, 180))
+        service.wallpaper_setter = MagicMock()
+        service.wallpaper_setter.applied_paths.return_value = []
+        service.wallpaper_cache = WallpaperCache(tmp_path / 'cache')
+        service.output_store = OutputStore(tmp_path / 'output', wallpaper_cache=service.wallpaper_cache)
+        return service
+
+    with patch('src.image_generator.OUTPUT_DIR', tmp_path / 'output'), \
+            patch('src.viewmodels.wallpaper_service.MULTI_DISPLAY_RENDER', False):
+        yield make
+
+
+class TestServiceRestore:
+    """WallpaperService の復元と再利用のテスト"""
+
+    def test_unchanged_refresh_reuses_restored_frame(self, make_service):
+        """復元後の更新で予定・描画状態が同じなら描画しない"""
+        first = make_service(_events())
+        rendered = first.generate_wallpaper('simple')
+
+        service = make_service(_events())
+        assert service.restore_last_frame('simple', apply=True) == rendered
+        service.wallpaper_setter.set_wallpaper.assert_called_once_with(rendered)
+        assert service.rendered_events_fingerprint() == first.rendered_events_fingerprint()
+
+        with patch.object(service.image_generator, 'generate_wallpaper') as render:
+            assert service.generate_wallpaper('simple') == rendered
+        render.assert_not_called()
+
+    def test_changed_events_are_rendered(self, make_service):
+        """復元後の更新で予定が変わっていれば描画し直す"""
+        rendered = make_service(_events()).generate_wallpaper('simple')
+
+        service = make_service(_events('変更後の予定'))
+        service.restore_last_frame('simple', apply=False)
+        path = service.generate_wallpaper('simple')
+
+        assert path != rendered
+        service.wallpaper_setter.set_wallpaper.assert_not_called()
+
+    def test_other_theme_is_not_restored(self, make_service):
+        """別のテーマの壁紙は復元しない"""
+        make_service(_events()).generate_wallpaper('simple')
+
+        service = make_service(_events())
+        assert service.restore_last_frame('dark') is None
+        assert service.rendered_events_fingerprint() is None
+
+
+class TestViewModelRestore:
+    """MainViewModel の復元のテスト"""
+
+    def test_first_update_uses_restored_service(self, qtbot, tmp_path):
+        """復元したサービスで最初の更新を行う"""
+        from src.viewmodels.main_viewmodel import MainViewModel
+        from src.viewmodels.update_queue import UpdateReason
+        from src.viewmodels.wallpaper_service import WallpaperService
+
+        restored_path = tmp_path / 'restored.png'
+        vm = MainViewModel(wallpaper_service=WallpaperService())
+        vm._thread_pool = MagicMock()
+
+        with patch.object(WallpaperService, 'restore_last_frame', return_value=restored_path) as restore:
+            assert vm.restore_last_frame() == restored_path
+        restore.assert_called_once_with('simple', apply=False)
+        restored_service = vm._tick_service
+
+        vm._start_update(UpdateReason.REFRESH)
+        assert vm._current_worker._wallpaper_service is restored_service
+
+        vm._on_worker_finished()
+        vm._start_update(UpdateReason.REFRESH)
+        assert vm._current_worker._wallpaper_service is not restored_service
+
+    def test_restore_disabled(self):
+        """INSTANT_ON_STARTUP が False なら復元しない"""
+        from src.viewmodels.main_viewmodel import MainViewModel
+
+        service = MagicMock()
+        vm = MainViewModel(wallpaper_service=service)
+        with patch('src.config.INSTANT_ON_STARTUP', False):
+            assert vm.restore_last_frame() is None
+        service.restore_last_frame.assert_not_called()
+
+
+class TestDaemonRestore:
+    """デーモン起動時の復元（main.restore_last_frame）のテスト"""
+
+    def _frame(self, tmp_path, theme):
+        from src.wallpaper_cache import CachedFrame
+        return CachedFrame(
+            wallpaper_path=tmp_path / 'wallpaper.png', theme=theme,
+            generated_at=datetime.now(), week_events=_events()
+        )
+
+    @pytest.mark.parametrize('theme, restored', [('simple', True), ('dark', False)])
+    def test_restores_only_frame_of_configured_theme(self, tmp_path, theme, restored):
+        """設定中のテーマで描画した壁紙のみ適用し、予定の通知を確認する"""
+        import main
+
+        with patch('main.THEME', 'simple'), \
+                patch('main.WallpaperCache') as cache_cls, \
+                patch('main.WallpaperSetter') as setter_cls, \
+                patch('main.get_notifier') as get_notifier:
+            cache_cls.return_value.load_frame.return_value = self._frame(tmp_path, theme)
+            assert main.restore_last_frame() is restored
+
+        assert setter_cls.return_value.set_wallpaper.called is restored
+        assert get_notifier.return_value.check_upcoming_events.called is restored
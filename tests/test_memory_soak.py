@@ -0,0 +1,40 @@
+"""
+メモリのソークテスト（benchmarks.memory_soak）のテスト
+
+短い回数・低解像度で実行し、計測と予算の判定を確認する。
+長時間の計測は python -m benchmarks.memory_soak で行う。
+"""
+import pytest
+
+from benchmarks.memory_soak import MemoryBudget, check_budget, format_report, run_soak
+
+MiB = 1024 * 1024
+
+
+@pytest.fixture(scope='module')
+def soak_result():
+    return run_soak(cycles=4, warmup=1, events=20, resolution=(640, 360), sample_every=2, time_only_every=2)
+
+
+@pytest.mark.slow
+class TestMemorySoak:
+    """ソークテストのテスト"""
+
+    def test_cycles_are_sampled(self, soak_result):
+        """更新を繰り返し、一定間隔でメモリを記録する"""
+        assert [sample['cycle'] for sample in soak_result.samples] == [0, 2, 4]
+        assert soak_result.py_peak > 0
+        assert soak_result.top_allocators
+
+    def test_short_soak_stays_within_default_budget(self, soak_result):
+        """既定の予算内に収まる"""
+        assert soak_result.passed, format_report(soak_result)
+
+    def test_budget_violations_are_reported(self, soak_result):
+        """予算を超えた項目を報告する"""
+        budget = MemoryBudget(max_py_growth=-1 * MiB, max_py_peak=1, max_rss_growth=64 * MiB)
+
+        violations = check_budget(soak_result, budget)
+
+        assert any('保持量' in v for v in violations)
+        assert any('ピーク' in v for v in violations)
@@ -0,0 +1,185 @@
+"""
+計測（MetricsRegistry）のテスト
+"""
+import json
+import urllib.request
+
+import pytest
+
+from src.metrics import MetricsRegistry, metrics, timed
+
+
+@pytest.fixture
+def registry():
+    reg = MetricsRegistry()
+    reg.configure(True)
+    yield reg
+    reg.stop_http_server()
+
+
+@pytest.fixture
+def global_metrics():
+    """プロセス共通のレジストリを有効にし、終了時に元に戻す"""
+    metrics.reset()
+    metrics.configure(True)
+    yield metrics
+    metrics.configure(False)
+    metrics.reset()
+
+
+class TestMetricsRegistry:
+    """MetricsRegistry のテスト"""
+
+    def test_disabled_registry_records_nothing(self):
+        """無効時はスパン・カウンターを記録しない"""
+        reg = MetricsRegistry()
+
+        with reg.span('render'):
+            pass
+        reg.observe('pipeline.cards', 0.1)
+        reg.incr('calendar_api_calls')
+
+        assert reg.snapshot() == {'counters': {}, 'gauges': {}, 'spans': {}}
+        assert reg.flush() is None
+
+    def test_span_and_observe_accumulate(self, registry):
+        """スパンは名前ごとに回数・合計・最大を累積する"""
+        with registry.span('wallpaper.apply'):
+            pass
+        with registry.span('wallpaper.apply'):
+            pass
+        registry.observe('pipeline.cards', 0.2)
+        registry.observe('pipeline.cards', 0.5)
+
+        spans = registry.snapshot()['spans']
+        assert spans['wallpaper.apply']['count'] == 2
+        assert spans['pipeline.cards'] == {'count': 2, 'sum_ms': 700.0, 'max_ms': 500.0}
+        assert set(spans) == {'wallpaper.apply', 'pipeline.cards'}
+
+    def test_span_records_even_when_exception_raised(self, registry):
+        """例外で抜けた場合も所要時間を記録する"""
+        with pytest.raises(RuntimeError):
+            with registry.span('calendar.get_all_events'):
+                raise RuntimeError("boom")
+
+        assert registry.snapshot()['spans']['calendar.get_all_events']['count'] == 1
+
+    def test_flush_writes_recent_spans_to_jsonl(self, tmp_path):
+        """flush() は前回以降のスパンと累積カウンターを1行のJSONとして追記する"""
+        path = tmp_path / 'metrics.jsonl'
+        reg = MetricsRegistry()
+        reg.configure(True, export_path=path)
+        try:
+            with reg.span('wallpaper.render'):
+                pass
+            reg.incr('calendar_api_calls', 2)
+            reg.flush()
+            reg.incr('calendar_api_calls')
+            assert reg.flush() is None  # 新しいスパンがなければ書き出さない
+            with reg.span('wallpaper.render'):
+                pass
+            reg.flush()
+        finally:
+            reg.configure(False)
+
+        lines = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+        assert len(lines) == 2
+        assert [span['name'] for span in lines[0]['spans']] == ['wallpaper.render']
+        assert lines[0]['counters'] == {'calendar_api_calls': 2}
+        assert lines[1]['counters'] == {'calendar_api_calls': 3}
+        assert [line['source'] for line in lines] == ['update', 'update']
+
+    def test_render_prometheus(self, registry):
+        """カウンター・最大値・スパンをPrometheusのテキスト形式で出力する"""
+        registry.incr('events_cache_hits')
+        registry.set_max('process_peak_rss_bytes', 100)
+        registry.set_max('process_peak_rss_bytes', 50)
+        with registry.span('render.encode'):
+            pass
+
+        text = registry.render_prometheus()
+
+        assert 'calesk_events_cache_hits_total 1' in text
+        assert 'calesk_process_peak_rss_bytes 100' in text
+        assert 'calesk_span_seconds_count{span="render.encode"} 1' in text
+
+    def test_http_endpoint_serves_metrics(self, registry):
+        """ローカルの /metrics で計測値を取得できる"""
+        registry.incr('calendar_api_calls')
+        port = registry.start_http_server(0)
+
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics', timeout=5) as response:
+            body = response.read().decode('utf-8')
+
+        assert 'calesk_calendar_api_calls_total 1' in body
+
+
+class TestInstrumentation:
+    """パイプラインへの計測の組み込み"""
+
+    def test_timed_decorator(self, global_metrics):
+        """timed() で修飾した関数の所要時間を記録する"""
+        @timed('render.effects.sample')
+        def sample(value):
+            return value * 2
+
+        assert sample(2) == 4
+        assert global_metrics.snapshot()['spans']['render.effects.sample']['count'] == 1
+
+    def test_generate_wallpaper_records_stage_spans(self, global_metrics, tmp_path):
+        """進捗を記録する壁紙生成で、描画の段階ごとのスパンを記録する"""
+        from src.image_generator import ImageGenerator
+        from src.pipeline_progress import PipelineProgress
+
+        gen = ImageGenerator(resolution=(1920, 1080))
+        progress = PipelineProgress()
+        gen.generate_wallpaper([], [], output_path=tmp_path / "out.png", output_size=(640, 360), progress=progress)
+
+        spans = global_metrics.snapshot()['spans']
+        assert {'pipeline.background', 'pipeline.cards', 'pipeline.week_calendar', 'pipeline.encode'} <= set(spans)
+        assert spans['pipeline.encode']['sum_ms'] == round(progress.timings['encode'] * 1000, 3)
+
+    def test_render_without_progress_records_no_stage_spans(self, global_metrics, tmp_path):
+        """進捗を記録しない描画（プレビュー）では段階のスパンを記録しない"""
+        from src.image_generator import ImageGenerator
+
+        gen = ImageGenerator(resolution=(1920, 1080))
+        gen.generate_wallpaper([], [], output_path=tmp_path / "out.png", output_size=(640, 360))
+
+        assert not any(name.startswith('pipeline.') for name in global_metrics.snapshot()['spans'])
+
+    def test_preview_spans_are_flushed_separately(self, global_metrics, tmp_path):
+        """プレビューの計測はプレビューごとに source='preview' として出力し、次の更新に混ぜない"""
+        from unittest.mock import MagicMock, patch
+        from src.image_generator import ImageGenerator
+        from src.viewmodels.wallpaper_service import WallpaperService
+        from src.wallpaper_cache import WallpaperCache
+
+        service = WallpaperService()
+        service.calendar_client = MagicMock(accounts={'a': {}})
+        service.calendar_client.get_all_events.return_value = []
+        service.image_generator = ImageGenerator(resolution=(640, 360))
+        service.wallpaper_cache = WallpaperCache(tmp_path)
+        with global_metrics.span('calendar.get_all_events'):
+            pass
+
+        records = []
+        flush = global_metrics.flush
+        with patch.object(global_metrics, 'flush', side_effect=lambda *args: records.append(flush(*args))):
+            service.generate_preview('simple')
+
+        assert [record['source'] for record in records] == ['preview']
+        assert [span['name'] for span in records[0]['spans']] == ['calendar.get_all_events']
+        assert global_metrics.flush() is None
+
+    def test_events_cache_counts_hits_and_misses(self, global_metrics):
+        """イベントキャッシュのヒット・ミスを数える"""
+        from src.events_cache import EventsCache
+
+        cache = EventsCache(base_ttl=60)
+        cache.get('key', lambda: [])
+        cache.get('key', lambda: [])
+
+        counters = global_metrics.snapshot()['counters']
+        assert counters['events_cache_misses'] == 1
+        assert counters['events_cache_hits'] == 1
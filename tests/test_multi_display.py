@@ -0,0 +1,179 @@
+"""
+マルチディスプレイ描画（解像度別の並列描画・ディスプレイ別設定）のテスト
+"""
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image, ImageChops
+
+from src.image_generator import ImageGenerator
+from src.models.event import CalendarEvent
+from src import multi_display
+from src.multi_display import render_for_displays, display_output_path
+from src.wallpaper_setter import WallpaperSetter
+
+
+def _events():
+    now = datetime.now().replace(minute=0, second=0, microsecond=0)
+    return [
+        CalendarEvent(
+            id=f"e{i}",
+            summary=f"会議{i}",
+            start_datetime=now + timedelta(days=i % 3, hours=i),
+            end_datetime=now + timedelta(days=i % 3, hours=i + 1),
+            is_all_day=False,
+            calendar_id="primary",
+        )
+        for i in range(6)
+    ]
+
+
+@pytest.fixture
+def generator():
+    gen = ImageGenerator(resolution=(960, 540))
+    gen.set_theme('simple')
+    return gen
+
+
+class TestEventIndex:
+    """事前計算したイベント振り分けの共有"""
+
+    def test_shared_index_renders_identically(self, generator, tmp_path):
+        """事前計算の有無で描画結果が変わらない"""
+        week_events = _events()
+        today_events = [e for e in week_events if e.start_datetime.date() == datetime.now().date()]
+
+        plain = generator.generate_wallpaper(today_events, week_events, output_path=tmp_path / "plain.png")
+        indexed = generator.generate_wallpaper(
+            today_events, week_events,
+            output_path=tmp_path / "indexed.png",
+            event_index=generator.build_event_index(week_events)
+        )
+
+        with Image.open(plain) as a, Image.open(indexed) as b:
+            assert ImageChops.difference(a, b).getbbox() is None
+        assert generator._event_index is None
+
+
+class TestRenderForDisplays:
+    """解像度別の描画"""
+
+    def test_identical_resolutions_rendered_once(self, generator, tmp_path):
+        """同じ解像度のディスプレイは1枚を共有する"""
+        week_events = _events()
+        with patch('src.multi_display.render_job', wraps=multi_display.render_job) as job:
+            outputs = render_for_displays(
+                generator, [], week_events,
+                [(960, 540), (640, 360), (960, 540)],
+                output_dir=tmp_path, max_workers=1
+            )
+
+        assert job.call_count == 2
+        assert outputs[0] == outputs[2]
+        assert outputs[0] != outputs[1]
+        with Image.open(outputs[0]) as a, Image.open(outputs[1]) as b:
+            assert a.size == (960, 540)
+            assert b.size == (640, 360)
+
+    def test_process_pool_rendering(self, generator, tmp_path, caplog):
+        """異なる解像度はプロセスプールで描画できる"""
+        outputs = render_for_displays(
+            generator, [], _events(),
+            [(640, 360), (480, 270)],
+            output_dir=tmp_path, max_workers=2
+        )
+        assert "並列描画に失敗" not in caplog.text
+        assert [Image.open(p).size for p in outputs] == [(640, 360), (480, 270)]
+
+    def test_process_pool_is_reused(self, generator, tmp_path):
+        """プロセスプールは更新のたびに作らず使い回し、終了時に停止する"""
+        multi_display.shutdown_pool()
+        try:
+            with patch('src.multi_display.render_job', return_value=tmp_path / 'out.png'), \
+                    patch('src.multi_display.ProcessPoolExecutor') as pool_cls:
+                pool_cls.return_value.submit.side_effect = lambda fn, job: MagicMock(
+                    **{'result.return_value': tmp_path / f"{job.resolution[0]}.png"}
+                )
+                for _ in range(2):
+                    outputs = render_for_displays(
+                        generator, [], _events(), [(640, 360), (480, 270)],
+                        output_dir=tmp_path, max_workers=2
+                    )
+                assert outputs == [tmp_path / '640.png', tmp_path / '480.png']
+                pool_cls.assert_called_once()
+
+                multi_display.shutdown_pool()
+                pool_cls.return_value.shutdown.assert_called_once_with(wait=True, cancel_futures=True)
+        finally:
+            multi_display.shutdown_pool()
+
+    def test_output_path_includes_resolution(self, tmp_path):
+        path = display_output_path('modern', (2560, 1440), tmp_path)
+        assert path.parent == tmp_path
+        assert path.name.startswith('wallpaper_modern_')
+        assert path.name.endswith('_2560x1440.png')
+
+
+class TestSetWallpapers:
+    """ディスプレイ別の壁紙設定"""
+
+    def _images(self, tmp_path, count):
+        paths = []
+        for i in range(count):
+            path = tmp_path / f"display{i}.png"
+            Image.new('RGB', (4, 4)).save(path)
+            paths.append(path)
+        return paths
+
+    def test_mac_sets_each_desktop(self, tmp_path):
+        setter = WallpaperSetter()
+        setter.system = 'Darwin'
+        paths = self._images(tmp_path, 2)
+        with patch.object(setter, '_set_wallpaper_mac', return_value=True) as mac:
+            assert setter.set_wallpapers(paths) is True
+        assert [c.kwargs['desktop'] for c in mac.call_args_list] == [1, 2]
+
+    def test_identical_paths_use_single_set(self, tmp_path):
+        setter = WallpaperSetter()
+        path = self._images(tmp_path, 1)[0]
+        with patch.object(setter, 'set_wallpaper', return_value=True) as single:
+            assert setter.set_wallpapers([path, path]) is True
+        single.assert_called_once_with(path)
+
+    def test_unsupported_platform_falls_back_to_first_image(self, tmp_path):
+        setter = WallpaperSetter()
+        setter.system = 'Windows'
+        paths = self._images(tmp_path, 2)
+        with patch.object(setter, 'set_wallpaper', return_value=True) as single:
+            assert setter.set_wallpapers(paths) is True
+        single.assert_called_once_with(paths[0])
+
+
+class TestServiceMultiDisplay:
+    """WallpaperService のマルチディスプレイ経路"""
+
+    @patch('src.viewmodels.wallpaper_service.WALLPAPER_TARGET_DESKTOP', 0)
+    @patch('src.viewmodels.wallpaper_service.MULTI_DISPLAY_RENDER', True)
+    @patch('src.viewmodels.wallpaper_service.render_for_displays')
+    @patch('src.viewmodels.wallpaper_service.DisplayInfo')
+    @patch('src.viewmodels.wallpaper_service.CalendarClient')
+    def test_generate_and_set_per_display(self, mock_client_cls, mock_display, mock_render, tmp_path):
+        from src.viewmodels.wallpaper_service import WallpaperService
+
+        client = MagicMock()
+        client.accounts = {'a': {}}
+        client.get_all_events.return_value = []
+        mock_client_cls.return_value = client
+        mock_display.return_value.get_display_resolutions.return_value = [(1920, 1080), (2560, 1440)]
+        outputs = [tmp_path / "a.png", tmp_path / "b.png"]
+        mock_render.return_value = outputs
+
+        service = WallpaperService()
+        service.wallpaper_cache = MagicMock()
+        service.wallpaper_setter = MagicMock()
+        service.wallpaper_setter.set_wallpapers.return_value = True
+
+        assert service.generate_and_set_wallpaper('simple') is True
+        service.wallpaper_setter.set_wallpapers.assert_called_once_with(outputs)
+        service.wallpaper_cache.save_cache.assert_called_once_with(wallpaper_path=outputs[0], theme='simple')
@@ -4,9 +4,11 @@ Notifier（通知機能）のテスト
 通知の重複送信防止、エッジケース、基本動作を検証する。
 """
 import pytest
+from dataclasses import replace
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 
+from src.notification_engine import dedupe_key
 from src.notifier import Notifier
 from src.models.event import CalendarEvent
 
@@ -208,15 +210,14 @@ class TestDuplicateNotificationPrevention:
 
         notifier.check_upcoming_events([event])
 
-        assert "evt_track_001" in notifier.notified_event_ids
+        assert dedupe_key(event) in notifier.engine.store
 
     @patch("src.notifier.notification")
     def test_notified_ids_initially_empty(self, mock_notification):
-        """初期状態では通知済みIDセットは空"""
+        """初期状態では通知済みの記録は空"""
         notifier = Notifier()
 
-        assert hasattr(notifier, "notified_event_ids")
-        assert len(notifier.notified_event_ids) == 0
+        assert len(notifier.engine.store) == 0
 
 
 # === 通知済みIDクリアのテスト ===
@@ -232,11 +233,11 @@ class TestNotifiedIdsClear:
 
         notifier.check_upcoming_events([event])
         assert mock_notification.notify.call_count == 1
-        assert "evt_clear_001" in notifier.notified_event_ids
+        assert dedupe_key(event) in notifier.engine.store
 
         # クリア
         notifier.clear_notified_ids()
-        assert len(notifier.notified_event_ids) == 0
+        assert len(notifier.engine.store) == 0
 
         # クリア後は同じイベントでも再通知される
         notifier.check_upcoming_events([event])
@@ -248,7 +249,7 @@ class TestNotifiedIdsClear:
         notifier = Notifier()
         notifier.clear_notified_ids()
 
-        assert len(notifier.notified_event_ids) == 0
+        assert len(notifier.engine.store) == 0
 
 
 # === _send_event_notification のテスト ===
@@ -343,7 +344,7 @@ class TestEdgeCases:
         notifier.check_upcoming_events([event])
 
         # 失敗したので通知済みに含まれない
-        assert "evt_fail_001" not in notifier.notified_event_ids
+        assert dedupe_key(event) not in notifier.engine.store
 
     @patch("src.notifier.notification")
     def test_notification_failure_allows_retry(self, mock_notification):
@@ -355,13 +356,13 @@ class TestEdgeCases:
 
         notifier.check_upcoming_events([event])
         assert mock_notification.notify.call_count == 1
-        assert "evt_retry_001" not in notifier.notified_event_ids
+        assert dedupe_key(event) not in notifier.engine.store
 
         # 2回目: 成功
         mock_notification.notify.side_effect = None
         notifier.check_upcoming_events([event])
         assert mock_notification.notify.call_count == 2
-        assert "evt_retry_001" in notifier.notified_event_ids
+        assert dedupe_key(event) in notifier.engine.store
 
     @patch("src.notifier.notification")
     def test_large_number_of_events(self, mock_notification):
@@ -379,7 +380,7 @@ class TestEdgeCases:
         notifier.check_upcoming_events(events)
 
         assert mock_notification.notify.call_count == 100
-        assert len(notifier.notified_event_ids) == 100
+        assert len(notifier.engine.store) == 100
 
     @patch("src.notifier.notification")
     def test_special_characters_in_summary(self, mock_notification):
@@ -394,3 +395,178 @@ class TestEdgeCases:
         notifier.check_upcoming_events([event])
 
         assert mock_notification.notify.call_count == 1
+
+
+# === 通知エンジン（ヒープ・永続化）のテスト ===
+
+class TestNotificationEngine:
+    """通知時刻ヒープと通知済み記録の永続化のテスト"""
+
+    def test_pop_due_returns_only_due_events(self):
+        """通知時刻を迎えたイベントだけを通知時刻順に取り出す"""
+        from src.notification_engine import NotificationEngine
+
+        engine = NotificationEngine(lead_minutes=30)
+        now = datetime(2026, 2, 5, 9, 0)
+        late = replace(_make_event(event_id="late"), start_datetime=now + timedelta(minutes=25))
+        early = replace(_make_event(event_id="early"), start_datetime=now + timedelta(minutes=10))
+        future = replace(_make_event(event_id="future"), start_datetime=now + timedelta(minutes=90))
+
+        engine.schedule([late, future, early], now)
+        due = engine.pop_due(now)
+
+        assert [event.id for event, _ in due] == ["early", "late"]
+        assert engine.next_deadline() == future.start_datetime - timedelta(minutes=30)
+
+    def test_next_deadline_none_when_empty(self):
+        """登録イベントがなければ次の通知時刻はNone"""
+        from src.notification_engine import NotificationEngine
+
+        engine = NotificationEngine(lead_minutes=30)
+        engine.schedule([_make_event(is_all_day=True)])
+
+        assert engine.next_deadline() is None
+
+    @patch("src.notifier.notification")
+    def test_dedupe_persists_across_restart(self, mock_notification, tmp_path):
+        """再起動（Notifierの作り直し）後も同じ予定は再通知しない"""
+        state_path = tmp_path / "notified.json"
+        event = _make_event(event_id="evt_persist", minutes_from_now=10)
+
+        Notifier(state_path=state_path).check_upcoming_events([event])
+        Notifier(state_path=state_path).check_upcoming_events([event])
+
+        assert mock_notification.notify.call_count == 1
+        assert state_path.exists()
+
+    @patch("src.notifier.notification")
+    def test_rescheduled_event_notified_again(self, mock_notification):
+        """開始時刻が変更された予定は改めて通知する"""
+        notifier = Notifier()
+        event = _make_event(event_id="evt_moved", minutes_from_now=10)
+        notifier.check_upcoming_events([event])
+
+        moved = _make_event(event_id="evt_moved", minutes_from_now=20)
+        notifier.check_upcoming_events([moved])
+
+        assert mock_notification.notify.call_count == 2
+
+    def test_expired_entries_pruned_on_load(self, tmp_path):
+        """有効期限切れの通知済み記録は読み込み時に削除される"""
+        import json
+        from src.notification_engine import NotifiedStore
+
+        state_path = tmp_path / "notified.json"
+        state_path.write_text(json.dumps({
+            "old@2026-01-01T09:00": "2026-01-03T09:00:00",
+            "new@2999-01-01T09:00": "2999-01-03T09:00:00",
+        }))
+
+        store = NotifiedStore(state_path)
+
+        assert "old@2026-01-01T09:00" not in store
+        assert "new@2999-01-01T09:00" in store
+        assert "old@2026-01-01T09:00" not in json.loads(state_path.read_text())
+
+    @patch("src.notifier.notification")
+    def test_dispatch_due_without_refetch(self, mock_notification):
+        """登録済みのイベントは取得し直さずに通知時刻で通知できる"""
+        notifier = Notifier()
+        event = _make_event(event_id="evt_deadline", minutes_from_now=10)
+        notifier.engine.schedule([event], datetime.now() - timedelta(minutes=30))
+
+        notifier.dispatch_due()
+
+        mock_notification.notify.assert_called_once()
+        assert notifier.next_deadline() is None
+
+
+# === 非同期送信キューのテスト ===
+
+class TestNotificationDispatcher:
+    """通知送信キュー（専用スレッド・まとめ送信・上限）のテスト"""
+
+    def test_submit_does_not_block_on_slow_backend(self):
+        """送信が遅いバックエンドでも submit は即座に戻る"""
+        import threading
+        import time
+        from src.notification_dispatcher import NotificationDispatcher, NotificationRequest
+
+        release = threading.Event()
+        dispatcher = NotificationDispatcher(
+            lambda *args, **kwargs: release.wait(5), coalesce_seconds=0
+        )
+
+        started = time.monotonic()
+        dispatcher.submit(NotificationRequest("タイトル", "本文"))
+        assert time.monotonic() - started < 0.5
+
+        release.set()
+        assert dispatcher.flush(timeout=5)
+        assert dispatcher.metrics['delivered'] == 1
+        assert dispatcher.metrics['last_latency'] > 0
+        dispatcher.stop()
+
+    def test_same_group_coalesced_into_one_toast(self):
+        """同じグループの通知は1つにまとめて送信される"""
+        from src.notification_dispatcher import NotificationDispatcher, NotificationRequest
+
+        sent = []
+        dispatcher = NotificationDispatcher(
+            lambda title, message, timeout: sent.append((title, message)) or True,
+            coalesce_seconds=0.2
+        )
+        results = []
+        for summary in ("会議A", "会議B", "会議C"):
+            dispatcher.submit(NotificationRequest(
+                "予定開始 10分前", f"10:00 - {summary}", group="10:00",
+                on_done=results.append,
+            ))
+
+        assert dispatcher.flush(timeout=5)
+        assert len(sent) == 1
+        assert sent[0][0] == "予定開始 10分前（3件）"
+        assert "会議B" in sent[0][1]
+        assert results == [True, True, True]
+        dispatcher.stop()
+
+    def test_overflow_drops_oldest_as_failure(self):
+        """キューが上限を超えたら古い通知を破棄し、失敗として通知する"""
+        import threading
+        from src.notification_dispatcher import NotificationDispatcher, NotificationRequest
+
+        release = threading.Event()
+        dispatcher = NotificationDispatcher(
+            lambda *args, **kwargs: release.wait(5), coalesce_seconds=60, max_queue=2
+        )
+        results = {}
+        for name in ("a", "b", "c"):
+            dispatcher.submit(NotificationRequest(
+                name, name, on_done=lambda ok, name=name: results.setdefault(name, ok)
+            ))
+
+        assert results == {"a": False}
+        assert dispatcher.metrics['dropped'] == 1
+        release.set()
+        dispatcher.stop()
+        assert results == {"a": False, "b": True, "c": True}
+
+    @patch("src.notifier.notification")
+    def test_notifier_marks_after_async_delivery(self, mock_notification):
+        """非同期送信の完了後に通知済みとして記録される"""
+        notifier = Notifier.with_dispatcher()
+        notifier.dispatcher.coalesce_seconds = 0
+        events = [
+            _make_event(event_id="evt_q1", summary="会議A", minutes_from_now=10),
+            _make_event(event_id="evt_q2", summary="会議B", minutes_from_now=20),
+        ]
+
+        notifier.check_upcoming_events(events)
+        assert notifier.dispatcher.flush(timeout=5)
+        notifier.check_upcoming_events(events)
+        assert notifier.dispatcher.flush(timeout=5)
+
+        assert mock_notification.notify.call_count == 2
+        assert all(dedupe_key(event) in notifier.engine.store for event in events)
+        assert len(notifier.engine.store) == 2
+        notifier.dispatcher.stop()
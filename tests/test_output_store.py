@@ -0,0 +1,123 @@
+"""
+OutputStore（出力ディレクトリの保持ポリシー）のテスト
+"""
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from src.output_store import OutputStore
+from src.wallpaper_cache import WallpaperCache
+
+DAY = 86400
+
+
+def _file(directory: Path, name: str, size: int = 10, age_days: float = 0) -> Path:
+    path = directory / name
+    path.write_bytes(b"x" * size)
+    moment = time.time() - age_days * DAY
+    os.utime(path, (moment, moment))
+    return path
+
+
+class TestAgeEviction:
+
+    def test_old_files_beyond_keep_previous_are_removed(self, tmp_path):
+        store = OutputStore(output_dir=tmp_path, keep_previous=1, max_age_days=7, max_bytes=10**9)
+        current = _file(tmp_path, "wallpaper_simple_20260210_a.png")
+        recent_old = _file(tmp_path, "wallpaper_simple_20260101_a.png", age_days=30)
+        older = _file(tmp_path, "wallpaper_simple_20251201_a.png", age_days=60)
+        fresh = _file(tmp_path, "wallpaper_dark_20260209_b.png", age_days=1)
+
+        evicted = store.evict(current=[current])
+
+        # 直近1件（fresh）は保持、期限切れの2件を削除
+        assert set(evicted) == {recent_old, older}
+        assert current.exists() and fresh.exists()
+
+    def test_keep_previous_protects_expired_files(self, tmp_path):
+        store = OutputStore(output_dir=tmp_path, keep_previous=2, max_age_days=7, max_bytes=10**9)
+        a = _file(tmp_path, "wallpaper_a.png", age_days=10)
+        b = _file(tmp_path, "wallpaper_b.png", age_days=20)
+        c = _file(tmp_path, "wallpaper_c.png", age_days=30)
+
+        assert store.evict() == [c]
+        assert a.exists() and b.exists()
+
+
+class TestByteBudget:
+
+    def test_least_recently_used_removed_until_under_budget(self, tmp_path):
+        store = OutputStore(output_dir=tmp_path, keep_previous=10, max_age_days=365, max_bytes=250)
+        current = _file(tmp_path, "wallpaper_current.png", size=100)
+        newer = _file(tmp_path, "wallpaper_newer.png", size=100, age_days=1)
+        older = _file(tmp_path, "wallpaper_older.png", size=100, age_days=2)
+
+        assert store.evict(current=[current]) == [older]
+        assert newer.exists()
+
+    def test_protected_files_never_evicted_even_over_budget(self, tmp_path):
+        store = OutputStore(output_dir=tmp_path, keep_previous=0, max_age_days=0, max_bytes=0)
+        current = _file(tmp_path, "wallpaper_current.png", size=100)
+        applied = _file(tmp_path, "wallpaper_applied.png", size=100, age_days=30)
+
+        assert store.evict(current=[current], protected=[applied]) == []
+
+
+class TestWallpaperCacheIntegration:
+
+    def test_cached_fallback_file_is_never_evicted(self, tmp_path):
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+        cache = WallpaperCache(cache_dir=tmp_path / "config")
+        cached = _file(output_dir, "wallpaper_simple_20250101_a.png", age_days=400)
+        cache.save_cache(wallpaper_path=cached, theme="simple")
+        other = _file(output_dir, "wallpaper_simple_20250102_a.png", age_days=399)
+
+        store = OutputStore(output_dir=output_dir, keep_previous=0, max_age_days=1, max_bytes=0, wallpaper_cache=cache)
+        assert store.evict() == [other]
+        assert cached.exists()
+
+
+class TestHousekeeping:
+
+    def test_ignores_unrelated_files(self, tmp_path):
+        store = OutputStore(output_dir=tmp_path, keep_previous=0, max_age_days=0, max_bytes=0)
+        unrelated = _file(tmp_path, "notes.txt", age_days=100)
+        assert store.evict() == []
+        assert unrelated.exists()
+
+    def test_removes_stale_temp_files(self, tmp_path):
+        store = OutputStore(output_dir=tmp_path)
+        stale = _file(tmp_path, ".wallpaper_simple_20260101_a.abc123.tmp", age_days=1)
+        in_progress = _file(tmp_path, ".wallpaper_simple_20260101_b.def456.tmp")
+        store.evict()
+        assert not stale.exists()
+        assert in_progress.exists()
+
+    def test_missing_directory(self, tmp_path):
+        assert OutputStore(output_dir=tmp_path / "missing").evict() == []
+
+
+class TestDaemonUpdate:
+
+    def test_update_wallpaper_evicts_old_outputs(self, tmp_path):
+        """デーモンの壁紙更新でも適用中の壁紙を避けて出力し、古い出力を整理する"""
+        import main
+
+        image_path = tmp_path / "wallpaper_simple_20260101_b.png"
+        applied = [tmp_path / "wallpaper_simple_20260101_a.png"]
+        with patch('main.CalendarClient'), \
+                patch('main.ImageGenerator') as generator_cls, \
+                patch('main.WallpaperCache') as cache_cls, \
+                patch('main.WallpaperSetter') as setter_cls, \
+                patch('main.OutputStore') as store_cls, \
+                patch('main.get_notifier'):
+            cache_cls.return_value.load_frame.return_value = None
+            generator_cls.return_value.generate_wallpaper.return_value = image_path
+            setter_cls.return_value.applied_paths.return_value = applied
+            assert main.update_wallpaper() is True
+
+        assert generator_cls.return_value.generate_wallpaper.call_args.kwargs['protected_paths'] == applied
+        store_cls.assert_called_once_with(wallpaper_cache=cache_cls.return_value)
+        store_cls.return_value.evict.assert_called_once_with(current=[image_path], protected=applied)
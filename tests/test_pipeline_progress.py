@@ -0,0 +1,93 @@
+"""
+壁紙生成パイプラインの進捗（PipelineProgress）のテスト
+"""
+from src.pipeline_progress import PipelineProgress
+
+
+class TestPipelineProgress:
+    """PipelineProgress のテスト"""
+
+    def test_mark_reports_stage_percent_and_elapsed(self):
+        """段階の完了時に進捗率と所要時間を通知する"""
+        events = []
+        progress = PipelineProgress(lambda stage, percent, elapsed: events.append((stage, percent, elapsed)))
+
+        progress.mark('fetch')
+        progress.mark('apply')
+
+        assert [(stage, percent) for stage, percent, _ in events] == [('fetch', 35), ('apply', 100)]
+        assert all(elapsed is not None and elapsed >= 0 for _, _, elapsed in events)
+        assert set(progress.timings) == {'fetch', 'apply'}
+
+    def test_advance_reports_partial_progress_within_stage(self):
+        """段階の途中経過は開始〜完了の間の進捗率になり、所要時間は通知しない"""
+        events = []
+        progress = PipelineProgress(lambda stage, percent, elapsed: events.append((stage, percent, elapsed)))
+
+        progress.advance('fetch', 0.5)
+        progress.advance('fetch', 0.5)  # 同じ値は通知しない
+
+        assert events == [('fetch', 17, None)]
+
+    def test_progress_never_goes_backwards(self):
+        """先の段階の完了後に前の段階の途中経過が来ても進捗率は戻らない"""
+        events = []
+        progress = PipelineProgress(lambda stage, percent, elapsed: events.append(percent))
+
+        progress.mark('cards')
+        progress.advance('fetch', 0.9)
+
+        assert events == [60]
+
+    def test_callback_error_does_not_break_pipeline(self):
+        """通知先のエラーで処理を止めない"""
+        def broken(*args):
+            raise RuntimeError("boom")
+
+        progress = PipelineProgress(broken)
+        progress.mark('fetch')
+        assert 'fetch' in progress.timings
+
+
+class TestRenderStages:
+    """描画段階の記録"""
+
+    def test_generate_wallpaper_records_render_stages(self, tmp_path):
+        """背景・予定カード・週間カレンダー・エンコードの完了を記録する"""
+        from src.image_generator import ImageGenerator
+
+        gen = ImageGenerator(resolution=(1920, 1080))
+        progress = PipelineProgress()
+
+        gen.generate_wallpaper([], [], output_path=tmp_path / "out.png", output_size=(640, 360), progress=progress)
+
+        assert list(progress.timings) == ['background', 'cards', 'week_calendar', 'encode']
+
+
+class TestWorkerStageSignals:
+    """WallpaperWorker による進捗の通知"""
+
+    def test_worker_forwards_stage_progress(self, qtbot, qapp):
+        """サービスが記録した段階の完了を stage_completed・progress シグナルで通知する"""
+        from src.viewmodels.wallpaper_worker import WallpaperWorker
+
+        class Service:
+            def generate_and_set_wallpaper(self, theme_name, cancel_token=None, progress=None):
+                progress.mark('fetch')
+                progress.mark('encode')
+                progress.mark('apply')
+                return True
+
+        worker = WallpaperWorker(Service(), "simple")
+        stages = []
+        percents = []
+        worker.signals.stage_completed.connect(lambda stage, seconds: stages.append(stage))
+        worker.signals.progress.connect(lambda value: percents.append(value))
+
+        worker.run()
+        qtbot.wait(50)
+
+        assert stages == ['fetch', 'encode', 'apply']
+        assert percents == sorted(percents)
+        assert percents[-1] == 100
+        assert set(worker.stage_timings) == {'fetch', 'encode', 'apply'}
@@ -4,7 +4,7 @@
 テーマ選択→プレビュー→適用の2ステップワークフローを検証
 """
 import pytest
-from unittest.mock import MagicMock, patch, PropertyMock
+from unittest.mock import ANY, MagicMock, patch, PropertyMock
 from pathlib import Path
 
 
@@ -44,7 +44,7 @@ class TestPreviewTheme:
         with qtbot.waitSignal(vm.preview_ready, timeout=2000):
             vm.preview_theme('modern')
         vm._wallpaper_service.generate_wallpaper.assert_called_once_with(
-            theme_name='modern'
+            theme_name='modern', cancel_token=ANY
         )
 
     def test_preview_ready_signal_emitted(self, qtbot):
@@ -79,7 +79,7 @@ class TestPreviewDebounce:
 
         # generate_wallpaperは1回だけ呼ばれる（最後のテーマ）
         vm._wallpaper_service.generate_wallpaper.assert_called_once_with(
-            theme_name='dark'
+            theme_name='dark', cancel_token=ANY
         )
 
     def test_debounce_timer_exists(self):
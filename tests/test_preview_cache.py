@@ -0,0 +1,149 @@
+"""
+先読みプレビュー（PreviewFrameCache / SpeculativePreviewWorker）のテスト
+"""
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from PyQt6.QtGui import QImage
+
+from src.viewmodels.preview_cache import PreviewFrameCache
+
+
+def _image(color=0xff336699):
+    image = QImage(64, 36, QImage.Format.Format_RGB32)
+    image.fill(color)
+    return image
+
+
+class TestPreviewFrameCache:
+    """PreviewFrameCache のテスト"""
+
+    def test_put_and_get(self, qapp):
+        """保存したフレームを取得できる"""
+        cache = PreviewFrameCache()
+        assert cache.put("modern", _image(), cache.generation)
+        assert cache.get("modern") is not None
+        assert cache.get("dark") is None
+
+    def test_lru_eviction(self, qapp):
+        """上限を超えると最も使われていないフレームから破棄する"""
+        cache = PreviewFrameCache(max_entries=2)
+        cache.put("simple", _image(), cache.generation)
+        cache.put("modern", _image(), cache.generation)
+        cache.get("simple")
+        cache.put("dark", _image(), cache.generation)
+
+        assert "simple" in cache
+        assert "modern" not in cache
+        assert "dark" in cache
+
+    def test_invalidate_rejects_frames_from_old_generation(self, qapp):
+        """無効化前に描画を開始したフレームは保存しない"""
+        cache = PreviewFrameCache()
+        generation = cache.generation
+        cache.put("simple", _image(), generation)
+
+        cache.invalidate()
+
+        assert len(cache) == 0
+        assert not cache.put("modern", _image(), generation)
+        assert cache.put("modern", _image(), cache.generation)
+
+    def test_expired_frame_is_not_used(self, qapp):
+        """一定時間を過ぎたフレームは使わない"""
+        cache = PreviewFrameCache(max_age_seconds=60)
+        cache.put("simple", _image(), cache.generation, now=100.0)
+
+        assert cache.get("simple", now=150.0) is not None
+        assert cache.get("simple", now=161.0) is None
+
+
+class _PreviewService:
+    """テーマごとにプレビュー画像を書き出すサービス"""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.rendered = []
+
+    def generate_preview(self, theme_name, cancel_token=None, filename="preview.png"):
+        self.rendered.append(theme_name)
+        path = self.directory / filename
+        _image().save(str(path))
+        return path
+
+
+class TestSpeculativePreviewWorker:
+    """SpeculativePreviewWorker のテスト"""
+
+    def test_frames_are_emitted_and_files_removed(self, qtbot, qapp, tmp_path):
+        """テーマごとにQImageを通知し、書き出したファイルは削除する"""
+        from src.viewmodels.wallpaper_worker import SpeculativePreviewWorker
+
+        service = _PreviewService(tmp_path)
+        worker = SpeculativePreviewWorker(service, ["modern", "dark"], generation=3)
+        frames = []
+        worker.signals.frame_ready.connect(lambda name, image, gen: frames.append((name, image.isNull(), gen)))
+
+        worker.run()
+        qtbot.wait(50)
+
+        assert frames == [("modern", False, 3), ("dark", False, 3)]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_cancel_stops_before_next_theme(self, qtbot, qapp, tmp_path):
+        """キャンセル後は次のテーマを描画しない"""
+        from src.viewmodels.wallpaper_worker import SpeculativePreviewWorker
+
+        service = _PreviewService(tmp_path)
+        worker = SpeculativePreviewWorker(service, ["modern", "dark"], generation=0)
+        worker.signals.frame_ready.connect(lambda *args: worker.cancel())
+
+        worker.run()
+
+        assert service.rendered == ["modern"]
+
+
+class TestViewModelPrerender:
+    """MainViewModel の先読みプレビュー利用のテスト"""
+
+    def _create_viewmodel(self):
+        from src.viewmodels.main_viewmodel import MainViewModel
+        mock_service = MagicMock()
+        mock_service.get_available_themes.return_value = ['simple', 'modern', 'pastel', 'dark', 'vibrant']
+        mock_service.generate_wallpaper.return_value = Path('/tmp/test_wallpaper.png')
+        return MainViewModel(wallpaper_service=mock_service)
+
+    def test_cached_frame_is_shown_without_worker(self, qtbot):
+        """先読み済みのテーマはワーカーを起動せずに即座に表示する"""
+        vm = self._create_viewmodel()
+        frame = _image()
+        vm._preview_frames.put('dark', frame, vm._preview_frames.generation)
+
+        with qtbot.waitSignal(vm.preview_frame_ready, timeout=100) as blocker:
+            vm.preview_theme('dark')
+
+        assert blocker.args[0] is frame
+        assert not vm._preview_debounce_timer.isActive()
+        vm._wallpaper_service.generate_wallpaper.assert_not_called()
+
+    def test_background_change_invalidates_frames(self, qtbot):
+        """背景を変更すると先読みしたプレビューを破棄する"""
+        from src.config import DEFAULT_PRESET_BACKGROUND
+        vm = self._create_viewmodel()
+        vm._preview_frames.put('dark', _image(), vm._preview_frames.generation)
+
+        vm.set_preset_background(DEFAULT_PRESET_BACKGROUND)
+
+        assert 'dark' not in vm._preview_frames
+
+    def test_prerender_order_starts_next_to_last_preview(self, qtbot):
+        """直前にプレビューしたテーマに近い順に先読みし、先読み済みは除く"""
+        vm = self._create_viewmodel()
+        vm._last_preview_theme = 'pastel'
+        vm._preview_frames.put('pastel', _image(), vm._preview_frames.generation)
+
+        order = vm._prerender_order()
+
+        assert order[:2] == ['modern', 'dark']
+        assert 'pastel' not in order
+        assert set(order) == {'simple', 'modern', 'dark', 'vibrant'}
@@ -0,0 +1,302 @@
+"""
+繰り返しイベントのローカル展開とマスターキャッシュのテスト
+"""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+from zoneinfo import ZoneInfo
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from src.calendar_client import CalendarClient
+from src.recurring_events import (
+    RecurrenceRule,
+    RecurringEventStore,
+    UnsupportedRecurrenceError,
+    expand_master,
+)
+
+JST = timezone(timedelta(hours=9))
+
+
+def _window(start_day, days):
+    start = datetime(2026, 2, start_day, tzinfo=JST)
+    return start, start + timedelta(days=days)
+
+
+def _master(recurrence, start='2026-02-02T10:00:00+09:00', end='2026-02-02T10:30:00+09:00',
+            tz='Asia/Tokyo', event_id='standup'):
+    return {
+        'id': event_id,
+        'summary': '朝会',
+        'status': 'confirmed',
+        'start': {'dateTime': start, 'timeZone': tz},
+        'end': {'dateTime': end, 'timeZone': tz},
+        'recurrence': recurrence,
+    }
+
+
+class TestRecurrenceRule:
+    """RRULE解析のテスト"""
+
+    def test_parse_weekly_byday(self):
+        """BYDAY付きWEEKLYを解析できる"""
+        rule = RecurrenceRule.parse('RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,WE', JST)
+
+        assert rule.freq == 'WEEKLY'
+        assert rule.interval == 2
+        assert rule.by_day == ((None, 0), (None, 2))
+
+    def test_parse_monthly_ordinal_byday(self):
+        """序数付きBYDAYを解析できる"""
+        rule = RecurrenceRule.parse('RRULE:FREQ=MONTHLY;BYDAY=-1FR', JST)
+
+        assert rule.by_day == ((-1, 4),)
+
+    def test_unsupported_part_raises(self):
+        """未対応の要素はUnsupportedRecurrenceError"""
+        with pytest.raises(UnsupportedRecurrenceError):
+            RecurrenceRule.parse('RRULE:FREQ=MONTHLY;BYDAY=MO;BYSETPOS=1', JST)
+
+
+class TestExpandMaster:
+    """マスター展開のテスト"""
+
+    def test_daily_expansion_within_window(self):
+        """DAILYのマスターを期間内の各日に展開する"""
+        window_start, window_end = _window(9, 3)
+
+        instances = expand_master(_master(['RRULE:FREQ=DAILY']), window_start, window_end)
+
+        assert [i['start']['dateTime'] for i in instances] == [
+            '2026-02-09T10:00:00+09:00',
+            '2026-02-10T10:00:00+09:00',
+            '2026-02-11T10:00:00+09:00',
+        ]
+        assert instances[0]['id'] == 'standup_20260209T010000Z'
+        assert instances[0]['recurringEventId'] == 'standup'
+        assert 'recurrence' not in instances[0]
+
+    def test_weekly_byday_with_count(self):
+        """COUNTは初回から数え、期間外の回も回数に含める"""
+        window_start, window_end = _window(1, 28)
+        master = _master(['RRULE:FREQ=WEEKLY;BYDAY=MO,TH;COUNT=3'])
+
+        instances = expand_master(master, window_start, window_end)
+
+        assert [i['start']['dateTime'][:10] for i in instances] == [
+            '2026-02-02', '2026-02-05', '2026-02-09',
+        ]
+
+    def test_until_and_exdate(self):
+        """UNTILとEXDATEで回を除外する"""
+        window_start, window_end = _window(1, 28)
+        master = _master([
+            'RRULE:FREQ=DAILY;UNTIL=20260205T235959Z',
+            'EXDATE;TZID=Asia/Tokyo:20260203T100000',
+        ])
+
+        instances = expand_master(master, window_start, window_end)
+
+        assert [i['start']['dateTime'][:10] for i in instances] == [
+            '2026-02-02', '2026-02-04', '2026-02-05',
+        ]
+
+    def test_monthly_last_friday(self):
+        """MONTHLY;BYDAY=-1FR は毎月最終金曜日に展開する"""
+        window_start = datetime(2026, 1, 1, tzinfo=JST)
+        window_end = datetime(2026, 4, 1, tzinfo=JST)
+        master = _master(
+            ['RRULE:FREQ=MONTHLY;BYDAY=-1FR'],
+            start='2026-01-30T18:00:00+09:00', end='2026-01-30T19:00:00+09:00'
+        )
+
+        instances = expand_master(master, window_start, window_end)
+
+        assert [i['start']['dateTime'][:10] for i in instances] == [
+            '2026-01-30', '2026-02-27', '2026-03-27',
+        ]
+
+    def test_dst_keeps_wall_clock_time(self):
+        """DSTを跨いでもシリーズのタイムゾーンの壁時計時刻を維持する"""
+        new_york = ZoneInfo('America/New_York')
+        window_start = datetime(2026, 3, 5, tzinfo=new_york)
+        window_end = datetime(2026, 3, 12, tzinfo=new_york)
+        master = _master(
+            ['RRULE:FREQ=WEEKLY'],
+            start='2026-03-05T09:00:00-05:00', end='2026-03-05T09:30:00-05:00',
+            tz='America/New_York'
+        )
+
+        instances = expand_master(master, window_start, window_end + timedelta(days=1))
+
+        assert [i['start']['dateTime'] for i in instances] == [
+            '2026-03-05T09:00:00-05:00',
+            '2026-03-12T09:00:00-04:00',
+        ]
+
+    def test_all_day_series(self):
+        """終日の繰り返しは日付で展開する"""
+        window_start, window_end = _window(9, 14)
+        master = {
+            'id': 'trash',
+            'summary': 'ゴミ出し',
+            'start': {'date': '2026-02-04'},
+            'end': {'date': '2026-02-05'},
+            'recurrence': ['RRULE:FREQ=WEEKLY'],
+        }
+
+        instances = expand_master(master, window_start, window_end)
+
+        assert [(i['id'], i['start']['date']) for i in instances] == [
+            ('trash_20260211', '2026-02-11'),
+            ('trash_20260218', '2026-02-18'),
+        ]
+
+    def test_skip_keys(self):
+        """例外で上書きされる回は展開しない"""
+        window_start, window_end = _window(9, 2)
+
+        instances = expand_master(
+            _master(['RRULE:FREQ=DAILY']), window_start, window_end,
+            skip_keys={'20260209T010000Z'}
+        )
+
+        assert [i['id'] for i in instances] == ['standup_20260210T010000Z']
+
+    def test_rdate_is_unsupported(self):
+        """RDATEを含むマスターはローカル展開しない"""
+        window_start, window_end = _window(9, 2)
+        master = _master(['RRULE:FREQ=DAILY', 'RDATE:20260220T010000Z'])
+
+        with pytest.raises(UnsupportedRecurrenceError):
+            expand_master(master, window_start, window_end)
+
+
+def _service_with_responses(*responses):
+    service = MagicMock()
+    service.events.return_value.list.return_value.execute.side_effect = list(responses)
+    return service
+
+
+def _list_calls(service):
+    return service.events.return_value.list.call_args_list
+
+
+class TestRecurringEventStore:
+    """マスターキャッシュ・差分同期のテスト"""
+
+    def _exception(self, original, **fields):
+        item = {
+            'id': f"standup_{original}",
+            'recurringEventId': 'standup',
+            'originalStartTime': {'dateTime': '2026-02-10T10:00:00+09:00'},
+        }
+        item.update(fields)
+        return item
+
+    def test_full_sync_then_incremental(self):
+        """初回は全件同期、2回目以降はsyncTokenで差分のみ取得する"""
+        service = _service_with_responses(
+            {'items': [_master(['RRULE:FREQ=DAILY'])], 'nextSyncToken': 'sync1'},
+            {'items': [], 'nextSyncToken': 'sync2'},
+        )
+        store = RecurringEventStore()
+        window_start, window_end = _window(9, 7)
+
+        first = store.window_items(service, 'account_1', 'primary', window_start, window_end)
+        # 月表示のような広い期間も追加のAPI呼び出しなしで展開できる
+        second = store.window_items(service, 'account_1', 'primary', window_start, window_start + timedelta(days=28))
+
+        assert len(first) == 7
+        assert len(second) == 28
+        calls = _list_calls(service)
+        assert calls[0].kwargs['singleEvents'] is False
+        assert calls[0].kwargs['timeMin'] == window_start.isoformat()
+        assert calls[1].kwargs['syncToken'] == 'sync1'
+
+    def test_exceptions_are_merged(self):
+        """差分で届いた変更・キャンセルを展開結果にマージする"""
+        moved = self._exception(
+            '20260210T010000Z',
+            summary='朝会（時間変更）',
+            start={'dateTime': '2026-02-10T11:00:00+09:00'},
+            end={'dateTime': '2026-02-10T11:30:00+09:00'},
+        )
+        cancelled = {
+            'id': 'standup_20260211T010000Z',
+            'recurringEventId': 'standup',
+            'status': 'cancelled',
+            'originalStartTime': {'dateTime': '2026-02-11T10:00:00+09:00'},
+        }
+        service = _service_with_responses(
+            {'items': [_master(['RRULE:FREQ=DAILY'])], 'nextSyncToken': 'sync1'},
+            {'items': [moved, cancelled], 'nextSyncToken': 'sync2'},
+        )
+        store = RecurringEventStore()
+        window_start, window_end = _window(9, 3)
+
+        store.window_items(service, 'account_1', 'primary', window_start, window_end)
+        items = store.window_items(service, 'account_1', 'primary', window_start, window_end)
+
+        by_id = {i['id']: i for i in items}
+        assert set(by_id) == {'standup_20260209T010000Z', 'standup_20260210T010000Z'}
+        assert by_id['standup_20260210T010000Z']['summary'] == '朝会（時間変更）'
+
+    def test_expired_sync_token_triggers_full_sync(self):
+        """syncTokenが失効（410）した場合は全件同期し直す"""
+        gone = HttpError(MagicMock(status=410), b'{"error": "gone"}')
+        service = _service_with_responses(
+            {'items': [_master(['RRULE:FREQ=DAILY'])], 'nextSyncToken': 'sync1'},
+            gone,
+            {'items': [_master(['RRULE:FREQ=DAILY;COUNT=1'], start='2026-02-09T10:00:00+09:00',
+                                end='2026-02-09T10:30:00+09:00')], 'nextSyncToken': 'sync2'},
+        )
+        store = RecurringEventStore()
+        window_start, window_end = _window(9, 3)
+
+        store.window_items(service, 'account_1', 'primary', window_start, window_end)
+        items = store.window_items(service, 'account_1', 'primary', window_start, window_end)
+
+        assert len(items) == 1
+        assert 'timeMin' in _list_calls(service)[2].kwargs
+
+    def test_unsupported_calendar_returns_none(self):
+        """ローカル展開できないカレンダーはNoneを返し、再同期しない"""
+        service = _service_with_responses(
+            {'items': [_master(['RRULE:FREQ=DAILY', 'RDATE:20260220T010000Z'])], 'nextSyncToken': 'sync1'},
+        )
+        store = RecurringEventStore()
+        window_start, window_end = _window(9, 3)
+
+        assert store.window_items(service, 'account_1', 'primary', window_start, window_end) is None
+        assert store.window_items(service, 'account_1', 'primary', window_start, window_end) is None
+        assert len(_list_calls(service)) == 1
+
+
+class TestCalendarClientLocalExpansion:
+    """CalendarClientとの統合テスト"""
+
+    def test_local_expansion_and_fallback(self):
+        """ローカル展開が有効ならキャッシュから、展開不可ならsingleEvents=Trueで取得する"""
+        store = MagicMock()
+        store.window_items.side_effect = [
+            [{'id': 'standup_1', 'summary': '朝会',
+              'start': {'dateTime': '2026-02-09T10:00:00+09:00'},
+              'end': {'dateTime': '2026-02-09T10:30:00+09:00'}}],
+            None,
+        ]
+        service = _service_with_responses({'items': [{
+            'id': 'single', 'summary': '単発',
+            'start': {'dateTime': '2026-02-09T12:00:00+09:00'},
+            'end': {'dateTime': '2026-02-09T13:00:00+09:00'},
+        }]})
+
+        client = CalendarClient()
+        client._recurring_store = store
+
+        with patch('src.calendar_client.CALENDAR_IDS', ['primary', 'team']):
+            events = client._get_events_from_service(service, 'account_1', '#4285f4', '仕事', 7)
+
+        assert [e.id for e in events] == ['standup_1', 'single']
+        assert _list_calls(service)[0].kwargs['singleEvents'] is True
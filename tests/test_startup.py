@@ -0,0 +1,153 @@
+"""
+起動時間の短縮（遅延インポート・遅延初期化）のテスト
+"""
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from benchmarks.startup_benchmark import DEFERRED_MODULES, TARGETS, parse_importtime, run_case, total_import_ms
+from src.lazy_import import LazyImport
+
+
+class TestLazyImport:
+    """LazyImport のテスト"""
+
+    def test_resolves_on_first_use(self):
+        """最初の利用時に読み込み、以降は同じ実体を使う"""
+        lazy = LazyImport('json', 'dumps')
+        assert not lazy.is_loaded
+
+        assert lazy({'a': 1}) == '{"a": 1}'
+        assert lazy.is_loaded
+        assert lazy.resolve() is __import__('json').dumps
+
+    def test_attribute_access_is_delegated(self):
+        """属性の参照は実体に委譲する"""
+        lazy = LazyImport('pathlib', 'Path')
+        assert lazy.cwd() == Path.cwd()
+
+    def test_attribute_can_be_patched(self):
+        """patch で属性を差し替え、終了後に元に戻せる"""
+        lazy = LazyImport('pathlib', 'Path')
+        with patch.object(lazy, 'cwd', return_value='patched'):
+            assert lazy.cwd() == 'patched'
+        assert lazy.cwd() == Path.cwd()
+
+
+class TestDeferredInitialization:
+    """CalendarClient・WallpaperService の遅延初期化のテスト"""
+
+    @patch('src.calendar_client.build')
+    def test_account_service_is_built_on_first_use(self, mock_build):
+        """アカウントのサービスは最初のAPI呼び出しで1回だけ構築する"""
+        from src.calendar_client import _DeferredService
+
+        service = _DeferredService(credentials='creds')
+        mock_build.assert_not_called()
+
+        service.events()
+        service.calendarList()
+        mock_build.assert_called_once_with('calendar', 'v3', credentials='creds')
+
+    @patch('src.viewmodels.wallpaper_service.ImageGenerator')
+    @patch('src.viewmodels.wallpaper_service.CalendarClient')
+    def test_service_creates_components_on_first_use(self, mock_client_cls, mock_generator_cls, tmp_path):
+        """CalendarClient・ImageGenerator は最初に使われた時点で作成し、先に受けた背景設定を反映する"""
+        from src.viewmodels.wallpaper_service import WallpaperService
+
+        service = WallpaperService()
+        service.set_background_image(tmp_path / 'bg.png')
+        service.set_crop_position('top')
+        service.invalidate_events_cache()
+
+        mock_client_cls.assert_not_called()
+        mock_generator_cls.assert_not_called()
+        assert service.crop_position == 'top'
+        events_cache = service.events_cache
+
+        generator = service.image_generator
+        generator.set_background_image.assert_called_once_with(tmp_path / 'bg.png')
+        generator.set_crop_position.assert_called_once_with('top')
+        assert service.calendar_client is mock_client_cls.return_value
+        mock_client_cls.assert_called_once_with(events_cache=events_cache)
+
+    @patch('src.viewmodels.wallpaper_service.warm_up_calendar_api')
+    @patch('src.viewmodels.wallpaper_service.CalendarClient')
+    def test_warm_up_loads_modules_without_creating_components(self, mock_client_cls, mock_calendar_warm_up):
+        """warm_up はモジュールの読み込みだけを行い、CalendarClient・ImageGenerator は作成しない"""
+        from src.viewmodels import wallpaper_service
+        from src.viewmodels.wallpaper_service import WallpaperService
+
+        service = WallpaperService()
+        service.warm_up()
+
+        assert wallpaper_service.ImageGenerator.is_loaded
+        assert wallpaper_service.render_for_displays.is_loaded
+        mock_calendar_warm_up.assert_called_once_with()
+        mock_client_cls.assert_not_called()
+        assert service._image_generator is None
+
+    @patch('src.calendar_client.build')
+    def test_calendar_warm_up_does_not_build_services(self, mock_build):
+        """Google API のモジュールを読み込み、アカウントのサービスは構築しない"""
+        from src import calendar_client
+
+        calendar_client.warm_up()
+
+        assert calendar_client.Request.is_loaded
+        assert calendar_client.Credentials.is_loaded
+        mock_build.assert_not_called()
+
+
+class TestStartupBenchmark:
+    """起動時間のベンチマークのテスト"""
+
+    def test_parse_importtime(self):
+        """`-X importtime` の出力からモジュールごとの時間と深さを読み取る"""
+        stderr = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |   child",
+            "import time:       200 |        300 | parent",
+            "import time:        50 |         50 | other",
+        ])
+        modules = parse_importtime(stderr)
+
+        assert modules['child'] == {'self_us': 100, 'cumulative_us': 100, 'depth': 1}
+        assert modules['parent']['cumulative_us'] == 300
+        assert total_import_ms(modules) == pytest.approx(0.35)
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize('target', sorted(TARGETS))
+    def test_heavy_modules_are_not_imported_at_startup(self, target):
+        """GUI・CLI の起動時に NumPy・PIL・Google API クライアントを読み込まない"""
+        result = run_case(TARGETS[target], repeat=1)
+
+        assert result['eager_heavy_modules'] == []
+        assert result['median_ms'] > 0
+        assert set(DEFERRED_MODULES).isdisjoint(result['top_cumulative_ms'])
+
+
+class TestCachedPreview:
+    """起動時のキャッシュ壁紙のプレビュー表示のテスト"""
+
+    def test_window_shows_cached_wallpaper(self, qtbot, tmp_path):
+        """前回の壁紙があれば取得・描画を待たずにプレビューに表示する"""
+        from PIL import Image
+        from src.ui.main_window import MainWindow
+
+        cached = tmp_path / 'cached.png'
+        Image.new('RGB', (64, 36), (10, 20, 30)).save(cached)
+        viewmodel = MagicMock()
+        viewmodel.get_available_themes.return_value = ['simple']
+        viewmodel.current_theme = 'simple'
+        viewmodel.get_cached_wallpaper.return_value = cached
+        settings = MagicMock()
+        settings.get.side_effect = lambda key, default=None: {'auto_update_enabled': False}.get(key, default)
+
+        with patch('src.ui.main_window.PreviewWidget.set_image') as set_image:
+            window = MainWindow(viewmodel=viewmodel, settings_service=settings)
+            qtbot.addWidget(window)
+
+        set_image.assert_called_once_with(cached)
+        assert window.statusBar().currentMessage() == "前回の壁紙を表示中"
@@ -0,0 +1,119 @@
+"""
+UpdateRequestQueue（更新リクエストのまとめ）のテスト
+"""
+import time
+from unittest.mock import Mock, patch
+
+from src.viewmodels.update_queue import UpdateReason, UpdateRequestQueue
+
+
+class TestUpdateRequestQueue:
+    """キューの単体テスト"""
+
+    def test_idle_request_starts_immediately(self):
+        """実行中でなければ即座に開始する"""
+        queue = UpdateRequestQueue(coalesce_seconds=30)
+        assert queue.submit(UpdateReason.REFRESH, busy=False, now=0) is True
+
+    def test_busy_requests_merge_into_strongest_pending(self):
+        """実行中のリクエストは1件にまとめ、最も強い理由を保持する"""
+        queue = UpdateRequestQueue(coalesce_seconds=0)
+        queue.mark_started(UpdateReason.TIME_ONLY, now=0)
+
+        assert queue.submit(UpdateReason.TIME_ONLY, busy=True, now=10) is False
+        assert queue.submit(UpdateReason.FULL, busy=True, now=11) is False
+        assert queue.submit(UpdateReason.REFRESH, busy=True, now=12) is False
+
+        assert queue.pending == UpdateReason.FULL
+        assert queue.take_pending(now=20) == UpdateReason.FULL
+        assert queue.take_pending(now=21) is None
+        assert queue.stats['merged'] == 2
+
+    def test_automatic_request_absorbed_by_recent_stronger_update(self):
+        """直前に同等以上の更新を開始していれば自動リクエストは省略する"""
+        queue = UpdateRequestQueue(coalesce_seconds=30)
+        queue.mark_started(UpdateReason.FULL, now=100)
+
+        assert queue.submit(UpdateReason.FULL, busy=True, now=101) is False
+        assert queue.submit(UpdateReason.REFRESH, busy=False, now=110) is False
+        assert queue.pending is None
+        assert queue.stats['absorbed'] == 2
+
+    def test_weaker_recent_update_does_not_absorb_stronger_request(self):
+        """直前の更新が弱ければ強いリクエストは保留される"""
+        queue = UpdateRequestQueue(coalesce_seconds=30)
+        queue.mark_started(UpdateReason.TIME_ONLY, now=100)
+
+        queue.submit(UpdateReason.FULL, busy=True, now=101)
+
+        assert queue.take_pending(now=105) == UpdateReason.FULL
+
+    def test_manual_request_never_absorbed(self):
+        """ユーザー操作のリクエストは直前の更新があっても実行する"""
+        queue = UpdateRequestQueue(coalesce_seconds=30)
+        queue.mark_started(UpdateReason.FULL, now=100)
+
+        assert queue.submit(UpdateReason.REFRESH, busy=False, manual=True, now=101) is True
+
+    def test_clear_drops_pending(self):
+        """clear で保留中の更新を破棄する"""
+        queue = UpdateRequestQueue(coalesce_seconds=0)
+        queue.submit(UpdateReason.REFRESH, busy=True, now=0)
+        queue.clear()
+        assert queue.take_pending(now=1) is None
+
+
+class TestMainViewModelUpdateQueue:
+    """MainViewModelでのまとめ動作のテスト"""
+
+    def test_follow_up_runs_once_after_current_update(self, qtbot):
+        """更新中の複数リクエストは完了後に1回だけ実行される"""
+        from src.viewmodels.main_viewmodel import MainViewModel
+
+        def slow_process(*args, **kwargs):
+            time.sleep(0.3)
+            return True
+
+        mock_service = Mock()
+        mock_service.generate_and_set_wallpaper.side_effect = slow_process
+
+        with patch('src.viewmodels.main_viewmodel.WallpaperService', return_value=mock_service):
+            viewmodel = MainViewModel()
+            viewmodel._update_queue.coalesce_seconds = 0
+
+            assert viewmodel.update_wallpaper() is True
+            assert viewmodel.update_wallpaper(UpdateReason.TIME_ONLY, automatic=True) is False
+            assert viewmodel.update_wallpaper(UpdateReason.FULL, automatic=True) is False
+
+            qtbot.waitUntil(
+                lambda: mock_service.generate_and_set_wallpaper.call_count == 2
+                and not viewmodel.is_updating,
+                timeout=5000
+            )
+            qtbot.wait(200)
+
+            assert mock_service.generate_and_set_wallpaper.call_count == 2
+            # FULL でまとめられたため、予定のキャッシュを破棄してから実行
+            mock_service.calendar_client.invalidate_events_cache.assert_called_once()
+
+    def test_wake_burst_runs_single_update(self, qtbot):
+        """スリープ復帰直後に各タイマーが発火しても更新は1回だけ"""
+        from src.viewmodels.main_viewmodel import MainViewModel
+
+        mock_service = Mock()
+        mock_service.generate_and_set_wallpaper.return_value = True
+
+        with patch('src.viewmodels.main_viewmodel.WallpaperService', return_value=mock_service):
+            viewmodel = MainViewModel()
+            viewmodel.start_auto_update()
+
+            viewmodel.update_wallpaper(UpdateReason.FULL, automatic=True)
+            viewmodel._on_auto_update_timeout()
+            viewmodel._on_time_indicator_timeout()
+            viewmodel._on_midnight_timeout()
+
+            qtbot.waitUntil(lambda: not viewmodel.is_updating, timeout=5000)
+            qtbot.wait(200)
+
+            assert mock_service.generate_and_set_wallpaper.call_count == 1
+            viewmodel.stop_auto_update()
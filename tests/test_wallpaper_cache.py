@@ -212,3 +212,82 @@ class TestWallpaperServiceCacheIntegration:
         result = cache.load_cache()
         assert result is not None
         assert result.exists()
+
+
+class TestWallpaperCacheFrame:
+    """フレームのスナップショット（描画に使った予定）のテスト"""
+
+    def _event(self, event_id, start):
+        from datetime import timedelta
+        from src.models.event import CalendarEvent
+        return CalendarEvent(
+            id=event_id, summary=f"予定 {event_id}", start_datetime=start,
+            end_datetime=start + timedelta(hours=1), is_all_day=False, calendar_id='primary'
+        )
+
+    def test_save_and_load_frame(self, tmp_path):
+        """保存した予定・描画状態を前回の壁紙とともに読み込めること"""
+        from datetime import timezone, timedelta
+        from src.wallpaper_cache import WallpaperCache
+        cache = WallpaperCache(cache_dir=tmp_path)
+        wallpaper_path = tmp_path / 'wallpaper.png'
+        wallpaper_path.write_bytes(b'dummy')
+        now = datetime.now().replace(microsecond=0)
+        events = [
+            self._event('a', now),
+            self._event('b', now.replace(tzinfo=timezone(timedelta(hours=9)))),
+        ]
+
+        cache.save_cache(wallpaper_path=wallpaper_path, theme='dark')
+        cache.save_frame(wallpaper_path, events, 'state')
+        frame = cache.load_frame()
+
+        assert frame.wallpaper_path == wallpaper_path
+        assert frame.theme == 'dark'
+        assert frame.week_events == events
+        assert frame.render_state == 'state'
+        assert frame.is_from_today()
+        assert frame.today_events() == events
+
+    def test_load_frame_ignores_snapshot_of_other_wallpaper(self, tmp_path):
+        """スナップショットが前回の壁紙と別のファイルのものならNone"""
+        from src.wallpaper_cache import WallpaperCache
+        cache = WallpaperCache(cache_dir=tmp_path)
+        old_path = tmp_path / 'old.png'
+        new_path = tmp_path / 'new.png'
+        old_path.write_bytes(b'old')
+        new_path.write_bytes(b'new')
+
+        cache.save_cache(wallpaper_path=old_path, theme='simple')
+        cache.save_frame(old_path, [], 'state')
+        cache.save_cache(wallpaper_path=new_path, theme='simple')
+
+        assert cache.load_frame() is None
+        assert cache.load_cache() == new_path
+
+    def test_load_frame_without_snapshot(self, tmp_path):
+        """スナップショットがなければNone（load_cache は従来どおり）"""
+        from src.wallpaper_cache import WallpaperCache
+        cache = WallpaperCache(cache_dir=tmp_path)
+        wallpaper_path = tmp_path / 'wallpaper.png'
+        wallpaper_path.write_bytes(b'dummy')
+        cache.save_cache(wallpaper_path=wallpaper_path, theme='simple')
+
+        assert cache.load_frame() is None
+        assert cache.load_cache() == wallpaper_path
+
+    def test_failed_frame_write_keeps_previous_snapshot(self, tmp_path):
+        """スナップショットの書き込みに失敗しても前回のスナップショットは壊れないこと"""
+        from unittest.mock import patch
+        from src.wallpaper_cache import WallpaperCache
+        cache = WallpaperCache(cache_dir=tmp_path)
+        wallpaper_path = tmp_path / 'wallpaper.png'
+        wallpaper_path.write_bytes(b'dummy')
+        cache.save_cache(wallpaper_path=wallpaper_path, theme='simple')
+        cache.save_frame(wallpaper_path, [], 'old')
+
+        with patch('src.atomic_output.os.fsync', side_effect=OSError('disk full')):
+            cache.save_frame(wallpaper_path, [], 'new')
+
+        assert cache.load_frame().render_state == 'old'
+        assert not list(tmp_path.glob('*.tmp'))
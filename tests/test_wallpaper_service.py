@@ -245,3 +245,177 @@ class TestWallpaperService:
         call_args = mock_generator.generate_wallpaper.call_args
         assert call_args[0][0] == [event_morning, event_lunch]  # today_events
         assert call_args[0][1] == all_week_events  # week_events
+
+
+class TestRefreshTimeOnly:
+    """時刻のみの更新（refresh_time_only）のテスト"""
+
+    def _make_service(self, mock_image_generator, mock_wallpaper_setter, mock_calendar_client):
+        from src.viewmodels.wallpaper_service import WallpaperService
+
+        mock_client = Mock()
+        mock_client.authenticate.return_value = True
+        mock_client.get_week_events.return_value = []
+        mock_calendar_client.return_value = mock_client
+
+        mock_generator = Mock()
+        mock_generator.generate_wallpaper.return_value = Path("/tmp/test_wallpaper.png")
+        mock_generator.visible_time_state.return_value = ("state", 10)
+        mock_image_generator.return_value = mock_generator
+
+        mock_setter = Mock()
+        mock_setter.set_wallpaper.return_value = True
+        mock_setter.applied_paths.return_value = []
+        mock_wallpaper_setter.return_value = mock_setter
+
+        return WallpaperService(), mock_client, mock_generator, mock_setter
+
+    @patch('src.viewmodels.wallpaper_service.CalendarClient')
+    @patch('src.viewmodels.wallpaper_service.WallpaperSetter')
+    @patch('src.viewmodels.wallpaper_service.ImageGenerator')
+    def test_unchanged_time_state_skips_render_and_apply(self, *mocks):
+        """時刻依存の表示が変わらなければ描画も適用もしない"""
+        service, client, generator, setter = self._make_service(*mocks)
+        assert service.generate_and_set_wallpaper("simple") is True
+
+        assert service.refresh_time_only("simple") is True
+
+        assert generator.generate_wallpaper.call_count == 1
+        assert setter.set_wallpaper.call_count == 1
+        client.get_week_events.assert_called_once()
+
+    @patch('src.viewmodels.wallpaper_service.CalendarClient')
+    @patch('src.viewmodels.wallpaper_service.WallpaperSetter')
+    @patch('src.viewmodels.wallpaper_service.ImageGenerator')
+    def test_changed_time_state_rerenders_without_fetch(self, *mocks):
+        """表示が変わる場合は前回のイベントで描画し直す（予定は取得しない）"""
+        service, client, generator, setter = self._make_service(*mocks)
+        service.generate_and_set_wallpaper("simple")
+
+        generator.visible_time_state.return_value = ("state", 11)
+        assert service.refresh_time_only("simple") is True
+
+        assert generator.generate_wallpaper.call_count == 2
+        assert setter.set_wallpaper.call_count == 2
+        client.get_week_events.assert_called_once()
+        client.load_accounts.assert_called_once()
+
+    @patch('src.viewmodels.wallpaper_service.CalendarClient')
+    @patch('src.viewmodels.wallpaper_service.WallpaperSetter')
+    @patch('src.viewmodels.wallpaper_service.ImageGenerator')
+    def test_falls_back_to_full_update_without_snapshot(self, *mocks):
+        """前回のイベントがない・テーマが違う場合は通常の更新を行う"""
+        service, client, generator, setter = self._make_service(*mocks)
+
+        assert service.refresh_time_only("simple") is True
+        assert client.get_week_events.call_count == 1
+
+        assert service.refresh_time_only("dark") is True
+        assert client.get_week_events.call_count == 2
+
+
+class TestVisibleTimeState:
+    """ImageGenerator.visible_time_state のテスト"""
+
+    def _event(self, start, end):
+        from src.models.event import CalendarEvent
+        return CalendarEvent(
+            id="evt", summary="会議", start_datetime=start, end_datetime=end,
+            is_all_day=False, calendar_id="primary",
+        )
+
+    def test_state_changes_with_hour_slot(self):
+        """現在時刻の時間枠が変わると値が変わる"""
+        from datetime import datetime
+        from src.image_generator import ImageGenerator
+
+        gen = ImageGenerator(resolution=(1920, 1080))
+        day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        a = gen.visible_time_state([], [], now=day.replace(hour=10, minute=5))
+        b = gen.visible_time_state([], [], now=day.replace(hour=10, minute=50))
+        c = gen.visible_time_state([], [], now=day.replace(hour=11, minute=0))
+
+        assert a == b
+        assert a != c
+
+    def test_state_tracks_hero_countdown_and_progress(self):
+        """Heroカードは残り時間・進行状況バーの幅が変わった場合のみ値が変わる"""
+        from datetime import datetime, timedelta
+        from src.image_generator import ImageGenerator
+
+        gen = ImageGenerator(resolution=(1920, 1080))
+        start = datetime.now().replace(hour=13, minute=0, second=0, microsecond=0)
+        event = self._event(start, start + timedelta(hours=1))
+
+        # 開始前: カウントダウンの分が同じなら変化なし
+        before_a = gen.visible_time_state([event], [event], now=start - timedelta(hours=3, seconds=-10))
+        before_b = gen.visible_time_state([event], [event], now=start - timedelta(hours=3, seconds=-40))
+        assert before_a == before_b
+
+        # 進行中: 進行状況バーの幅が伸びれば変化あり
+        during_a = gen.visible_time_state([event], [event], now=start + timedelta(minutes=10))
+        during_b = gen.visible_time_state([event], [event], now=start + timedelta(minutes=15))
+        assert during_a != during_b
+
+    @pytest.mark.parametrize('count', [3, 4])
+    def test_state_tracks_card_progress(self, count):
+        """3列レイアウト（card / compact）でも進行中カードの進行状況バーの幅が変われば値が変わる"""
+        from datetime import datetime, timedelta
+        from src.image_generator import ImageGenerator
+
+        gen = ImageGenerator(resolution=(1920, 1080))
+        start = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+        today = [self._event(start, start + timedelta(hours=1)) for _ in range(count)]
+        tomorrow = self._event(start + timedelta(days=1), start + timedelta(days=1, hours=1))
+        week = today + [tomorrow]
+
+        early = gen.visible_time_state(today, week, now=start + timedelta(minutes=5))
+        late = gen.visible_time_state(today, week, now=start + timedelta(minutes=40))
+        assert early[2][0] == ('card' if count <= 3 else 'compact')
+        assert early != late
+
+
+class TestPreviewRendering:
+    """プレビューサイズでの壁紙生成のテスト"""
+
+    def test_preview_is_rendered_at_preview_size(self, tmp_path):
+        """output_size を指定するとその範囲に収まるサイズで保存される"""
+        from PIL import Image
+        from src.image_generator import ImageGenerator
+
+        gen = ImageGenerator(resolution=(1920, 1080))
+        path = gen.generate_wallpaper([], [], output_path=tmp_path / "preview.png", output_size=(640, 360))
+
+        with Image.open(path) as img:
+            assert img.size == (640, 360)
+
+    def test_downscale_keeps_aspect_ratio(self):
+        """縮小時は縦横比を維持し、拡大はしない"""
+        from PIL import Image
+        from src.image_generator import ImageGenerator
+
+        small = ImageGenerator._downscale(Image.new("RGB", (2560, 1600)), (640, 360))
+        assert small.size == (576, 360)
+
+        same = ImageGenerator._downscale(Image.new("RGB", (320, 180)), (640, 360))
+        assert same.size == (320, 180)
+
+    def test_preview_background_is_shared_between_generators(self, tmp_path):
+        """縮小した背景はインスタンスをまたいで再利用される"""
+        from PIL import Image
+        from src import image_generator
+        from src.image_generator import ImageGenerator
+
+        bg = tmp_path / "bg.png"
+        Image.new("RGB", (1600, 900), (10, 120, 200)).save(bg)
+
+        first = ImageGenerator(resolution=(1920, 1080))
+        first.set_background_image(bg)
+        first.generate_wallpaper([], [], output_path=tmp_path / "a.png", output_size=(640, 360))
+
+        second = ImageGenerator(resolution=(1920, 1080))
+        second.set_background_image(bg)
+        with patch.object(image_generator.Image, "open", wraps=image_generator.Image.open) as opened:
+            second.generate_wallpaper([], [], output_path=tmp_path / "b.png", output_size=(640, 360))
+        assert bg not in [call.args[0] for call in opened.call_args_list]
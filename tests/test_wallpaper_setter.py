@@ -504,3 +504,86 @@ class TestPathValidation:
         # Assert: 受け入れられる
         assert result is True, "通常サイズのファイルが拒否された"
         assert mock_subprocess_run.called, "通常サイズのファイルでsubprocess.runが呼ばれなかった"
+
+
+class TestSkipUnchangedWallpaper:
+    """内容が同じ壁紙の再設定スキップのテスト"""
+
+    def _image(self, path: Path, color=(0, 0, 0)) -> Path:
+        from PIL import Image
+        Image.new('RGB', (8, 8), color).save(path)
+        return path
+
+    @patch('src.wallpaper_setter.subprocess.run')
+    def test_identical_content_skips_os_call(self, mock_run, tmp_path):
+        """同じ内容の壁紙は2回目以降OSを呼び出さない"""
+        mock_run.return_value = Mock(returncode=0)
+        setter = WallpaperSetter(state_path=tmp_path / 'state.json')
+        setter.system = 'Linux'
+        image = self._image(tmp_path / 'a.png')
+
+        assert setter.set_wallpaper(image) is True
+        assert setter.set_wallpaper(image) is True
+
+        assert mock_run.call_count == 1
+        assert setter.metrics['applied'] == 1
+        assert setter.metrics['skipped'] == 1
+        assert setter.metrics['os_calls_saved'] == 1
+
+    @patch('src.wallpaper_setter.subprocess.run')
+    def test_changed_content_is_applied(self, mock_run, tmp_path):
+        """内容が変わった場合は適用する"""
+        mock_run.return_value = Mock(returncode=0)
+        setter = WallpaperSetter(state_path=tmp_path / 'state.json')
+        setter.system = 'Linux'
+        image = self._image(tmp_path / 'a.png')
+        setter.set_wallpaper(image)
+
+        self._image(image, color=(255, 255, 255))
+        setter.set_wallpaper(image)
+
+        assert mock_run.call_count == 2
+
+    @patch('src.wallpaper_setter.subprocess.run')
+    def test_state_persists_across_instances(self, mock_run, tmp_path):
+        """適用済みの記録は再起動（新しいインスタンス）後も有効"""
+        mock_run.return_value = Mock(returncode=0)
+        state_path = tmp_path / 'state.json'
+        image = self._image(tmp_path / 'a.png')
+
+        first = WallpaperSetter(state_path=state_path)
+        first.system = 'Linux'
+        first.set_wallpaper(image)
+
+        second = WallpaperSetter(state_path=state_path)
+        second.system = 'Linux'
+        assert second.set_wallpaper(image) is True
+        assert mock_run.call_count == 1
+
+    @patch('src.wallpaper_setter.subprocess.run')
+    def test_same_content_at_new_path_skips_while_old_file_unchanged(self, mock_run, tmp_path):
+        """別パスでも同じ内容で、適用中のファイルが残っていればスキップ"""
+        mock_run.return_value = Mock(returncode=0)
+        setter = WallpaperSetter(state_path=tmp_path / 'state.json')
+        setter.system = 'Linux'
+        first = self._image(tmp_path / 'a.png')
+        second = self._image(tmp_path / 'b.png')
+        setter.set_wallpaper(first)
+        setter.set_wallpaper(second)
+        assert mock_run.call_count == 1
+
+        first.unlink()
+        setter.set_wallpaper(second)
+        assert mock_run.call_count == 2
+
+    @patch('src.wallpaper_setter.subprocess.run')
+    def test_failed_apply_is_not_recorded(self, mock_run, tmp_path):
+        """適用に失敗した場合は記録しない"""
+        mock_run.side_effect = subprocess.CalledProcessError(1, 'cmd', stderr='error')
+        setter = WallpaperSetter(state_path=tmp_path / 'state.json')
+        setter.system = 'Linux'
+        image = self._image(tmp_path / 'a.png')
+
+        assert setter.set_wallpaper(image) is False
+        assert setter.set_wallpaper(image) is False
+        assert setter.metrics['skipped'] == 0